@@ -5,14 +5,18 @@ Simple approach to just list all memory records without semantic search
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict
 import os
 import logging
 from datetime import datetime
 from bedrock_agentcore.memory import MemoryClient
 from dotenv import load_dotenv
+from event_index import EventIndex
+from event_stream import EventScan, entry_filter, event_text, sort_entries
+from memory_catalog import NamespaceCatalog, record_text
 
 # Load environment variables from .env file
 load_dotenv()
@@ -84,6 +88,14 @@ app.add_middleware(
 
 # Configuration
 MEMORY_ID = os.getenv("AGENTCORE_MEMORY_ID")  # No default - must be provided by user
+# Namespace catalog: how long strategies/namespace samples are reused, and how
+# many namespaces are sampled at once
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", "300"))
+CATALOG_MAX_WORKERS = int(os.getenv("CATALOG_MAX_WORKERS", "8"))
+# Event index: background refresh period, and how long a scanned session's
+# event IDs are trusted before the session is scanned again
+EVENT_INDEX_REFRESH_SECONDS = float(os.getenv("EVENT_INDEX_REFRESH_SECONDS", "60"))
+EVENT_INDEX_RESCAN_SECONDS = float(os.getenv("EVENT_INDEX_RESCAN_SECONDS", "300"))
 
 
 # AWS Region detection - try multiple sources
@@ -152,6 +164,29 @@ except Exception as e:
     logger.error(f"❌ Failed to initialize AgentCore Memory client: {e}")
     memory_client = None
 
+namespace_catalog = (
+    NamespaceCatalog(
+        memory_client,
+        ttl_seconds=CATALOG_TTL_SECONDS,
+        max_workers=CATALOG_MAX_WORKERS,
+    )
+    if memory_client
+    else None
+)
+
+event_index = (
+    EventIndex(
+        memory_client,
+        refresh_interval_seconds=EVENT_INDEX_REFRESH_SECONDS,
+        rescan_after_seconds=EVENT_INDEX_RESCAN_SECONDS,
+        max_workers=CATALOG_MAX_WORKERS,
+    )
+    if memory_client
+    else None
+)
+if event_index and MEMORY_ID:
+    event_index.warm(MEMORY_ID)
+
 
 class MemoryQuery(BaseModel):
     namespace: Optional[str] = None
@@ -169,6 +204,8 @@ async def health_check():
         "region": AWS_REGION,
         "region_source": "auto-detected from AWS configuration",
         "requires_memory_id": MEMORY_ID is None,
+        "namespace_catalog": namespace_catalog.stats() if namespace_catalog else None,
+        "event_index": event_index.stats() if event_index else None,
         "timestamp": datetime.now().isoformat() + "Z",
     }
 
@@ -185,6 +222,15 @@ class ShortTermMemoryQuery(BaseModel):
     sort_order: Optional[str] = "desc"
     # Essential filters only
     content_search: Optional[str] = None
+    # Pagination: next_cursor from the previous response, and how many events
+    # to scan for max_results matches per request (defaults to max_results).
+    # Pages hold consecutive matches and sort_by orders each page on its own.
+    # With rank_window, a request instead returns the top max_results matches
+    # by sort_by of the next max_scan events; next_cursor continues after those
+    # events, so matches ranked lower within them are not returned
+    cursor: Optional[str] = None
+    max_scan: Optional[int] = None
+    rank_window: bool = False
 
 
 class LongTermMemoryQuery(BaseModel):
@@ -194,6 +240,8 @@ class LongTermMemoryQuery(BaseModel):
     content_type: Optional[str] = "all"
     sort_by: Optional[str] = "timestamp"
     sort_order: Optional[str] = "desc"
+    # Bypass the cached retrieval for this namespace
+    refresh: Optional[bool] = False
 
     @field_validator("namespace")
     @classmethod
@@ -203,49 +251,6 @@ class LongTermMemoryQuery(BaseModel):
         return v.strip()
 
 
-def apply_short_term_filters(
-    memories: List[Dict[str, Any]], query: ShortTermMemoryQuery
-) -> List[Dict[str, Any]]:
-    """Apply client-side filters to short-term memory results"""
-    filtered_memories = memories.copy()
-
-    # Content search filtering
-    if query.content_search and query.content_search.strip():
-        search_term = query.content_search.strip().lower()
-        filtered_memories = [
-            m for m in filtered_memories if search_term in m.get("content", "").lower()
-        ]
-
-    # Role filtering (existing)
-    if query.role_filter != "all":
-        filtered_memories = [
-            m
-            for m in filtered_memories
-            if m.get("role", "").upper() == query.role_filter.upper()
-        ]
-
-    # Event type filtering (existing)
-    if query.event_type != "all":
-        filtered_memories = [
-            m for m in filtered_memories if m.get("type", "") == query.event_type
-        ]
-
-    # Simple sorting with consistent string conversion
-    reverse_order = query.sort_order == "desc"
-
-    if query.sort_by == "timestamp":
-        # Convert all timestamps to strings for consistent sorting
-        filtered_memories.sort(
-            key=lambda x: str(x.get("timestamp", "")), reverse=reverse_order
-        )
-    elif query.sort_by == "size":
-        filtered_memories.sort(
-            key=lambda x: int(x.get("size", 0)), reverse=reverse_order
-        )
-
-    return filtered_memories
-
-
 @app.post("/api/agentcore/getShortTermMemory")
 async def get_short_term_memory(query: ShortTermMemoryQuery):
     """Get short-term memory (events and conversation turns) from AgentCore Memory"""
@@ -272,82 +277,31 @@ async def get_short_term_memory(query: ShortTermMemoryQuery):
         logger.info(f"📋 Memory ID: {memory_id}")
         logger.info(f"📋 Max results: {query.max_results}")
 
-        # Method 1: Try ListEvents API
+        # Method 1: Try ListEvents API, one page at a time from the cursor,
+        # until max_results matches are found or max_scan events are scanned
+        # (or, ranking the window, keeping the top max_results of max_scan)
+        matches = entry_filter(
+            query.content_search, query.role_filter, query.event_type
+        )
+        scan = EventScan(
+            memory_client,
+            memory_id,
+            query.actor_id,
+            query.session_id,
+            cursor=query.cursor,
+            limit=query.max_results,
+            max_scan=query.max_scan,
+            matches=matches,
+            rank_by=query.sort_by if query.rank_window else None,
+            rank_order=query.sort_order,
+        )
         try:
             logger.info("📞 Using ListEvents API")
-            events = memory_client.list_events(
-                memory_id=memory_id,
-                actor_id=query.actor_id,
-                session_id=query.session_id,
-                max_results=query.max_results,
+            short_term_memories = await run_in_threadpool(scan.run)
+            logger.info(
+                f"✅ Scanned {scan.scanned} events, kept {len(short_term_memories)}"
             )
 
-            if events:
-                logger.info(f"✅ Found {len(events)} events")
-
-                for event_idx, event in enumerate(events):
-                    payload = event.get("payload", {})
-                    content_text = ""
-
-                    # Handle the actual payload structure from MemoryClient.list_events
-                    if isinstance(payload, list) and len(payload) > 0:
-                        # Payload is a list, get first item
-                        first_item = payload[0]
-                        if isinstance(first_item, dict):
-                            # Look for conversational content
-                            if "conversational" in first_item:
-                                conversational = first_item["conversational"]
-                                if isinstance(conversational, dict):
-                                    content = conversational.get("content", {})
-                                    if isinstance(content, dict) and "text" in content:
-                                        content_text = content["text"]
-                                    else:
-                                        content_text = str(conversational)
-                            else:
-                                # Fallback to any content field
-                                if "content" in first_item:
-                                    content = first_item["content"]
-                                    if isinstance(content, dict) and "text" in content:
-                                        content_text = content["text"]
-                                    else:
-                                        content_text = str(content)
-                                else:
-                                    content_text = str(first_item)
-                        else:
-                            content_text = str(first_item)
-                    elif isinstance(payload, dict):
-                        # Handle dict payload
-                        if "content" in payload:
-                            content = payload["content"]
-                            if isinstance(content, dict) and "text" in content:
-                                content_text = content["text"]
-                            else:
-                                content_text = str(content)
-                        elif "message" in payload:
-                            content_text = str(payload["message"])
-                        else:
-                            content_text = str(payload)
-                    else:
-                        content_text = str(payload)
-
-                    memory_entry = {
-                        "id": f"event-{event_idx}",
-                        "content": content_text,
-                        "type": "event",
-                        "memory_type": "SHORT_TERM",
-                        "actor_id": query.actor_id,
-                        "session_id": query.session_id,
-                        "event_id": event.get("eventId", f"event-{event_idx}"),
-                        "event_type": event.get("eventType", "unknown"),
-                        "timestamp": str(
-                            event.get(
-                                "eventTimestamp", datetime.now().isoformat() + "Z"
-                            )
-                        ),
-                        "size": len(content_text),
-                    }
-                    short_term_memories.append(memory_entry)
-
         except Exception as e:
             error_msg = str(e).lower()
             logger.warning(
@@ -386,15 +340,20 @@ async def get_short_term_memory(query: ShortTermMemoryQuery):
                 logger.error(f"❌ Access denied for Memory ID '{memory_id}'")
                 raise HTTPException(status_code=403, detail=clean_error)
 
-        # Method 2: Try get_last_k_turns
+        # Method 2: Try get_last_k_turns. Only on the first page; the cursor
+        # continues the ListEvents scan, not the recent turns
+        turn_memories = []
         try:
-            logger.info("🔄 Using get_last_k_turns API")
-            recent_turns = memory_client.get_last_k_turns(
-                memory_id=memory_id,
-                actor_id=query.actor_id,
-                session_id=query.session_id,
-                k=query.max_results or 10,
-            )
+            if query.cursor:
+                recent_turns = []
+            else:
+                logger.info("🔄 Using get_last_k_turns API")
+                recent_turns = memory_client.get_last_k_turns(
+                    memory_id=memory_id,
+                    actor_id=query.actor_id,
+                    session_id=query.session_id,
+                    k=query.max_results or 10,
+                )
 
             if recent_turns:
                 logger.info(f"✅ Found {len(recent_turns)} conversation turns")
@@ -420,7 +379,7 @@ async def get_short_term_memory(query: ShortTermMemoryQuery):
                             "timestamp": datetime.now().isoformat() + "Z",
                             "size": len(content_text),
                         }
-                        short_term_memories.append(memory_entry)
+                        turn_memories.append(memory_entry)
 
         except Exception as e:
             error_msg = str(e).lower()
@@ -460,16 +419,21 @@ async def get_short_term_memory(query: ShortTermMemoryQuery):
                 logger.error(f"❌ Access denied for Memory ID '{memory_id}'")
                 raise HTTPException(status_code=403, detail=clean_error)
 
-        logger.info(f"✅ Total short-term memories found: {len(short_term_memories)}")
-
-        # Apply filters
-        filtered_memories = apply_short_term_filters(short_term_memories, query)
+        # Merge the recent turns into the filtered events. Nothing is dropped
+        # here: next_cursor already points past every event of this page
+        filtered_memories = sort_entries(
+            short_term_memories + [m for m in turn_memories if matches(m)],
+            query.sort_by,
+            query.sort_order,
+        )
         logger.info(f"🔍 After filtering: {len(filtered_memories)} memories remain")
 
         return {
             "memories": filtered_memories,
             "total_count": len(filtered_memories),
-            "raw_count": len(short_term_memories),
+            "raw_count": scan.scanned + len(turn_memories),
+            "next_cursor": scan.next_cursor,
+            "has_more": scan.next_cursor is not None,
             "source": "short_term_memory",
             "actor_id": query.actor_id,
             "session_id": query.session_id,
@@ -519,74 +483,76 @@ async def search_event_by_id(query: EventSearchQuery):
         logger.info(f"🔍 Searching for event ID: {query.event_id}")
         logger.info(f"📋 Memory ID: {memory_id}")
 
-        # Common actor IDs to try (only if provided by user)
-        actor_ids_to_try = query.known_actor_ids or []
-
-        # Session IDs must be provided by user - no hardcoded defaults
-        session_ids_to_try = []
-
-        for actor_id in actor_ids_to_try:
-            for session_id in session_ids_to_try:
-                try:
-                    logger.info(
-                        f"🔍 Searching in actor_id={actor_id}, session_id={session_id}"
-                    )
-
-                    events = memory_client.list_events(
-                        memory_id=memory_id,
-                        actor_id=actor_id,
-                        session_id=session_id,
-                        max_results=100,  # Search more events
-                    )
+        async def fetch_indexed_event(location):
+            try:
+                response = await run_in_threadpool(
+                    memory_client.gmdp_client.get_event,
+                    memoryId=memory_id,
+                    actorId=location[0],
+                    sessionId=location[1],
+                    eventId=query.event_id,
+                )
+                return response.get("event", {})
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Indexed event {query.event_id} not readable from "
+                    f"{location[0]}/{location[1]}: {e}"
+                )
+                return None
+
+        # Look the event up in the local index. On a miss, or when the indexed
+        # location no longer holds the event, rescan the candidate sessions
+        # (only the known actors', if given) however recently they were
+        # scanned, and look again
+        location = event_index.locate(memory_id, query.event_id)
+        event = await fetch_indexed_event(location) if location else None
+        if event is None:
+            actor_ids = query.known_actor_ids or (
+                [location[0]] if location else None
+            )
+            await run_in_threadpool(event_index.refresh, memory_id, actor_ids, True)
+            location = event_index.locate(memory_id, query.event_id)
+            event = await fetch_indexed_event(location) if location else None
 
-                    # Look for the specific event ID
-                    for event in events:
-                        if event.get("eventId") == query.event_id:
-                            logger.info(
-                                f"✅ Found event {query.event_id} in {actor_id}/{session_id}"
-                            )
+        if event is None:
+            return {
+                "event": None,
+                "found": False,
+                "event_id": query.event_id,
+                "error": f"Event {query.event_id} not found in searched sessions",
+                "searched_combinations": len(event_index.sessions(memory_id)),
+            }
 
-                            # Process the event (same logic as before)
-                            payload = event.get("payload", {})
-                            content_text = str(payload)  # Simplified for now
-
-                            event_data = {
-                                "id": query.event_id,
-                                "content": content_text,
-                                "type": "event",
-                                "memory_type": "SHORT_TERM",
-                                "event_id": event.get("eventId", query.event_id),
-                                "event_type": event.get("eventType", "unknown"),
-                                "actor_id": actor_id,
-                                "session_id": session_id,
-                                "timestamp": str(
-                                    event.get(
-                                        "eventTimestamp",
-                                        datetime.now().isoformat() + "Z",
-                                    )
-                                ),
-                                "size": len(content_text),
-                                "found_in": f"{actor_id}/{session_id}",
-                            }
-
-                            return {
-                                "event": event_data,
-                                "found": True,
-                                "memory_id": memory_id,
-                                "event_id": query.event_id,
-                                "search_location": f"{actor_id}/{session_id}",
-                            }
-
-                except Exception as e:
-                    logger.warning(f"Search failed for {actor_id}/{session_id}: {e}")
-                    continue
+        actor_id, session_id = location
+        logger.info(f"✅ Found event {query.event_id} in {actor_id}/{session_id}")
+
+        content_text = event_text(event.get("payload", {}))
+
+        event_data = {
+            "id": query.event_id,
+            "content": content_text,
+            "type": "event",
+            "memory_type": "SHORT_TERM",
+            "event_id": event.get("eventId", query.event_id),
+            "event_type": event.get("eventType", "unknown"),
+            "actor_id": actor_id,
+            "session_id": session_id,
+            "timestamp": str(
+                event.get(
+                    "eventTimestamp",
+                    datetime.now().isoformat() + "Z",
+                )
+            ),
+            "size": len(content_text),
+            "found_in": f"{actor_id}/{session_id}",
+        }
 
         return {
-            "event": None,
-            "found": False,
+            "event": event_data,
+            "found": True,
+            "memory_id": memory_id,
             "event_id": query.event_id,
-            "error": f"Event {query.event_id} not found in searched sessions",
-            "searched_combinations": len(actor_ids_to_try) * len(session_ids_to_try),
+            "search_location": f"{actor_id}/{session_id}",
         }
 
     except Exception as e:
@@ -850,24 +816,16 @@ async def get_long_term_memory(query: LongTermMemoryQuery):
         try:
             logger.info("📚 Using retrieve_memories API")
 
-            # Use retrieve_memories for semantic search
-            memory_results = memory_client.retrieve_memories(
-                memory_id=memory_id,
-                namespace=query.namespace,
-                query="*",  # Get all content - could be made configurable
-                top_k=query.max_results,
+            # Served from the namespace catalog's cache when the same
+            # namespace was listed or retrieved recently
+            memory_records = await run_in_threadpool(
+                namespace_catalog.retrieve,
+                memory_id,
+                query.namespace,
+                query.max_results,
+                bool(query.refresh),
             )
 
-            if (
-                isinstance(memory_results, dict)
-                and "memoryRecordSummaries" in memory_results
-            ):
-                memory_records = memory_results["memoryRecordSummaries"]
-            else:
-                memory_records = (
-                    memory_results if isinstance(memory_results, list) else []
-                )
-
             if memory_records:
                 logger.info(f"✅ Found {len(memory_records)} memory records")
 
@@ -875,11 +833,7 @@ async def get_long_term_memory(query: LongTermMemoryQuery):
                     # Debug: log the raw memory structure
                     logger.info(f"📋 Raw memory record {memory_idx}: {memory}")
 
-                    content = memory.get("content", {})
-                    if isinstance(content, dict):
-                        content_text = content.get("text", str(content))
-                    else:
-                        content_text = str(content)
+                    content_text = record_text(memory)
 
                     # Apply content type filter
                     memory_namespaces = memory.get("namespaces", [])
@@ -1140,6 +1094,8 @@ class MemoryIdValidationQuery(BaseModel):
 class ListNamespacesQuery(BaseModel):
     memory_id: str
     max_results: Optional[int] = 100
+    # Rebuild the namespace catalog instead of using the cached one
+    refresh: Optional[bool] = False
 
 
 @app.post("/api/agentcore/listNamespacesV2")
@@ -1161,83 +1117,37 @@ async def list_namespaces_v2(query: ListNamespacesQuery):
         try:
             logger.info("📋 Getting memory strategies to discover namespaces...")
 
-            # Get memory strategies which contain namespace information
-            strategies = memory_client.get_memory_strategies(memory_id)
-            logger.info(f"✅ Found {len(strategies)} memory strategies")
-
-            found_namespaces = []
-
-            # Extract namespaces from strategies
-            for strategy in strategies:
-                strategy_type = strategy.get("type", "unknown")
-                namespaces = strategy.get("namespaces", [])
-
-                logger.info(
-                    f"📋 Strategy '{strategy_type}' has namespaces: {namespaces}"
-                )
-
-                for namespace in namespaces:
-                    # Try to get a sample of records from this namespace to count them
-                    try:
-                        # Use retrieve_memories to get sample content
-                        sample_memories = memory_client.retrieve_memories(
-                            memory_id=memory_id,
-                            namespace=namespace,
-                            query="*",  # Generic query to get any content
-                            top_k=3,  # Get a few samples
-                        )
-
-                        sample_content = ""
-                        if sample_memories and len(sample_memories) > 0:
-                            first_memory = sample_memories[0]
-                            content = first_memory.get("content", {})
-                            if isinstance(content, dict):
-                                sample_content = (
-                                    content.get("text", str(content))[:100] + "..."
-                                )
-                            else:
-                                sample_content = str(content)[:100] + "..."
-
-                        found_namespaces.append(
-                            {
-                                "namespace": namespace,
-                                "type": strategy_type,
-                                "count": len(sample_memories) if sample_memories else 0,
-                                "sample_content": sample_content,
-                            }
-                        )
-
-                        logger.info(
-                            f"✅ Found namespace: {namespace} (type: {strategy_type}) with {len(sample_memories) if sample_memories else 0} sample records"
-                        )
-
-                    except Exception as e:
-                        # Still add the namespace even if we can't get samples
-                        found_namespaces.append(
-                            {
-                                "namespace": namespace,
-                                "type": strategy_type,
-                                "count": 0,
-                                "sample_content": f"Unable to retrieve sample: {clean_aws_error_message(str(e))}",
-                            }
-                        )
-                        logger.warning(
-                            f"⚠️ Found namespace: {namespace} (type: {strategy_type}) but couldn't retrieve samples: {e}"
-                        )
+            # Strategies and namespace samples come from the catalog, which
+            # samples namespaces concurrently and caches the result
+            catalog = await run_in_threadpool(
+                namespace_catalog.get, memory_id, bool(query.refresh)
+            )
+            strategies = catalog["strategies"]
 
-            # Remove duplicates based on namespace
             unique_namespaces = []
-            seen_namespaces = set()
-            for ns in found_namespaces:
-                if ns["namespace"] not in seen_namespaces:
-                    unique_namespaces.append(ns)
-                    seen_namespaces.add(ns["namespace"])
+            for entry in catalog["namespaces"]:
+                if entry["sample_error"]:
+                    sample_content = f"Unable to retrieve sample: {clean_aws_error_message(entry['sample_error'])}"
+                elif entry["sample_content"]:
+                    sample_content = entry["sample_content"][:100] + "..."
+                else:
+                    sample_content = ""
+                unique_namespaces.append(
+                    {
+                        "namespace": entry["namespace"],
+                        "type": entry["type"],
+                        "count": entry["count"],
+                        "sample_content": sample_content,
+                    }
+                )
 
             return {
                 "memory_id": memory_id,
                 "namespaces": unique_namespaces,
                 "total_found": len(unique_namespaces),
                 "strategies_found": len(strategies),
+                "cached": catalog["cached"],
+                "cache_age_seconds": catalog["cache_age_seconds"],
                 "message": f"Found {len(unique_namespaces)} namespaces from {len(strategies)} memory strategies"
                 if unique_namespaces
                 else "No namespaces found in memory strategies",
@@ -1323,6 +1233,36 @@ async def list_namespaces_v2(query: ListNamespacesQuery):
         )
 
 
+@app.post("/api/agentcore/refreshCatalog")
+async def refresh_catalog(query: MemoryIdValidationQuery):
+    """Drop the cached namespace catalog for a memory ID and rebuild it"""
+    try:
+        if not memory_client:
+            raise HTTPException(
+                status_code=503, detail="AgentCore Memory client not available"
+            )
+
+        logger.info(f"🔄 Refreshing namespace catalog for memory ID: {query.memory_id}")
+        namespace_catalog.invalidate(query.memory_id)
+        catalog = await run_in_threadpool(namespace_catalog.get, query.memory_id)
+
+        return {
+            "memory_id": query.memory_id,
+            "total_found": len(catalog["namespaces"]),
+            "strategies_found": len(catalog["strategies"]),
+            "build_seconds": catalog["build_seconds"],
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error refreshing namespace catalog: {e}")
+        clean_error = clean_aws_error_message(str(e))
+        raise HTTPException(
+            status_code=500, detail=f"Failed to refresh namespace catalog: {clean_error}"
+        )
+
+
 @app.post("/api/agentcore/validateMemoryId")
 async def validate_memory_id(query: MemoryIdValidationQuery):
     """Validate if a memory ID is accessible"""
@@ -1441,61 +1381,22 @@ async def list_namespaces(request: dict):
         logger.info(f"🔍 Listing namespaces for memory_id: {memory_id}")
 
         try:
-            # Get memory strategies to discover namespaces
-            strategies = memory_client.get_memory_strategies(memory_id)
-            logger.info(f"✅ Found {len(strategies)} memory strategies")
-
-            namespaces = []
-            for strategy in strategies:
-                strategy_type = strategy.get("type", "UNKNOWN")
-                strategy_namespaces = strategy.get("namespaces", [])
-
-                for namespace in strategy_namespaces:
-                    # Try to get a count of records in this namespace
-                    try:
-                        # Sample a few records to get count and sample content
-                        sample_memories = memory_client.retrieve_memories(
-                            memory_id=memory_id, namespace=namespace, query="*", top_k=5
-                        )
-
-                        if (
-                            isinstance(sample_memories, dict)
-                            and "memoryRecordSummaries" in sample_memories
-                        ):
-                            memory_records = sample_memories["memoryRecordSummaries"]
-                        else:
-                            memory_records = (
-                                sample_memories
-                                if isinstance(sample_memories, list)
-                                else []
-                            )
-
-                        count = len(memory_records)
-                        sample_content = ""
-                        if memory_records:
-                            first_record = memory_records[0]
-                            content = first_record.get("content", {})
-                            if isinstance(content, dict):
-                                sample_content = content.get("text", str(content))
-                            else:
-                                sample_content = str(content)
+            # One round trip for the UI: strategies, namespaces and samples
+            # from the (cached) catalog
+            catalog = await run_in_threadpool(
+                namespace_catalog.get, memory_id, bool(request.get("refresh"))
+            )
+            strategies = catalog["strategies"]
 
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to get count for namespace {namespace}: {e}"
-                        )
-                        count = 0
-                        sample_content = ""
-
-                    namespace_info = {
-                        "namespace": namespace,
-                        "type": strategy_type,
-                        "count": count,
-                        "sample_content": sample_content[:200]
-                        if sample_content
-                        else "",
-                    }
-                    namespaces.append(namespace_info)
+            namespaces = [
+                {
+                    "namespace": entry["namespace"],
+                    "type": entry["type"],
+                    "count": entry["count"],
+                    "sample_content": entry["sample_content"],
+                }
+                for entry in catalog["namespaces"]
+            ]
 
             logger.info(f"✅ Found {len(namespaces)} total namespaces")
 
@@ -1504,6 +1405,8 @@ async def list_namespaces(request: dict):
                 "total_count": len(namespaces),
                 "memory_id": memory_id,
                 "strategies_count": len(strategies),
+                "cached": catalog["cached"],
+                "cache_age_seconds": catalog["cache_age_seconds"],
             }
 
         except Exception as e:
@@ -1522,19 +1425,44 @@ async def list_namespaces(request: dict):
 
 
 @app.get("/api/agentcore/listSessions")
-async def list_sessions():
-    """List available sessions (simplified)"""
+async def list_sessions(memory_id: Optional[str] = None, actor_id: Optional[str] = None):
+    """List sessions known to the event index"""
     try:
+        memory_id = memory_id or MEMORY_ID
+        if not event_index or not memory_id:
+            return {
+                "sessions": [
+                    {
+                        "session_id": "memory-records",
+                        "type": "MEMORY_RECORDS",
+                        "active": True,
+                    }
+                ],
+                "total_sessions": 1,
+                "source": "list_records_focus",
+            }
+
+        # Served from the index; memory IDs other than the configured one are
+        # refreshed here on demand rather than by a background warmer
+        await run_in_threadpool(
+            event_index.refresh_if_stale, memory_id, [actor_id] if actor_id else None
+        )
+
+        sessions = [
+            {
+                "session_id": session["sessionId"],
+                "actor_id": session["actorId"],
+                "created_at": str(session.get("createdAt", "")),
+                "type": "SHORT_TERM",
+                "active": True,
+            }
+            for session in event_index.sessions(memory_id, actor_id)
+        ]
         return {
-            "sessions": [
-                {
-                    "session_id": "memory-records",
-                    "type": "MEMORY_RECORDS",
-                    "active": True,
-                }
-            ],
-            "total_sessions": 1,
-            "source": "list_records_focus",
+            "sessions": sessions,
+            "total_sessions": len(sessions),
+            "memory_id": memory_id,
+            "source": "event_index",
         }
 
     except Exception as e:
@@ -0,0 +1,313 @@
+"""
+Local actor/session/event-ID index for the memory browser.
+
+Finding an event by ID used to mean one ``list_events`` call per
+(actor, session) pair followed by a linear scan of the returned events.
+``EventIndex`` keeps, per memory ID, the actors and sessions reported by
+``ListActors``/``ListSessions`` and a map from event ID to the
+(actor, session) that holds it, so a lookup is a dictionary access followed
+by a single ``GetEvent`` call.
+
+The index is refreshed incrementally: sessions are re-listed on every
+refresh, but only sessions that are new or were scanned more than
+``rescan_after_seconds`` ago have their event IDs listed again, unless the
+refresh is forced after a lookup miss. A rescan replaces the session's event
+IDs, so deleted events and sessions drop out of the index. ``warm`` keeps
+the configured memory ID refreshed from a background thread; other memory IDs
+are indexed on demand by ``refresh_if_stale``, and one whose first refresh
+fails is not kept.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from event_stream import LIST_EVENTS_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class _MemoryIndex:
+    """Index state of one memory ID"""
+
+    def __init__(self):
+        # actor_id -> session_id -> session summary
+        self.sessions: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # event_id -> (actor_id, session_id)
+        self.events: Dict[str, Tuple[str, str]] = {}
+        # (actor_id, session_id) -> event IDs found by its last scan
+        self.session_events: Dict[Tuple[str, str], Set[str]] = {}
+        # (actor_id, session_id) -> monotonic time of the last event scan
+        self.scanned_at: Dict[Tuple[str, str], float] = {}
+        self.refreshed_at: Optional[float] = None
+        # Monotonic time of the last refresh that listed every actor
+        self.listed_at: Optional[float] = None
+        self.refresh_lock = threading.Lock()
+
+
+class EventIndex:
+    """
+    Event ID -> (actor, session) index and session listing per memory ID.
+
+    All AWS calls go through the data plane client of ``memory_client``.
+    Event IDs are listed without payloads, and the sessions of one refresh
+    are scanned concurrently through a bounded thread pool.
+    """
+
+    def __init__(
+        self,
+        memory_client,
+        refresh_interval_seconds: float = 60,
+        rescan_after_seconds: float = 300,
+        max_workers: int = 8,
+    ):
+        self.memory_client = memory_client
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.rescan_after_seconds = rescan_after_seconds
+        self._indexes: Dict[str, _MemoryIndex] = {}
+        self._warmers: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="event-index"
+        )
+
+    def _index(self, memory_id: str) -> _MemoryIndex:
+        with self._lock:
+            return self._indexes.setdefault(memory_id, _MemoryIndex())
+
+    def _paginate(self, operation: str, result_key: str, **params) -> List[Dict]:
+        paginator = self.memory_client.gmdp_client.get_paginator(operation)
+        items = []
+        for page in paginator.paginate(**params):
+            items.extend(page.get(result_key, []))
+        return items
+
+    def refresh(
+        self,
+        memory_id: str,
+        actor_ids: Optional[List[str]] = None,
+        force: bool = False,
+    ) -> None:
+        """Bring the index of ``memory_id`` up to date.
+
+        ``actor_ids`` limits the refresh to those actors; by default every
+        actor reported by ``ListActors`` is refreshed. ``force`` rescans every
+        session of those actors, however recently it was scanned; use it
+        after a lookup miss. Concurrent refreshes of the same memory ID are
+        serialized. If the first refresh of a memory ID fails (for example
+        because the ID does not exist), the memory ID is forgotten again.
+        """
+        index = self._index(memory_id)
+        with index.refresh_lock:
+            try:
+                self._refresh(index, memory_id, actor_ids, force)
+            except Exception:
+                with self._lock:
+                    if (
+                        index.refreshed_at is None
+                        and memory_id not in self._warmers
+                        and self._indexes.get(memory_id) is index
+                    ):
+                        del self._indexes[memory_id]
+                raise
+
+    def refresh_if_stale(
+        self, memory_id: str, actor_ids: Optional[List[str]] = None
+    ) -> None:
+        """Refresh ``memory_id`` unless it is already being kept fresh.
+
+        A memory ID with a background warmer is refreshed here only until its
+        first refresh completes; any other memory ID is refreshed when no
+        refresh has listed all of its actors within
+        ``refresh_interval_seconds``.
+        """
+        with self._lock:
+            index = self._indexes.get(memory_id)
+            if index is not None:
+                if memory_id in self._warmers and index.refreshed_at is not None:
+                    return
+                if (
+                    index.listed_at is not None
+                    and time.monotonic() - index.listed_at
+                    < self.refresh_interval_seconds
+                ):
+                    return
+        self.refresh(memory_id, actor_ids)
+
+    def _refresh(
+        self,
+        index: _MemoryIndex,
+        memory_id: str,
+        actor_ids: Optional[List[str]],
+        force: bool,
+    ) -> None:
+        """Body of ``refresh`` (caller holds ``index.refresh_lock``)"""
+        started = time.monotonic()
+        listing_all = actor_ids is None
+        if listing_all:
+            actor_ids = [
+                actor["actorId"]
+                for actor in self._paginate(
+                    "list_actors", "actorSummaries", memoryId=memory_id
+                )
+            ]
+            with self._lock:
+                # Actors that no longer exist take their sessions with them
+                for actor_id in set(index.sessions) - set(actor_ids):
+                    for session_id in index.sessions.pop(actor_id):
+                        self._replace_session_events(index, actor_id, session_id, set())
+                        index.scanned_at.pop((actor_id, session_id), None)
+
+        to_scan = []
+        for actor_id in actor_ids:
+            sessions = {
+                session["sessionId"]: session
+                for session in self._paginate(
+                    "list_sessions",
+                    "sessionSummaries",
+                    memoryId=memory_id,
+                    actorId=actor_id,
+                )
+            }
+            with self._lock:
+                # Sessions that no longer exist take their events with them
+                for session_id in set(index.sessions.get(actor_id, {})) - set(sessions):
+                    self._replace_session_events(index, actor_id, session_id, set())
+                    index.scanned_at.pop((actor_id, session_id), None)
+                index.sessions[actor_id] = sessions
+            for session_id in sessions:
+                scanned_at = index.scanned_at.get((actor_id, session_id))
+                if (
+                    force
+                    or scanned_at is None
+                    or started - scanned_at >= self.rescan_after_seconds
+                ):
+                    to_scan.append((actor_id, session_id))
+
+        futures = [
+            self._executor.submit(self._scan_session, memory_id, actor, session)
+            for actor, session in to_scan
+        ]
+        for (actor_id, session_id), future in zip(to_scan, futures):
+            try:
+                event_ids = future.result()
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Couldn't index events of {actor_id}/{session_id}: {e}"
+                )
+                continue
+            with self._lock:
+                self._replace_session_events(
+                    index, actor_id, session_id, set(event_ids)
+                )
+                index.scanned_at[(actor_id, session_id)] = started
+
+        index.refreshed_at = time.monotonic()
+        if listing_all:
+            index.listed_at = started
+        logger.info(
+            f"🗂️ Event index for {memory_id}: {len(index.events)} events, "
+            f"{len(to_scan)} sessions scanned in "
+            f"{index.refreshed_at - started:.2f}s"
+        )
+
+    @staticmethod
+    def _replace_session_events(
+        index: _MemoryIndex, actor_id: str, session_id: str, event_ids: Set[str]
+    ) -> None:
+        """Make ``event_ids`` the indexed events of a session (caller holds the lock)"""
+        location = (actor_id, session_id)
+        for event_id in index.session_events.pop(location, set()) - event_ids:
+            if index.events.get(event_id) == location:
+                del index.events[event_id]
+        for event_id in event_ids:
+            index.events[event_id] = location
+        if event_ids:
+            index.session_events[location] = event_ids
+
+    def _scan_session(
+        self, memory_id: str, actor_id: str, session_id: str
+    ) -> List[str]:
+        event_ids = []
+        next_token = None
+        while True:
+            params = {
+                "memoryId": memory_id,
+                "actorId": actor_id,
+                "sessionId": session_id,
+                "maxResults": LIST_EVENTS_PAGE_SIZE,
+                "includePayloads": False,
+            }
+            if next_token:
+                params["nextToken"] = next_token
+            response = self.memory_client.gmdp_client.list_events(**params)
+            event_ids.extend(event["eventId"] for event in response.get("events", []))
+            next_token = response.get("nextToken")
+            if not next_token:
+                return event_ids
+
+    def locate(self, memory_id: str, event_id: str) -> Optional[Tuple[str, str]]:
+        """(actor_id, session_id) holding ``event_id``, if it has been indexed"""
+        with self._lock:
+            index = self._indexes.get(memory_id)
+            return index.events.get(event_id) if index else None
+
+    def sessions(
+        self, memory_id: str, actor_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Indexed sessions of ``memory_id``, optionally of a single actor"""
+        with self._lock:
+            index = self._indexes.get(memory_id)
+            if not index:
+                return []
+            actors = [actor_id] if actor_id else list(index.sessions)
+            return [
+                {**summary, "actorId": actor, "sessionId": session_id}
+                for actor in actors
+                for session_id, summary in index.sessions.get(actor, {}).items()
+            ]
+
+    def is_warm(self, memory_id: str) -> bool:
+        with self._lock:
+            index = self._indexes.get(memory_id)
+            return bool(index and index.refreshed_at is not None)
+
+    def warm(self, memory_id: str) -> None:
+        """Keep ``memory_id`` refreshed from a background thread (idempotent).
+
+        Each warmed memory ID holds a thread for the life of the process, so
+        this is meant for the configured memory ID only.
+        """
+        with self._lock:
+            if memory_id in self._warmers:
+                return
+            thread = threading.Thread(
+                target=self._warm_loop,
+                args=(memory_id,),
+                name=f"event-index-{memory_id}",
+                daemon=True,
+            )
+            self._warmers[memory_id] = thread
+        thread.start()
+
+    def _warm_loop(self, memory_id: str) -> None:
+        while True:
+            try:
+                self.refresh(memory_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Background event index refresh failed: {e}")
+            time.sleep(self.refresh_interval_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                memory_id: {
+                    "actors": len(index.sessions),
+                    "sessions": sum(len(s) for s in index.sessions.values()),
+                    "events": len(index.events),
+                    "warm": index.refreshed_at is not None,
+                }
+                for memory_id, index in self._indexes.items()
+            }
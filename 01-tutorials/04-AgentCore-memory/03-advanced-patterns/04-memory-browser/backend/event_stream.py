@@ -0,0 +1,227 @@
+"""
+Paginated short-term memory event scanning for the memory browser.
+
+``MemoryClient.list_events`` collects every page into one list before
+returning, so browsing a long session meant loading all of its events, then
+copying, filtering and sorting them in Python. ``EventScan`` instead walks
+the ``ListEvents`` pages one at a time, filters events as they arrive and
+stops once a page of results is full, so memory stays bounded by the page
+size. The service ``nextToken`` is handed back as an opaque cursor so the UI
+can continue the scan where the previous request stopped.
+
+By default pages hold consecutive matches and are sorted one page at a time.
+A ranked scan instead reads a whole ``max_scan`` window and keeps only the
+best ``limit`` matches of it in a bounded heap.
+"""
+
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Largest page the ListEvents API returns
+LIST_EVENTS_PAGE_SIZE = 100
+
+
+def _content_text(content: Any, fallback: Any) -> str:
+    if isinstance(content, dict) and "text" in content:
+        return content["text"]
+    return str(fallback)
+
+
+def event_text(payload: Any) -> str:
+    """Text of an event payload as returned by ListEvents"""
+    if isinstance(payload, list):
+        if not payload:
+            return str(payload)
+        item = payload[0]
+        if not isinstance(item, dict):
+            return str(item)
+        if "conversational" in item:
+            conversational = item["conversational"]
+            if not isinstance(conversational, dict):
+                return ""
+            content = conversational.get("content", {})
+            return _content_text(content, conversational)
+        if "content" in item:
+            return _content_text(item["content"], item["content"])
+        return str(item)
+    if isinstance(payload, dict):
+        if "content" in payload:
+            return _content_text(payload["content"], payload["content"])
+        if "message" in payload:
+            return str(payload["message"])
+    return str(payload)
+
+
+class EventScan:
+    """One page of an actor/session's events, read one ListEvents call at a time.
+
+    ``run`` collects up to ``limit`` entries accepted by ``matches``. Each
+    ListEvents call asks for no more events than are still wanted, so every
+    event scanned is either returned or rejected by the filter, and
+    ``next_cursor`` resumes exactly after the last event scanned. At most
+    ``max_scan`` events are scanned per page. ``next_cursor`` is ``None``
+    once the session has no more events.
+
+    With ``rank_by`` set to a ``sort_entries`` key, ``run`` scans the whole
+    ``max_scan`` window instead and returns its top ``limit`` matches in
+    ``rank_order``; matches ranked below them are skipped by ``next_cursor``.
+    """
+
+    def __init__(
+        self,
+        memory_client,
+        memory_id: str,
+        actor_id: str,
+        session_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        max_scan: Optional[int] = None,
+        matches: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        rank_by: Optional[str] = None,
+        rank_order: str = "desc",
+    ):
+        self.memory_client = memory_client
+        self.memory_id = memory_id
+        self.actor_id = actor_id
+        self.session_id = session_id
+        self.next_cursor = cursor
+        self.limit = limit
+        self.max_scan = max(max_scan or limit, limit)
+        self.matches = matches or (lambda entry: True)
+        self.rank_by = rank_by if _sort_key(rank_by) else None
+        self.rank_order = rank_order
+        self.scanned = 0
+        self.pages = 0
+
+    def run(self) -> List[Dict[str, Any]]:
+        if self.rank_by:
+            return sort_entries(
+                self._scan(lambda: LIST_EVENTS_PAGE_SIZE),
+                self.rank_by,
+                self.rank_order,
+                limit=self.limit,
+            )
+        entries: List[Dict[str, Any]] = []
+        entries.extend(self._scan(lambda: self.limit - len(entries)))
+        return entries
+
+    def _scan(self, wanted: Callable[[], int]) -> Iterator[Dict[str, Any]]:
+        """Matching entries, reading no more than ``wanted()`` events per call"""
+        while True:
+            page_size = min(
+                LIST_EVENTS_PAGE_SIZE,
+                wanted(),
+                self.max_scan - self.scanned,
+            )
+            params = {
+                "memoryId": self.memory_id,
+                "actorId": self.actor_id,
+                "sessionId": self.session_id,
+                "maxResults": page_size,
+                "includePayloads": True,
+            }
+            if self.next_cursor:
+                params["nextToken"] = self.next_cursor
+
+            response = self.memory_client.gmdp_client.list_events(**params)
+            events = response.get("events", [])
+            self.pages += 1
+            self.next_cursor = response.get("nextToken")
+
+            for entry in event_entries(
+                events, self.actor_id, self.session_id, start=self.scanned
+            ):
+                if self.matches(entry):
+                    yield entry
+            self.scanned += len(events)
+
+            if (
+                not self.next_cursor
+                or not events
+                or wanted() <= 0
+                or self.scanned >= self.max_scan
+            ):
+                logger.info(
+                    f"📄 Scanned {self.scanned} events in {self.pages} pages"
+                    f"{' (more available)' if self.next_cursor else ''}"
+                )
+                return
+
+
+def event_entries(
+    events: Iterable[Dict[str, Any]], actor_id: str, session_id: str, start: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """Memory browser entries for raw ListEvents events"""
+    for event_idx, event in enumerate(events, start):
+        content_text = event_text(event.get("payload", {}))
+        yield {
+            "id": f"event-{event_idx}",
+            "content": content_text,
+            "type": "event",
+            "memory_type": "SHORT_TERM",
+            "actor_id": actor_id,
+            "session_id": session_id,
+            "event_id": event.get("eventId", f"event-{event_idx}"),
+            "event_type": event.get("eventType", "unknown"),
+            "timestamp": str(
+                event.get("eventTimestamp", datetime.now().isoformat() + "Z")
+            ),
+            "size": len(content_text),
+        }
+
+
+def entry_filter(
+    content_search: Optional[str], role_filter: str, event_type: str
+) -> Callable[[Dict[str, Any]], bool]:
+    """Predicate applying the short-term memory filters to one entry"""
+    search_term = (
+        content_search.strip().lower()
+        if content_search and content_search.strip()
+        else None
+    )
+    role = role_filter.upper() if role_filter != "all" else None
+
+    def matches(entry: Dict[str, Any]) -> bool:
+        if search_term and search_term not in entry.get("content", "").lower():
+            return False
+        if role and entry.get("role", "").upper() != role:
+            return False
+        if event_type != "all" and entry.get("type", "") != event_type:
+            return False
+        return True
+
+    return matches
+
+
+def _sort_key(sort_by: Optional[str]) -> Optional[Callable[[Dict[str, Any]], Any]]:
+    if sort_by == "timestamp":
+        return lambda x: str(x.get("timestamp", ""))
+    if sort_by == "size":
+        return lambda x: int(x.get("size", 0))
+    return None
+
+
+def sort_entries(
+    entries: Iterable[Dict[str, Any]],
+    sort_by: str,
+    sort_order: str,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Entries in the requested order; unknown sorts keep arrival order.
+
+    With ``limit`` only the first ``limit`` entries of that order are kept,
+    in a heap of that size while ``entries`` is consumed.
+    """
+    key = _sort_key(sort_by)
+    if key is None:
+        return list(itertools.islice(entries, limit))
+    if limit is None:
+        return sorted(entries, key=key, reverse=sort_order == "desc")
+    if sort_order == "desc":
+        return heapq.nlargest(limit, entries, key=key)
+    return heapq.nsmallest(limit, entries, key=key)
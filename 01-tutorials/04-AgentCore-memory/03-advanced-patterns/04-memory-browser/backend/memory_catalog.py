@@ -0,0 +1,204 @@
+"""
+Cached namespace/strategy catalog for the memory browser.
+
+Listing namespaces used to call ``get_memory_strategies`` and then one
+``retrieve_memories`` per namespace, one after another, on every request.
+The catalog keeps the result per memory ID for ``ttl_seconds`` and fetches
+the namespace samples concurrently through a bounded thread pool. Long-term
+memory retrievals are cached next to it, so opening a namespace right after
+listing it does not go back to the service.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def memory_records(response: Any) -> List[Dict[str, Any]]:
+    """Normalize a retrieve_memories response to a list of records"""
+    if isinstance(response, dict) and "memoryRecordSummaries" in response:
+        return response["memoryRecordSummaries"]
+    return response if isinstance(response, list) else []
+
+
+def record_text(record: Dict[str, Any]) -> str:
+    """Text content of a memory record"""
+    content = record.get("content", {})
+    if isinstance(content, dict):
+        return content.get("text", str(content))
+    return str(content)
+
+
+class NamespaceCatalog:
+    """
+    Per-memory-ID cache of strategies, namespaces and sample records.
+
+    ``get`` builds the catalog on first use and serves it until it is older
+    than ``ttl_seconds`` or a refresh is requested. Concurrent requests for
+    the same memory ID wait for a single build instead of starting their own.
+    """
+
+    def __init__(
+        self,
+        memory_client,
+        ttl_seconds: float = 300,
+        max_workers: int = 8,
+        sample_size: int = 5,
+        max_cached_retrievals: int = 256,
+    ):
+        self.memory_client = memory_client
+        self.ttl_seconds = ttl_seconds
+        self.sample_size = sample_size
+        self.max_cached_retrievals = max_cached_retrievals
+        self._catalogs: Dict[str, Dict[str, Any]] = {}
+        # (memory_id, namespace) -> (top_k requested, records, fetched at)
+        self._retrievals: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="namespace-catalog"
+        )
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.monotonic() - fetched_at < self.ttl_seconds
+
+    def get(self, memory_id: str, refresh: bool = False) -> Dict[str, Any]:
+        """Return the catalog for ``memory_id``, building it if needed.
+
+        Raises whatever ``get_memory_strategies`` raises; failed builds are
+        not cached.
+        """
+        with self._lock:
+            build_lock = self._build_locks.setdefault(memory_id, threading.Lock())
+            catalog = self._catalogs.get(memory_id)
+        if catalog and not refresh and self._is_fresh(catalog["fetched_at"]):
+            return self._with_age(catalog, cached=True)
+
+        requested_at = time.monotonic()
+        with build_lock:
+            with self._lock:
+                catalog = self._catalogs.get(memory_id)
+            # Another request finished a build while we waited for the lock
+            if catalog and catalog["fetched_at"] >= requested_at:
+                return self._with_age(catalog, cached=True)
+            if refresh:
+                self._drop_retrievals(memory_id)
+            catalog = self._build(memory_id)
+            with self._lock:
+                self._catalogs[memory_id] = catalog
+        return self._with_age(catalog, cached=False)
+
+    def _with_age(self, catalog: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            **catalog,
+            "cached": cached,
+            "cache_age_seconds": round(time.monotonic() - catalog["fetched_at"], 1),
+        }
+
+    def _build(self, memory_id: str) -> Dict[str, Any]:
+        started = time.monotonic()
+        strategies = self.memory_client.get_memory_strategies(memory_id)
+        logger.info(f"✅ Found {len(strategies)} memory strategies")
+
+        namespaces = []
+        seen = set()
+        for strategy in strategies:
+            for namespace in strategy.get("namespaces", []):
+                if namespace in seen:
+                    continue
+                seen.add(namespace)
+                namespaces.append(
+                    {
+                        "namespace": namespace,
+                        "type": strategy.get("type", "UNKNOWN"),
+                        "strategy_id": strategy.get("strategyId", ""),
+                    }
+                )
+
+        futures = [
+            self._executor.submit(self._sample, memory_id, entry["namespace"])
+            for entry in namespaces
+        ]
+        for entry, future in zip(namespaces, futures):
+            entry.update(future.result())
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"📋 Catalog for {memory_id}: {len(namespaces)} namespaces from "
+            f"{len(strategies)} strategies in {elapsed:.2f}s"
+        )
+        return {
+            "memory_id": memory_id,
+            "strategies": strategies,
+            "namespaces": namespaces,
+            "fetched_at": time.monotonic(),
+            "build_seconds": round(elapsed, 3),
+        }
+
+    def _sample(self, memory_id: str, namespace: str) -> Dict[str, Any]:
+        """Record count and first record text for one namespace (never raises)"""
+        try:
+            records = self.retrieve(memory_id, namespace, self.sample_size)
+        except Exception as e:
+            logger.warning(f"⚠️ Couldn't retrieve samples for namespace {namespace}: {e}")
+            return {"count": 0, "sample_content": "", "sample_error": str(e)}
+        return {
+            "count": len(records),
+            "sample_content": record_text(records[0])[:200] if records else "",
+            "sample_error": None,
+        }
+
+    def retrieve(
+        self, memory_id: str, namespace: str, top_k: int, refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """``retrieve_memories(query="*")`` for a namespace, served from cache when possible.
+
+        A cached retrieval answers any request for at most as many records
+        as it asked for, or any request at all if the namespace returned
+        fewer records than were asked for.
+        """
+        key = (memory_id, namespace)
+        with self._lock:
+            cached = self._retrievals.get(key)
+        if cached and not refresh and self._is_fresh(cached[2]):
+            cached_top_k, records, _ = cached
+            if top_k <= cached_top_k or len(records) < cached_top_k:
+                with self._lock:
+                    if key in self._retrievals:
+                        self._retrievals.move_to_end(key)
+                return records[:top_k]
+
+        records = memory_records(
+            self.memory_client.retrieve_memories(
+                memory_id=memory_id, namespace=namespace, query="*", top_k=top_k
+            )
+        )
+        with self._lock:
+            self._retrievals[key] = (top_k, records, time.monotonic())
+            self._retrievals.move_to_end(key)
+            while len(self._retrievals) > self.max_cached_retrievals:
+                self._retrievals.popitem(last=False)
+        return records
+
+    def _drop_retrievals(self, memory_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._retrievals if k[0] == memory_id]:
+                del self._retrievals[key]
+
+    def invalidate(self, memory_id: str) -> None:
+        """Forget the catalog and cached retrievals of ``memory_id``"""
+        with self._lock:
+            self._catalogs.pop(memory_id, None)
+        self._drop_retrievals(memory_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "catalogs": len(self._catalogs),
+            "cached_retrievals": len(self._retrievals),
+            "ttl_seconds": self.ttl_seconds,
+        }
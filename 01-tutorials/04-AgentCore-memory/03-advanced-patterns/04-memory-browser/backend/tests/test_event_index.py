@@ -0,0 +1,181 @@
+"""Unit tests for the event ID index in event_index."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from event_index import EventIndex  # noqa: E402
+
+
+class FakePaginator:
+    def __init__(self, data_plane, operation):
+        self.data_plane = data_plane
+        self.operation = operation
+
+    def paginate(self, memoryId, actorId=None):
+        if memoryId in self.data_plane.unknown_memory_ids:
+            raise ValueError(f"Memory {memoryId} not found")
+        if self.operation == "list_actors":
+            self.data_plane.list_actors_calls += 1
+            actors = self.data_plane.sessions
+            yield {"actorSummaries": [{"actorId": a} for a in actors]}
+        else:
+            sessions = self.data_plane.sessions.get(actorId, {})
+            yield {
+                "sessionSummaries": [
+                    {"sessionId": s, "actorId": actorId} for s in sessions
+                ]
+            }
+
+
+class FakeDataPlane:
+    """actor -> session -> event IDs, served through ListActors/Sessions/Events"""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.unknown_memory_ids = set()
+        self.list_actors_calls = 0
+        self.list_events_calls = 0
+
+    def get_paginator(self, operation):
+        return FakePaginator(self, operation)
+
+    def list_events(self, actorId, sessionId, **_):
+        self.list_events_calls += 1
+        events = self.sessions[actorId][sessionId]
+        return {"events": [{"eventId": e} for e in events]}
+
+
+class FakeMemoryClient:
+    def __init__(self, sessions):
+        self.gmdp_client = FakeDataPlane(sessions)
+
+
+def make_index(sessions, refresh_interval_seconds=60):
+    client = FakeMemoryClient(sessions)
+    index = EventIndex(
+        client,
+        refresh_interval_seconds=refresh_interval_seconds,
+        rescan_after_seconds=300,
+    )
+    return index, client.gmdp_client
+
+
+def test_refresh_indexes_every_session():
+    index, _ = make_index({"a1": {"s1": ["e1", "e2"]}, "a2": {"s2": ["e3"]}})
+
+    index.refresh("mem")
+
+    assert index.locate("mem", "e2") == ("a1", "s1")
+    assert index.locate("mem", "e3") == ("a2", "s2")
+    assert index.locate("mem", "missing") is None
+
+
+def test_recently_scanned_sessions_are_skipped_unless_forced():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}})
+    index.refresh("mem")
+    data_plane.sessions["a1"]["s1"].append("e2")
+
+    index.refresh("mem")
+    assert index.locate("mem", "e2") is None
+
+    index.refresh("mem", force=True)
+    assert index.locate("mem", "e2") == ("a1", "s1")
+    assert data_plane.list_events_calls == 2
+
+
+def test_rescan_drops_deleted_events_and_sessions():
+    index, data_plane = make_index({"a1": {"s1": ["e1", "e2"], "s2": ["e3"]}})
+    index.refresh("mem")
+
+    data_plane.sessions["a1"]["s1"] = ["e2"]
+    del data_plane.sessions["a1"]["s2"]
+    index.refresh("mem", ["a1"], force=True)
+
+    assert index.locate("mem", "e1") is None
+    assert index.locate("mem", "e2") == ("a1", "s1")
+    assert index.locate("mem", "e3") is None
+    assert [s["sessionId"] for s in index.sessions("mem")] == ["s1"]
+
+
+def test_deleted_actors_are_dropped_on_full_refresh():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}, "a2": {"s2": ["e2"]}})
+    index.refresh("mem")
+
+    del data_plane.sessions["a2"]
+    index.refresh("mem")
+
+    assert index.locate("mem", "e2") is None
+    assert index.stats()["mem"]["actors"] == 1
+
+
+def test_refresh_if_stale_builds_an_unwarmed_memory_id_on_demand():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}})
+
+    index.refresh_if_stale("other")
+    index.refresh_if_stale("other")
+
+    assert index.locate("other", "e1") == ("a1", "s1")
+    assert data_plane.list_actors_calls == 1
+    assert index._warmers == {}
+
+
+def test_refresh_if_stale_refreshes_after_the_interval():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}}, refresh_interval_seconds=0)
+
+    index.refresh_if_stale("other")
+    index.refresh_if_stale("other")
+
+    assert data_plane.list_actors_calls == 2
+
+
+def test_actor_refresh_does_not_count_as_a_full_listing():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}, "a2": {"s2": ["e2"]}})
+
+    index.refresh_if_stale("other", ["a1"])
+    index.refresh_if_stale("other")
+
+    assert data_plane.list_actors_calls == 1
+    assert index.locate("other", "e2") == ("a2", "s2")
+
+
+def test_warmed_memory_id_is_left_to_its_warmer():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}})
+    index.warm("mem")
+    deadline = time.monotonic() + 2
+    while not index.is_warm("mem") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    calls = data_plane.list_actors_calls
+
+    index.refresh_if_stale("mem")
+
+    assert index.is_warm("mem")
+    assert data_plane.list_actors_calls == calls == 1
+
+
+def test_failed_first_refresh_forgets_the_memory_id():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}})
+    data_plane.unknown_memory_ids.add("bogus")
+
+    with pytest.raises(ValueError):
+        index.refresh_if_stale("bogus")
+    with pytest.raises(ValueError):
+        index.refresh("bogus", force=True)
+
+    assert "bogus" not in index.stats()
+    assert index._warmers == {}
+
+
+def test_failed_later_refresh_keeps_the_index():
+    index, data_plane = make_index({"a1": {"s1": ["e1"]}})
+    index.refresh("mem")
+    data_plane.unknown_memory_ids.add("mem")
+
+    with pytest.raises(ValueError):
+        index.refresh("mem")
+
+    assert index.locate("mem", "e1") == ("a1", "s1")
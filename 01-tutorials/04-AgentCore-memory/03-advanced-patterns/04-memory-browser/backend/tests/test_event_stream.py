@@ -0,0 +1,155 @@
+"""Unit tests for cursor paging over ListEvents in event_stream."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from event_stream import EventScan, entry_filter, sort_entries  # noqa: E402
+
+
+class FakeDataPlane:
+    """ListEvents over a fixed list of events, paged with integer tokens"""
+
+    def __init__(self, total):
+        self.events = [
+            {
+                "eventId": f"e{i}",
+                "eventTimestamp": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}Z",
+                "payload": [
+                    {
+                        "conversational": {
+                            "content": {"text": "needle" if i % 7 == 0 else "hay"},
+                            "role": "USER",
+                        }
+                    }
+                ],
+            }
+            for i in range(total)
+        ]
+        self.page_sizes = []
+
+    def list_events(self, maxResults, nextToken=None, **_):
+        assert 1 <= maxResults <= 100
+        self.page_sizes.append(maxResults)
+        start = int(nextToken or 0)
+        end = min(start + maxResults, len(self.events))
+        response = {"events": self.events[start:end]}
+        if end < len(self.events):
+            response["nextToken"] = str(end)
+        return response
+
+
+class FakeMemoryClient:
+    def __init__(self, total):
+        self.gmdp_client = FakeDataPlane(total)
+
+
+def page_through(client, **scan_kwargs):
+    seen = []
+    cursor = None
+    while True:
+        scan = EventScan(
+            client, "mem", "actor", "session", cursor=cursor, **scan_kwargs
+        )
+        seen.extend(entry["event_id"] for entry in scan.run())
+        cursor = scan.next_cursor
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("limit,max_scan", [(20, None), (20, 250), (100, None), (7, 3)])
+def test_paging_to_exhaustion_returns_every_event_once(limit, max_scan):
+    client = FakeMemoryClient(350)
+
+    seen = page_through(client, limit=limit, max_scan=max_scan)
+
+    assert seen == [f"e{i}" for i in range(350)]
+
+
+def test_filtered_paging_returns_every_match_once():
+    client = FakeMemoryClient(350)
+    matches = entry_filter("needle", "all", "all")
+
+    seen = page_through(client, limit=20, max_scan=250, matches=matches)
+
+    assert seen == [f"e{i}" for i in range(350) if i % 7 == 0]
+
+
+def test_page_never_reads_more_events_than_still_wanted():
+    client = FakeMemoryClient(350)
+
+    scan = EventScan(client, "mem", "actor", "session", limit=20)
+    entries = scan.run()
+
+    assert len(entries) == 20
+    assert client.gmdp_client.page_sizes == [20]
+    assert scan.next_cursor == "20"
+
+
+def test_sort_entries_orders_by_timestamp_and_size():
+    entries = [
+        {"timestamp": "b", "size": 1},
+        {"timestamp": "c", "size": 3},
+        {"timestamp": "a", "size": 2},
+    ]
+
+    by_time = sort_entries(entries, "timestamp", "desc")
+    by_size = sort_entries(entries, "size", "asc")
+
+    assert [e["timestamp"] for e in by_time] == ["c", "b", "a"]
+    assert [e["size"] for e in by_size] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("sort_by", ["timestamp", "size"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_sort_entries_limit_keeps_the_top_entries(sort_by, sort_order):
+    entries = [{"timestamp": f"{i:03d}", "size": i % 13} for i in range(200)]
+
+    top = sort_entries(iter(entries), sort_by, sort_order, limit=15)
+
+    assert top == sort_entries(entries, sort_by, sort_order)[:15]
+
+
+def test_default_paging_sorts_each_page_on_its_own():
+    client = FakeMemoryClient(350)
+
+    scan = EventScan(client, "mem", "actor", "session", limit=20, max_scan=250)
+    page = sort_entries(scan.run(), "timestamp", "desc")
+
+    assert [entry["event_id"] for entry in page] == [f"e{i}" for i in range(19, -1, -1)]
+    assert scan.next_cursor == "20"
+
+
+def test_ranked_scan_returns_the_top_matches_of_the_window():
+    client = FakeMemoryClient(350)
+    matches = entry_filter("needle", "all", "all")
+
+    scan = EventScan(
+        client,
+        "mem",
+        "actor",
+        "session",
+        limit=5,
+        max_scan=250,
+        matches=matches,
+        rank_by="timestamp",
+        rank_order="desc",
+    )
+    entries = scan.run()
+
+    newest_matches = [i for i in range(249, -1, -1) if i % 7 == 0][:5]
+    assert [entry["event_id"] for entry in entries] == [f"e{i}" for i in newest_matches]
+    assert scan.scanned == 250
+    assert scan.next_cursor == "250"
+    assert max(client.gmdp_client.page_sizes) == 100
+
+
+def test_unknown_rank_key_pages_without_ranking():
+    client = FakeMemoryClient(350)
+
+    seen = page_through(client, limit=20, max_scan=250, rank_by="relevance")
+
+    assert seen == [f"e{i}" for i in range(350)]
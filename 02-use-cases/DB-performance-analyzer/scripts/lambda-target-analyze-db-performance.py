@@ -15,7 +15,7 @@ lambda_target_config = {
                 "inlinePayload": [
                     {
                         "name": "explain_query",
-                        "description": "Analyzes and explains the execution plan for a SQL query to help optimize database performance. Provide the database environment (dev/prod) and the SQL query to analyze. Use action_type default value as explain_query.",
+                        "description": "Analyzes and explains the execution plan for a SQL query to help optimize database performance. Provide the database environment (dev/prod) and the SQL query to analyze, or a pg_stat_statements queryid instead of the query. Analyses of the same normalized query are cached for a few minutes. Use action_type default value as explain_query.",
                         "inputSchema": {
                             "type": "object",
                             "properties": {
@@ -28,9 +28,35 @@ lambda_target_config = {
                                 },
                                  "query": {
                                     "type": "string"
+                                },
+                                "queryid": {
+                                    "type": "string",
+                                    "description": "Optional. pg_stat_statements queryid of the query to analyze when no query is given."
+                                },
+                                "use_cache": {
+                                    "type": "string",
+                                    "description": "Optional. Set to 'false' to run EXPLAIN again instead of reusing a cached analysis."
                                 }
                             },
-                            "required": ["environment","action_type","query"]
+                            "required": ["environment","action_type"]
+                            }
+                        },
+                        {
+                        "name": "analyze_plan",
+                        "description": "Analyzes already-captured execution plans without connecting to the database. Provide EXPLAIN (FORMAT JSON) output or a PostgreSQL log written by auto_explain with log_format json. Use action_type default value as analyze_plan.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "action_type": {
+                                    "type": "string",
+                                    "description": "The type of action to perform. Use 'analyze_plan' for this tool."
+                                },
+                                "plan": {
+                                    "type": "string",
+                                    "description": "EXPLAIN JSON output or auto_explain log text containing one or more JSON plans."
+                                }
+                            },
+                            "required": ["action_type","plan"]
                             }
                         },
                         {
@@ -74,6 +100,10 @@ lambda_target_config = {
                                 },
                                  "query": {
                                     "type": "string"
+                                },
+                                "result_format": {
+                                    "type": "string",
+                                    "description": "Optional. 'rows' (default) returns a text table of up to 20 rows. 'columnar' streams up to thousands of rows and returns JSON with column names, column types and one value array per column."
                                 }
                             },
                             "required": ["environment","action_type","query"]
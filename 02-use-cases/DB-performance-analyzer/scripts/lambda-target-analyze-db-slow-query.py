@@ -199,6 +199,73 @@ lambda_target_config = {
                             },
                             "required": ["environment","action_type"]
                             }
+                        },
+                        {
+                        "name": "full_health_report",
+                        "description": "Runs slow query, index, autovacuum, I/O, replication, XID wraparound, table bloat and long-running transaction diagnostics in parallel and returns one combined report. Use this first to triage a database in a single call. Provide the environment (dev/prod) to analyze. Use action_type default value as full_health_report.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "environment": {
+                                    "type": "string"
+                                },
+                                "action_type": {
+                                    "type": "string",
+                                    "description": "The type of action to perform. Use 'full_health_report' for this tool."
+                                }
+                            },
+                            "required": ["environment","action_type"]
+                            }
+                        },
+                        {
+                        "name": "stat_sampling",
+                        "description": "Shows what the database is doing right now. Takes two or more snapshots of pg_stat_statements and the pg_stat table and database views interval_seconds apart and ranks queries by their per-second calls, execution time, blocks read/hit or rows in that window. Pass snapshots (saved stat_snapshot output) instead of an environment to diff them without connecting. Use action_type default value as stat_sampling.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "environment": {
+                                    "type": "string"
+                                },
+                                "action_type": {
+                                    "type": "string",
+                                    "description": "The type of action to perform. Use 'stat_sampling' for this tool."
+                                },
+                                "interval_seconds": {
+                                    "type": "integer",
+                                    "description": "Seconds between snapshots (default 10)"
+                                },
+                                "samples": {
+                                    "type": "integer",
+                                    "description": "Number of snapshots to take, at least 2 (default 2)"
+                                },
+                                "rank_by": {
+                                    "type": "string",
+                                    "description": "Rank queries by exec_time, calls, rows, blks_read or blks_hit (default exec_time)"
+                                },
+                                "snapshots": {
+                                    "type": "string",
+                                    "description": "Optional JSON list of saved stat_snapshot results to diff instead of sampling the database"
+                                }
+                            },
+                            "required": ["action_type"]
+                            }
+                        },
+                        {
+                        "name": "stat_snapshot",
+                        "description": "Returns one JSON snapshot of the cumulative pg_stat_statements, table and database counters. Save two or more snapshots and pass them to stat_sampling to compare periods. Provide the environment (dev/prod) to analyze. Use action_type default value as stat_snapshot.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "environment": {
+                                    "type": "string"
+                                },
+                                "action_type": {
+                                    "type": "string",
+                                    "description": "The type of action to perform. Use 'stat_snapshot' for this tool."
+                                }
+                            },
+                            "required": ["environment","action_type"]
+                            }
                         }
                 ]
             }
@@ -216,7 +283,7 @@ credential_config = [
 response = agentcore_client.create_gateway_target(
     gatewayIdentifier=os.getenv('GATEWAY_IDENTIFIER'), # Replace with your GatewayID
     name=os.getenv('TARGET_NAME','pgstat-analyze-db'),
-    description=os.getenv('TARGET_DESCRIPTION', 'Enhanced PostgreSQL database performance analyzer with comprehensive diagnostics including slow queries, connection issues, I/O bottlenecks, index usage, autovacuum, replication, system health, vacuum progress monitoring, XID wraparound analysis, table bloat detection, and long-running transaction identification. Based on production-ready runbooks with deep diagnostic capabilities.'),
+    description=os.getenv('TARGET_DESCRIPTION', 'Enhanced PostgreSQL database performance analyzer with comprehensive diagnostics including slow queries, connection issues, I/O bottlenecks, index usage, autovacuum, replication, system health, vacuum progress monitoring, XID wraparound analysis, table bloat detection, long-running transaction identification, a combined full health report, and snapshot-based sampling of current load. Based on production-ready runbooks with deep diagnostic capabilities.'),
     credentialProviderConfigurations=credential_config, 
     targetConfiguration=lambda_target_config)
 
@@ -1,11 +1,19 @@
+import base64
+import decimal
+import hashlib
 import json
 import boto3
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 import os
 import re
 import time
+import uuid
 import logging
-from datetime import datetime
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
 from botocore.exceptions import ClientError
 
 # Set up logging
@@ -20,52 +28,165 @@ class QueryLimitError(Exception):
     """Custom exception for query limit violations"""
     pass
 
-def analyze_query_complexity(query):
+# SQL lexer shared by query validation, complexity analysis and EXPLAIN
+# cleanup. A single pass over the text tracks string, quoted identifier,
+# dollar-quote and comment state, so semicolons and keywords inside them are
+# never mistaken for statement boundaries or commands.
+SqlToken = namedtuple('SqlToken', ['kind', 'value', 'start', 'end'])
+
+# Whitespace before a token is consumed by the same match
+_SQL_TOKEN = re.compile(r"""\s*(?:
+      (?P<comment>--[^\n]*)
+    | (?P<block_comment>/\*)
+    | (?P<string>[eE]'(?:[^'\\]|\\.|'')*'?|'(?:[^']|'')*'?)
+    | (?P<quoted_identifier>"(?:[^"]|"")*"?)
+    | (?P<parameter>\$\d+)
+    | (?P<dollar_string>\$(?:[^\W\d]\w*)?\$)
+    | (?P<word>[^\W\d][\w$]*)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<semicolon>;)
+    | (?P<symbol>\S)
+)""", re.VERBOSE | re.DOTALL)
+_BLOCK_COMMENT_DELIMITER = re.compile(r'/\*|\*/')
+
+def _block_comment_end(text, start):
+    """End offset of the (possibly nested) block comment starting at start"""
+    depth = 0
+    pos = start
+    while True:
+        match = _BLOCK_COMMENT_DELIMITER.search(text, pos)
+        if not match:
+            return len(text)  # Unterminated comment runs to the end
+        depth += 1 if match.group() == '/*' else -1
+        pos = match.end()
+        if depth == 0:
+            return pos
+
+def tokenize_sql(text):
+    """
+    Split SQL text into tokens in a single linear pass
+    
+    Token kinds: comment, string, dollar_string, quoted_identifier,
+    parameter, word, number, semicolon and symbol (any other single
+    character). Whitespace is skipped. Unterminated strings and comments
+    extend to the end of the text.
+    
+    Args:
+        text (str): SQL text
+    
+    Returns:
+        list: SqlToken(kind, value, start, end) tuples in text order
+    """
+    tokens = []
+    append = tokens.append
+    match_token = _SQL_TOKEN.match
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = match_token(text, pos)
+        if not match:
+            break  # Only trailing whitespace is left
+        kind = match.lastgroup
+        start = match.start(kind)
+        end = match.end()
+        if kind == 'block_comment':
+            kind, end = 'comment', _block_comment_end(text, start)
+        elif kind == 'dollar_string':
+            close = text.find(match.group(kind), end)
+            end = length if close == -1 else close + end - start
+        append(SqlToken(kind, text[start:end], start, end))
+        pos = end
+    return tokens
+
+def significant_tokens(tokens):
+    """Tokens other than comments"""
+    return [token for token in tokens if token.kind != 'comment']
+
+def split_sql_statements(text, tokens=None):
+    """
+    Split SQL text into statements at top-level semicolons
+    
+    Args:
+        text (str): SQL text
+        tokens (list): Optional tokens of text from tokenize_sql
+    
+    Returns:
+        list: (statement text, statement tokens) pairs. The statement text
+        runs from its first to its last significant token, so surrounding
+        whitespace, comments and the semicolon are dropped. Statements
+        made only of comments are skipped.
+    """
+    if tokens is None:
+        tokens = tokenize_sql(text)
+    statements = []
+    first = last = None  # First and last code token of the current statement
+    for index, token in enumerate(tokens):
+        if token.kind == 'semicolon':
+            if first is not None:
+                statements.append((text[tokens[first].start:tokens[last].end], tokens[first:last + 1]))
+            first = last = None
+        elif token.kind != 'comment':
+            if first is None:
+                first = index
+            last = index
+    if first is not None:
+        statements.append((text[tokens[first].start:tokens[last].end], tokens[first:last + 1]))
+    return statements
+
+def analyze_query_complexity(query, tokens=None):
     """
     Analyze query complexity and potential resource impact
     
+    Only SQL code is considered; keywords inside strings, quoted
+    identifiers and comments do not count.
+    
     Args:
         query (str): SQL query to analyze
+        tokens (list): Optional tokens of query from tokenize_sql
     
     Returns:
         dict: Complexity metrics
-        
-    Raises:
-        QueryComplexityError: If query is too complex
     """
-    query_lower = query.lower()
+    if tokens is None:
+        tokens = tokenize_sql(query)
+    code = significant_tokens(tokens)
+    words = [token.value.lower() if token.kind == 'word' else None for token in code]
+    values = [token.value for token in code]
     complexity_score = 0
     warnings = []
     
+    def followed_by(index, value):
+        return index + 1 < len(code) and values[index + 1].lower() == value
+    
     # Check for joins
-    join_count = sum(1 for join_type in ['join', 'inner join', 'left join', 'right join', 'full join'] 
-                    if join_type in query_lower)
+    join_count = words.count('join')
     complexity_score += join_count * 2
     if join_count > 3:
         warnings.append(f"Query contains {join_count} joins - consider simplifying")
     
     # Check for subqueries
-    subquery_count = query_lower.count('(select')
+    subquery_count = sum(1 for i, value in enumerate(values)
+                         if value == '(' and code[i].kind == 'symbol' and followed_by(i, 'select'))
     complexity_score += subquery_count * 3
     if subquery_count > 2:
         warnings.append(f"Query contains {subquery_count} subqueries - consider restructuring")
     
     # Check for aggregations
-    agg_functions = ['count(', 'sum(', 'avg(', 'max(', 'min(']
-    agg_count = sum(query_lower.count(func) for func in agg_functions)
+    agg_functions = {'count', 'sum', 'avg', 'max', 'min'}
+    agg_count = sum(1 for i, word in enumerate(words) if word in agg_functions and followed_by(i, '('))
     complexity_score += agg_count
     
     # Check for window functions
-    if 'over(' in query_lower or 'partition by' in query_lower:
+    if any((word == 'over' and followed_by(i, '(')) or (word == 'partition' and followed_by(i, 'by'))
+           for i, word in enumerate(words)):
         complexity_score += 3
         warnings.append("Query uses window functions - monitor performance")
     
     # Check for complex WHERE conditions
-    where_pos = query_lower.find('where')
-    if where_pos != -1:
-        where_clause = query_lower[where_pos:]
-        and_count = where_clause.count(' and ')
-        or_count = where_clause.count(' or ')
+    if 'where' in words:
+        where_clause = words[words.index('where'):]
+        and_count = where_clause.count('and')
+        or_count = where_clause.count('or')
         complexity_score += (and_count + or_count)
         if (and_count + or_count) > 5:
             warnings.append(f"Complex WHERE clause with {and_count + or_count} conditions")
@@ -78,11 +199,140 @@ def analyze_query_complexity(query):
         'aggregation_count': agg_count
     }
 
+# Streaming (columnar) result settings
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', '500'))
+COLUMNAR_MAX_ROWS = int(os.environ.get('COLUMNAR_MAX_ROWS', '10000'))
+COLUMNAR_MAX_BYTES = int(os.environ.get('COLUMNAR_MAX_BYTES', str(1024 * 1024)))
+
+# PostgreSQL type OIDs -> columnar array types; other types are sent as text
+_COLUMNAR_TYPES = {
+    16: 'bool',
+    20: 'int', 21: 'int', 23: 'int', 26: 'int',
+    700: 'float', 701: 'float', 1700: 'numeric',
+    1082: 'date', 1083: 'time', 1114: 'timestamp', 1184: 'timestamptz',
+    1186: 'interval_seconds',
+    114: 'json', 3802: 'json',
+    17: 'bytea_base64',
+    # bool[], int2[], int4[], int8[], oid[], text[], varchar[], float4[],
+    # float8[], numeric[], date[], timestamp[], timestamptz[], json[], jsonb[], bytea[]
+    1000: 'array', 1005: 'array', 1007: 'array', 1016: 'array', 1028: 'array',
+    1009: 'array', 1015: 'array', 1021: 'array', 1022: 'array', 1231: 'array',
+    1182: 'array', 1115: 'array', 1185: 'array', 199: 'array', 3807: 'array',
+    1001: 'array',
+}
+
+def _encode_json_value(value):
+    """Convert a value psycopg2 returned to plain JSON, whatever its column type"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if hasattr(value, 'isoformat'):
+        # date, time and datetime
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if isinstance(value, (list, tuple)):
+        # Arrays, including multidimensional ones, are encoded element-wise
+        return [_encode_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode_json_value(item) for key, item in value.items()}
+    return str(value)
+
+def _encode_columnar_value(value, column_type):
+    """Convert a fetched value to the JSON type of its column array"""
+    if value is None or column_type in ('bool', 'int', 'float', 'json'):
+        return value
+    if column_type == 'numeric':
+        return float(value)
+    if column_type == 'interval_seconds':
+        return value.total_seconds()
+    if column_type in ('date', 'time', 'timestamp', 'timestamptz'):
+        return value.isoformat()
+    # bytea as base64, arrays element-wise, anything else unknown as text
+    return _encode_json_value(value)
+
+def fetch_columnar(conn, stmt, max_rows, max_bytes, server_side=True, batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream a statement's rows into a compact columnar payload
+    
+    SELECT statements run on a named (server-side) cursor and are fetched
+    batch_size rows at a time, so at most one batch is held besides the
+    payload itself. Statements that cannot be declared as a cursor (SHOW)
+    use a regular cursor. Fetching stops once max_rows rows or max_bytes of
+    JSON-encoded values have been collected.
+    
+    Args:
+        conn: Database connection inside a transaction
+        stmt (str): Validated statement
+        max_rows (int): Maximum number of rows to return
+        max_bytes (int): Budget for the JSON-encoded values
+        server_side (bool): Whether to use a named cursor
+        batch_size (int): Rows per fetchmany() round trip
+    
+    Returns:
+        dict: columns, types, values (one array per column), row_count,
+        bytes, truncated and message
+    """
+    cursor_name = f"columnar_{uuid.uuid4().hex}" if server_side else None
+    with conn.cursor(name=cursor_name) as cur:
+        cur.itersize = batch_size
+        cur.execute(stmt)
+        rows = cur.fetchmany(batch_size)
+        # Named cursors only describe their columns after the first fetch
+        description = cur.description or []
+        columns = [desc[0] for desc in description]
+        types = [_COLUMNAR_TYPES.get(desc[1], 'text') for desc in description]
+        values = [[] for _ in columns]
+        row_count = 0
+        used_bytes = 0
+        truncated_by = None
+        while rows and not truncated_by:
+            for row in rows:
+                if row_count >= max_rows:
+                    truncated_by = 'max_rows'
+                    break
+                encoded = [_encode_columnar_value(value, column_type)
+                           for value, column_type in zip(row, types)]
+                row_bytes = len(json.dumps(encoded, default=str))
+                if used_bytes + row_bytes > max_bytes:
+                    truncated_by = 'max_bytes'
+                    break
+                for column_values, value in zip(values, encoded):
+                    column_values.append(value)
+                row_count += 1
+                used_bytes += row_bytes
+            else:
+                rows = cur.fetchmany(batch_size)
+
+    message = ''
+    if truncated_by == 'max_rows':
+        message = f"Results truncated to {max_rows} rows"
+    elif truncated_by == 'max_bytes':
+        message = f"Results truncated to {row_count} rows to stay within {max_bytes} bytes"
+    return {
+        'columns': columns,
+        'types': types,
+        'values': values,
+        'row_count': row_count,
+        'bytes': used_bytes,
+        'truncated': truncated_by is not None,
+        'message': message
+    }
+
 def validate_and_execute_queries(secret_name, query, max_rows=20, 
                                max_statements=5, max_total_rows=1000, 
-                               max_complexity=15):
+                               max_complexity=15, result_format='rows',
+                               max_bytes=COLUMNAR_MAX_BYTES):
     """
     Enhanced query validation and execution with additional controls
+    
+    With result_format='columnar' rows are streamed from a server-side
+    cursor into column arrays (see fetch_columnar) within max_bytes, and
+    the EXPLAIN ANALYZE pre-run is skipped since it would execute the
+    unlimited statement a second time.
     """
     response = {
         'results': [],
@@ -94,10 +344,12 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
     start_time = time.time()
     conn = None
     total_rows = 0
+    bytes_used = 0
     
     try:
         # Validate and split queries
-        statements = validate_query(query)
+        validated = validate_query_statements(query)
+        statements = [stmt for stmt, _ in validated]
         
         # Check number of statements
         if len(statements) > max_statements:
@@ -115,9 +367,9 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
             cur.execute("SET idle_in_transaction_session_timeout = '60s'")
             
             # Execute each statement
-            for stmt_index, stmt in enumerate(statements, 1):
+            for stmt_index, (stmt, stmt_tokens) in enumerate(validated, 1):
                 # Analyze query complexity
-                complexity_metrics = analyze_query_complexity(stmt)
+                complexity_metrics = analyze_query_complexity(stmt, stmt_tokens)
                 if complexity_metrics['complexity_score'] > max_complexity:
                     raise QueryComplexityError(
                         f"Statement {stmt_index} is too complex (score: {complexity_metrics['complexity_score']})"
@@ -141,6 +393,20 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
                 
                 stmt_lower = stmt.lower().strip()
                 
+                if result_format == 'columnar':
+                    # Stream instead of adding LIMIT and fetching everything
+                    stmt_response.update(fetch_columnar(
+                        conn, stmt,
+                        max_rows=min(max_rows, max_total_rows - total_rows),
+                        max_bytes=max(max_bytes - bytes_used, 0),
+                        server_side=stmt_lower.startswith('select')
+                    ))
+                    del stmt_response['rows']
+                    total_rows += stmt_response['row_count']
+                    bytes_used += stmt_response['bytes']
+                    response['results'].append(stmt_response)
+                    continue
+                
                 # Only add LIMIT for SELECT queries
                 if stmt_lower.startswith('select') and 'limit' not in stmt_lower:
                     remaining_rows = max_total_rows - total_rows
@@ -235,28 +501,69 @@ def validate_and_execute_queries(secret_name, query, max_rows=20,
     
     finally:
         if conn:
-            conn.close()
-
-def get_secret(secret_name):
-    """Get secret from AWS Secrets Manager """
-    secret_name = secret_name
-    region_name = os.environ['REGION']
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-    
+            release_db_connection(conn)
+
+# Module-level state survives warm Lambda invocations, so secrets, AWS clients
+# and database connections are reused instead of being set up on every call.
+SECRET_CACHE_TTL = int(os.environ.get('SECRET_CACHE_TTL', '300'))
+DB_POOL_MIN_CONNECTIONS = int(os.environ.get('DB_POOL_MIN_CONNECTIONS', '1'))
+DB_POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', '4'))
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', '10'))
+# Pooled connections idle for longer than this are pinged before reuse
+DB_VALIDATE_AFTER = int(os.environ.get('DB_VALIDATE_AFTER', '30'))
+
+_aws_clients = {}
+_secret_cache = {}      # secret name -> (secret, fetched at)
+_env_secret_cache = {}  # environment -> (secret name, fetched at)
+_pools = {}             # secret name -> (connection parameters, pool)
+_pools_lock = threading.Lock()
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its pool and when it was last used"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owner_pool = None
+        self.released_at = time.monotonic()
+
+def _aws_client(service_name, region_name=None):
+    """Return a cached boto3 client (clients are thread-safe, sessions are not)"""
+    key = (service_name, region_name)
+    client = _aws_clients.get(key)
+    if client is None:
+        client = boto3.session.Session().client(
+            service_name=service_name,
+            region_name=region_name
+        )
+        _aws_clients[key] = client
+    return client
+
+def get_secret(secret_name, refresh=False):
+    """Get secret from AWS Secrets Manager, cached for SECRET_CACHE_TTL seconds"""
+    cached = _secret_cache.get(secret_name)
+    if cached and not refresh and time.monotonic() - cached[1] < SECRET_CACHE_TTL:
+        return cached[0]
+
+    client = _aws_client('secretsmanager', os.environ['REGION'])
     try:
         secret_value = client.get_secret_value(SecretId=secret_name)
         secret = json.loads(secret_value['SecretString'])
-        return secret
     except ClientError as e:
         raise Exception(f"Failed to get secret: {str(e)}")
+    _secret_cache[secret_name] = (secret, time.monotonic())
+    return secret
 
 def get_env_secret(environment):
-    ssm_client = boto3.client('ssm')
-    """Retrieve the secret name for the specified environment"""
+    """Retrieve the secret name for the specified environment (cached)"""
+    cached = _env_secret_cache.get(environment)
+    if cached and time.monotonic() - cached[1] < SECRET_CACHE_TTL:
+        return cached[0]
+    secret_name = _get_env_secret_from_ssm(environment)
+    _env_secret_cache[environment] = (secret_name, time.monotonic())
+    return secret_name
+
+def _get_env_secret_from_ssm(environment):
+    """Look up the secret name for the environment in Parameter Store"""
+    ssm_client = _aws_client('ssm')
     if environment == 'prod':
         try:
             # Get the secret name from Parameter Store
@@ -282,22 +589,98 @@ def get_env_secret(environment):
         print("environement does not exist")
         raise ValueError(f"Unknown environment: {environment}")
 
+def _get_pool(secret_name):
+    """Return the connection pool for a secret, rebuilding it if the credentials changed"""
+    secret = get_secret(secret_name)
+    params = {
+        'host': secret['host'],
+        'database': secret['dbname'],
+        'user': secret['username'],
+        'password': secret['password'],
+        'port': secret['port']
+    }
+    with _pools_lock:
+        current = _pools.get(secret_name)
+        if current and current[0] == params:
+            return current[1]
+        if current:
+            logger.info(f"Credentials in {secret_name} changed, replacing its connection pool")
+            current[1].closeall()
+            del _pools[secret_name]
+        pool = psycopg2.pool.ThreadedConnectionPool(
+            DB_POOL_MIN_CONNECTIONS,
+            DB_POOL_MAX_CONNECTIONS,
+            connection_factory=PooledConnection,
+            connect_timeout=DB_CONNECT_TIMEOUT,
+            **params
+        )
+        _pools[secret_name] = (params, pool)
+        return pool
+
+def _is_usable(conn):
+    """Validate a pooled connection before handing it out again"""
+    if conn.closed:
+        return False
+    if time.monotonic() - conn.released_at < DB_VALIDATE_AFTER:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error as e:
+        logger.warning(f"Discarding stale database connection: {str(e)}")
+        return False
+
+def _checkout(pool):
+    """Take a connection from the pool, replacing ones that went stale"""
+    for _ in range(DB_POOL_MAX_CONNECTIONS + 1):
+        conn = pool.getconn()
+        if _is_usable(conn):
+            conn.owner_pool = pool
+            return conn
+        pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("No usable connection in the database connection pool")
+
+def _secret_changed(secret_name):
+    """Re-read a cached secret; returns True if it was rotated"""
+    cached = _secret_cache.get(secret_name)
+    return get_secret(secret_name, refresh=True) != (cached[0] if cached else None)
+
 def connect_to_db(secret_name):
-    """Establish database connection"""
-    cur_secret = secret_name
-    secret = get_secret(cur_secret)
+    """Borrow a pooled database connection; return it with release_db_connection()"""
     try:
-        conn = psycopg2.connect(
-            host=secret['host'],
-            database=secret['dbname'],
-            user=secret['username'],
-            password=secret['password'],
-            port=secret['port']
-        )
-        return conn
+        try:
+            return _checkout(_get_pool(secret_name))
+        except psycopg2.OperationalError:
+            # The cached password may be stale after a secret rotation
+            if not _secret_changed(secret_name):
+                raise
+            return _checkout(_get_pool(secret_name))
     except Exception as e:
         raise Exception(f"Failed to connect to the database: {str(e)}")
 
+def release_db_connection(conn):
+    """Return a connection from connect_to_db() to its pool"""
+    pool = getattr(conn, 'owner_pool', None)
+    if pool is None:
+        conn.close()
+        return
+    conn.owner_pool = None
+    broken = bool(conn.closed)
+    if not broken:
+        try:
+            # Also undoes transaction-scoped settings such as READ ONLY and statement_timeout
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+    conn.released_at = time.monotonic()
+    try:
+        pool.putconn(conn, close=broken)
+    except psycopg2.pool.PoolError:
+        # The pool was closed after a credential change
+        conn.close()
+
 # Define the queries dictionary for different object types
 queries = {
     'table': """
@@ -570,7 +953,7 @@ def extract_database_object_ddl(secret_name, object_type, object_name=None, obje
     finally:
         if conn:
             try:
-                conn.close()
+                release_db_connection(conn)
                 print("\nDatabase connection closed")
             except Exception as e:
                 print(f"\nError closing connection: {str(e)}")
@@ -732,89 +1115,180 @@ def analyze_trigger_definition(definition):
     return '\n'.join(explanation)
 
 
-def clean_query_for_explain(query):
+def clean_query_for_explain(query, tokens=None):
     """
     Remove any existing EXPLAIN or EXPLAIN ANALYZE keywords from the query
     
     Parameters:
     - query: Original query string
+    - tokens: Optional tokens of query from tokenize_sql
     Returns:
     - Cleaned query string
     """
-    # Remove common EXPLAIN variants (case-insensitive)
-    patterns = [
-        r'^\s*EXPLAIN\s+ANALYZE\s+',
-        r'^\s*EXPLAIN\s+\(.*?\)\s+',
-        r'^\s*EXPLAIN\s+'
-    ]
-    
-    cleaned_query = query
-    for pattern in patterns:
-        cleaned_query = re.sub(pattern, '', cleaned_query, flags=re.IGNORECASE)
+    if tokens is None:
+        tokens = tokenize_sql(query)
+    code = significant_tokens(tokens)
+    if not code or code[0].value.lower() != 'explain':
+        return query.strip()
+    
+    # Skip EXPLAIN with either its parenthesized option list or legacy options
+    index = 1
+    if index < len(code) and code[index].value == '(':
+        depth = 0
+        for index in range(index, len(code)):
+            if code[index].kind == 'symbol' and code[index].value in '()':
+                depth += 1 if code[index].value == '(' else -1
+                if depth == 0:
+                    break
+        index += 1
+    else:
+        while index < len(code) and code[index].value.lower() in ('analyze', 'analyse', 'verbose'):
+            index += 1
     
-    return cleaned_query.strip()
+    if index >= len(code):
+        return ''
+    return query[code[index].start:].strip()
+
+# Plan cache: analyses by database and normalized query, so repeated
+# questions about the same hot query do not run it again under ANALYZE
+PLAN_CACHE_TTL = int(os.environ.get('PLAN_CACHE_TTL', '300'))
+PLAN_CACHE_SIZE = int(os.environ.get('PLAN_CACHE_SIZE', '128'))
 
-def analyze_query_performance(secret_name, query_or_object_name, parameters=None, object_type=None):
+_plan_cache = OrderedDict()   # (secret name, fingerprint) -> (analysis, cached at)
+_plan_cache_queryids = {}     # (secret name, pg_stat_statements queryid) -> fingerprint
+
+def query_fingerprint(query, tokens=None):
+    """
+    Fingerprint of a query that ignores literal values, $n parameters,
+    comments, whitespace and keyword case
+    """
+    if tokens is None:
+        tokens = tokenize_sql(query)
+    parts = []
+    for token in significant_tokens(tokens):
+        if token.kind in ('string', 'dollar_string', 'number', 'parameter'):
+            parts.append('?')
+        elif token.kind == 'word':
+            parts.append(token.value.lower())
+        elif token.kind != 'semicolon':
+            parts.append(token.value)
+    return hashlib.sha256(' '.join(parts).encode('utf-8')).hexdigest()[:32]
+
+def get_cached_plan_analysis(secret_name, fingerprint=None, queryid=None):
+    """Return a cached analysis by fingerprint or queryid, or None"""
+    if fingerprint is None:
+        fingerprint = _plan_cache_queryids.get((secret_name, queryid))
+    key = (secret_name, fingerprint)
+    entry = _plan_cache.get(key)
+    if entry is None:
+        return None
+    analysis, cached_at = entry
+    age = time.monotonic() - cached_at
+    if age > PLAN_CACHE_TTL:
+        del _plan_cache[key]
+        return None
+    _plan_cache.move_to_end(key)
+    return dict(analysis, cached=True, cache_age_seconds=round(age, 1))
+
+def cache_plan_analysis(secret_name, fingerprint, queryid, analysis):
+    """Store an analysis, evicting the least recently used beyond PLAN_CACHE_SIZE"""
+    key = (secret_name, fingerprint)
+    _plan_cache[key] = (analysis, time.monotonic())
+    _plan_cache.move_to_end(key)
+    if queryid is not None:
+        _plan_cache_queryids[(secret_name, queryid)] = fingerprint
+    while len(_plan_cache) > PLAN_CACHE_SIZE:
+        evicted, _ = _plan_cache.popitem(last=False)
+        for queryid_key in [k for k, v in _plan_cache_queryids.items()
+                            if k[0] == evicted[0] and v == evicted[1]]:
+            del _plan_cache_queryids[queryid_key]
+
+def analyze_query_performance(secret_name, query_or_object_name, parameters=None, object_type=None,
+                              queryid=None, use_cache=True):
     """
     Analyze query performance and provide optimization recommendations
     
+    Analyses are cached for PLAN_CACHE_TTL seconds under the query's
+    fingerprint and its pg_stat_statements queryid, so a repeated request
+    for the same normalized query is answered without connecting.
+    
     Parameters:
     - secret_name: Secret containing database credentials
     - query_or_object_name: SQL query string or object name to analyze
     - parameters: Optional. List of parameter values for parameterized queries
     - object_type: Optional. If provided, will fetch definition from database object
+    - queryid: Optional. pg_stat_statements queryid to analyze when no query is given;
+      only SELECT statements are analyzed, in a read-only transaction
+    - use_cache: Optional. Set to False to always run EXPLAIN
     """
+    if use_cache and not object_type:
+        if query_or_object_name:
+            cached = get_cached_plan_analysis(
+                secret_name, fingerprint=query_fingerprint(clean_query_for_explain(query_or_object_name)))
+        else:
+            cached = get_cached_plan_analysis(secret_name, queryid=queryid)
+        if cached:
+            return cached
+
     conn = connect_to_db(secret_name)
     try:
         with conn.cursor() as cur:
             # If object_type is provided, fetch the query definition
             if object_type:
                 query_to_analyze = get_object_definition(cur, query_or_object_name, object_type)
+            elif not query_or_object_name and queryid is not None:
+                # pg_stat_statements also records DML; EXPLAIN ANALYZE would run it
+                cur.execute("SET TRANSACTION READ ONLY")
+                cur.execute("SELECT query FROM pg_stat_statements WHERE queryid = %s LIMIT 1", (queryid,))
+                row = cur.fetchone()
+                if not row:
+                    raise ValueError(f"queryid {queryid} not found in pg_stat_statements")
+                query_to_analyze = row[0]
+                validate_query_statements(query_to_analyze)
             else:
                 query_to_analyze = query_or_object_name
 
             # Clean the query before analysis
             query_to_analyze = clean_query_for_explain(query_to_analyze)
-
-            # Check if the query contains parameter placeholders
-            has_parameters = any(f'${i}' in query_to_analyze for i in range(1, 21))
-
-            if has_parameters:
+            tokens = tokenize_sql(query_to_analyze)
+            fingerprint = query_fingerprint(query_to_analyze, tokens)
+            if use_cache and (object_type or not query_or_object_name):
+                cached = get_cached_plan_analysis(secret_name, fingerprint=fingerprint)
+                if cached:
+                    return cached
+
+            # The plan carries estimated ('Plan Rows') next to actual figures,
+            # so one EXPLAIN serves as both the actual and the estimated plan.
+            # VERBOSE adds the pg_stat_statements Query Identifier.
+            parameter_tokens = [token for token in tokens if token.kind == 'parameter']
+            if parameter_tokens:
                 # Replace $n parameters with dummy placeholders
                 modified_query = query_to_analyze
-                param_count = 0
-                for i in range(1, 21):
-                    if f'${i}' in modified_query:
-                        param_count = max(param_count, i)
-                        modified_query = modified_query.replace(f'${i}', 'NULL')
+                for token in reversed(parameter_tokens):
+                    modified_query = modified_query[:token.start] + 'NULL' + modified_query[token.end:]
 
                 # Use GENERIC_PLAN for parameterized queries
-                cur.execute(f"EXPLAIN (GENERIC_PLAN, BUFFERS, FORMAT JSON) {modified_query}")
+                cur.execute(f"EXPLAIN (GENERIC_PLAN, BUFFERS, VERBOSE, FORMAT JSON) {modified_query}")
                 plan = cur.fetchone()[0]
-
-                cur.execute(f"EXPLAIN (FORMAT JSON) {modified_query}")
-                estimated_plan = cur.fetchone()[0]
-                
-                # Pass True for is_generic_plan
-                analysis = analyze_execution_plan(plan[0], estimated_plan[0], True)
+                is_generic_plan = True
             else:
                 # For non-parameterized queries, use ANALYZE
-                cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query_to_analyze}")
+                cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, VERBOSE, FORMAT JSON) {query_to_analyze}")
                 plan = cur.fetchone()[0]
-                
-                cur.execute(f"EXPLAIN (FORMAT JSON) {query_to_analyze}")
-                estimated_plan = cur.fetchone()[0]
-                
-                # Pass False for is_generic_plan
-                analysis = analyze_execution_plan(plan[0], estimated_plan[0], False)
+                is_generic_plan = False
 
+            analysis = analyze_execution_plan(plan[0], plan[0], is_generic_plan)
+            analysis['fingerprint'] = fingerprint
+            analysis['queryid'] = plan[0].get('Query Identifier', queryid)
+            if use_cache:
+                cache_plan_analysis(secret_name, fingerprint, analysis['queryid'], analysis)
             return analysis
 
     except Exception as e:
         raise Exception(f"Failed to analyze query performance: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def analyze_execution_plan(actual_plan, estimated_plan, is_generic_plan):
     """
@@ -863,11 +1337,19 @@ def analyze_execution_plan(actual_plan, estimated_plan, is_generic_plan):
     
     return analysis
 
-def analyze_plan_node(node, analysis, is_generic_plan):
+def analyze_plan_node(root, analysis, is_generic_plan):
     """
-    Recursively analyze each node in the execution plan
+    Analyze each node in the execution plan in one depth-first walk
     """
-    # Analyze current node
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        _analyze_single_plan_node(node, analysis, is_generic_plan)
+        # Children are visited in plan order
+        pending.extend(reversed(node.get('Plans', [])))
+
+def _analyze_single_plan_node(node, analysis, is_generic_plan):
+    """Record issues for one plan node"""
     node_type = node['Node Type']
     
     # Check for expensive operations with appropriate metrics based on plan type
@@ -907,10 +1389,6 @@ def analyze_plan_node(node, analysis, is_generic_plan):
     if 'Filter' in node:
         analyze_filter_condition(node['Filter'], analysis)
 
-    # Recursively analyze child nodes
-    for child in node.get('Plans', []):
-        analyze_plan_node(child, analysis, is_generic_plan)
-
 def analyze_filter_condition(filter_condition, analysis):
     """
     Analyze filter conditions for potential optimization opportunities
@@ -1010,6 +1488,8 @@ def format_analysis_output(analysis):
     
     # Performance Statistics
     output.append("Query Performance Summary:")
+    if analysis.get('cached'):
+        output.append(f"- Served from plan cache (analyzed {analysis['cache_age_seconds']}s ago)")
     
     # Check if this is a generic plan
     is_generic_plan = analysis.get('plan_type') == 'Generic Plan'
@@ -1046,6 +1526,92 @@ def format_analysis_output(analysis):
 
     return "\n".join(output)
 
+_JSON_VALUE_START = re.compile(r'[\[{]')
+_PSQL_CONTINUATION = re.compile(r'[ \t]*\+[ \t]*$', re.MULTILINE)
+
+def _plans_in(value):
+    """EXPLAIN JSON documents (dicts with a 'Plan' key) within a decoded value"""
+    if isinstance(value, dict):
+        return [value] if isinstance(value.get('Plan'), dict) else []
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, dict) and isinstance(item.get('Plan'), dict)]
+    return []
+
+def load_captured_plans(text):
+    """
+    Extract JSON execution plans from captured output
+    
+    Accepts EXPLAIN (FORMAT JSON) output, including psql's aligned output
+    with '+' line continuations, and PostgreSQL logs written by
+    auto_explain with auto_explain.log_format = json, where each plan
+    follows a 'plan:' log line.
+    
+    Args:
+        text (str): File contents or pasted output
+    
+    Returns:
+        list: Plan documents, each a dict with a 'Plan' key
+    """
+    if ' +\n' in text or '\t+\n' in text:
+        text = _PSQL_CONTINUATION.sub('', text)
+    decoder = json.JSONDecoder()
+    plans = []
+    pos = 0
+    while True:
+        match = _JSON_VALUE_START.search(text, pos)
+        if not match:
+            return plans
+        try:
+            value, pos = decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            pos = match.start() + 1
+            continue
+        plans.extend(_plans_in(value))
+
+def analyze_captured_plans(text):
+    """
+    Analyze already-captured JSON plans without connecting to a database
+    
+    Plans that carry 'Actual Total Time' are analyzed like EXPLAIN ANALYZE
+    output, others like generic (estimate-only) plans.
+    
+    Args:
+        text (str): EXPLAIN JSON output or an auto_explain log
+    
+    Returns:
+        list: One analysis per plan found
+        
+    Raises:
+        ValueError: If the text contains no JSON plan
+    """
+    plans = load_captured_plans(text)
+    if not plans:
+        raise ValueError("No JSON execution plan found. Capture plans with EXPLAIN (FORMAT JSON) "
+                         "or auto_explain.log_format = json")
+    analyses = []
+    for plan in plans:
+        is_generic_plan = 'Actual Total Time' not in plan['Plan']
+        analysis = analyze_execution_plan(plan, plan, is_generic_plan)
+        if plan.get('Query Text'):
+            analysis['query_text'] = plan['Query Text']
+        if plan.get('Query Identifier') is not None:
+            analysis['queryid'] = plan['Query Identifier']
+        analyses.append(analysis)
+    return analyses
+
+def format_captured_plan_analyses(analyses):
+    """Format the analyses of captured plans for display"""
+    output = []
+    for index, analysis in enumerate(analyses, 1):
+        output.append(f"=== Plan {index} of {len(analyses)} ===")
+        if analysis.get('query_text'):
+            query_text = ' '.join(analysis['query_text'].split())
+            output.append(f"Query: {query_text[:300]}{'...' if len(query_text) > 300 else ''}")
+        if analysis.get('queryid') is not None:
+            output.append(f"Query Identifier: {analysis['queryid']}")
+        output.append(format_analysis_output(analysis))
+    return "\n".join(output)
+
 def monitor_query_performance(query, start_time, rows_returned):
     """
     Monitor query performance and suggest analysis if needed
@@ -1096,15 +1662,16 @@ def monitor_query_performance(query, start_time, rows_returned):
     
     return metrics
 
-def validate_query(query):
+def validate_query_statements(query):
     """
-    Validate query for security concerns and split into statements
+    Validate query for security concerns and split it into statements
     
     Args:
         query (str): SQL query to validate
     
     Returns:
-        list: List of validated statements
+        list: (statement, tokens) pairs for the validated statements; the
+        tokens can be passed on to analyze_query_complexity
         
     Raises:
         ValueError: If query contains prohibited operations
@@ -1112,115 +1679,49 @@ def validate_query(query):
     if not query or not isinstance(query, str):
         raise ValueError("Query must be a non-empty string")
 
-    def is_within_quotes(text, position):
-        """Check if a position in text is within quotes"""
-        single_quotes = False
-        double_quotes = False
-        for i in range(position):
-            if text[i] == "'" and not double_quotes:
-                single_quotes = not single_quotes
-            elif text[i] == '"' and not single_quotes:
-                double_quotes = not double_quotes
-        return single_quotes or double_quotes
-
-    def split_statements(query_text):
-        """Split query into individual statements, respecting quotes and comments"""
-        statements = []
-        current_stmt = []
-        i = 0
-        comment_block = False
-        line_comment = False
-        
-        while i < len(query_text):
-            char = query_text[i]
-            
-            # Handle comment blocks
-            if query_text[i:i+2] == '/*' and not line_comment:
-                comment_block = True
-                current_stmt.append(char)
-                i += 1
-            elif query_text[i:i+2] == '*/' and comment_block:
-                comment_block = False
-                current_stmt.append(char)
-                i += 1
-            # Handle line comments
-            elif query_text[i:i+2] == '--' and not comment_block:
-                line_comment = True
-                current_stmt.append(char)
-                i += 1
-            elif char == '\n' and line_comment:
-                line_comment = False
-                current_stmt.append(char)
-            # Handle semicolons
-            elif char == ';' and not comment_block and not line_comment and not is_within_quotes(query_text, i):
-                current_stmt.append(char)
-                stmt = ''.join(current_stmt).strip()
-                if stmt:
-                    statements.append(stmt)
-                current_stmt = []
-            else:
-                current_stmt.append(char)
-            i += 1
-        
-        # Add the last statement if exists
-        last_stmt = ''.join(current_stmt).strip()
-        if last_stmt:
-            statements.append(last_stmt)
-        
-        return [stmt for stmt in statements if stmt]
+    # Keywords that must not appear in SQL code (strings and comments are fine)
+    dangerous_operations = {
+        'insert', 'update', 'delete', 'drop', 'truncate', 'alter', 'create',
+        'grant', 'revoke', 'execute', 'copy'
+    }
 
-    # Split into statements
-    statements = split_statements(query)
     validated_statements = []
-
-    # Validate each statement
-    for stmt in statements:
-        stmt = stmt.strip()
-        if stmt.endswith(';'):
-            stmt = stmt[:-1]
-        
-        stmt_lower = stmt.lower().strip()
+    for stmt, tokens in split_sql_statements(query):
+        words = [token.value.lower() for token in tokens if token.kind == 'word']
         
         # Get the command type
-        first_word = stmt_lower.split()[0] if stmt_lower.split() else ''
+        first_word = significant_tokens(tokens)[0].value.lower()
         
         if first_word not in ['select', 'show']:
             raise ValueError(f"Prohibited operation detected: {first_word}")
         
         # For SELECT statements, check for dangerous operations
         if first_word == 'select':
-            dangerous_operations = [
-                r'\binsert\b', r'\bupdate\b', r'\bdelete\b', r'\bdrop\b', 
-                r'\btruncate\b', r'\balter\b', r'\bcreate\b', r'\bgrant\b', 
-                r'\brevoke\b', r'\bexecute\b', r'\bcopy\b'
-            ]
-            
-            # Remove content within quotes for checking
-            query_for_check = ''
-            in_quote = False
-            quote_char = None
-            
-            for char in stmt:
-                if char in ["'", '"'] and (not quote_char or char == quote_char):
-                    if not in_quote:
-                        quote_char = char
-                        in_quote = True
-                    else:
-                        quote_char = None
-                        in_quote = False
-                elif not in_quote:
-                    query_for_check += char
-            
-            # Check for dangerous operations
-            for operation in dangerous_operations:
-                if re.search(operation, query_for_check.lower()):
-                    raise ValueError(f"Statement contains prohibited operation: {operation}")
+            for word in words:
+                if word in dangerous_operations:
+                    raise ValueError(f"Statement contains prohibited operation: {word}")
         
-        validated_statements.append(stmt)
+        validated_statements.append((stmt, tokens))
     
     return validated_statements
 
-def execute_read_query(secret_name, query, max_rows=20):
+def validate_query(query):
+    """
+    Validate query for security concerns and split into statements
+    
+    Args:
+        query (str): SQL query to validate
+    
+    Returns:
+        list: List of validated statements
+        
+    Raises:
+        ValueError: If query contains prohibited operations
+    """
+    return [stmt for stmt, _ in validate_query_statements(query)]
+
+def execute_read_query(secret_name, query, max_rows=20, result_format='rows',
+                       max_bytes=COLUMNAR_MAX_BYTES):
     """
     Execute read-only queries safely and return results with monitoring
     
@@ -1228,6 +1729,9 @@ def execute_read_query(secret_name, query, max_rows=20):
         secret_name (str): Secret containing database credentials
         query (str): SQL query to execute
         max_rows (int): Maximum number of rows to return (only for SELECT queries)
+        result_format (str): 'rows' for row dictionaries, or 'columnar' to
+            stream rows into column arrays (see fetch_columnar)
+        max_bytes (int): Result size budget across statements for 'columnar'
     
     Returns:
         dict: Query results and metadata
@@ -1242,10 +1746,12 @@ def execute_read_query(secret_name, query, max_rows=20):
     
     start_time = time.time()
     conn = None
+    bytes_used = 0
     
     try:
         # Validate and split queries
-        statements = validate_query(query)
+        validated = validate_query_statements(query)
+        statements = [stmt for stmt, _ in validated]
         
         # Connect to database
         conn = connect_to_db(secret_name)
@@ -1256,7 +1762,7 @@ def execute_read_query(secret_name, query, max_rows=20):
             cur.execute("SET statement_timeout = '30s'")
             
             # Execute each statement
-            for stmt_index, stmt in enumerate(statements, 1):
+            for stmt_index, (stmt, stmt_tokens) in enumerate(validated, 1):
                 stmt_response = {
                     'columns': [],
                     'rows': [],
@@ -1270,6 +1776,21 @@ def execute_read_query(secret_name, query, max_rows=20):
                 stmt_lower = stmt.lower().strip()
                 is_select_query = stmt_lower.lstrip('(').startswith('select')
                 
+                if result_format == 'columnar':
+                    # Stream instead of adding LIMIT and fetching everything
+                    stmt_response.update(fetch_columnar(
+                        conn, stmt,
+                        max_rows=max_rows,
+                        max_bytes=max(max_bytes - bytes_used, 0),
+                        server_side=is_select_query
+                    ))
+                    del stmt_response['rows']
+                    bytes_used += stmt_response['bytes']
+                    if is_select_query:
+                        stmt_response['complexity_metrics'] = analyze_query_complexity(stmt, stmt_tokens)
+                    response['results'].append(stmt_response)
+                    continue
+                
                 # Prepare the final query
                 final_query = stmt
                 if is_select_query and 'limit' not in stmt_lower:
@@ -1310,7 +1831,7 @@ def execute_read_query(secret_name, query, max_rows=20):
                 
                 # Add performance monitoring only for SELECT queries
                 if is_select_query:
-                    complexity_metrics = analyze_query_complexity(stmt)
+                    complexity_metrics = analyze_query_complexity(stmt, stmt_tokens)
                     stmt_response['complexity_metrics'] = complexity_metrics
                     
                     # Add complexity warnings if any
@@ -1355,7 +1876,7 @@ def execute_read_query(secret_name, query, max_rows=20):
     
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_enhanced_results(results):
     """
@@ -1619,7 +2140,7 @@ def execute_enhanced_query_diagnostics(secret_name, query):
         raise Exception(f"Failed to execute enhanced query diagnostics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def execute_performance_insights_analysis(secret_name):
     """
@@ -1702,7 +2223,7 @@ def execute_performance_insights_analysis(secret_name):
         raise Exception(f"Failed to execute performance insights analysis: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_enhanced_diagnostics_output(results):
     """Format enhanced diagnostics results for display"""
@@ -1761,6 +2282,27 @@ def lambda_handler(event, context):
             environment = event.get('environment')
             action_type = event.get('action_type')
         
+        # Captured plans are analyzed without a database
+        if action_type == 'analyze_plan':
+            plan_text = event.get('plan') if 'arguments' not in event else event['arguments'].get('plan')
+            if not plan_text:
+                return {
+                    "functionResponse": {
+                        "content": "Error: Missing required parameter 'plan' (EXPLAIN JSON output or auto_explain log)."
+                    }
+                }
+            print("Analyzing captured plans")
+            results = analyze_captured_plans(plan_text)
+            return {
+                'functionResponse': {
+                    'responseBody': {
+                        'TEXT': {
+                            'body': format_captured_plan_analyses(results)
+                        }
+                    }
+                }
+            }
+
         if not environment or not action_type:
             return {
                 "functionResponse": {
@@ -1773,9 +2315,16 @@ def lambda_handler(event, context):
 
         # Get explain plan for a query
         if action_type == 'explain_query':
-            query = event.get('query') if 'arguments' not in event else event['arguments'].get('query')
+            args = event if 'arguments' not in event else event['arguments']
+            query = args.get('query')
+            queryid = args.get('queryid')
             print("Executing explain query scripts")
-            results = analyze_query_performance(secret_name, query)
+            results = analyze_query_performance(
+                secret_name,
+                query,
+                queryid=int(queryid) if queryid not in (None, '') else None,
+                use_cache=str(args.get('use_cache', True)).lower() != 'false'
+            )
             formatted_results = format_analysis_output(results)
         elif action_type == 'extract_ddl':
             if 'arguments' in event:
@@ -1793,16 +2342,33 @@ def lambda_handler(event, context):
             formatted_results = str(results) if results else "No results found"
         elif action_type == 'execute_query':
             query = event.get('query') if 'arguments' not in event else event['arguments'].get('query')
+            result_format = (event.get('result_format') if 'arguments' not in event
+                             else event['arguments'].get('result_format')) or 'rows'
             print("Executing read-only queries")
-            results = validate_and_execute_queries(
-                secret_name,
-                query,
-                max_rows=20,
-                max_statements=5,
-                max_total_rows=1000,
-                max_complexity=15
-            )
-            formatted_results = format_enhanced_results(results)
+            if result_format == 'columnar':
+                results = validate_and_execute_queries(
+                    secret_name,
+                    query,
+                    max_rows=COLUMNAR_MAX_ROWS,
+                    max_statements=5,
+                    max_total_rows=COLUMNAR_MAX_ROWS,
+                    max_complexity=15,
+                    result_format='columnar',
+                    max_bytes=COLUMNAR_MAX_BYTES
+                )
+                formatted_results = json.dumps(results, default=str, separators=(',', ':'))
+            elif result_format == 'rows':
+                results = validate_and_execute_queries(
+                    secret_name,
+                    query,
+                    max_rows=20,
+                    max_statements=5,
+                    max_total_rows=1000,
+                    max_complexity=15
+                )
+                formatted_results = format_enhanced_results(results)
+            else:
+                raise ValueError(f"Unknown result_format '{result_format}'. Use 'rows' or 'columnar'")
         elif action_type == 'enhanced_query_diagnostics':
             query = event.get('query') if 'arguments' not in event else event['arguments'].get('query')
             print("Executing enhanced query diagnostics")
@@ -1816,7 +2382,7 @@ def lambda_handler(event, context):
             print("I'm inside else condition")
             return {
                 "functionResponse": {
-                    "content": f"Error: Unknown action_type '{action_type}'. Available actions: explain_query, extract_ddl, execute_query, enhanced_query_diagnostics, performance_insights_analysis"
+                    "content": f"Error: Unknown action_type '{action_type}'. Available actions: explain_query, analyze_plan, extract_ddl, execute_query, enhanced_query_diagnostics, performance_insights_analysis"
                 }
             }
 
@@ -1841,4 +2407,18 @@ def lambda_handler(event, context):
             "functionResponse": {
                 "content": f"Error inside the exception block: {str(e)}"
             }
-        }
\ No newline at end of file
+        }
+
+if __name__ == '__main__':
+    # Offline mode: analyze captured plans from local files without a database
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Analyze EXPLAIN (FORMAT JSON) output or auto_explain JSON logs"
+    )
+    parser.add_argument('plan_files', nargs='+', help="Files with captured JSON plans")
+    cli_args = parser.parse_args()
+    for plan_file in cli_args.plan_files:
+        with open(plan_file, encoding='utf-8') as f:
+            print(f"# {plan_file}")
+            print(format_captured_plan_analyses(analyze_captured_plans(f.read())))
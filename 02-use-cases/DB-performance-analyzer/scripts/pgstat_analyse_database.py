@@ -2,28 +2,301 @@
 import json
 import boto3
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 from botocore.exceptions import ClientError
 
-def get_secret(secret_name):
-    """Get secret from AWS Secrets Manager """
-    #secret_name = os.environ['SECRET_NAME']
-    region_name = os.environ['REGION']
-    
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name=region_name
-    )
-    
+# Module-level state survives warm Lambda invocations, so secrets, AWS clients
+# and database connections are reused instead of being set up on every call.
+SECRET_CACHE_TTL = int(os.environ.get('SECRET_CACHE_TTL', '300'))
+DB_POOL_MIN_CONNECTIONS = int(os.environ.get('DB_POOL_MIN_CONNECTIONS', '1'))
+DB_POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', '4'))
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', '10'))
+# Pooled connections idle for longer than this are pinged before reuse
+DB_VALIDATE_AFTER = int(os.environ.get('DB_VALIDATE_AFTER', '30'))
+# Seconds to wait for a free pooled connection when all are in use
+DB_POOL_WAIT = float(os.environ.get('DB_POOL_WAIT', '10'))
+
+_aws_clients = {}
+_secret_cache = {}      # secret name -> (secret, fetched at)
+_env_secret_cache = {}  # environment -> (secret name, fetched at)
+_pools = {}             # secret name -> (connection parameters, pool)
+_pools_lock = threading.Lock()
+# Per worker thread: the CancelScope its connections are registered with
+_cancel_scopes = threading.local()
+
+class PooledCursor(psycopg2.extensions.cursor):
+    """Cursor that refuses new statements once its connection was cancelled"""
+    def execute(self, query, vars=None):
+        if self.connection.cancel_requested:
+            raise psycopg2.extensions.QueryCanceledError("canceling statement due to health report timeout")
+        return super().execute(query, vars)
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its pool and when it was last used"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = PooledCursor
+        self.owner_pool = None
+        self.released_at = time.monotonic()
+        self.statement_timeout_set = False
+        self.cancel_requested = False
+
+class CancelScope:
+    """Connections checked out by a group of workers, cancelled together
+
+    Worker threads enter the scope with `with scope:`; connect_to_db()
+    registers every connection they borrow. cancel() stops the statement
+    each connection is running and makes further statements and checkouts
+    fail, so the workers give their connections back to the pool promptly.
+    """
+    def __init__(self):
+        self.cancelled = False
+        self._connections = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _cancel_scopes.current = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _cancel_scopes.current = None
+
+    def register(self, conn):
+        with self._lock:
+            if self.cancelled:
+                raise psycopg2.extensions.QueryCanceledError("canceling connection due to health report timeout")
+            self._connections.add(conn)
+
+    def unregister(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            connections = list(self._connections)
+        for conn in connections:
+            conn.cancel_requested = True
+            try:
+                conn.cancel()
+            except psycopg2.Error as e:
+                print(f"Failed to cancel a running diagnostic query: {str(e)}")
+
+def _aws_client(service_name, region_name=None):
+    """Return a cached boto3 client (clients are thread-safe, sessions are not)"""
+    key = (service_name, region_name)
+    client = _aws_clients.get(key)
+    if client is None:
+        client = boto3.session.Session().client(
+            service_name=service_name,
+            region_name=region_name
+        )
+        _aws_clients[key] = client
+    return client
+
+def get_secret(secret_name, refresh=False):
+    """Get secret from AWS Secrets Manager, cached for SECRET_CACHE_TTL seconds"""
+    cached = _secret_cache.get(secret_name)
+    if cached and not refresh and time.monotonic() - cached[1] < SECRET_CACHE_TTL:
+        return cached[0]
+
+    client = _aws_client('secretsmanager', os.environ['REGION'])
     try:
         secret_value = client.get_secret_value(SecretId=secret_name)
         secret = json.loads(secret_value['SecretString'])
-        return secret
     except ClientError as e:
         raise Exception(f"Failed to get secret: {str(e)}")
+    _secret_cache[secret_name] = (secret, time.monotonic())
+    return secret
+
+def get_env_secret(environment):
+    """Retrieve the secret name for the specified environment (cached)"""
+    cached = _env_secret_cache.get(environment)
+    if cached and time.monotonic() - cached[1] < SECRET_CACHE_TTL:
+        return cached[0]
+    secret_name = _get_env_secret_from_ssm(environment)
+    _env_secret_cache[environment] = (secret_name, time.monotonic())
+    return secret_name
+
+def _get_env_secret_from_ssm(environment):
+    """Look up the secret name for the environment in Parameter Store"""
+    ssm_client = _aws_client('ssm')
+    print("in get_env_secret")
+    if environment == 'prod':
+        print("in get_env_secret1")
+        try:
+            # Get the secret name from Parameter Store
+            print("in get_env_secret-try")
+            response = ssm_client.get_parameter(
+                Name=f'/AuroraOps/{environment}'
+            )
+            print(response['Parameter']['Value'])
+            return response['Parameter']['Value']
+        except ssm_client.exceptions.ParameterNotFound:
+            error_message = f"Parameter not found: /AuroraOps/{environment}"
+            print(error_message)
+            raise Exception(error_message)
+    elif environment == 'dev':
+        try:
+            # Get the secret name from Parameter Store
+            response = ssm_client.get_parameter(
+                Name=f'/AuroraOps/{environment}'
+            )
+            return response['Parameter']['Value']
+        except Exception as e:
+            raise Exception(f"Failed to get dev secret name from Parameter Store: {str(e)}")
+    else:
+        print("environement does not exist")
+        raise ValueError(f"Unknown environment: {environment}")
+
+def _get_pool(secret_name):
+    """Return the connection pool for a secret, rebuilding it if the credentials changed"""
+    secret = get_secret(secret_name)
+    params = {
+        'host': secret['host'],
+        'database': secret['dbname'],
+        'user': secret['username'],
+        'password': secret['password'],
+        'port': secret['port']
+    }
+    with _pools_lock:
+        current = _pools.get(secret_name)
+        if current and current[0] == params:
+            return current[1]
+        if current:
+            print(f"Credentials in {secret_name} changed, replacing its connection pool")
+            current[1].closeall()
+            del _pools[secret_name]
+        pool = psycopg2.pool.ThreadedConnectionPool(
+            DB_POOL_MIN_CONNECTIONS,
+            DB_POOL_MAX_CONNECTIONS,
+            connection_factory=PooledConnection,
+            connect_timeout=DB_CONNECT_TIMEOUT,
+            **params
+        )
+        _pools[secret_name] = (params, pool)
+        return pool
+
+def _is_usable(conn):
+    """Validate a pooled connection before handing it out again"""
+    if conn.closed:
+        return False
+    if time.monotonic() - conn.released_at < DB_VALIDATE_AFTER:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error as e:
+        print(f"Discarding stale database connection: {str(e)}")
+        return False
+
+def _getconn(pool):
+    """pool.getconn(), waiting up to DB_POOL_WAIT seconds while every connection is in use"""
+    deadline = time.monotonic() + DB_POOL_WAIT
+    while True:
+        try:
+            return pool.getconn()
+        except psycopg2.pool.PoolError:
+            # Raised for a closed pool too, which waiting does not fix
+            if pool.closed or time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+def _checkout(pool):
+    """Take a connection from the pool, replacing ones that went stale"""
+    for _ in range(DB_POOL_MAX_CONNECTIONS + 1):
+        conn = _getconn(pool)
+        if _is_usable(conn):
+            conn.owner_pool = pool
+            return conn
+        pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("No usable connection in the database connection pool")
+
+def _secret_changed(secret_name):
+    """Re-read a cached secret; returns True if it was rotated"""
+    cached = _secret_cache.get(secret_name)
+    return get_secret(secret_name, refresh=True) != (cached[0] if cached else None)
 
-def execute_slow_query(secret_name, min_exec_time):
+def connect_to_db(secret_name, statement_timeout_ms=None):
+    """Borrow a pooled database connection; return it with release_db_connection()
+
+    With statement_timeout_ms, every statement run on the connection is
+    cancelled by the server after that many milliseconds.
+    """
+    try:
+        try:
+            conn = _checkout(_get_pool(secret_name))
+        except psycopg2.OperationalError:
+            # The cached password may be stale after a secret rotation
+            if not _secret_changed(secret_name):
+                raise
+            conn = _checkout(_get_pool(secret_name))
+    except psycopg2.pool.PoolError as e:
+        raise Exception(
+            f"Failed to connect to the database: no free pooled connection after "
+            f"{DB_POOL_WAIT:.0f} seconds ({str(e)})"
+        )
+    except Exception as e:
+        raise Exception(f"Failed to connect to the database: {str(e)}")
+
+    scope = getattr(_cancel_scopes, 'current', None)
+    if scope is not None:
+        try:
+            scope.register(conn)
+        except Exception:
+            release_db_connection(conn)
+            raise
+
+    if statement_timeout_ms:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SET statement_timeout = %s", (int(statement_timeout_ms),))
+            conn.statement_timeout_set = True
+        except Exception as e:
+            release_db_connection(conn)
+            raise Exception(f"Failed to set statement timeout: {str(e)}")
+    return conn
+
+def release_db_connection(conn):
+    """Return a connection from connect_to_db() to its pool"""
+    scope = getattr(_cancel_scopes, 'current', None)
+    if scope is not None:
+        scope.unregister(conn)
+    pool = getattr(conn, 'owner_pool', None)
+    if pool is None:
+        conn.close()
+        return
+    conn.owner_pool = None
+    # A cancel request may still be in flight; never hand the connection out again
+    broken = bool(conn.closed) or conn.cancel_requested
+    if not broken:
+        try:
+            # Also undoes transaction-scoped settings such as READ ONLY and statement_timeout
+            conn.rollback()
+            if conn.statement_timeout_set:
+                # A commit after SET keeps it for the session
+                with conn.cursor() as cur:
+                    cur.execute("RESET statement_timeout")
+                conn.commit()
+                conn.statement_timeout_set = False
+        except psycopg2.Error:
+            broken = True
+    conn.released_at = time.monotonic()
+    try:
+        pool.putconn(conn, close=broken)
+    except psycopg2.pool.PoolError:
+        # The pool was closed after a credential change
+        conn.close()
+
+def execute_slow_query(secret_name, min_exec_time, statement_timeout_ms=None):
     """Execute enhanced slow query analysis based on runbooks.py diagnostics"""
     queries = {
         "active_slow_queries": """
@@ -153,7 +426,7 @@ def execute_slow_query(secret_name, min_exec_time):
     print("Connecting to the database...")
     conn = None
     try:
-        conn = connect_to_db(secret_name)
+        conn = connect_to_db(secret_name, statement_timeout_ms)
         print("Connected to the database.")
     
         # First, ensure pg_stat_statements is installed
@@ -185,7 +458,7 @@ def execute_slow_query(secret_name, min_exec_time):
         raise Exception(f"Failed to retrieve slow queries: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_slow_query(results):
     """Format results in a human-readable string"""
@@ -361,7 +634,7 @@ def execute_connect_issues(secret_name, min_exec_time):
         raise Exception(f"Failed to retrieve connection metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_conn_issues(results):
     """Format connection management results in a human-readable string"""
@@ -435,7 +708,7 @@ def format_results_for_conn_issues(results):
     
     return output
 
-def execute_index_analysis(secret_name):
+def execute_index_analysis(secret_name, statement_timeout_ms=None):
     """Execute index-related analysis queries"""
     queries = {
         "unused_indexes": """
@@ -479,7 +752,7 @@ def execute_index_analysis(secret_name):
     
     conn = None
     try:
-        conn = connect_to_db(secret_name)
+        conn = connect_to_db(secret_name, statement_timeout_ms)
         # First, ensure pg_stat_statements is installed
         
         with conn.cursor() as cur:
@@ -509,7 +782,7 @@ def execute_index_analysis(secret_name):
         raise Exception(f"Failed to retrieve index metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
     
 def format_results_for_index_analysis(results):
     """Format index analysis results in a human-readable string"""
@@ -562,7 +835,7 @@ def format_results_for_index_analysis(results):
     
     return output
 
-def execute_autovacuum_analysis(secret_name):
+def execute_autovacuum_analysis(secret_name, statement_timeout_ms=None):
     """Execute enhanced autovacuum-related analysis queries based on runbooks.py diagnostics"""
     queries = {
         "current_vacuum_progress": """
@@ -694,7 +967,7 @@ def execute_autovacuum_analysis(secret_name):
     
     conn = None
     try:
-        conn = connect_to_db(secret_name)
+        conn = connect_to_db(secret_name, statement_timeout_ms)
         # First, ensure pg_stat_statements is installed
         
         with conn.cursor() as cur:
@@ -724,7 +997,7 @@ def execute_autovacuum_analysis(secret_name):
         raise Exception(f"Failed to retrieve autovacuum metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_autovacuum_analysis(results):
     """Format autovacuum analysis results in a human-readable string"""
@@ -794,7 +1067,7 @@ def format_results_for_autovacuum_analysis(results):
     
     return output
 
-def execute_io_analysis(secret_name):
+def execute_io_analysis(secret_name, statement_timeout_ms=None):
     """Execute I/O-related analysis queries"""
     queries = {
         "buffer_usage": """
@@ -840,7 +1113,7 @@ def execute_io_analysis(secret_name):
         """
     }
     
-    conn = connect_to_db(secret_name)
+    conn = connect_to_db(secret_name, statement_timeout_ms)
     try:
         # First, ensure pg_stat_statements is installed
         
@@ -870,7 +1143,7 @@ def execute_io_analysis(secret_name):
         raise Exception(f"Failed to retrieve I/O metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_io_analysis(results):
     """Format I/O analysis results in a human-readable string"""
@@ -942,7 +1215,7 @@ def format_results_for_io_analysis(results):
     
     return output
 
-def execute_replication_analysis(secret_name):
+def execute_replication_analysis(secret_name, statement_timeout_ms=None):
     """Execute replication-related analysis queries"""
     queries = {
         "aurora_replica_status": """
@@ -981,7 +1254,7 @@ def execute_replication_analysis(secret_name):
         """
     }
     
-    conn = connect_to_db(secret_name)
+    conn = connect_to_db(secret_name, statement_timeout_ms)
     try:
         # First, ensure pg_stat_statements is installed
         
@@ -1010,7 +1283,7 @@ def execute_replication_analysis(secret_name):
         raise Exception(f"Failed to retrieve replication metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_replication_analysis(results):
     """Format replication analysis results in a human-readable string"""
@@ -1161,7 +1434,7 @@ def execute_system_health(secret_name):
         raise Exception(f"Failed to retrieve system health metrics: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_system_health(results):
     """Format system health analysis results in a human-readable string"""
@@ -1255,54 +1528,6 @@ def format_results_for_system_health(results):
     
     return output
 
-def connect_to_db(secret_name):
-    """Establish database connection"""
-    cur_secret = secret_name
-    secret = get_secret(cur_secret)
-    try:
-        print("in connect_to_db")
-        conn = psycopg2.connect(
-            host=secret['host'],
-            database=secret['dbname'],
-            user=secret['username'],
-            password=secret['password'],
-            port=secret['port']
-        )
-        return conn
-    except Exception as e:
-        raise Exception(f"Failed to connect to the database: {str(e)}")
-
-def get_env_secret(environment):
-    ssm_client = boto3.client('ssm')
-    print("in get_env_secret")
-    """Retrieve the secret name for the specified environment"""
-    if environment == 'prod':
-        print("in get_env_secret1")
-        try:
-            # Get the secret name from Parameter Store
-            print("in get_env_secret-try")
-            response = ssm_client.get_parameter(
-                Name=f'/AuroraOps/{environment}'
-            )
-            print(response['Parameter']['Value'])
-            return response['Parameter']['Value']
-        except ssm_client.exceptions.ParameterNotFound:
-            error_message = f"Parameter not found: /AuroraOps/{environment}"
-            print(error_message)
-            raise Exception(error_message)
-    elif environment == 'dev':
-        try:
-            # Get the secret name from Parameter Store
-            response = ssm_client.get_parameter(
-                Name=f'/AuroraOps/{environment}'
-            )
-            return response['Parameter']['Value']
-        except Exception as e:
-            raise Exception(f"Failed to get dev secret name from Parameter Store: {str(e)}")
-    else:
-        print("environement does not exist")
-        raise ValueError(f"Unknown environment: {environment}")
-
 def execute_vacuum_progress_analysis(secret_name):
     """Execute current vacuum progress analysis based on runbooks.py"""
     query = """
@@ -1338,9 +1563,9 @@ def execute_vacuum_progress_analysis(secret_name):
         raise Exception(f"Failed to retrieve vacuum progress: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-def execute_xid_analysis(secret_name):
+def execute_xid_analysis(secret_name, statement_timeout_ms=None):
     """Execute XID wraparound analysis based on runbooks.py"""
     queries = {
         "oldest_xid_all_databases": """
@@ -1381,7 +1606,7 @@ def execute_xid_analysis(secret_name):
     
     conn = None
     try:
-        conn = connect_to_db(secret_name)
+        conn = connect_to_db(secret_name, statement_timeout_ms)
         results = {}
         
         for query_name, query in queries.items():
@@ -1400,9 +1625,9 @@ def execute_xid_analysis(secret_name):
         raise Exception(f"Failed to retrieve XID analysis: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-def execute_bloat_analysis(secret_name):
+def execute_bloat_analysis(secret_name, statement_timeout_ms=None):
     """Execute table and index bloat analysis based on runbooks.py"""
     query = """
         -- Table and index bloat analysis (from runbooks.py)
@@ -1464,7 +1689,7 @@ def execute_bloat_analysis(secret_name):
     
     conn = None
     try:
-        conn = connect_to_db(secret_name)
+        conn = connect_to_db(secret_name, statement_timeout_ms)
         with conn.cursor() as cur:
             cur.execute(query)
             columns = [desc[0] for desc in cur.description]
@@ -1474,9 +1699,9 @@ def execute_bloat_analysis(secret_name):
         raise Exception(f"Failed to retrieve bloat analysis: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-def execute_long_running_transactions(secret_name):
+def execute_long_running_transactions(secret_name, statement_timeout_ms=None):
     """Execute long-running transaction analysis based on runbooks.py"""
     query = """
         -- Long-running transactions (from runbooks.py)
@@ -1494,7 +1719,7 @@ def execute_long_running_transactions(secret_name):
     
     conn = None
     try:
-        conn = connect_to_db(secret_name)
+        conn = connect_to_db(secret_name, statement_timeout_ms)
         with conn.cursor() as cur:
             cur.execute(query)
             columns = [desc[0] for desc in cur.description]
@@ -1504,7 +1729,7 @@ def execute_long_running_transactions(secret_name):
         raise Exception(f"Failed to retrieve long-running transactions: {str(e)}")
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 def format_results_for_vacuum_progress(results):
     """Format vacuum progress results for display"""
@@ -1596,6 +1821,377 @@ def format_results_for_long_running_transactions(results):
     
     return output
 
+# Settings for the full_health_report action
+HEALTH_REPORT_STATEMENT_TIMEOUT_MS = int(os.environ.get('HEALTH_REPORT_STATEMENT_TIMEOUT_MS', '15000'))
+HEALTH_REPORT_TIMEOUT = int(os.environ.get('HEALTH_REPORT_TIMEOUT', '120'))
+# Seconds cancelled diagnostics get to return their connections to the pool
+HEALTH_REPORT_CANCEL_GRACE = int(os.environ.get('HEALTH_REPORT_CANCEL_GRACE', '5'))
+
+# Diagnostics run by full_health_report: (name, execute function, format function)
+HEALTH_REPORT_DIAGNOSTICS = [
+    ('slow_query', lambda secret_name, timeout_ms: execute_slow_query(secret_name, 1000, timeout_ms),
+     format_results_for_slow_query),
+    ('index_analysis', execute_index_analysis, format_results_for_index_analysis),
+    ('autovacuum_analysis', execute_autovacuum_analysis, format_results_for_autovacuum_analysis),
+    ('io_analysis', execute_io_analysis, format_results_for_io_analysis),
+    ('replication_analysis', execute_replication_analysis, format_results_for_replication_analysis),
+    ('xid_analysis', execute_xid_analysis, format_results_for_xid_analysis),
+    ('bloat_analysis', execute_bloat_analysis, format_results_for_bloat_analysis),
+    ('long_running_transactions', execute_long_running_transactions,
+     format_results_for_long_running_transactions),
+]
+
+def _run_diagnostic(execute, secret_name, statement_timeout_ms, scope):
+    """Run one diagnostic; returns (results, elapsed seconds)"""
+    started = time.monotonic()
+    with scope:
+        if scope.cancelled:
+            raise psycopg2.extensions.QueryCanceledError("health report timed out before the diagnostic started")
+        results = execute(secret_name, statement_timeout_ms)
+    return results, time.monotonic() - started
+
+def execute_full_health_report(secret_name, timeout=HEALTH_REPORT_TIMEOUT,
+                               statement_timeout_ms=HEALTH_REPORT_STATEMENT_TIMEOUT_MS):
+    """Run the health report diagnostics concurrently on pooled connections
+
+    Each diagnostic gets its own connection, at most DB_POOL_MAX_CONNECTIONS
+    at a time, and every statement is limited to statement_timeout_ms.
+    Diagnostics still running after `timeout` seconds are reported as timed
+    out instead of failing the whole report. Their queries are cancelled and
+    they get HEALTH_REPORT_CANCEL_GRACE seconds to hand their connections
+    back, so a warm invocation does not find the pool still checked out.
+    """
+    started = time.monotonic()
+    report = {
+        'snapshot_time': datetime.now(timezone.utc).isoformat(),
+        'diagnostics': {}
+    }
+    workers = max(1, min(len(HEALTH_REPORT_DIAGNOSTICS), DB_POOL_MAX_CONNECTIONS))
+    scope = CancelScope()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='health-report')
+    try:
+        futures = {
+            executor.submit(_run_diagnostic, execute, secret_name, statement_timeout_ms, scope): name
+            for name, execute, _ in HEALTH_REPORT_DIAGNOSTICS
+        }
+        done, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            # Diagnostics that have not started are dropped; running ones
+            # have their queries cancelled and release their connections
+            for future in not_done:
+                future.cancel()
+            scope.cancel()
+            _, still_running = wait(not_done, timeout=HEALTH_REPORT_CANCEL_GRACE)
+            if still_running:
+                print(f"{len(still_running)} health report diagnostics did not stop within "
+                      f"{HEALTH_REPORT_CANCEL_GRACE} seconds of being cancelled")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for future, name in futures.items():
+        if future not in done:
+            report['diagnostics'][name] = {
+                'status': 'timeout',
+                'error': f"Did not finish within {timeout:.0f} seconds"
+            }
+            continue
+        try:
+            results, elapsed = future.result()
+            report['diagnostics'][name] = {'status': 'ok', 'results': results, 'elapsed': elapsed}
+        except Exception as e:
+            report['diagnostics'][name] = {'status': 'error', 'error': str(e)}
+    report['elapsed'] = time.monotonic() - started
+    return report
+
+def format_results_for_full_health_report(report):
+    """Format the combined health report for display"""
+    diagnostics = report['diagnostics']
+    completed = sum(1 for d in diagnostics.values() if d['status'] == 'ok')
+    output = "=== FULL DATABASE HEALTH REPORT ===\n"
+    output += f"Snapshot time: {report['snapshot_time']}\n"
+    output += f"Completed {completed} of {len(diagnostics)} diagnostics in {report['elapsed']:.1f} seconds\n"
+
+    output += "\nDiagnostic Summary:\n"
+    for name, _, _ in HEALTH_REPORT_DIAGNOSTICS:
+        diagnostic = diagnostics[name]
+        if diagnostic['status'] == 'ok':
+            output += f"• {name}: ok ({diagnostic['elapsed']:.2f}s)\n"
+        else:
+            output += f"• {name}: {diagnostic['status']} - {diagnostic['error']}\n"
+
+    for name, _, format_results in HEALTH_REPORT_DIAGNOSTICS:
+        diagnostic = diagnostics[name]
+        if diagnostic['status'] != 'ok':
+            continue
+        try:
+            output += "\n\n" + format_results(diagnostic['results'])
+        except Exception as e:
+            output += f"\n\nFailed to format {name} results: {str(e)}\n"
+    return output
+
+# Settings for the stat_sampling action. Cumulative counters say little about
+# current load, so the sampler diffs snapshots taken a few seconds apart.
+STAT_SAMPLE_INTERVAL = int(os.environ.get('STAT_SAMPLE_INTERVAL', '10'))
+STAT_SAMPLE_MAX_SAMPLES = int(os.environ.get('STAT_SAMPLE_MAX_SAMPLES', '6'))
+
+STAT_SNAPSHOT_QUERIES = {
+    "statements": """
+        SELECT s.userid, s.dbid, s.queryid, left(s.query, 500) AS query, s.calls, s.rows,
+               -- total_exec_time since PostgreSQL 13, total_time before
+               COALESCE((to_jsonb(s) ->> 'total_exec_time')::float8,
+                        (to_jsonb(s) ->> 'total_time')::float8) AS total_exec_time,
+               s.shared_blks_hit, s.shared_blks_read
+        FROM pg_stat_statements s
+        JOIN pg_database d ON d.oid = s.dbid
+        WHERE d.datname = current_database();
+    """,
+    "tables": """
+        SELECT t.relid, t.schemaname, t.relname,
+               COALESCE(t.seq_scan, 0) AS seq_scan, COALESCE(t.seq_tup_read, 0) AS seq_tup_read,
+               COALESCE(t.idx_scan, 0) AS idx_scan, COALESCE(t.idx_tup_fetch, 0) AS idx_tup_fetch,
+               t.n_tup_ins, t.n_tup_upd, t.n_tup_del,
+               COALESCE(io.heap_blks_read, 0) AS heap_blks_read, COALESCE(io.heap_blks_hit, 0) AS heap_blks_hit,
+               COALESCE(io.idx_blks_read, 0) AS idx_blks_read, COALESCE(io.idx_blks_hit, 0) AS idx_blks_hit
+        FROM pg_stat_user_tables t
+        JOIN pg_statio_user_tables io USING (relid);
+    """,
+    "database": """
+        SELECT datname, xact_commit, xact_rollback, blks_read, blks_hit,
+               tup_returned, tup_fetched, tup_inserted, tup_updated, tup_deleted
+        FROM pg_stat_database
+        WHERE datname = current_database();
+    """
+}
+
+STATEMENT_COUNTERS = ('calls', 'total_exec_time', 'rows', 'shared_blks_hit', 'shared_blks_read')
+TABLE_COUNTERS = ('seq_scan', 'seq_tup_read', 'idx_scan', 'idx_tup_fetch', 'n_tup_ins', 'n_tup_upd',
+                  'n_tup_del', 'heap_blks_read', 'heap_blks_hit', 'idx_blks_read', 'idx_blks_hit')
+DATABASE_COUNTERS = ('xact_commit', 'xact_rollback', 'blks_read', 'blks_hit', 'tup_returned',
+                     'tup_fetched', 'tup_inserted', 'tup_updated', 'tup_deleted')
+# Ranking keys for statements: per-second delta of these counters
+STATEMENT_RANKINGS = {
+    'exec_time': 'total_exec_time',
+    'calls': 'calls',
+    'rows': 'rows',
+    'blks_read': 'shared_blks_read',
+    'blks_hit': 'shared_blks_hit'
+}
+
+def take_stat_snapshot(secret_name, statement_timeout_ms=None):
+    """Read the cumulative pg_stat_statements and pg_stat_* counters once
+
+    Each snapshot uses its own transaction, since statistics are cached
+    for the duration of a transaction. A view that cannot be read (e.g.
+    pg_stat_statements not installed) is recorded as an error.
+    """
+    conn = None
+    try:
+        conn = connect_to_db(secret_name, statement_timeout_ms)
+        snapshot = {'errors': {}}
+        with conn.cursor() as cur:
+            cur.execute("SELECT extract(epoch FROM clock_timestamp())::float8")
+            snapshot['captured_at'] = cur.fetchone()[0]
+            for name, query in STAT_SNAPSHOT_QUERIES.items():
+                cur.execute("SAVEPOINT stat_snapshot")
+                try:
+                    cur.execute(query)
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT stat_snapshot")
+                    snapshot[name] = []
+                    snapshot['errors'][name] = str(e).strip()
+                    continue
+                columns = [desc[0] for desc in cur.description]
+                snapshot[name] = [dict(zip(columns, row)) for row in cur.fetchall()]
+        snapshot['database'] = snapshot['database'][0] if snapshot['database'] else {}
+        return snapshot
+    except Exception as e:
+        raise Exception(f"Failed to take statistics snapshot: {str(e)}")
+    finally:
+        if conn:
+            release_db_connection(conn)
+
+def collect_stat_snapshots(secret_name, interval_seconds=10, samples=2):
+    """Take `samples` snapshots `interval_seconds` apart"""
+    snapshots = [take_stat_snapshot(secret_name)]
+    for _ in range(samples - 1):
+        time.sleep(interval_seconds)
+        snapshots.append(take_stat_snapshot(secret_name))
+    return snapshots
+
+def load_stat_snapshots(text):
+    """Parse snapshots saved as a JSON list (or one snapshot per line)"""
+    text = text.strip()
+    if text.startswith('['):
+        snapshots = json.loads(text)
+    else:
+        snapshots = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if len(snapshots) < 2:
+        raise ValueError("At least two snapshots are needed to compute rates")
+    return sorted(snapshots, key=lambda snapshot: snapshot['captured_at'])
+
+def _counter_deltas(before, after, counters):
+    """Counter deltas; a counter that went backwards was reset in between"""
+    deltas = {}
+    reset = False
+    for counter in counters:
+        current = after.get(counter) or 0
+        previous = (before or {}).get(counter) or 0
+        delta = current - previous
+        if delta < 0:
+            delta, reset = current, True
+        deltas[counter] = delta
+    return deltas, reset
+
+def _accumulate_deltas(snapshots, section, key_fields, counters):
+    """
+    Sum counter deltas over consecutive snapshots, per row key
+    
+    Summing interval by interval keeps the activity before a stats reset
+    (or before pg_stat_statements evicted an entry) that a plain
+    first-to-last difference would lose. Rows first seen after the first
+    snapshot count from zero.
+    """
+    totals = {}  # key -> [latest row, summed deltas, reset seen]
+    for before, after in zip(snapshots, snapshots[1:]):
+        before_by_key = {tuple(row[field] for field in key_fields): row
+                         for row in before.get(section) or []}
+        for row in after.get(section) or []:
+            key = tuple(row[field] for field in key_fields)
+            deltas, reset = _counter_deltas(before_by_key.get(key), row, counters)
+            entry = totals.setdefault(key, [row, dict.fromkeys(counters, 0), False])
+            entry[0] = row
+            for counter, delta in deltas.items():
+                entry[1][counter] += delta
+            entry[2] = entry[2] or reset
+    return totals.values()
+
+def diff_stat_snapshots(snapshots, rank_by='exec_time', top_n=10):
+    """
+    Compute per-second rates across the snapshots and rank statements and
+    tables by their activity within the window
+    
+    Statements are ranked by the per-second delta selected with rank_by
+    (exec_time, calls, rows, blks_read or blks_hit). Tables are ranked by
+    tuples touched per second. With more than two snapshots, database-wide
+    rates are also reported per interval.
+    """
+    if rank_by not in STATEMENT_RANKINGS:
+        raise ValueError(f"Unknown rank_by '{rank_by}'. Use one of: {', '.join(STATEMENT_RANKINGS)}")
+    if len(snapshots) < 2:
+        raise ValueError("At least two snapshots are needed to compute rates")
+    elapsed = snapshots[-1]['captured_at'] - snapshots[0]['captured_at']
+    if elapsed <= 0:
+        raise ValueError("Snapshots must be taken at different times")
+
+    statements = []
+    for row, deltas, reset in _accumulate_deltas(snapshots, 'statements',
+                                                 ('userid', 'dbid', 'queryid'), STATEMENT_COUNTERS):
+        if deltas['calls'] <= 0 and deltas['total_exec_time'] <= 0:
+            continue
+        statements.append({
+            'queryid': row['queryid'],
+            'query': row['query'],
+            'rates': {counter: delta / elapsed for counter, delta in deltas.items()},
+            'mean_exec_time_ms': deltas['total_exec_time'] / deltas['calls'] if deltas['calls'] else None,
+            'counters_reset': reset
+        })
+    statements.sort(key=lambda s: s['rates'][STATEMENT_RANKINGS[rank_by]], reverse=True)
+
+    tables = []
+    for row, deltas, reset in _accumulate_deltas(snapshots, 'tables', ('relid',), TABLE_COUNTERS):
+        rates = {counter: delta / elapsed for counter, delta in deltas.items()}
+        tuples = (rates['seq_tup_read'] + rates['idx_tup_fetch'] + rates['n_tup_ins']
+                  + rates['n_tup_upd'] + rates['n_tup_del'])
+        if tuples <= 0 and rates['heap_blks_read'] <= 0:
+            continue
+        tables.append({
+            'table': f"{row['schemaname']}.{row['relname']}",
+            'tuples_per_sec': tuples,
+            'rates': rates,
+            'counters_reset': reset
+        })
+    tables.sort(key=lambda t: t['tuples_per_sec'], reverse=True)
+
+    intervals = []
+    database_rates = dict.fromkeys(DATABASE_COUNTERS, 0)
+    for before, after in zip(snapshots, snapshots[1:]):
+        interval = after['captured_at'] - before['captured_at']
+        deltas, reset = _counter_deltas(before.get('database'), after.get('database') or {},
+                                        DATABASE_COUNTERS)
+        for counter, delta in deltas.items():
+            database_rates[counter] += delta / elapsed
+        if interval > 0:
+            intervals.append({
+                'seconds': interval,
+                'rates': {counter: delta / interval for counter, delta in deltas.items()},
+                'counters_reset': reset
+            })
+
+    errors = {}
+    for snapshot in snapshots:
+        errors.update(snapshot.get('errors') or {})
+    return {
+        'window_seconds': elapsed,
+        'snapshots': len(snapshots),
+        'rank_by': rank_by,
+        'database': database_rates,
+        'intervals': intervals if len(intervals) > 1 else [],
+        'statements': statements[:top_n],
+        'active_statements': len(statements),
+        'tables': tables[:top_n],
+        'errors': errors
+    }
+
+def format_results_for_stat_sampling(results):
+    """Format snapshot diff results for display"""
+    output = "=== CURRENT LOAD (SNAPSHOT DIFF) ===\n"
+    output += f"Window: {results['window_seconds']:.1f} seconds across {results['snapshots']} snapshots\n"
+
+    db = results['database']
+    reads = db['blks_read'] + db['blks_hit']
+    output += "\nDatabase Rates (per second):\n"
+    output += f"• Commits: {db['xact_commit']:.1f}, Rollbacks: {db['xact_rollback']:.1f}\n"
+    output += f"• Blocks read: {db['blks_read']:.1f}, Blocks hit: {db['blks_hit']:.1f}"
+    output += f" (cache hit ratio {100 * db['blks_hit'] / reads:.1f}%)\n" if reads else "\n"
+    output += (f"• Tuples returned: {db['tup_returned']:.1f}, fetched: {db['tup_fetched']:.1f}, "
+               f"inserted: {db['tup_inserted']:.1f}, updated: {db['tup_updated']:.1f}, "
+               f"deleted: {db['tup_deleted']:.1f}\n")
+
+    if results['intervals']:
+        output += "\nPer Interval:\n"
+        for idx, interval in enumerate(results['intervals'], 1):
+            rates = interval['rates']
+            output += (f"• #{idx} ({interval['seconds']:.1f}s): {rates['xact_commit']:.1f} commits/s, "
+                       f"{rates['blks_read']:.1f} blocks read/s, {rates['tup_returned']:.1f} tuples returned/s\n")
+
+    output += f"\nTop Statements by {results['rank_by']} ({results['active_statements']} active in window):\n"
+    if not results['statements']:
+        output += "No statement activity captured.\n"
+    for idx, stmt in enumerate(results['statements'], 1):
+        rates = stmt['rates']
+        output += f"\nStatement #{idx} (queryid {stmt['queryid']}):\n"
+        output += f"• Calls/sec: {rates['calls']:.2f}\n"
+        output += f"• Exec time: {rates['total_exec_time']:.1f} ms/sec"
+        output += f" (mean {stmt['mean_exec_time_ms']:.2f} ms)\n" if stmt['mean_exec_time_ms'] is not None else "\n"
+        output += f"• Rows/sec: {rates['rows']:.1f}\n"
+        output += f"• Shared blocks read/sec: {rates['shared_blks_read']:.1f}, hit/sec: {rates['shared_blks_hit']:.1f}\n"
+        if stmt['counters_reset']:
+            output += "• Note: statistics were reset during the window\n"
+        output += f"• Query: {' '.join(stmt['query'].split())[:200]}\n"
+
+    output += "\nTop Tables by Tuples Touched:\n"
+    if not results['tables']:
+        output += "No table activity captured.\n"
+    for table in results['tables']:
+        rates = table['rates']
+        output += (f"• {table['table']}: {table['tuples_per_sec']:.1f} tuples/s "
+                   f"(seq scans {rates['seq_scan']:.2f}/s, index scans {rates['idx_scan']:.2f}/s, "
+                   f"heap blocks read {rates['heap_blks_read']:.1f}/s)\n")
+
+    for name, error in results['errors'].items():
+        output += f"\n⚠️ Could not read {name}: {error}\n"
+    return output
+
 def lambda_handler(event, context):
     try:
         print(f"Received event: {json.dumps(event)}")
@@ -1610,7 +2206,23 @@ def lambda_handler(event, context):
             # Use the flat structure
             environment = event.get('environment')
             action_type = event.get('action_type')
+        params = event['arguments'] if 'arguments' in event else event
         
+        # Saved snapshots are diffed without a database
+        if action_type == 'stat_sampling' and params.get('snapshots'):
+            print("Diffing saved statistics snapshots")
+            results = diff_stat_snapshots(load_stat_snapshots(params['snapshots']),
+                                          rank_by=params.get('rank_by') or 'exec_time')
+            return {
+                'functionResponse': {
+                    'responseBody': {
+                        'TEXT': {
+                            'body': format_results_for_stat_sampling(results)
+                        }
+                    }
+                }
+            }
+
         if not environment or not action_type:
             return {
                 "functionResponse": {
@@ -1670,10 +2282,35 @@ def lambda_handler(event, context):
             print("Executing long-running transactions analysis")
             results = execute_long_running_transactions(secret_name)
             formatted_output = format_results_for_long_running_transactions(results)
+        elif action_type == 'full_health_report':
+            print("Executing full health report")
+            timeout = HEALTH_REPORT_TIMEOUT
+            if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+                # Leave time to cancel leftover diagnostics, then format and return the report
+                timeout = min(timeout, context.get_remaining_time_in_millis() / 1000 - 5 - HEALTH_REPORT_CANCEL_GRACE)
+            results = execute_full_health_report(secret_name, timeout=max(timeout, 1))
+            formatted_output = format_results_for_full_health_report(results)
+        elif action_type == 'stat_snapshot':
+            print("Taking statistics snapshot")
+            # Returned as JSON so it can be saved and diffed later
+            formatted_output = json.dumps(take_stat_snapshot(secret_name))
+        elif action_type == 'stat_sampling':
+            interval = float(params.get('interval_seconds') or STAT_SAMPLE_INTERVAL)
+            samples = min(max(int(params.get('samples') or 2), 2), STAT_SAMPLE_MAX_SAMPLES)
+            if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+                # Shrink the interval so every snapshot fits in the invocation
+                budget = context.get_remaining_time_in_millis() / 1000 - 15
+                interval = min(interval, budget / (samples - 1))
+            if interval <= 0:
+                raise ValueError("Not enough time left in the invocation to sample statistics")
+            print(f"Sampling statistics: {samples} snapshots {interval:.1f} seconds apart")
+            snapshots = collect_stat_snapshots(secret_name, interval, samples)
+            results = diff_stat_snapshots(snapshots, rank_by=params.get('rank_by') or 'exec_time')
+            formatted_output = format_results_for_stat_sampling(results)
         else:
             return {
                 "functionResponse": {
-                    "content": f"Error: Unknown action_type '{action_type}'. Available actions: slow_query, connection_management_issues, index_analysis, autovacuum_analysis, io_analysis, replication_analysis, system_health, vacuum_progress, xid_analysis, bloat_analysis, long_running_transactions"
+                    "content": f"Error: Unknown action_type '{action_type}'. Available actions: slow_query, connection_management_issues, index_analysis, autovacuum_analysis, io_analysis, replication_analysis, system_health, vacuum_progress, xid_analysis, bloat_analysis, long_running_transactions, full_health_report, stat_snapshot, stat_sampling"
                 }
             }
 
@@ -1698,4 +2335,19 @@ def lambda_handler(event, context):
             "functionResponse": {
                 "content": f"Error analyzing slow queries: {str(e)}"
             }
-        }
\ No newline at end of file
+        }
+
+if __name__ == '__main__':
+    # Offline mode: diff snapshots saved from the stat_snapshot action
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compute per-second pg_stat deltas from saved stat_snapshot output"
+    )
+    parser.add_argument('snapshot_file', help="JSON list of snapshots, or one snapshot per line")
+    parser.add_argument('--rank-by', default='exec_time', choices=sorted(STATEMENT_RANKINGS))
+    parser.add_argument('--top', type=int, default=10)
+    cli_args = parser.parse_args()
+    with open(cli_args.snapshot_file, encoding='utf-8') as f:
+        snapshots = load_stat_snapshots(f.read())
+    print(format_results_for_stat_sampling(diff_stat_snapshots(snapshots, cli_args.rank_by, cli_args.top)))
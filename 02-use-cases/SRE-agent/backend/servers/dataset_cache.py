@@ -0,0 +1,116 @@
+"""Process-wide cache for the JSON datasets served by the demo API servers.
+
+Each file is decoded once and kept in memory; later requests only `stat` the
+file and reuse the decoded value until its mtime or size changes. Values
+derived from a dataset (indexes, parsed views) can be cached alongside it
+with `load_derived` and are dropped together with the dataset on reload.
+
+Cached values are shared between requests and must be treated as read-only.
+
+If `orjson` is installed it is used for decoding, and files larger than
+MMAP_THRESHOLD_BYTES are memory-mapped and decoded without an extra copy.
+"""
+
+import json
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+T = TypeVar("T")
+
+
+def _decode_file(file_path: Path, size: int) -> Any:
+    """Read and decode one JSON file using the fastest available path"""
+    with open(file_path, "rb") as f:
+        if orjson is None:
+            return json.loads(f.read())
+        if size < MMAP_THRESHOLD_BYTES:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+
+class _CacheEntry:
+    def __init__(self, signature: Tuple[int, int], data: Any) -> None:
+        self.signature = signature
+        self.data = data
+        self.derived: Dict[str, Any] = {}
+
+
+class DatasetCache:
+    """Decoded JSON files keyed by path, invalidated by mtime/size"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+        # One lock per file so concurrent first loads decode it only once
+        self._file_locks: Dict[str, threading.Lock] = {}
+
+    def _file_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._file_locks.setdefault(key, threading.Lock())
+
+    def _entry(self, file_path: Path) -> _CacheEntry:
+        key = str(file_path)
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry
+
+        with self._file_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                return entry
+
+            entry = _CacheEntry(signature, _decode_file(file_path, stat.st_size))
+            self._entries[key] = entry
+            logger.info(f"Loaded dataset {file_path} ({stat.st_size} bytes)")
+            return entry
+
+    def load(self, file_path: Path) -> Any:
+        """Decoded contents of a JSON file"""
+        return self._entry(file_path).data
+
+    def load_derived(self, file_path: Path, name: str, build: Callable[[Any], T]) -> T:
+        """Value computed by `build` from a dataset, cached per dataset version"""
+        entry = self._entry(file_path)
+        try:
+            return entry.derived[name]
+        except KeyError:
+            pass
+        with self._file_lock(str(file_path)):
+            if name not in entry.derived:
+                entry.derived[name] = build(entry.data)
+            return entry.derived[name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = DatasetCache()
+
+
+def load_json(file_path: Path) -> Any:
+    """Decoded contents of a JSON file from the shared dataset cache"""
+    return _default_cache.load(file_path)
+
+
+def load_derived(file_path: Path, name: str, build: Callable[[Any], T]) -> T:
+    """Value derived from a JSON file, cached in the shared dataset cache"""
+    return _default_cache.load_derived(file_path, name, build)
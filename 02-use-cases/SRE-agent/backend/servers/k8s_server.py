@@ -1,10 +1,9 @@
-import json
 import logging
-from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional
 
+from dataset_cache import load_json
 from fastapi import (
     Depends,
     FastAPI,
@@ -14,6 +13,7 @@ from fastapi import (
 )
 from pydantic import BaseModel, Field
 from retrieve_api_key import retrieve_api_key
+from time_series import load_series, parse_query_time
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -50,46 +50,6 @@ def _validate_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     return x_api_key
 
 
-def _parse_timestamp(timestamp_str: str) -> datetime:
-    """Parse ISO timestamp string to datetime object"""
-    try:
-        # Handle both with and without timezone
-        if timestamp_str.endswith("Z"):
-            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        elif "+" in timestamp_str or timestamp_str.endswith("0"):
-            return datetime.fromisoformat(timestamp_str)
-        else:
-            return datetime.fromisoformat(timestamp_str + "+00:00")
-    except:
-        # Fallback: assume current time if parsing fails
-        return datetime.now(timezone.utc)
-
-
-def _filter_events_by_time(events: list, since: Optional[str] = None) -> list:
-    """Filter events by since timestamp"""
-    if not since:
-        return events
-
-    filtered_events = []
-    since_dt = _parse_timestamp(since)
-
-    for event in events:
-        event_timestamp = event.get("timestamp")
-        if not event_timestamp:
-            continue
-
-        try:
-            event_dt = _parse_timestamp(event_timestamp)
-
-            if event_dt >= since_dt:
-                filtered_events.append(event)
-        except:
-            # Include events with unparseable timestamps
-            filtered_events.append(event)
-
-    return filtered_events
-
-
 # Pydantic Models
 class PodStatus(str, Enum):
     """Pod status enumeration"""
@@ -249,8 +209,7 @@ async def get_pod_status(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "pods.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "pods.json")
 
         pods = data.get("pods", [])
 
@@ -296,8 +255,7 @@ async def get_deployment_status(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "deployments.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "deployments.json")
 
         deployments = data.get("deployments", [])
 
@@ -345,17 +303,14 @@ async def get_cluster_events(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "events.json", "r") as f:
-            data = json.load(f)
-
-        events = data.get("events", [])
+        # Filter by since timestamp
+        events = load_series(DATA_PATH / "events.json", "events").since(
+            parse_query_time(since)
+        )
 
         if severity:
             events = [e for e in events if e.get("type") == severity]
 
-        # Filter by since timestamp
-        events = _filter_events_by_time(events, since)
-
         return EventsResponse(events=events)
     except Exception as e:
         logging.error(f"Error retrieving cluster events: {str(e)}")
@@ -390,8 +345,7 @@ async def get_resource_usage(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "resource_usage.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "resource_usage.json")
 
         resource_usage = data.get("resource_usage", {})
 
@@ -434,8 +388,7 @@ async def get_node_status(
         HTTPException: 500 if data retrieval fails
     """
     try:
-        with open(DATA_PATH / "nodes.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "nodes.json")
 
         nodes = data.get("nodes", [])
 
@@ -0,0 +1,470 @@
+"""In-memory, indexed store for plain-text application logs.
+
+The log file is parsed once at startup and then tailed: every query first
+checks whether the file grew and only parses the appended lines. Parsed
+entries are kept in columnar arrays (epoch timestamp, level id, service id,
+raw line) together with:
+
+- a time index (entry ids sorted by timestamp) answering range queries by
+  binary search
+- posting lists per level, per service and per lower-cased word token
+
+so search, recent and count requests touch only the entries they return
+instead of re-reading the whole file.
+"""
+
+import bisect
+import heapq
+import itertools
+import logging
+import os
+import re
+import threading
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from time_series import parse_epoch
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Levels reported for event_type "error", mirroring log_counts.json
+ERROR_LEVELS = ("ERROR", "CRITICAL")
+
+# Column value used for entries without a level/service (unstructured lines)
+_NO_VALUE = 0xFFFF_FFFF
+
+
+def _parse_line(line: str) -> dict:
+    """Split a `<timestamp> [LEVEL] <service> <message>` line into fields"""
+    parts = line.strip().split(" ", 3)
+    if len(parts) < 4:
+        return {"message": line.strip()}
+
+    level_part = parts[1]
+    level = "INFO"
+    if "[" in level_part and "]" in level_part:
+        level = level_part.strip("[]")
+
+    return {
+        "timestamp": parts[0],
+        "level": level,
+        "service": parts[2],
+        "message": parts[3],
+    }
+
+
+def _token_matches(value: str, token: str, left_bound: bool, right_bound: bool) -> bool:
+    """Whether an indexed token can contain a (possibly partial) pattern token"""
+    if left_bound:
+        return value.startswith(token)
+    if right_bound:
+        return value.endswith(token)
+    return token in value
+
+
+def _in_time_range(
+    epoch: float, level_id: int, start: Optional[float], end: Optional[float]
+) -> bool:
+    """Whether an entry's epoch column value falls inside [start, end]"""
+    if epoch != epoch:  # NaN: no timestamp or unparseable timestamp
+        return level_id != _NO_VALUE
+    if start is not None and epoch < start:
+        return False
+    if end is not None and epoch > end:
+        return False
+    return True
+
+
+class _Vocabulary:
+    """Interns strings to small integer ids with a posting list per id"""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.postings: List[array] = []
+
+    def add(self, value: str, entry_id: int) -> int:
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.ids[value] = value_id
+            self.values.append(value)
+            self.postings.append(array("I"))
+        self.postings[value_id].append(entry_id)
+        return value_id
+
+    def get(self, value: str) -> Optional[array]:
+        value_id = self.ids.get(value)
+        return None if value_id is None else self.postings[value_id]
+
+
+class LogStore:
+    """Memory-resident, incrementally tailed index over one text log file"""
+
+    def __init__(self, file_path: Path) -> None:
+        self.file_path = Path(file_path)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+        # Columns indexed by entry id (file order)
+        self._lines: List[str] = []
+        self._epochs = array("d")
+        self._levels = array("I")
+        self._services = array("I")
+
+        # Time index: ids of timestamped entries sorted by epoch
+        self._sorted_epochs = array("d")
+        self._sorted_ids = array("I")
+        # Entries whose timestamp could not be parsed match every time range
+        self._untimed_ids = array("I")
+
+        self._level_vocab = _Vocabulary()
+        self._service_vocab = _Vocabulary()
+        self._token_vocab = _Vocabulary()
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def refresh(self) -> int:
+        """Index lines appended since the last refresh.
+
+        Rebuilds from scratch if the file was truncated or replaced (log
+        rotation). Returns the number of newly indexed entries.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.file_path)
+            except FileNotFoundError:
+                if self._lines:
+                    logger.info(f"Log file {self.file_path} removed, clearing index")
+                    self._reset()
+                return 0
+
+            if self._inode is not None and (
+                stat.st_ino != self._inode or stat.st_size < self._offset
+            ):
+                logger.info(f"Log file {self.file_path} rotated, rebuilding index")
+                self._reset()
+
+            self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return 0
+
+            added = 0
+            with open(self.file_path, "rb") as f:
+                f.seek(self._offset)
+                for raw_line in f:
+                    # Leave a partially written last line for the next refresh
+                    if not raw_line.endswith(b"\n"):
+                        break
+                    self._offset += len(raw_line)
+                    self._add_line(raw_line.decode("utf-8", errors="replace"))
+                    added += 1
+
+            if added:
+                logger.info(
+                    f"Indexed {added} new log entries from {self.file_path} "
+                    f"({len(self._lines)} total)"
+                )
+            return added
+
+    def _add_line(self, line: str) -> None:
+        entry_id = len(self._lines)
+        self._lines.append(line)
+
+        for token in set(_TOKEN_RE.findall(line.lower())):
+            self._token_vocab.add(token, entry_id)
+
+        entry = _parse_line(line)
+        if "timestamp" not in entry:
+            self._epochs.append(float("nan"))
+            self._levels.append(_NO_VALUE)
+            self._services.append(_NO_VALUE)
+            return
+
+        self._levels.append(self._level_vocab.add(entry["level"], entry_id))
+        self._services.append(self._service_vocab.add(entry["service"], entry_id))
+
+        epoch = parse_epoch(entry["timestamp"])
+        if epoch is None:
+            self._epochs.append(float("nan"))
+            self._untimed_ids.append(entry_id)
+            return
+
+        self._epochs.append(epoch)
+        if not self._sorted_epochs or epoch >= self._sorted_epochs[-1]:
+            self._sorted_epochs.append(epoch)
+            self._sorted_ids.append(entry_id)
+        else:
+            # Out-of-order line: keep the time index sorted
+            position = bisect.bisect_right(self._sorted_epochs, epoch)
+            self._sorted_epochs.insert(position, epoch)
+            self._sorted_ids.insert(position, entry_id)
+
+    def entry(self, entry_id: int) -> dict:
+        """Materialize one entry in the shape returned by the API"""
+        return _parse_line(self._lines[entry_id])
+
+    def entry_or_none(self, entry_id: int) -> Optional[dict]:
+        """Like `entry`, but None for an id that is not (or no longer) indexed"""
+        with self._lock:
+            if 0 <= entry_id < len(self._lines):
+                return _parse_line(self._lines[entry_id])
+        return None
+
+    def latest_epoch(self) -> Optional[float]:
+        """Newest indexed timestamp, used to anchor relative time windows"""
+        return self._sorted_epochs[-1] if self._sorted_epochs else None
+
+    def _time_range_ids(
+        self, start: Optional[float], end: Optional[float]
+    ) -> List[int]:
+        """Ids of entries inside [start, end] (plus untimed ones), in file order"""
+        lo = 0 if start is None else bisect.bisect_left(self._sorted_epochs, start)
+        hi = (
+            len(self._sorted_epochs)
+            if end is None
+            else bisect.bisect_right(self._sorted_epochs, end)
+        )
+        ids = list(self._sorted_ids[lo:hi])
+        ids.extend(self._untimed_ids)
+        ids.sort()
+        return ids
+
+    def _token_candidates(self, pattern: str) -> Optional[List[int]]:
+        """Ids of entries that may contain `pattern`, in file order.
+
+        Each word token in the pattern is matched against the token vocabulary:
+        exactly when the pattern delimits it on both sides, as a prefix/suffix
+        when delimited on one side, and as a substring otherwise. Returns None
+        when the pattern has no word characters to look up.
+        """
+        matches = list(_TOKEN_RE.finditer(pattern))
+        if not matches:
+            return None
+
+        candidate_sets = []
+        for match in matches:
+            token = match.group()
+            left_bound = match.start() > 0
+            right_bound = match.end() < len(pattern)
+            if left_bound and right_bound:
+                postings = self._token_vocab.get(token)
+                posting_lists = [postings] if postings is not None else []
+            else:
+                posting_lists = [
+                    self._token_vocab.postings[value_id]
+                    for value, value_id in self._token_vocab.ids.items()
+                    if _token_matches(value, token, left_bound, right_bound)
+                ]
+            if not posting_lists:
+                return []
+            if len(posting_lists) == 1:
+                candidate_sets.append(posting_lists[0])
+            else:
+                candidate_sets.append(
+                    array("I", sorted(set(heapq.merge(*posting_lists))))
+                )
+
+        candidate_sets.sort(key=len)
+        result = candidate_sets[0]
+        for other in candidate_sets[1:]:
+            other_set = set(other)
+            result = [entry_id for entry_id in result if entry_id in other_set]
+            if not result:
+                break
+        return list(result)
+
+    def iter_search(
+        self,
+        pattern: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        log_level: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Lazily yield entries (file order) containing `pattern`, case-insensitive.
+
+        Candidates are resolved up front; entries are then materialized one at a
+        time so callers can stop at any limit. Lines indexed after the call
+        started are not included.
+        """
+        for _, entry in self.iter_search_after(
+            None, pattern, start_time, end_time, log_level
+        ):
+            yield entry
+
+    def iter_search_after(
+        self,
+        after_id: Optional[int],
+        pattern: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        log_level: Optional[str] = None,
+    ) -> Iterator[Tuple[int, dict]]:
+        """`iter_search` as (entry id, entry) pairs, starting after `after_id`.
+
+        Candidate lists are in file order, so resuming is a binary search into
+        the driving list rather than a replay of the entries before it.
+        """
+        with self._lock:
+            needle = pattern.lower()
+            has_time_filter = start_time is not None or end_time is not None
+            lines, levels, epochs = self._lines, self._levels, self._epochs
+
+            # Pick the smallest candidate list to drive the scan
+            drivers: List[Iterable[int]] = []
+            token_ids = self._token_candidates(needle)
+            if token_ids is not None:
+                drivers.append(token_ids)
+            if log_level:
+                level_ids = self._level_vocab.get(log_level)
+                if level_ids is None:
+                    return
+                level_id = self._level_vocab.ids[log_level]
+                drivers.append(level_ids[:])
+            if has_time_filter:
+                drivers.append(self._time_range_ids(start_time, end_time))
+            driver = min(drivers, key=len) if drivers else range(len(lines))
+            if after_id is not None:
+                driver = driver[bisect.bisect_right(driver, after_id) :]
+
+        for entry_id in driver:
+            if log_level and levels[entry_id] != level_id:
+                continue
+            if has_time_filter and not _in_time_range(
+                epochs[entry_id], levels[entry_id], start_time, end_time
+            ):
+                continue
+            if needle not in lines[entry_id].lower():
+                continue
+            yield entry_id, _parse_line(lines[entry_id])
+
+    def search(
+        self,
+        pattern: str,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        log_level: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[dict]:
+        """First `limit` entries (file order) containing `pattern`, case-insensitive"""
+        return list(
+            itertools.islice(
+                self.iter_search(pattern, start_time, end_time, log_level), limit
+            )
+        )
+
+    def iter_recent(self, service: Optional[str] = None) -> Iterator[dict]:
+        """Lazily yield entries newest first, optionally by service substring"""
+        for _, entry in self.iter_recent_before(None, service):
+            yield entry
+
+    def iter_recent_before(
+        self, before_id: Optional[int], service: Optional[str] = None
+    ) -> Iterator[Tuple[int, dict]]:
+        """`iter_recent` as (entry id, entry) pairs, starting below `before_id`"""
+        with self._lock:
+            lines = self._lines
+            end = len(lines) if before_id is None else min(before_id, len(lines))
+            if service:
+                service_ids = [
+                    value_id
+                    for value, value_id in self._service_vocab.ids.items()
+                    if service in value
+                ]
+                merged = list(
+                    heapq.merge(*(self._service_vocab.postings[s] for s in service_ids))
+                )
+                ids: Iterable[int] = reversed(merged[: bisect.bisect_left(merged, end)])
+            else:
+                ids = range(end - 1, -1, -1)
+
+        for entry_id in ids:
+            yield entry_id, _parse_line(lines[entry_id])
+
+    def recent(self, limit: int = 100, service: Optional[str] = None) -> List[dict]:
+        """Last `limit` entries, newest first, optionally by service substring"""
+        return list(itertools.islice(self.iter_recent(service), limit))
+
+    def _group_key(self, entry_id: int, group_by: str) -> str:
+        if group_by == "service":
+            return self._service_vocab.values[self._services[entry_id]]
+        if group_by == "level":
+            return self._level_vocab.values[self._levels[entry_id]]
+        epoch = self._epochs[entry_id]
+        if epoch != epoch:
+            return "unknown"
+        return datetime.fromtimestamp(epoch // 3600 * 3600, tz=timezone.utc).strftime(
+            "%Y-%m-%dT%H:00:00Z"
+        )
+
+    def count(
+        self,
+        levels: Optional[Iterable[str]] = None,
+        start_time: Optional[float] = None,
+        group_by: Optional[str] = None,
+    ) -> Dict:
+        """Count entries with the given levels since `start_time`.
+
+        Returns the total and, when `group_by` is service, level or hour, a list
+        of `{"group", "count", "percentage"}` rows sorted by count.
+        """
+        with self._lock:
+            if levels is None:
+                candidates: Iterable[int] = (
+                    range(len(self._lines))
+                    if start_time is None
+                    else self._time_range_ids(start_time, None)
+                )
+                ids: List[int] = [i for i in candidates if self._levels[i] != _NO_VALUE]
+            else:
+                level_lists = [
+                    postings
+                    for postings in (self._level_vocab.get(level) for level in levels)
+                    if postings is not None
+                ]
+                ids = list(heapq.merge(*level_lists))
+                if start_time is not None:
+                    ids = [
+                        i
+                        for i in ids
+                        if _in_time_range(
+                            self._epochs[i], self._levels[i], start_time, None
+                        )
+                    ]
+
+            total = len(ids)
+            if not group_by:
+                return {"total_count": total, "counts": []}
+
+            groups: Dict[str, int] = {}
+            for entry_id in ids:
+                group = self._group_key(entry_id, group_by)
+                groups[group] = groups.get(group, 0) + 1
+
+            counts = [
+                {
+                    "group": group,
+                    "count": count,
+                    "percentage": round(count * 100 / total, 1),
+                }
+                for group, count in sorted(
+                    groups.items(), key=lambda item: item[1], reverse=True
+                )
+            ]
+            return {"total_count": total, "counts": counts}
@@ -1,9 +1,8 @@
-import json
 import logging
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from dataset_cache import load_json
 from fastapi import (
     Depends,
     FastAPI,
@@ -12,7 +11,10 @@ from fastapi import (
     Query,
 )
 from fastapi.responses import JSONResponse
+from log_store import ERROR_LEVELS, LogStore
+from pagination import CursorError, Seekable, page_response
 from retrieve_api_key import retrieve_api_key
+from time_series import load_series, parse_query_time
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -25,6 +27,12 @@ app = FastAPI(title="Application Logs API", version="1.0.0")
 
 DATA_PATH = Path(__file__).parent.parent / "data" / "logs_data"
 
+# Parsed once at startup; new lines are picked up on each request
+LOG_STORE = LogStore(DATA_PATH / "application.log")
+LOG_STORE.refresh()
+
+TIME_WINDOW_SECONDS = {"1h": 3600, "6h": 6 * 3600, "24h": 24 * 3600, "7d": 7 * 86400}
+
 # API Key for authentication
 CREDENTIAL_PROVIDER_NAME = "sre-agent-api-key-credential-provider"
 
@@ -48,100 +56,9 @@ def _validate_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     return x_api_key
 
 
-def _parse_timestamp(timestamp_str: str) -> datetime:
-    """Parse ISO timestamp string to datetime object"""
-    try:
-        # Handle both with and without timezone
-        if timestamp_str.endswith("Z"):
-            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        elif "+" in timestamp_str or timestamp_str.endswith("0"):
-            return datetime.fromisoformat(timestamp_str)
-        else:
-            return datetime.fromisoformat(timestamp_str + "+00:00")
-    except:
-        # Fallback: assume current time if parsing fails
-        return datetime.now(timezone.utc)
-
-
-def _filter_by_time(
-    logs: list, start_time: Optional[str] = None, end_time: Optional[str] = None
-) -> list:
-    """Filter logs by time range"""
-    if not start_time and not end_time:
-        return logs
-
-    filtered_logs = []
-    start_dt = _parse_timestamp(start_time) if start_time else None
-    end_dt = _parse_timestamp(end_time) if end_time else None
-
-    for log in logs:
-        log_timestamp = log.get("timestamp")
-        if not log_timestamp:
-            continue
-
-        try:
-            log_dt = _parse_timestamp(log_timestamp)
-
-            if start_dt and log_dt < start_dt:
-                continue
-            if end_dt and log_dt > end_dt:
-                continue
-
-            filtered_logs.append(log)
-        except:
-            # Include logs with unparseable timestamps
-            filtered_logs.append(log)
-
-    return filtered_logs
-
-
-def _parse_log_file(file_path: Path, pattern: Optional[str] = None):
-    """Parse log file and filter by pattern"""
-    logs = []
-
-    if file_path.suffix == ".json":
-        with open(file_path, "r") as f:
-            data = json.load(f)
-            # Handle both array and object with array
-            if isinstance(data, list):
-                logs = data
-            elif isinstance(data, dict):
-                # Get the first array value in the dict
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        logs = value
-                        break
-    else:
-        # Parse text log files
-        with open(file_path, "r") as f:
-            for line in f:
-                if pattern and pattern.lower() not in line.lower():
-                    continue
-                # Parse log line to extract timestamp, level, and message
-                parts = line.strip().split(" ", 3)
-                if len(parts) >= 4:
-                    timestamp = parts[0]
-                    level_part = parts[1]
-                    service = parts[2]
-                    message = parts[3] if len(parts) > 3 else ""
-
-                    # Extract log level from [LEVEL] format
-                    level = "INFO"
-                    if "[" in level_part and "]" in level_part:
-                        level = level_part.strip("[]")
-
-                    logs.append(
-                        {
-                            "timestamp": timestamp,
-                            "level": level,
-                            "service": service,
-                            "message": message,
-                        }
-                    )
-                else:
-                    logs.append({"message": line.strip()})
-
-    return logs
+def _cursor_error_response(error: CursorError) -> JSONResponse:
+    """Reject an invalid or stale pagination cursor"""
+    return JSONResponse(status_code=400, content={"error": str(error)})
 
 
 @app.get("/logs/search")
@@ -152,22 +69,37 @@ async def search_logs(
     log_level: Optional[str] = Query(
         None, enum=["ERROR", "WARN", "INFO", "DEBUG"], description="Filter by log level"
     ),
+    page_size: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of entries per page"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Continuation token returned as next_cursor"
+    ),
+    response_format: str = Query(
+        "json",
+        alias="format",
+        enum=["json", "ndjson"],
+        description="Return one JSON page or stream newline-delimited JSON",
+    ),
     api_key: str = Depends(_validate_api_key),
 ):
     """Search logs by pattern/timeframe"""
     try:
-        application_logs = _parse_log_file(DATA_PATH / "application.log", pattern)
-
-        # Filter by log level if provided
-        if log_level:
-            application_logs = [
-                log for log in application_logs if log.get("level") == log_level
-            ]
-
-        # Filter by time range
-        application_logs = _filter_by_time(application_logs, start_time, end_time)
+        LOG_STORE.refresh()
+        start, end = parse_query_time(start_time), parse_query_time(end_time)
+        # Seekable by entry id, so a cursor resumes without replaying earlier pages
+        application_logs = Seekable(
+            lambda after_id: LOG_STORE.iter_search_after(
+                after_id, pattern, start, end, log_level
+            ),
+            LOG_STORE.entry_or_none,
+        )
 
-        return {"logs": application_logs[:100]}  # Limit results
+        return page_response(
+            "logs", application_logs, page_size, cursor, response_format
+        )
+    except CursorError as e:
+        return _cursor_error_response(e)
     except Exception as e:
         logging.error(f"Error searching logs: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -177,21 +109,31 @@ async def search_logs(
 async def get_error_logs(
     since: Optional[str] = Query(None, description="Get errors since this timestamp"),
     service: Optional[str] = Query(None, description="Filter by service name"),
+    page_size: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of entries per page"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Continuation token returned as next_cursor"
+    ),
+    response_format: str = Query(
+        "json",
+        alias="format",
+        enum=["json", "ndjson"],
+        description="Return one JSON page or stream newline-delimited JSON",
+    ),
     api_key: str = Depends(_validate_api_key),
 ):
     """Retrieve error-specific entries"""
     try:
-        with open(DATA_PATH / "error.log", "r") as f:
-            error_logs = json.load(f)
+        # Filter by since timestamp
+        error_logs = load_series(DATA_PATH / "error.log").since(parse_query_time(since))
 
         if service:
             error_logs = [log for log in error_logs if log.get("service") == service]
 
-        # Filter by since timestamp
-        if since:
-            error_logs = _filter_by_time(error_logs, start_time=since)
-
-        return {"errors": error_logs}
+        return page_response("errors", error_logs, page_size, cursor, response_format)
+    except CursorError as e:
+        return _cursor_error_response(e)
     except Exception as e:
         logging.error(f"Error retrieving error logs: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -216,8 +158,7 @@ async def analyze_log_patterns(
         if not patterns_file.exists():
             return {"patterns": []}
 
-        with open(patterns_file, "r") as f:
-            data = json.load(f)
+        data = load_json(patterns_file)
 
         patterns = data.get("patterns", [])
 
@@ -236,20 +177,30 @@ async def get_recent_logs(
         100, ge=1, le=1000, description="Number of recent logs to return"
     ),
     service: Optional[str] = Query(None, description="Filter by service name"),
+    cursor: Optional[str] = Query(
+        None, description="Continuation token returned as next_cursor"
+    ),
+    response_format: str = Query(
+        "json",
+        alias="format",
+        enum=["json", "ndjson"],
+        description="Return one JSON page or stream newline-delimited JSON",
+    ),
     api_key: str = Depends(_validate_api_key),
 ):
     """Fetch latest log entries"""
     try:
-        all_logs = _parse_log_file(DATA_PATH / "application.log")
+        LOG_STORE.refresh()
 
-        if service:
-            all_logs = [log for log in all_logs if service in log.get("service", "")]
-
-        # Return the most recent logs (last N entries)
-        recent_logs = all_logs[-limit:] if len(all_logs) > limit else all_logs
-        recent_logs.reverse()  # Most recent first
+        # Most recent first
+        recent_logs = Seekable(
+            lambda before_id: LOG_STORE.iter_recent_before(before_id, service),
+            LOG_STORE.entry_or_none,
+        )
 
-        return {"logs": recent_logs}
+        return page_response("logs", recent_logs, limit, cursor, response_format)
+    except CursorError as e:
+        return _cursor_error_response(e)
     except Exception as e:
         logging.error(f"Error retrieving recent logs: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -270,13 +221,26 @@ async def count_log_events(
 ):
     """Count occurrences of specific events"""
     try:
-        # Read counts from actual data file
+        LOG_STORE.refresh()
+        if len(LOG_STORE):
+            # Window is anchored at the newest entry so replayed logs count correctly
+            latest = LOG_STORE.latest_epoch()
+            start = (
+                latest - TIME_WINDOW_SECONDS[time_window]
+                if latest is not None and time_window in TIME_WINDOW_SECONDS
+                else None
+            )
+            levels = ERROR_LEVELS if event_type.lower() == "error" else None
+            if levels is None and not group_by:
+                group_by = "level"
+            return LOG_STORE.count(levels=levels, start_time=start, group_by=group_by)
+
+        # Fall back to the precomputed counts data file
         counts_file = DATA_PATH / "log_counts.json"
         if not counts_file.exists():
             return {"total_count": 0, "counts": []}
 
-        with open(counts_file, "r") as f:
-            data = json.load(f)
+        data = load_json(counts_file)
 
         if event_type.lower() == "error":
             error_data = data.get("error_counts", {})
@@ -1,9 +1,8 @@
-import json
 import logging
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from dataset_cache import load_json
 from fastapi import (
     Depends,
     FastAPI,
@@ -12,7 +11,9 @@ from fastapi import (
     Query,
 )
 from fastapi.responses import JSONResponse
+from pagination import CursorError, Seekable, page_response
 from retrieve_api_key import retrieve_api_key
+from time_series import load_series, parse_query_time
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -48,51 +49,26 @@ def _validate_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     return x_api_key
 
 
-def _parse_timestamp(timestamp_str: str) -> datetime:
-    """Parse ISO timestamp string to datetime object"""
-    try:
-        # Handle both with and without timezone
-        if timestamp_str.endswith("Z"):
-            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        elif "+" in timestamp_str or timestamp_str.endswith("0"):
-            return datetime.fromisoformat(timestamp_str)
-        else:
-            return datetime.fromisoformat(timestamp_str + "+00:00")
-    except:
-        # Fallback: assume current time if parsing fails
-        return datetime.now(timezone.utc)
-
-
-def _filter_metrics_by_time(
-    metrics: list, start_time: Optional[str] = None, end_time: Optional[str] = None
-) -> list:
-    """Filter metrics by time range"""
-    if not start_time and not end_time:
-        return metrics
-
-    filtered_metrics = []
-    start_dt = _parse_timestamp(start_time) if start_time else None
-    end_dt = _parse_timestamp(end_time) if end_time else None
-
-    for metric in metrics:
-        metric_timestamp = metric.get("timestamp")
-        if not metric_timestamp:
-            continue
+def _cursor_error_response(error: CursorError) -> JSONResponse:
+    """Reject an invalid or stale pagination cursor"""
+    return JSONResponse(status_code=400, content={"error": str(error)})
 
-        try:
-            metric_dt = _parse_timestamp(metric_timestamp)
 
-            if start_dt and metric_dt < start_dt:
-                continue
-            if end_dt and metric_dt > end_dt:
-                continue
-
-            filtered_metrics.append(metric)
-        except:
-            # Include metrics with unparseable timestamps
-            filtered_metrics.append(metric)
-
-    return filtered_metrics
+def _resource_metric_value(metric: dict, metric_type: str) -> dict:
+    """Project a resource usage record onto a single cpu/memory value"""
+    if metric_type == "cpu_usage":
+        return {
+            "timestamp": metric["timestamp"],
+            "service": metric["service"],
+            "value": metric["cpu_usage_percent"],
+            "unit": "percent",
+        }
+    return {
+        "timestamp": metric["timestamp"],
+        "service": metric["service"],
+        "value": metric["memory_usage_mb"],
+        "unit": "MB",
+    }
 
 
 @app.get("/metrics/performance")
@@ -105,58 +81,47 @@ async def get_performance_metrics(
     start_time: Optional[str] = Query(None, description="Start time for metrics"),
     end_time: Optional[str] = Query(None, description="End time for metrics"),
     service: Optional[str] = Query(None, description="Filter by service name"),
+    page_size: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of metrics per page"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Continuation token returned as next_cursor"
+    ),
+    response_format: str = Query(
+        "json",
+        alias="format",
+        enum=["json", "ndjson"],
+        description="Return one JSON page or stream newline-delimited JSON",
+    ),
     api_key: str = Depends(_validate_api_key),
 ):
     """Retrieve performance data"""
     try:
-        metrics = []
-
         if metric_type == "response_time":
-            with open(DATA_PATH / "response_times.json", "r") as f:
-                data = json.load(f)
-                metrics = data.get("metrics", [])
+            series = load_series(DATA_PATH / "response_times.json", "metrics")
         elif metric_type == "throughput":
-            with open(DATA_PATH / "throughput.json", "r") as f:
-                data = json.load(f)
-                metrics = data.get("metrics", [])
-        elif metric_type in ["cpu_usage", "memory_usage"]:
-            with open(DATA_PATH / "resource_usage.json", "r") as f:
-                data = json.load(f)
-                raw_metrics = data.get("metrics", [])
-                # Transform resource metrics to match expected format
-                metrics = []
-                for m in raw_metrics:
-                    if metric_type == "cpu_usage":
-                        metrics.append(
-                            {
-                                "timestamp": m["timestamp"],
-                                "service": m["service"],
-                                "value": m["cpu_usage_percent"],
-                                "unit": "percent",
-                            }
-                        )
-                    else:  # memory_usage
-                        metrics.append(
-                            {
-                                "timestamp": m["timestamp"],
-                                "service": m["service"],
-                                "value": m["memory_usage_mb"],
-                                "unit": "MB",
-                            }
-                        )
+            series = load_series(DATA_PATH / "throughput.json", "metrics")
         else:
-            # Return combined metrics for demo
-            with open(DATA_PATH / "resource_usage.json", "r") as f:
-                data = json.load(f)
-                metrics = data.get("metrics", [])
+            # Combined resource metrics for demo, or one resource series
+            series = load_series(DATA_PATH / "resource_usage.json", "metrics")
+
+        # Filter by time range
+        metrics = series.between(
+            parse_query_time(start_time), parse_query_time(end_time)
+        )
 
         if service:
             metrics = [m for m in metrics if m.get("service") == service]
 
-        # Filter by time range
-        metrics = _filter_metrics_by_time(metrics, start_time, end_time)
+        if metric_type in ["cpu_usage", "memory_usage"]:
+            # Transform resource metrics to match expected format, one page at a time
+            metrics = Seekable.from_sequence(
+                metrics, lambda m: _resource_metric_value(m, metric_type)
+            )
 
-        return {"metrics": metrics}
+        return page_response("metrics", metrics, page_size, cursor, response_format)
+    except CursorError as e:
+        return _cursor_error_response(e)
     except Exception as e:
         logging.error(f"Error retrieving performance metrics: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -172,8 +137,7 @@ async def get_error_rates(
 ):
     """Fetch error rate statistics"""
     try:
-        with open(DATA_PATH / "error_rates.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "error_rates.json")
 
         error_rates = data.get("error_rates", [])
 
@@ -188,6 +152,23 @@ async def get_error_rates(
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+def _resource_type_fields(metric: dict, resource_type: str) -> dict:
+    """Keep only the fields of a resource usage record for one resource type"""
+    filtered = {"timestamp": metric["timestamp"], "service": metric["service"]}
+    if resource_type == "cpu":
+        filtered["cpu_usage_percent"] = metric.get("cpu_usage_percent")
+    elif resource_type == "memory":
+        filtered["memory_usage_mb"] = metric.get("memory_usage_mb")
+        filtered["memory_usage_percent"] = metric.get("memory_usage_percent")
+    elif resource_type == "disk":
+        filtered["disk_io_read_mb"] = metric.get("disk_io_read_mb")
+        filtered["disk_io_write_mb"] = metric.get("disk_io_write_mb")
+    elif resource_type == "network":
+        filtered["network_in_mb"] = metric.get("network_in_mb")
+        filtered["network_out_mb"] = metric.get("network_out_mb")
+    return filtered
+
+
 @app.get("/metrics/resources")
 async def get_resource_metrics(
     resource_type: Optional[str] = Query(
@@ -199,12 +180,23 @@ async def get_resource_metrics(
     time_window: Optional[str] = Query(
         "24h", enum=["1h", "6h", "24h", "7d"], description="Time window for metrics"
     ),
+    page_size: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of metrics per page"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Continuation token returned as next_cursor"
+    ),
+    response_format: str = Query(
+        "json",
+        alias="format",
+        enum=["json", "ndjson"],
+        description="Return one JSON page or stream newline-delimited JSON",
+    ),
     api_key: str = Depends(_validate_api_key),
 ):
     """Monitor resource utilization"""
     try:
-        with open(DATA_PATH / "resource_usage.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "resource_usage.json")
 
         metrics = data.get("metrics", [])
 
@@ -213,24 +205,13 @@ async def get_resource_metrics(
 
         # Filter by resource type if specified
         if resource_type:
-            filtered_metrics = []
-            for m in metrics:
-                filtered = {"timestamp": m["timestamp"], "service": m["service"]}
-                if resource_type == "cpu":
-                    filtered["cpu_usage_percent"] = m.get("cpu_usage_percent")
-                elif resource_type == "memory":
-                    filtered["memory_usage_mb"] = m.get("memory_usage_mb")
-                    filtered["memory_usage_percent"] = m.get("memory_usage_percent")
-                elif resource_type == "disk":
-                    filtered["disk_io_read_mb"] = m.get("disk_io_read_mb")
-                    filtered["disk_io_write_mb"] = m.get("disk_io_write_mb")
-                elif resource_type == "network":
-                    filtered["network_in_mb"] = m.get("network_in_mb")
-                    filtered["network_out_mb"] = m.get("network_out_mb")
-                filtered_metrics.append(filtered)
-            metrics = filtered_metrics
-
-        return {"metrics": metrics}
+            metrics = Seekable.from_sequence(
+                metrics, lambda m: _resource_type_fields(m, resource_type)
+            )
+
+        return page_response("metrics", metrics, page_size, cursor, response_format)
+    except CursorError as e:
+        return _cursor_error_response(e)
     except Exception as e:
         logging.error(f"Error retrieving resource metrics: {str(e)}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -248,8 +229,7 @@ async def get_availability_metrics(
 ):
     """Check service availability"""
     try:
-        with open(DATA_PATH / "availability.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "availability.json")
 
         availability_metrics = data.get("availability_metrics", [])
 
@@ -292,8 +272,7 @@ async def analyze_trends(
                 "anomalies": [],
             }
 
-        with open(trends_file, "r") as f:
-            data = json.load(f)
+        data = load_json(trends_file)
 
         # Determine which trend data to use based on metric name
         if "response" in metric_name.lower():
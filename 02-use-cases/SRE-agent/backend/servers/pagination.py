@@ -0,0 +1,203 @@
+"""Cursor pagination and NDJSON streaming helpers shared by the API servers.
+
+Endpoints produce their records lazily as generators; these helpers slice
+one page out of that generator (or stream it as newline-delimited JSON)
+without materializing the full result set.
+
+Continuation tokens are opaque to clients. Internally a token records how
+many records were already returned (the offset), the position of the last
+one and its timestamp, which is checked on resume so a cursor taken against
+different data is rejected instead of silently skipping or repeating
+records. Sequences and `Seekable` producers resume by jumping straight to
+the position; other iterables have to replay the records before it.
+"""
+
+import base64
+import binascii
+import itertools
+import json
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class CursorError(ValueError):
+    """Raised when a continuation token is malformed or no longer valid"""
+
+
+class Seekable:
+    """Records in a stable order that can resume after a position without replay.
+
+    `iterate_after(position)` yields `(position, record)` pairs for the records
+    after `position` (all of them when it is None); positions only need to be
+    meaningful to the producer. `record_at(position)` returns the record at a
+    position, or None, and is used to check that a cursor still matches.
+    Iterating a Seekable directly yields just the records.
+    """
+
+    def __init__(
+        self,
+        iterate_after: Callable[[Optional[int]], Iterator[Tuple[int, dict]]],
+        record_at: Callable[[int], Optional[dict]],
+    ) -> None:
+        self.iterate_after = iterate_after
+        self.record_at = record_at
+
+    def __iter__(self) -> Iterator[dict]:
+        return (record for _, record in self.iterate_after(None))
+
+    @classmethod
+    def from_sequence(
+        cls,
+        records: Sequence[dict],
+        transform: Optional[Callable[[dict], dict]] = None,
+    ) -> "Seekable":
+        """Index-addressed records, optionally transformed one at a time"""
+        convert = transform or (lambda record: record)
+
+        def iterate_after(position: Optional[int]) -> Iterator[Tuple[int, dict]]:
+            start = 0 if position is None else position + 1
+            for index in range(start, len(records)):
+                yield index, convert(records[index])
+
+        def record_at(position: int) -> Optional[dict]:
+            if 0 <= position < len(records):
+                return convert(records[position])
+            return None
+
+        return cls(iterate_after, record_at)
+
+
+def encode_cursor(timestamp: Optional[str], offset: int, position: int) -> str:
+    """Build an opaque continuation token"""
+    payload = json.dumps(
+        {"ts": timestamp, "off": offset, "pos": position}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[str], int, int]:
+    """Return the (timestamp, offset, position) stored in a continuation token"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        timestamp, offset = payload["ts"], int(payload["off"])
+        position = int(payload["pos"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise CursorError(f"Invalid cursor: {token}") from e
+    if offset < 0:
+        raise CursorError(f"Invalid cursor: {token}")
+    return timestamp, offset, position
+
+
+def _stale_cursor() -> CursorError:
+    return CursorError("Cursor no longer matches the result set; restart paging")
+
+
+def _resume(
+    records: Iterable[dict], cursor: Optional[str]
+) -> Tuple[Iterator[Tuple[int, dict]], int]:
+    """Position `records` after `cursor`, yielding (position, record) pairs.
+
+    Sequences and Seekable producers jump straight to the cursor position;
+    other iterables replay the records already delivered.
+    """
+    if isinstance(records, Sequence):
+        records = Seekable.from_sequence(records)
+
+    if not cursor:
+        if isinstance(records, Seekable):
+            return records.iterate_after(None), 0
+        return enumerate(records), 0
+
+    timestamp, offset, position = decode_cursor(cursor)
+    if isinstance(records, Seekable):
+        last = records.record_at(position)
+        if last is None or last.get("timestamp") != timestamp:
+            raise _stale_cursor()
+        return records.iterate_after(position), offset
+
+    iterator = enumerate(records)
+    last = None
+    for _, last in itertools.islice(iterator, offset):
+        pass
+    if offset and (last is None or last.get("timestamp") != timestamp):
+        raise _stale_cursor()
+    return iterator, offset
+
+
+def paginate(
+    records: Iterable[dict], page_size: int, cursor: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """Return one page of `records` and the token for the next page, if any"""
+    iterator, offset = _resume(records, cursor)
+    page = list(itertools.islice(iterator, page_size))
+
+    next_cursor = None
+    if len(page) == page_size and next(iterator, None) is not None:
+        position, last = page[-1]
+        next_cursor = encode_cursor(last.get("timestamp"), offset + len(page), position)
+    return [record for _, record in page], next_cursor
+
+
+def ndjson_stream(
+    records: Iterator[Tuple[int, dict]], offset: int = 0, limit: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield records as NDJSON lines.
+
+    `records` yields `(position, record)` pairs as produced by `_resume`, and
+    `offset` is the position of the first record in the full result set. When
+    `limit` cuts the stream short, a final `{"next_cursor": ...}` line tells
+    the client where to continue.
+    """
+    last = None
+    last_position = None
+    for sent, (position, record) in enumerate(records):
+        if limit is not None and sent >= limit:
+            trailer = {
+                "next_cursor": encode_cursor(
+                    last.get("timestamp"), offset + sent, last_position
+                )
+            }
+            yield (json.dumps(trailer) + "\n").encode()
+            return
+        yield (json.dumps(record) + "\n").encode()
+        last, last_position = record, position
+
+
+def page_response(
+    key: str,
+    records: Iterable[dict],
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    response_format: str = "json",
+):
+    """Render a paginated endpoint response as a JSON page or an NDJSON stream.
+
+    JSON pages default to DEFAULT_PAGE_SIZE records; NDJSON streams every
+    remaining record unless `page_size` is given. Raises CursorError before
+    any output is produced if `cursor` is invalid.
+    """
+    if response_format == "ndjson":
+        iterator, offset = _resume(records, cursor)
+        return StreamingResponse(
+            ndjson_stream(iterator, offset=offset, limit=page_size),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    page, next_cursor = paginate(records, page_size or DEFAULT_PAGE_SIZE, cursor)
+    response = {key: page}
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
@@ -0,0 +1,213 @@
+"""BM25 full-text index over the runbooks data set.
+
+Every record in `runbooks_data/*.json` (playbooks, troubleshooting guides,
+escalation procedures, common resolutions, service recovery procedures)
+becomes one document. Sections of the markdown runbooks are folded into the
+document whose ID they reference, or indexed on their own when they have
+none. The index is built once and rebuilt only when a source file changes.
+"""
+
+import heapq
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dataset_cache import load_json
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MARKDOWN_ID_RE = re.compile(r"\*\*[^*]*ID:\*\*\s*`([^`]+)`")
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _flatten_text(value: Any) -> Iterable[str]:
+    """Yield every string nested inside a JSON value"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _flatten_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _flatten_text(item)
+
+
+def _markdown_sections(text: str) -> Iterable[Tuple[str, str]]:
+    """Split a markdown document into (heading, body) pairs on `## ` headings"""
+    heading, lines = None, []
+    for line in text.splitlines():
+        if line.startswith("## "):
+            if heading is not None:
+                yield heading, "\n".join(lines)
+            heading, lines = line[3:].strip(), []
+        elif heading is not None:
+            lines.append(line)
+    if heading is not None:
+        yield heading, "\n".join(lines)
+
+
+class RunbookDocument:
+    """One searchable runbook record"""
+
+    def __init__(self, source: str, record: dict, text: str) -> None:
+        self.source = source
+        self.record = record
+        self.text = text
+
+
+class RunbookIndex:
+    """Inverted index with BM25 ranking over runbook documents"""
+
+    def __init__(self, data_path: Path) -> None:
+        self.data_path = Path(data_path)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        self._documents: List[RunbookDocument] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        self._average_length = 0.0
+
+    def _source_files(self) -> List[Path]:
+        files = sorted(self.data_path.glob("*.json"))
+        markdown_dir = self.data_path / "markdown"
+        if markdown_dir.is_dir():
+            files.extend(sorted(markdown_dir.glob("*.md")))
+        return files
+
+    def _current_signature(self) -> Tuple:
+        signature = []
+        for file_path in self._source_files():
+            stat = os.stat(file_path)
+            signature.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def refresh(self) -> None:
+        """Build the index, or rebuild it if any source file changed"""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            self._build()
+            self._signature = signature
+
+    def _build(self) -> None:
+        documents: List[RunbookDocument] = []
+        by_id: Dict[str, RunbookDocument] = {}
+
+        for file_path in sorted(self.data_path.glob("*.json")):
+            data = load_json(file_path)
+            for source, records in data.items():
+                if not isinstance(records, list):
+                    continue
+                for record in records:
+                    if not isinstance(record, dict):
+                        continue
+                    document = RunbookDocument(
+                        source, record, " ".join(_flatten_text(record))
+                    )
+                    documents.append(document)
+                    if record.get("id"):
+                        by_id[record["id"]] = document
+
+        markdown_dir = self.data_path / "markdown"
+        for file_path in sorted(markdown_dir.glob("*.md")):
+            for heading, body in _markdown_sections(file_path.read_text()):
+                match = _MARKDOWN_ID_RE.search(body)
+                document = by_id.get(match.group(1)) if match else None
+                if document is not None:
+                    document.text += f" {heading} {body}"
+                    continue
+                record = {
+                    "id": match.group(1) if match else f"{file_path.stem}:{heading}",
+                    "title": heading,
+                    "content": body.strip(),
+                }
+                documents.append(
+                    RunbookDocument("markdown", record, f"{heading} {body}")
+                )
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        for doc_id, document in enumerate(documents):
+            terms = Counter(_tokenize(document.text))
+            lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                postings.setdefault(term, []).append((doc_id, frequency))
+
+        self._documents = documents
+        self._postings = postings
+        self._lengths = lengths
+        self._average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        logger.info(
+            f"Indexed {len(documents)} runbook documents ({len(postings)} terms)"
+        )
+
+    def _query_terms(self, query: str) -> List[str]:
+        """Query tokens; unknown tokens expand to indexed terms they prefix"""
+        terms = []
+        for token in _tokenize(query):
+            if token in self._postings:
+                terms.append(token)
+            else:
+                terms.extend(term for term in self._postings if term.startswith(token))
+        return terms
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, str]] = None,
+    ) -> List[Tuple[float, RunbookDocument]]:
+        """Top `top_k` documents for `query` by BM25 score.
+
+        `filters` maps record fields to required values; documents without the
+        field are excluded.
+        """
+        self.refresh()
+        documents, postings, lengths = self._documents, self._postings, self._lengths
+        if not documents:
+            return []
+
+        scores: Dict[int, float] = {}
+        for term in self._query_terms(query):
+            term_postings = postings[term]
+            idf = math.log(
+                1
+                + (len(documents) - len(term_postings) + 0.5)
+                / (len(term_postings) + 0.5)
+            )
+            for doc_id, frequency in term_postings:
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * lengths[doc_id] / self._average_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    frequency * (BM25_K1 + 1) / (frequency + norm)
+                )
+
+        if filters:
+            scores = {
+                doc_id: score
+                for doc_id, score in scores.items()
+                if all(
+                    documents[doc_id].record.get(field) == value
+                    for field, value in filters.items()
+                )
+            }
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(score, documents[doc_id]) for doc_id, score in best]
@@ -1,8 +1,10 @@
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Optional
 
+from dataset_cache import load_json
 from fastapi import (
     Depends,
     FastAPI,
@@ -15,6 +17,7 @@ from fastapi import (
 )
 from fastapi.responses import JSONResponse
 from retrieve_api_key import retrieve_api_key
+from runbook_index import RunbookIndex
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -27,6 +30,13 @@ app = FastAPI(title="DevOps Runbooks API", version="1.0.0")
 
 DATA_PATH = Path(__file__).parent.parent / "data" / "runbooks_data"
 
+# Full response bodies are only logged when explicitly enabled
+LOG_RESPONSE_BODIES = os.getenv("RUNBOOKS_LOG_RESPONSES", "false").lower() == "true"
+
+# Built once at startup; rebuilt when a runbook data file changes
+RUNBOOK_INDEX = RunbookIndex(DATA_PATH)
+RUNBOOK_INDEX.refresh()
+
 # API Key for authentication
 CREDENTIAL_PROVIDER_NAME = "sre-agent-api-key-credential-provider"
 
@@ -43,6 +53,12 @@ except Exception as e:
     raise RuntimeError(f"Cannot start server: {e}") from e
 
 
+def _log_response_body(label: str, body) -> None:
+    """Log a full JSON response body when LOG_RESPONSE_BODIES is enabled"""
+    if LOG_RESPONSE_BODIES:
+        logging.info(f"📋 RUNBOOKS API: {label}: {json.dumps(body, indent=2)}")
+
+
 def _validate_api_key(x_api_key: str = Header(None, alias="X-API-Key")):
     """Validate API key from header"""
     if not x_api_key or x_api_key != EXPECTED_API_KEY:
@@ -65,43 +81,54 @@ async def search_runbooks(
         enum=["low", "medium", "high", "critical"],
         description="Incident severity level",
     ),
+    limit: int = Query(
+        10, ge=1, le=100, description="Maximum number of ranked results for keyword"
+    ),
     api_key: str = Depends(_validate_api_key),
 ):
-    """Search runbooks by incident type/keyword"""
+    """Search runbooks by incident type/keyword.
+
+    Without a keyword, playbooks matching the filters are returned. With a
+    keyword, all runbook documents are ranked by BM25 relevance and the top
+    `limit` are returned, each with its `source` collection and `score`.
+    """
     try:
         logging.info(
             f"🔍 RUNBOOKS API: search_runbooks called - incident_type={incident_type}, keyword={keyword}, severity={severity}"
         )
 
-        with open(DATA_PATH / "incident_playbooks.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "incident_playbooks.json")
 
         runbooks = data.get("playbooks", [])
         original_count = len(runbooks)
 
-        if incident_type:
-            runbooks = [r for r in runbooks if r.get("incident_type") == incident_type]
-            logging.info(
-                f"📋 RUNBOOKS API: Filtered by incident_type '{incident_type}': {len(runbooks)} runbooks"
-            )
-
-        if severity:
-            runbooks = [r for r in runbooks if r.get("severity") == severity]
-            logging.info(
-                f"📋 RUNBOOKS API: Filtered by severity '{severity}': {len(runbooks)} runbooks"
-            )
-
         if keyword:
+            filters = {}
+            if incident_type:
+                filters["incident_type"] = incident_type
+            if severity:
+                filters["severity"] = severity
             runbooks = [
-                r
-                for r in runbooks
-                if keyword.lower() in r.get("title", "").lower()
-                or keyword.lower() in r.get("description", "").lower()
-                or any(keyword.lower() in step.lower() for step in r.get("steps", []))
+                {**document.record, "source": document.source, "score": round(score, 4)}
+                for score, document in RUNBOOK_INDEX.search(keyword, limit, filters)
             ]
             logging.info(
-                f"📋 RUNBOOKS API: Filtered by keyword '{keyword}': {len(runbooks)} runbooks"
+                f"📋 RUNBOOKS API: Ranked keyword '{keyword}' with filters {filters}: {len(runbooks)} results"
             )
+        else:
+            if incident_type:
+                runbooks = [
+                    r for r in runbooks if r.get("incident_type") == incident_type
+                ]
+                logging.info(
+                    f"📋 RUNBOOKS API: Filtered by incident_type '{incident_type}': {len(runbooks)} runbooks"
+                )
+
+            if severity:
+                runbooks = [r for r in runbooks if r.get("severity") == severity]
+                logging.info(
+                    f"📋 RUNBOOKS API: Filtered by severity '{severity}': {len(runbooks)} runbooks"
+                )
 
         response_data = {"runbooks": runbooks}
 
@@ -120,9 +147,7 @@ async def search_runbooks(
             if len(steps) > 3:
                 logging.info(f"     ... and {len(steps) - 3} more steps")
 
-        logging.info(
-            f"📋 RUNBOOKS API: Full response data: {json.dumps(response_data, indent=2)}"
-        )
+        _log_response_body("Full response data", response_data)
         return response_data
     except Exception as e:
         logging.error(f"❌ Error searching runbooks: {str(e)}")
@@ -140,8 +165,7 @@ async def get_incident_playbook(
             f"🔍 RUNBOOKS API: get_incident_playbook called for playbook_id='{playbook_id}'"
         )
 
-        with open(DATA_PATH / "incident_playbooks.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "incident_playbooks.json")
 
         playbooks = data.get("playbooks", [])
 
@@ -155,9 +179,7 @@ async def get_incident_playbook(
                 for i, step in enumerate(steps):
                     logging.info(f"   Step {i + 1}: {step}")
 
-                logging.info(
-                    f"📤 RUNBOOKS API: Returning complete playbook data: {json.dumps(playbook, indent=2)}"
-                )
+                _log_response_body("Returning complete playbook data", playbook)
                 return playbook
 
         logging.warning(f"❌ RUNBOOKS API: Playbook '{playbook_id}' not found")
@@ -183,8 +205,7 @@ async def get_troubleshooting_guide(
             f"🔍 RUNBOOKS API: get_troubleshooting_guide called - category={category}, issue_type={issue_type}"
         )
 
-        with open(DATA_PATH / "troubleshooting_guides.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "troubleshooting_guides.json")
 
         guides = data.get("guides", [])
         original_count = len(guides)
@@ -223,9 +244,7 @@ async def get_troubleshooting_guide(
             if len(steps) > 3:
                 logging.info(f"     ... and {len(steps) - 3} more steps")
 
-        logging.info(
-            f"📋 RUNBOOKS API: Full response data: {json.dumps(response_data, indent=2)}"
-        )
+        _log_response_body("Full response data", response_data)
         return response_data
     except Exception as e:
         logging.error(f"❌ Error retrieving troubleshooting guides: {str(e)}")
@@ -244,8 +263,7 @@ async def get_escalation_procedures(
 ):
     """Retrieve escalation procedures"""
     try:
-        with open(DATA_PATH / "escalation_procedures.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "escalation_procedures.json")
 
         procedures = data.get("escalation_procedures", [])
 
@@ -281,8 +299,7 @@ async def get_common_resolutions(
             f"🔍 RUNBOOKS API: get_common_resolutions called - issue='{issue}', service={service}"
         )
 
-        with open(DATA_PATH / "common_resolutions.json", "r") as f:
-            data = json.load(f)
+        data = load_json(DATA_PATH / "common_resolutions.json")
 
         resolutions = data.get("resolutions", [])
         original_count = len(resolutions)
@@ -328,9 +345,7 @@ async def get_common_resolutions(
             if len(steps) > 3:
                 logging.info(f"     ... and {len(steps) - 3} more steps")
 
-        logging.info(
-            f"📋 RUNBOOKS API: Full response data: {json.dumps(response_data, indent=2)}"
-        )
+        _log_response_body("Full response data", response_data)
         return response_data
     except Exception as e:
         logging.error(f"❌ Error retrieving common resolutions: {str(e)}")
@@ -364,9 +379,17 @@ if __name__ == "__main__":
     parser.add_argument("--ssl-keyfile", type=str, help="Path to SSL private key file")
     parser.add_argument("--ssl-certfile", type=str, help="Path to SSL certificate file")
     parser.add_argument("--port", type=int, help="Port to bind to (overrides config)")
+    parser.add_argument(
+        "--log-responses",
+        action="store_true",
+        help="Log full JSON response bodies (verbose, for debugging)",
+    )
 
     args = parser.parse_args()
 
+    if args.log_responses:
+        LOG_RESPONSE_BODIES = True
+
     port = args.port if args.port else get_server_port("runbooks")
 
     # Configure SSL if both cert files are provided
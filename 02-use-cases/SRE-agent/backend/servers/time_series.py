@@ -0,0 +1,121 @@
+"""Shared time-series layer for the demo API servers.
+
+Timestamped JSON datasets are parsed once when loaded: every record's
+timestamp is converted to epoch seconds and kept in a sorted array, so
+`[start_time, end_time]` and `since` filters are answered with two binary
+searches instead of re-parsing every record on every request. Series are
+cached in the shared dataset cache and rebuilt only when the file changes.
+"""
+
+import bisect
+import logging
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from dataset_cache import load_derived
+
+logger = logging.getLogger(__name__)
+
+
+def parse_epoch(timestamp_str: str) -> Optional[float]:
+    """Parse an ISO timestamp to epoch seconds, or None if it is not parseable.
+
+    Timestamps without a timezone are treated as UTC.
+    """
+    try:
+        if timestamp_str.endswith("Z"):
+            dt = datetime.fromisoformat(timestamp_str[:-1] + "+00:00")
+        else:
+            dt = datetime.fromisoformat(timestamp_str)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def parse_query_time(timestamp_str: Optional[str]) -> Optional[float]:
+    """Parse a start/end/since query parameter to epoch seconds.
+
+    Unparseable values fall back to the current time, as the servers always
+    have.
+    """
+    if not timestamp_str:
+        return None
+    epoch = parse_epoch(timestamp_str)
+    if epoch is None:
+        logger.warning(f"Could not parse timestamp '{timestamp_str}', using now")
+        return datetime.now(timezone.utc).timestamp()
+    return epoch
+
+
+class TimeSeries:
+    """Records with a pre-parsed, time-sorted timestamp index"""
+
+    def __init__(self, records: Sequence[dict], key: str = "timestamp") -> None:
+        self.records = records
+
+        timed: List[Tuple[float, int]] = []
+        # Records whose timestamp cannot be parsed are kept in every time range
+        self._untimed_ids: List[int] = []
+        for record_id, record in enumerate(records):
+            timestamp = record.get(key)
+            if not timestamp:
+                continue
+            epoch = parse_epoch(timestamp)
+            if epoch is None:
+                self._untimed_ids.append(record_id)
+            else:
+                timed.append((epoch, record_id))
+
+        self._in_order = all(a <= b for a, b in zip(timed, timed[1:]))
+        if not self._in_order:
+            timed.sort()
+        self._epochs = array("d", (epoch for epoch, _ in timed))
+        self._ids = array("I", (record_id for _, record_id in timed))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Sequence[dict]:
+        """Records with start <= timestamp <= end, in their original order.
+
+        With no bounds every record is returned, including ones without a
+        timestamp; with bounds, records lacking a timestamp are excluded.
+        """
+        if start is None and end is None:
+            return self.records
+
+        lo = 0 if start is None else bisect.bisect_left(self._epochs, start)
+        hi = (
+            len(self._epochs) if end is None else bisect.bisect_right(self._epochs, end)
+        )
+        ids = list(self._ids[lo:hi])
+        if self._untimed_ids:
+            ids.extend(self._untimed_ids)
+            ids.sort()
+        elif not self._in_order:
+            ids.sort()
+        return [self.records[record_id] for record_id in ids]
+
+    def since(self, start: Optional[float]) -> Sequence[dict]:
+        """Records at or after `start`"""
+        return self.between(start, None)
+
+
+def load_series(file_path: Path, list_key: Optional[str] = None) -> TimeSeries:
+    """Load the record list in a JSON file as a TimeSeries, cached until it changes.
+
+    `list_key` names the top-level key holding the records; when omitted the
+    file must contain a bare JSON array.
+    """
+
+    def build(data) -> TimeSeries:
+        records = data if list_key is None else data.get(list_key, [])
+        return TimeSeries(records)
+
+    return load_derived(file_path, f"time_series:{list_key}", build)
@@ -14,7 +14,7 @@ from langgraph.prebuilt import create_react_agent
 from .agent_state import AgentState
 from .constants import AgentMetadata
 from .llm_utils import create_llm_with_error_handling
-from .memory import SREMemoryClient, create_conversation_memory_manager
+from .memory import aget_memory_client, create_conversation_memory_manager
 from .prompt_loader import prompt_loader
 
 # Logging will be configured by the main entry point
@@ -174,12 +174,14 @@ class BaseAgentNode:
 
             # Initialize conversation memory manager for automatic message tracking
             conversation_manager = None
+            memory_client = None
             user_id = state.get("user_id")
             if user_id:
                 try:
                     # Get region from llm_kwargs if available
                     region = self.llm_kwargs.get("region_name", "us-east-1") if self.llm_provider == "bedrock" else "us-east-1"
-                    memory_client = SREMemoryClient(region=region)
+                    # Shared, already-initialized client for this region
+                    memory_client = await aget_memory_client(region=region)
                     conversation_manager = create_conversation_memory_manager(
                         memory_client
                     )
@@ -371,15 +373,12 @@ class BaseAgentNode:
                     )
 
             # Process agent response for pattern extraction and memory capture
-            if user_id and agent_response:
+            if user_id and agent_response and memory_client:
                 try:
                     # Check if memory hooks are available through the memory client
                     from .memory.hooks import MemoryHookProvider
 
-                    # Use the SREMemoryClient that's already imported at the top
-                    # Get region from llm_kwargs if available
-                    region = self.llm_kwargs.get("region_name", "us-east-1") if self.llm_provider == "bedrock" else "us-east-1"
-                    memory_client = SREMemoryClient(region=region)
+                    # Reuse the shared memory client obtained above
                     memory_hooks = MemoryHookProvider(memory_client)
 
                     # Create response object for hooks
@@ -496,3 +495,94 @@ def create_runbooks_agent(
         agent_metadata=agent_metadata,
         **kwargs,
     )
+
+
+class ParallelAgentNode:
+    """Runs a wave of independent agents concurrently and merges their results.
+
+    The supervisor lists the agents for the current wave in
+    metadata["parallel_agents"]. Every agent sees the same input state, so
+    the wave takes as long as its slowest agent instead of the sum of all of
+    them. Agents that exceed the timeout are recorded in
+    metadata["timed_out_agents"] and reported by the aggregation step.
+    """
+
+    def __init__(self, agents: Dict[str, BaseAgentNode], timeout_seconds: float):
+        self.agents = agents
+        self.timeout_seconds = timeout_seconds
+
+    def _resolve_agents(self, names: List[str]) -> List[BaseAgentNode]:
+        agents = []
+        for name in names:
+            node_name = name if name.endswith("_agent") else f"{name}_agent"
+            agent = self.agents.get(node_name)
+            if agent is None:
+                logger.warning(f"Unknown agent in parallel wave: {name}, skipping")
+            elif agent not in agents:
+                agents.append(agent)
+        return agents
+
+    async def __call__(self, state: AgentState) -> Dict[str, Any]:
+        """Run every agent in the wave and return the merged state update."""
+        metadata = dict(state.get("metadata", {}))
+        agents = self._resolve_agents(metadata.get("parallel_agents", []))
+        logger.info(
+            f"Running {len(agents)} agents in parallel: {[agent.name for agent in agents]}"
+        )
+
+        start_time = asyncio.get_event_loop().time()
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.wait_for(agent(state), timeout=self.timeout_seconds)
+                for agent in agents
+            ),
+            return_exceptions=True,
+        )
+        elapsed = asyncio.get_event_loop().time() - start_time
+        logger.info(f"Parallel wave finished in {elapsed:.1f}s")
+
+        messages = state["messages"]
+        new_messages = []
+        agent_results = dict(state.get("agent_results", {}))
+        timed_out_agents = list(metadata.get("timed_out_agents", []))
+
+        # Merge in wave (plan) order, whatever order the agents finished in
+        for agent, outcome in zip(agents, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.error(
+                    f"{agent.name} - Timed out after {self.timeout_seconds} seconds in parallel wave"
+                )
+                agent_results[agent.name] = (
+                    f"Error: Agent timed out after {self.timeout_seconds} seconds"
+                )
+                timed_out_agents.append(agent.name)
+                continue
+            if isinstance(outcome, BaseException):
+                logger.error(f"{agent.name} - Failed in parallel wave: {outcome}")
+                agent_results[agent.name] = f"Error: {str(outcome)}"
+                continue
+
+            agent_results[agent.name] = outcome.get("agent_results", {}).get(
+                agent.name, ""
+            )
+            # Agents return the input messages followed by their own
+            new_messages.extend(outcome.get("messages", messages)[len(messages) :])
+            for key, value in outcome.get("metadata", {}).items():
+                if key.endswith("_trace"):
+                    metadata[key] = value
+
+        metadata["timed_out_agents"] = timed_out_agents
+        return {
+            "agent_results": agent_results,
+            "agents_invoked": state.get("agents_invoked", [])
+            + [agent.name for agent in agents],
+            "messages": messages + new_messages,
+            "metadata": metadata,
+        }
+
+
+def create_parallel_agent_node(
+    agents: Dict[str, BaseAgentNode], timeout_seconds: float
+) -> ParallelAgentNode:
+    """Create the node that fans out a plan wave to several agents."""
+    return ParallelAgentNode(agents, timeout_seconds)
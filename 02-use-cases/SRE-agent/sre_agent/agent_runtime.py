@@ -177,6 +177,7 @@ async def invoke_agent(request: InvocationRequest):
                     "logs_agent",
                     "metrics_agent",
                     "runbooks_agent",
+                    "parallel_agents",
                 ]:
                     agent_results = node_output.get("agent_results", {})
                     logger.info(f"{node_name} completed with results")
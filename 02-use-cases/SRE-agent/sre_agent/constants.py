@@ -85,6 +85,13 @@ class TimeoutConfig(BaseModel):
         description="Maximum time to wait for MCP tools loading",
     )
 
+    agent_execution_timeout_seconds: int = Field(
+        default=150,
+        ge=1,
+        le=1800,
+        description="Maximum time a specialist agent may run when executed in parallel",
+    )
+
 
 class PromptConfig(BaseModel):
     """Prompt configuration constants."""
@@ -152,7 +159,17 @@ class ApplicationConfig(BaseModel):
 
     conversation_state_file: str = Field(
         default=".multi_agent_conversation_state.json",
-        description="Filename for saving conversation state",
+        description="Filename of the legacy single-document conversation state",
+    )
+
+    conversation_journal_file: str = Field(
+        default=".multi_agent_conversation_state.jsonl",
+        description="Filename of the append-only conversation state journal",
+    )
+
+    parallel_agent_execution: bool = Field(
+        default=True,
+        description="Run independent investigation plan steps concurrently",
     )
 
     spinner_chars: list[str] = Field(
@@ -209,6 +226,51 @@ class MemoryConfig(BaseModel):
         description="Maximum character length for conversation content stored in memory",
     )
 
+    # Cache for retrieve_memories results
+    retrieval_cache_ttl_seconds: float = Field(
+        default=300.0,
+        ge=0.0,
+        description="Seconds a retrieve_memories result is reused (0 disables the cache)",
+    )
+
+    retrieval_cache_max_entries: int = Field(
+        default=256,
+        ge=0,
+        description="Maximum number of cached retrieve_memories results",
+    )
+
+    # Write-behind queue for memory events
+    write_behind_enabled: bool = Field(
+        default=True,
+        description="Write memory events from a background queue instead of blocking the caller",
+    )
+
+    write_queue_max_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum number of pending memory writes before callers write synchronously",
+    )
+
+    write_batch_max_messages: int = Field(
+        default=50,
+        ge=1,
+        le=100,
+        description="Maximum number of messages coalesced into one create_event call",
+    )
+
+    write_flush_interval_seconds: float = Field(
+        default=0.5,
+        ge=0.0,
+        description="How long the writer waits to coalesce messages for the same actor and session",
+    )
+
+    write_max_retries: int = Field(
+        default=3,
+        ge=0,
+        le=10,
+        description="Retries with exponential backoff for a failed create_event call",
+    )
+
 
 class AgentsConstant(BaseModel):
     """Agent-specific constants for the SRE system."""
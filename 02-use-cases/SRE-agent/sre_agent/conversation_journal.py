@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Logging will be configured by the main entry point
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+def _serialize_message(msg: Any) -> Any:
+    """Convert a LangChain message (or plain value) to a JSON-safe value."""
+    if hasattr(msg, "model_dump"):
+        data = msg.model_dump()
+    elif hasattr(msg, "dict"):
+        data = msg.dict()
+    elif hasattr(msg, "content"):
+        return {"role": getattr(msg, "role", "unknown"), "content": msg.content}
+    else:
+        return str(msg)
+
+    # The loader rebuilds messages from "role"; LangChain dumps only carry "type"
+    if "role" not in data:
+        data["role"] = {"human": "user", "ai": "assistant"}.get(
+            data.get("type"), data.get("type", "unknown")
+        )
+    return data
+
+
+def _serialize_state(state: Any) -> Dict[str, Any]:
+    """Keep JSON-compatible state values; stringify the rest."""
+    serializable_state = {}
+    if isinstance(state, dict):
+        for k, v in state.items():
+            if k == "messages":
+                continue  # Stored as message records
+            elif isinstance(v, (str, int, float, bool, list, dict, type(None))):
+                serializable_state[k] = v
+            else:
+                serializable_state[k] = str(v)
+    return serializable_state
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str)
+
+
+class ConversationJournal:
+    """Append-only JSONL persistence for interactive conversation state.
+
+    Each save appends only the messages added since the previous save (and
+    the state, when it changed), so a turn costs O(new messages) instead of
+    rewriting the whole history. The journal is compacted into a single
+    snapshot when superseded state records pile up, when the conversation
+    shrinks (/clear, /load), or when the file was changed by someone else.
+
+    Record types, one JSON object per line:
+        {"type": "header", "version": 1, "timestamp": ...}
+        {"type": "message", "message": {...}}
+        {"type": "state", "state": {...}, "timestamp": ...}
+    """
+
+    def __init__(self, path: str, compact_after: int = 50):
+        self.path = Path(path)
+        self.compact_after = compact_after
+        self._persisted_count = 0
+        self._last_message_json: Optional[str] = None
+        self._last_state_json: Optional[str] = None
+        self._stale_records = 0
+        self._file_signature: Optional[Tuple[int, int]] = None
+
+    def _current_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size)
+
+    def _can_append(self, messages: list) -> bool:
+        """Whether the journal on disk still holds a prefix of `messages`."""
+        if self._file_signature is None:
+            return False
+        if self._current_signature() != self._file_signature:
+            return False
+        if len(messages) < self._persisted_count:
+            return False
+        if self._persisted_count == 0:
+            return True
+        # Checking the last persisted message catches /load and /clear
+        last_persisted = _dumps(_serialize_message(messages[self._persisted_count - 1]))
+        return last_persisted == self._last_message_json
+
+    def save(self, messages: list, state: Dict[str, Any]) -> None:
+        """Persist the conversation, appending when possible."""
+        if not self._can_append(messages):
+            self.compact(messages, state)
+            return
+
+        new_messages = [
+            _dumps(_serialize_message(msg)) for msg in messages[self._persisted_count :]
+        ]
+        lines = [
+            f'{{"type":"message","message":{message_json}}}'
+            for message_json in new_messages
+        ]
+        state_json = _dumps(_serialize_state(state))
+        if state_json != self._last_state_json:
+            lines.append(self._state_line(state_json))
+            self._stale_records += 1
+
+        if lines:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+            self._file_signature = self._current_signature()
+
+        self._persisted_count = len(messages)
+        if new_messages:
+            self._last_message_json = new_messages[-1]
+        self._last_state_json = state_json
+
+        if self._stale_records >= self.compact_after:
+            self.compact(messages, state)
+
+    def _state_line(self, state_json: str) -> str:
+        return (
+            f'{{"type":"state","state":{state_json},'
+            f'"timestamp":{json.dumps(datetime.now().isoformat())}}}'
+        )
+
+    def compact(self, messages: list, state: Dict[str, Any]) -> None:
+        """Rewrite the journal as a single snapshot of the conversation."""
+        state_json = _dumps(_serialize_state(state))
+        header = _dumps(
+            {
+                "type": "header",
+                "version": JOURNAL_VERSION,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+        message_jsons = [_dumps(_serialize_message(msg)) for msg in messages]
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(header + "\n")
+            for message_json in message_jsons:
+                f.write(f'{{"type":"message","message":{message_json}}}\n')
+            f.write(self._state_line(state_json) + "\n")
+        os.replace(tmp_path, self.path)
+
+        self._persisted_count = len(messages)
+        self._last_message_json = message_jsons[-1] if message_jsons else None
+        self._last_state_json = state_json
+        self._stale_records = 0
+        self._file_signature = self._current_signature()
+        logger.debug(f"Compacted conversation journal {self.path}")
+
+    def load(self) -> Tuple[Optional[list], Optional[Dict[str, Any]]]:
+        """Replay the journal; returns (None, None) if there is none."""
+        if not self.path.exists():
+            return None, None
+
+        messages: list = []
+        state: Dict[str, Any] = {}
+        stale_records = -1
+        last_state_json = None
+        complete = True
+        with open(self.path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                complete = line.endswith("\n")
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one partial line
+                    logger.warning(
+                        f"Skipping unreadable line {line_number} in {self.path}"
+                    )
+                    continue
+                record_type = record.get("type")
+                if record_type == "message":
+                    messages.append(record.get("message"))
+                elif record_type == "state":
+                    state = record.get("state", {})
+                    stale_records += 1
+                    last_state_json = _dumps(state)
+
+        # Continue appending to the journal we just replayed
+        self._persisted_count = len(messages)
+        self._last_message_json = _dumps(messages[-1]) if messages else None
+        self._last_state_json = last_state_json
+        self._stale_records = max(stale_records, 0)
+        # After a partial last line, the next save rewrites instead of appending
+        self._file_signature = self._current_signature() if complete else None
+        return messages, state
+
+
+_journals: Dict[str, ConversationJournal] = {}
+
+
+def get_conversation_journal(path: str) -> ConversationJournal:
+    """Return the journal for `path`, keeping append offsets across saves."""
+    key = str(Path(path).resolve())
+    journal = _journals.get(key)
+    if journal is None:
+        journal = ConversationJournal(path)
+        _journals[key] = journal
+    return journal
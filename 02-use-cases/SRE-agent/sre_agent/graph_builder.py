@@ -11,6 +11,7 @@ from .agent_nodes import (
     create_kubernetes_agent,
     create_logs_agent,
     create_metrics_agent,
+    create_parallel_agent_node,
     create_runbooks_agent,
 )
 from .agent_state import AgentState
@@ -61,6 +62,8 @@ def _route_supervisor(state: AgentState) -> str:
         "logs_agent": "logs_agent",
         "metrics_agent": "metrics_agent",
         "runbooks_agent": "runbooks_agent",
+        # A wave of independent plan steps run concurrently
+        "parallel": "parallel_agents",
     }
 
     return agent_map.get(next_agent, "aggregate")
@@ -92,6 +95,7 @@ def build_multi_agent_graph(
     force_delete_memory: bool = False,
     export_graph: bool = False,
     graph_output_path: str = "./docs/sre_agent_architecture.md",
+    parallel_agents: bool = False,
     **llm_kwargs,
 ) -> StateGraph:
     """Build the multi-agent collaboration graph.
@@ -102,6 +106,7 @@ def build_multi_agent_graph(
         force_delete_memory: Whether to force delete existing memory
         export_graph: Whether to export the graph as a Mermaid diagram
         graph_output_path: Path to save the exported Mermaid diagram (default: ./docs/sre_agent_architecture.md)
+        parallel_agents: Whether independent plan steps run concurrently
         **llm_kwargs: Additional arguments for LLM
 
     Returns:
@@ -114,7 +119,10 @@ def build_multi_agent_graph(
 
     # Create supervisor
     supervisor = SupervisorAgent(
-        llm_provider=llm_provider, force_delete_memory=force_delete_memory, **llm_kwargs
+        llm_provider=llm_provider,
+        force_delete_memory=force_delete_memory,
+        parallel_agents=parallel_agents,
+        **llm_kwargs,
     )
 
     # Create agent nodes with filtered tools and metadata from constants
@@ -152,6 +160,28 @@ def build_multi_agent_graph(
     workflow.add_node("runbooks_agent", runbooks_agent)
     workflow.add_node("aggregate", supervisor.aggregate_responses)
 
+    route_map = {
+        "kubernetes_agent": "kubernetes_agent",
+        "logs_agent": "logs_agent",
+        "metrics_agent": "metrics_agent",
+        "runbooks_agent": "runbooks_agent",
+        "aggregate": "aggregate",
+    }
+
+    if parallel_agents:
+        parallel_node = create_parallel_agent_node(
+            {
+                "kubernetes_agent": kubernetes_agent,
+                "logs_agent": logs_agent,
+                "metrics_agent": metrics_agent,
+                "runbooks_agent": runbooks_agent,
+            },
+            timeout_seconds=SREConstants.timeouts.agent_execution_timeout_seconds,
+        )
+        workflow.add_node("parallel_agents", parallel_node)
+        workflow.add_edge("parallel_agents", "supervisor")
+        route_map["parallel_agents"] = "parallel_agents"
+
     # Set entry point
     workflow.set_entry_point("prepare")
 
@@ -159,17 +189,7 @@ def build_multi_agent_graph(
     workflow.add_edge("prepare", "supervisor")
 
     # Add conditional edges from supervisor
-    workflow.add_conditional_edges(
-        "supervisor",
-        _route_supervisor,
-        {
-            "kubernetes_agent": "kubernetes_agent",
-            "logs_agent": "logs_agent",
-            "metrics_agent": "metrics_agent",
-            "runbooks_agent": "runbooks_agent",
-            "aggregate": "aggregate",
-        },
-    )
+    workflow.add_conditional_edges("supervisor", _route_supervisor, route_map)
 
     # Add edges from agents back to supervisor
     workflow.add_edge("kubernetes_agent", "supervisor")
@@ -1,6 +1,11 @@
 """Memory module for SRE Agent long-term memory capabilities."""
 
-from .client import SREMemoryClient
+from .client import (
+    SREMemoryClient,
+    aget_memory_client,
+    get_memory_client,
+    reset_memory_clients,
+)
 from .config import MemoryConfig
 from .conversation_manager import (
     ConversationMemoryManager,
@@ -18,9 +23,17 @@ from .tools import (
     SaveInvestigationTool,
     SavePreferenceTool,
 )
+from .write_behind import (
+    MemoryWriteBehindQueue,
+    flush_memory_writes,
+    get_write_behind_queue,
+)
 
 __all__ = [
     "SREMemoryClient",
+    "get_memory_client",
+    "aget_memory_client",
+    "reset_memory_clients",
     "MemoryConfig",
     "UserPreference",
     "InfrastructureKnowledge",
@@ -32,4 +45,7 @@ __all__ = [
     "ConversationMemoryManager",
     "ConversationMessage",
     "create_conversation_memory_manager",
+    "MemoryWriteBehindQueue",
+    "get_write_behind_queue",
+    "flush_memory_writes",
 ]
@@ -1,10 +1,15 @@
+import asyncio
 import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from bedrock_agentcore.memory import MemoryClient
 
+from ..constants import SREConstants
 from .config import _load_memory_config
+from .retrieval_cache import RetrievalCache
+from .write_behind import submit_memory_event
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -30,6 +35,10 @@ class SREMemoryClient:
         self.config = _load_memory_config()
         self.memory_ids = {}
         self.force_delete = force_delete
+        self.retrieval_cache = RetrievalCache(
+            max_entries=SREConstants.memory.retrieval_cache_max_entries,
+            ttl_seconds=SREConstants.memory.retrieval_cache_ttl_seconds,
+        )
         self._initialize_memories()
 
     def _initialize_memories(self):
@@ -175,6 +184,9 @@ class SREMemoryClient:
     ) -> bool:
         """Save an event to memory using create_event API.
 
+        The event is written by the background write-behind queue; True means
+        it was accepted for writing.
+
         actor_id is always required. session_id is required for infrastructure
         and investigations memory types, but optional for preferences.
         """
@@ -214,19 +226,28 @@ class SREMemoryClient:
             # but the namespace doesn't use it
             actual_session_id = session_id if session_id else "preferences-default"
 
-            result = self.client.create_event(
+            # Cached retrievals for this actor may now be stale. The write
+            # lands later, so they are dropped again once it has been written;
+            # otherwise a retrieval in between would be cached for the full TTL
+            namespace = self._get_namespace(memory_type, actor_id)
+
+            def invalidate_cached_retrievals() -> None:
+                self.retrieval_cache.invalidate(namespace)
+
+            if not submit_memory_event(
+                self.client,
                 memory_id=self.memory_id,
                 actor_id=actor_id,
                 session_id=actual_session_id,
                 messages=messages,
-            )
+                on_written=invalidate_cached_retrievals,
+            ):
+                return False
+
+            invalidate_cached_retrievals()
 
-            event_id = result.get("eventId", "unknown")
-            logger.info(f"create_event result: {result}")
             logger.info("=== SAVE_EVENT TRACE END ===")
-            logger.info(
-                f"Saved {memory_type} event for {actor_id} (event_id: {event_id})"
-            )
+            logger.info(f"Queued {memory_type} event for {actor_id}")
             logger.info(f"Event data size: {len(str(event_data))} characters")
             return True
 
@@ -244,7 +265,11 @@ class SREMemoryClient:
         max_results: int = 10,
         session_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Retrieve memories using the retrieve_memories API."""
+        """Retrieve memories using the retrieve_memories API.
+
+        Results are cached per (namespace, normalized query, max_results) for
+        SREConstants.memory.retrieval_cache_ttl_seconds.
+        """
         if not self.memory_id:
             logger.warning("Memory system not initialized, returning empty results")
             return []
@@ -253,6 +278,14 @@ class SREMemoryClient:
             # Get appropriate namespace (session_id only needed for infrastructure/investigations)
             namespace = self._get_namespace(memory_type, actor_id, session_id)
 
+            cache_key = RetrievalCache.make_key(namespace, query, max_results)
+            cached = self.retrieval_cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    f"Using {len(cached)} cached {memory_type} memories for {actor_id} (namespace={namespace})"
+                )
+                return cached
+
             logger.info(
                 f"Retrieving {memory_type} memories: actor_id={actor_id}, namespace={namespace}, query='{query}'"
             )
@@ -267,6 +300,7 @@ class SREMemoryClient:
             logger.info(
                 f"Retrieved {len(result)} {memory_type} memories for {actor_id}"
             )
+            self.retrieval_cache.put(cache_key, result)
             if result:
                 logger.debug(
                     f"First result keys: {list(result[0].keys()) if result else 'N/A'}"
@@ -291,6 +325,24 @@ class SREMemoryClient:
             )
             return []
 
+    async def aretrieve_memories(
+        self,
+        memory_type: str,
+        actor_id: str,
+        query: str,
+        max_results: int = 10,
+        session_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Async variant of retrieve_memories that runs the call in a worker thread."""
+        return await asyncio.to_thread(
+            self.retrieve_memories,
+            memory_type,
+            actor_id,
+            query,
+            max_results,
+            session_id,
+        )
+
     def _get_namespace(
         self, memory_type: str, actor_id: str, session_id: Optional[str] = None
     ) -> str:
@@ -377,3 +429,67 @@ class SREMemoryClient:
 
         except Exception as e:
             logger.warning(f"Failed to write memory ID to file: {e}")
+
+
+# Process-wide clients keyed by (region, memory_name). Constructing an
+# SREMemoryClient lists memories on the control plane and may create
+# strategies, so every agent node, the supervisor and the memory tools share
+# one initialized client instead of paying that on each invocation.
+_memory_clients: Dict[Tuple[str, str], SREMemoryClient] = {}
+_memory_clients_lock = threading.Lock()
+_memory_client_init_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+
+def get_memory_client(
+    memory_name: str = "sre_agent_memory",
+    region: str = "us-east-1",
+    force_delete: bool = False,
+) -> SREMemoryClient:
+    """Return the shared memory client for a region and memory name.
+
+    The client is created lazily on first use; concurrent callers for the same
+    key wait for that single initialization. `force_delete` only applies when
+    the client is first created. Clients that failed to initialize (offline
+    mode) are not cached, so a later call retries.
+    """
+    key = (region, memory_name)
+    client = _memory_clients.get(key)
+    if client is not None:
+        return client
+
+    with _memory_clients_lock:
+        init_lock = _memory_client_init_locks.setdefault(key, threading.Lock())
+
+    with init_lock:
+        client = _memory_clients.get(key)
+        if client is not None:
+            return client
+
+        client = SREMemoryClient(
+            memory_name=memory_name, region=region, force_delete=force_delete
+        )
+        if client.memory_id:
+            _memory_clients[key] = client
+            logger.info(
+                f"Registered shared memory client for {memory_name} in {region}"
+            )
+        return client
+
+
+async def aget_memory_client(
+    memory_name: str = "sre_agent_memory",
+    region: str = "us-east-1",
+    force_delete: bool = False,
+) -> SREMemoryClient:
+    """Async variant of get_memory_client that never blocks the event loop."""
+    client = _memory_clients.get((region, memory_name))
+    if client is not None:
+        return client
+    return await asyncio.to_thread(get_memory_client, memory_name, region, force_delete)
+
+
+def reset_memory_clients() -> None:
+    """Drop all shared memory clients (used by tests and after config changes)."""
+    with _memory_clients_lock:
+        _memory_clients.clear()
+        _memory_client_init_locks.clear()
@@ -5,6 +5,7 @@ from typing import List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 from .client import SREMemoryClient
+from .write_behind import submit_memory_event
 
 # Configure logging with basicConfig
 logging.basicConfig(
@@ -40,6 +41,22 @@ class ConversationMemoryManager:
         self.memory_client = memory_client
         logger.info("Initialized ConversationMemoryManager")
 
+    def _submit(
+        self, user_id: str, session_id: str, messages: List[Tuple[str, str]]
+    ) -> bool:
+        """Hand messages to the write-behind queue (or write them directly)."""
+        if not self.memory_client.memory_id:
+            logger.warning("Memory system not initialized, skipping conversation storage")
+            return False
+
+        return submit_memory_event(
+            self.memory_client.client,
+            memory_id=self.memory_client.memory_id,
+            actor_id=user_id,  # Use user_id as actor_id as specified
+            session_id=session_id,
+            messages=messages,  # AgentCore expects list of tuples
+        )
+
     def store_conversation_message(
         self,
         content: str,
@@ -51,6 +68,9 @@ class ConversationMemoryManager:
         """
         Store a conversation message in memory using create_event.
 
+        The write is queued and performed in the background; the return value
+        reports whether the message was accepted.
+
         Args:
             content: The message content
             role: USER, ASSISTANT, or TOOL
@@ -81,18 +101,12 @@ class ConversationMemoryManager:
             # Format message as tuple for AgentCore memory
             message_tuple = (content, role)
 
-            # Use AgentCore's create_event with user_id as actor_id
-            result = self.memory_client.client.create_event(
-                memory_id=self.memory_client.memory_id,
-                actor_id=user_id,  # Use user_id as actor_id as specified
-                session_id=session_id,  # Use provided session_id
-                messages=[message_tuple],  # AgentCore expects list of tuples
-            )
+            # Queue the create_event call with user_id as actor_id; the
+            # write-behind queue batches it with other pending messages
+            if not self._submit(user_id, session_id, [message_tuple]):
+                return False
 
-            event_id = result.get("eventId", "unknown")
-            logger.info(
-                f"Successfully stored conversation message (event_id: {event_id})"
-            )
+            logger.info("Queued conversation message for storage")
             return True
 
         except Exception as e:
@@ -109,6 +123,9 @@ class ConversationMemoryManager:
         """
         Store multiple conversation messages in a single create_event call.
 
+        The write is queued and may be coalesced with other pending messages
+        for the same user and session.
+
         Args:
             messages: List of (content, role) tuples
             user_id: User ID to use as actor_id
@@ -153,17 +170,12 @@ class ConversationMemoryManager:
                 else:
                     truncated_messages.append((content, role))
 
-            # Use AgentCore's create_event with batch of messages
-            result = self.memory_client.client.create_event(
-                memory_id=self.memory_client.memory_id,
-                actor_id=user_id,  # Use user_id as actor_id as specified
-                session_id=session_id,  # Use provided session_id
-                messages=truncated_messages,  # AgentCore expects list of tuples
-            )
+            # Queue the batch of messages for create_event
+            if not self._submit(user_id, session_id, truncated_messages):
+                return False
 
-            event_id = result.get("eventId", "unknown")
             logger.info(
-                f"Successfully stored conversation batch of {len(messages)} messages (event_id: {event_id})"
+                f"Queued conversation batch of {len(messages)} messages for storage"
             )
             return True
 
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import re
@@ -44,10 +45,7 @@ class MemoryHookProvider:
             # Retrieve relevant memories to provide context
             # Use comprehensive query to get all user preference types
             preferences = self.memory_client.retrieve_memories(
-                memory_type="preferences",
-                actor_id=user_id,
-                query=SREConstants.memory.user_preferences_query,
-                max_results=SREConstants.memory.max_preferences_results,
+                **self._preferences_request(user_id)
             )
 
             # Get infrastructure knowledge for specific user only
@@ -55,87 +53,156 @@ class MemoryHookProvider:
                 f"Retrieving infrastructure knowledge for user '{user_id}' for query: '{query}'"
             )
             all_knowledge = self.memory_client.retrieve_memories(
-                memory_type="infrastructure",
-                actor_id=user_id,  # Only retrieve memories for the current user
-                query=query,
-                max_results=SREConstants.memory.max_infrastructure_results,
-                session_id=None,  # Cross-session search for planning purposes
+                **self._infrastructure_request(user_id, query)
             )
 
-            # Organize knowledge by agent for later distribution
-            knowledge_by_agent = self._organize_memories_by_agent(all_knowledge)
-            # Log summary with breakdown
-            if knowledge_by_agent:
-                agent_summary = ", ".join(
-                    [
-                        f"{agent}: {len(memories)} memories"
-                        for agent, memories in knowledge_by_agent.items()
-                    ]
-                )
-                logger.info(
-                    f"Retrieved infrastructure knowledge for user '{user_id}' from {len(knowledge_by_agent)} different sources: {agent_summary}"
-                )
-            else:
-                logger.info(f"No infrastructure knowledge found for user '{user_id}'")
-
             # Get past investigation summaries for similar issues (cross-session search for planning)
             logger.info(
                 f"Retrieving investigation summaries for user '{user_id}' for query: '{query}'"
             )
             investigations = self.memory_client.retrieve_memories(
-                memory_type="investigations",
-                actor_id=user_id,  # Use user_id to retrieve only user-specific investigations
-                query=query,
-                max_results=SREConstants.memory.max_investigation_results,
-                session_id=None,  # Cross-session search for planning purposes
+                **self._investigations_request(user_id, query)
             )
 
-            if investigations:
-                logger.info(
-                    f"Retrieved {len(investigations)} past investigation summaries for user '{user_id}'"
-                )
-            else:
-                logger.info(
-                    f"No past investigation summaries found for user '{user_id}'"
-                )
+            return self._build_investigation_context(
+                user_id, preferences, all_knowledge, investigations
+            )
 
-            # Extract content from memory records - need to get the 'text' field from within 'content'
-            preference_contents = []
-            for record in preferences:
-                content = record.get("content", {})
-                if content and "text" in content:
-                    preference_contents.append(content["text"])
-
-            # Log the extracted user preferences for debugging
-            logger.debug("Extracted user preferences content:")
-            for i, pref in enumerate(preference_contents):
-                logger.debug(f"Preference {i + 1}: {pref}")
-            logger.debug(f"Total extracted preferences: {len(preference_contents)}")
-
-            memory_context = {
-                "user_preferences": preference_contents,
-                "infrastructure_by_agent": knowledge_by_agent,
-                "past_investigations": investigations,
-            }
-
-            total_knowledge = sum(
-                len(memories) for memories in knowledge_by_agent.values()
+        except Exception as e:
+            logger.error(
+                f"Failed to retrieve memory context on investigation start: {e}"
             )
+            return self._empty_investigation_context()
+
+    async def aon_investigation_start(
+        self,
+        query: str,
+        user_id: str,
+        actor_id: str,
+        session_id: str,
+        incident_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async variant of on_investigation_start.
+
+        Preferences, infrastructure knowledge and past investigations are
+        retrieved concurrently, so planning waits for the slowest namespace
+        rather than all three in turn.
+        """
+        try:
             logger.info(
-                f"Retrieved memory context for investigation: {len(preference_contents)} preference contents (from {len(preferences)} records), {total_knowledge} knowledge items from {len(knowledge_by_agent)} agents, {len(investigations)} past investigations"
+                f"Retrieving preferences, infrastructure knowledge and investigation summaries concurrently for user '{user_id}' for query: '{query}'"
+            )
+            preferences, all_knowledge, investigations = await asyncio.gather(
+                self.memory_client.aretrieve_memories(
+                    **self._preferences_request(user_id)
+                ),
+                self.memory_client.aretrieve_memories(
+                    **self._infrastructure_request(user_id, query)
+                ),
+                self.memory_client.aretrieve_memories(
+                    **self._investigations_request(user_id, query)
+                ),
             )
 
-            return memory_context
+            return self._build_investigation_context(
+                user_id, preferences, all_knowledge, investigations
+            )
 
         except Exception as e:
             logger.error(
                 f"Failed to retrieve memory context on investigation start: {e}"
             )
-            return {
-                "user_preferences": [],
-                "infrastructure_knowledge": [],
-                "past_investigations": [],
-            }
+            return self._empty_investigation_context()
+
+    def _preferences_request(self, user_id: str) -> Dict[str, Any]:
+        return {
+            "memory_type": "preferences",
+            "actor_id": user_id,
+            "query": SREConstants.memory.user_preferences_query,
+            "max_results": SREConstants.memory.max_preferences_results,
+        }
+
+    def _infrastructure_request(self, user_id: str, query: str) -> Dict[str, Any]:
+        return {
+            "memory_type": "infrastructure",
+            "actor_id": user_id,  # Only retrieve memories for the current user
+            "query": query,
+            "max_results": SREConstants.memory.max_infrastructure_results,
+            "session_id": None,  # Cross-session search for planning purposes
+        }
+
+    def _investigations_request(self, user_id: str, query: str) -> Dict[str, Any]:
+        return {
+            "memory_type": "investigations",
+            "actor_id": user_id,  # Use user_id to retrieve only user-specific investigations
+            "query": query,
+            "max_results": SREConstants.memory.max_investigation_results,
+            "session_id": None,  # Cross-session search for planning purposes
+        }
+
+    def _empty_investigation_context(self) -> Dict[str, Any]:
+        return {
+            "user_preferences": [],
+            "infrastructure_knowledge": [],
+            "past_investigations": [],
+        }
+
+    def _build_investigation_context(
+        self,
+        user_id: str,
+        preferences: List[Dict[str, Any]],
+        all_knowledge: List[Dict[str, Any]],
+        investigations: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Organize retrieved memory records into the investigation context."""
+        # Organize knowledge by agent for later distribution
+        knowledge_by_agent = self._organize_memories_by_agent(all_knowledge)
+        # Log summary with breakdown
+        if knowledge_by_agent:
+            agent_summary = ", ".join(
+                [
+                    f"{agent}: {len(memories)} memories"
+                    for agent, memories in knowledge_by_agent.items()
+                ]
+            )
+            logger.info(
+                f"Retrieved infrastructure knowledge for user '{user_id}' from {len(knowledge_by_agent)} different sources: {agent_summary}"
+            )
+        else:
+            logger.info(f"No infrastructure knowledge found for user '{user_id}'")
+
+        if investigations:
+            logger.info(
+                f"Retrieved {len(investigations)} past investigation summaries for user '{user_id}'"
+            )
+        else:
+            logger.info(f"No past investigation summaries found for user '{user_id}'")
+
+        # Extract content from memory records - need to get the 'text' field from within 'content'
+        preference_contents = []
+        for record in preferences:
+            content = record.get("content", {})
+            if content and "text" in content:
+                preference_contents.append(content["text"])
+
+        # Log the extracted user preferences for debugging
+        logger.debug("Extracted user preferences content:")
+        for i, pref in enumerate(preference_contents):
+            logger.debug(f"Preference {i + 1}: {pref}")
+        logger.debug(f"Total extracted preferences: {len(preference_contents)}")
+
+        memory_context = {
+            "user_preferences": preference_contents,
+            "infrastructure_by_agent": knowledge_by_agent,
+            "past_investigations": investigations,
+        }
+
+        total_knowledge = sum(len(memories) for memories in knowledge_by_agent.values())
+        logger.info(
+            f"Retrieved memory context for investigation: {len(preference_contents)} preference contents (from {len(preferences)} records), {total_knowledge} knowledge items from {len(knowledge_by_agent)} agents, {len(investigations)} past investigations"
+        )
+
+        return memory_context
 
     def on_agent_response(
         self, agent_name: str, response: Dict[str, Any], state: Dict[str, Any]
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging with basicConfig
+logging.basicConfig(
+    level=logging.INFO,  # Set the log level to INFO
+    # Define log message format
+    format="%(asctime)s,p%(process)s,{%(filename)s:%(lineno)d},%(levelname)s,%(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, int]
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+class RetrievalCache:
+    """LRU cache with a TTL for retrieve_memories results.
+
+    Entries are keyed on (namespace, normalized query, top_k). Follow-up
+    questions in a session re-use the same namespaces and often the same
+    query, so they are answered from here instead of the memory service.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[Dict[str, Any]]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, query: str, top_k: int) -> CacheKey:
+        return (namespace, _normalize_query(query), top_k)
+
+    def get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        """Cached records for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, records = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Copy so callers cannot modify the cached list
+            return list(records)
+
+    def put(self, key: CacheKey, records: List[Dict[str, Any]]) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, list(records))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str) -> int:
+        """Drop entries for `namespace` and the namespaces nested under it."""
+        nested = namespace.rstrip("/") + "/"
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key[0] == namespace or key[0].startswith(nested)
+            ]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug(
+                f"Invalidated {len(stale)} cached retrievals under {namespace}"
+            )
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,307 @@
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Configure logging with basicConfig
+logging.basicConfig(
+    level=logging.INFO,  # Set the log level to INFO
+    # Define log message format
+    format="%(asctime)s,p%(process)s,{%(filename)s:%(lineno)d},%(levelname)s,%(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PendingWrite(NamedTuple):
+    """Messages waiting to be written to one (actor, session) event stream."""
+
+    client: Any  # bedrock_agentcore MemoryClient
+    memory_id: str
+    actor_id: str
+    session_id: str
+    messages: List[Tuple[str, str]]
+    # Called after the messages were written successfully
+    on_written: Tuple[Callable[[], None], ...] = ()
+
+
+def _notify_written(write: PendingWrite) -> None:
+    for callback in write.on_written:
+        try:
+            callback()
+        except Exception as e:
+            logger.warning(f"Memory write callback failed: {e}")
+
+
+_STOP = object()
+
+
+class MemoryWriteBehindQueue:
+    """Background writer for AgentCore memory events.
+
+    Callers hand messages to `submit` and return immediately; a worker thread
+    drains the bounded queue, coalesces everything pending for the same
+    (actor, session) into batched create_event calls, and retries failed
+    calls with exponential backoff. When the queue is full, `submit` waits
+    briefly and then writes on the caller's thread rather than dropping data.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        max_batch_messages: int = 50,
+        flush_interval_seconds: float = 0.5,
+        max_retries: int = 3,
+        retry_base_delay_seconds: float = 0.5,
+        enqueue_timeout_seconds: float = 1.0,
+    ):
+        self.max_batch_messages = max_batch_messages
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay_seconds = retry_base_delay_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="memory-write-behind", daemon=True
+                )
+                self._worker.start()
+
+    def submit(
+        self,
+        client: Any,
+        memory_id: str,
+        actor_id: str,
+        session_id: str,
+        messages: List[Tuple[str, str]],
+        on_written: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """Queue messages for writing.
+
+        Returns True once the messages are accepted. If the queue has been shut
+        down, or stays full past the enqueue timeout, the write happens
+        synchronously and its result is returned. `on_written` is called once
+        the messages have been written, from whichever thread wrote them.
+        """
+        write = PendingWrite(
+            client,
+            memory_id,
+            actor_id,
+            session_id,
+            list(messages),
+            (on_written,) if on_written else (),
+        )
+        if self._closed:
+            return self._write_now(write)
+
+        self._ensure_started()
+        with self._pending_cond:
+            self._pending += 1
+        try:
+            self._queue.put(write, timeout=self.enqueue_timeout_seconds)
+            return True
+        except queue.Full:
+            self._done(1)
+            logger.warning(
+                f"Memory write queue is full, writing {len(write.messages)} messages synchronously for actor_id={actor_id}, session_id={session_id}"
+            )
+            return self._write_now(write)
+
+    def _write_now(self, write: PendingWrite) -> bool:
+        written = self._write_with_retry(write)
+        if written:
+            _notify_written(write)
+        return written
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued write has completed; False on timeout."""
+        with self._pending_cond:
+            return self._pending_cond.wait_for(
+                lambda: self._pending == 0, timeout=timeout
+            )
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> None:
+        """Write everything still queued and stop the worker thread."""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+
+        if worker is None:
+            return
+        # The sentinel is queued behind all pending writes, so they drain first
+        self._queue.put(_STOP)
+        worker.join(timeout=timeout)
+        if worker.is_alive():
+            logger.warning(
+                f"Memory write-behind worker did not finish within {timeout}s; {self._pending} writes may be lost"
+            )
+
+    def _done(self, count: int) -> None:
+        with self._pending_cond:
+            self._pending -= count
+            self._pending_cond.notify_all()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            # Collect whatever else arrives within the flush interval
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Memory write-behind batch failed: {e}", exc_info=True)
+            finally:
+                self._done(len(batch))
+
+    def _write_batch(self, batch: List[PendingWrite]) -> None:
+        """Coalesce writes per (actor, session) and send them in order."""
+        groups: Dict[Tuple[int, str, str, str], PendingWrite] = {}
+        for write in batch:
+            key = (id(write.client), write.memory_id, write.actor_id, write.session_id)
+            if key in groups:
+                groups[key].messages.extend(write.messages)
+                groups[key] = groups[key]._replace(
+                    on_written=groups[key].on_written + write.on_written
+                )
+            else:
+                groups[key] = write._replace(messages=list(write.messages))
+
+        for write in groups.values():
+            written = True
+            for start in range(0, len(write.messages), self.max_batch_messages):
+                chunk = write.messages[start : start + self.max_batch_messages]
+                if not self._write_with_retry(write._replace(messages=chunk)):
+                    written = False
+            if written:
+                _notify_written(write)
+
+    def _write_with_retry(self, write: PendingWrite) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = write.client.create_event(
+                    memory_id=write.memory_id,
+                    actor_id=write.actor_id,
+                    session_id=write.session_id,
+                    messages=write.messages,
+                )
+                event_id = result.get("eventId", "unknown")
+                logger.info(
+                    f"Wrote {len(write.messages)} memory messages for actor_id={write.actor_id}, session_id={write.session_id} (event_id: {event_id})"
+                )
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(
+                        f"Dropping {len(write.messages)} memory messages for actor_id={write.actor_id}, session_id={write.session_id} after {attempt + 1} attempts: {e}"
+                    )
+                    return False
+                delay = self.retry_base_delay_seconds * (2**attempt)
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning(
+                    f"create_event failed (attempt {attempt + 1}/{self.max_retries + 1}), retrying in {delay:.2f}s: {e}"
+                )
+                time.sleep(delay)
+        return False
+
+
+_write_queue: Optional[MemoryWriteBehindQueue] = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_behind_queue() -> Optional[MemoryWriteBehindQueue]:
+    """Return the process-wide write queue, or None if write-behind is disabled.
+
+    The queue is created on first use and flushed at interpreter exit.
+    """
+    global _write_queue
+
+    from ..constants import SREConstants
+
+    settings = SREConstants.memory
+    if not settings.write_behind_enabled:
+        return None
+    if _write_queue is not None:
+        return _write_queue
+
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = MemoryWriteBehindQueue(
+                max_queue_size=settings.write_queue_max_size,
+                max_batch_messages=settings.write_batch_max_messages,
+                flush_interval_seconds=settings.write_flush_interval_seconds,
+                max_retries=settings.write_max_retries,
+            )
+            atexit.register(_write_queue.shutdown)
+        return _write_queue
+
+
+def submit_memory_event(
+    client: Any,
+    memory_id: str,
+    actor_id: str,
+    session_id: str,
+    messages: List[Tuple[str, str]],
+    on_written: Optional[Callable[[], None]] = None,
+) -> bool:
+    """Write messages through the shared queue, or directly if it is disabled.
+
+    `on_written` is called once the messages have been written.
+    """
+    write_queue = get_write_behind_queue()
+    if write_queue is not None:
+        return write_queue.submit(
+            client, memory_id, actor_id, session_id, messages, on_written
+        )
+
+    client.create_event(
+        memory_id=memory_id,
+        actor_id=actor_id,
+        session_id=session_id,
+        messages=messages,
+    )
+    if on_written:
+        on_written()
+    return True
+
+
+def flush_memory_writes(timeout: Optional[float] = None) -> bool:
+    """Wait for queued memory writes to complete; True if nothing is pending."""
+    if _write_queue is None:
+        return True
+    return _write_queue.flush(timeout=timeout)
@@ -24,6 +24,7 @@ from langgraph.errors import GraphRecursionError
 
 from .agent_state import AgentState
 from .constants import SREConstants
+from .conversation_journal import get_conversation_journal
 from .graph_builder import build_multi_agent_graph
 from .logging_config import configure_logging, should_show_debug_traces
 
@@ -374,10 +375,18 @@ async def create_multi_agent_system(
     export_graph: bool = False,
     graph_output_path: str = "./docs/sre_agent_architecture.md",
     region_name: str = None,
+    parallel_agents: Optional[bool] = None,
     **llm_kwargs,
 ):
-    """Create multi-agent system with MCP tools."""
+    """Create multi-agent system with MCP tools.
+
+    When `parallel_agents` is enabled (the default comes from
+    SREConstants.app.parallel_agent_execution), independent investigation
+    plan steps run concurrently instead of one agent at a time.
+    """
     logger.info(f"Creating multi-agent system with provider: {provider}")
+    if parallel_agents is None:
+        parallel_agents = SREConstants.app.parallel_agent_execution
 
     # Get Anthropic API key if needed
     if provider == "anthropic" and not llm_kwargs.get("api_key"):
@@ -460,7 +469,7 @@ async def create_multi_agent_system(
     # Add memory tools if memory system is enabled
     memory_tools = []
     try:
-        from .memory.client import SREMemoryClient
+        from .memory.client import get_memory_client
         from .memory.config import _load_memory_config
         from .memory.tools import create_memory_tools
 
@@ -469,7 +478,7 @@ async def create_multi_agent_system(
             logger.debug("Adding memory tools to agent tool list")
             # Use the region from parameter if provided, otherwise use config default
             memory_region = region_name if region_name else memory_config.region
-            memory_client = SREMemoryClient(
+            memory_client = get_memory_client(
                 memory_name=memory_config.memory_name,
                 region=memory_region,
                 force_delete=force_delete_memory,
@@ -577,6 +586,7 @@ async def create_multi_agent_system(
         force_delete_memory=force_delete_memory,
         export_graph=export_graph,
         graph_output_path=graph_output_path,
+        parallel_agents=parallel_agents,
         **llm_kwargs,
     )
 
@@ -586,60 +596,41 @@ async def create_multi_agent_system(
 def _save_conversation_state(
     messages: list,
     state: Dict[str, Any],
-    filename: str = SREConstants.app.conversation_state_file,
+    filename: str = SREConstants.app.conversation_journal_file,
 ):
-    """Save conversation state to a file."""
+    """Save conversation state to an append-only journal file.
+
+    Only messages added since the last save are written; the journal is
+    compacted periodically (see ConversationJournal).
+    """
     try:
-        # Convert messages to serializable format
-        serializable_messages = []
-        for msg in messages:
-            if hasattr(msg, "model_dump"):
-                serializable_messages.append(msg.model_dump())
-            elif hasattr(msg, "dict"):
-                serializable_messages.append(msg.dict())
-            elif hasattr(msg, "content"):
-                serializable_messages.append(
-                    {"role": getattr(msg, "role", "unknown"), "content": msg.content}
-                )
-            else:
-                serializable_messages.append(str(msg))
-
-        # Convert state to serializable format
-        serializable_state = {}
-        if isinstance(state, dict):
-            # Filter out non-serializable items
-            for k, v in state.items():
-                if k == "messages":
-                    continue  # Already handled above
-                elif isinstance(v, (str, int, float, bool, list, dict, type(None))):
-                    serializable_state[k] = v
-                else:
-                    serializable_state[k] = str(v)
-
-        with open(filename, "w") as f:
-            json.dump(
-                {
-                    "messages": serializable_messages,
-                    "state": serializable_state,
-                    "timestamp": datetime.now().isoformat(),
-                },
-                f,
-                indent=2,
-            )
+        get_conversation_journal(filename).save(messages, state)
         logger.debug(f"Saved conversation state to {filename}")
     except Exception as e:
         logger.error(f"Failed to save conversation state: {e}")
 
 
 def _load_conversation_state(
-    filename: str = SREConstants.app.conversation_state_file,
+    filename: str = SREConstants.app.conversation_journal_file,
 ) -> tuple[Optional[list], Optional[Dict[str, Any]]]:
-    """Load conversation state from a file."""
+    """Load conversation state by replaying the journal file.
+
+    Falls back to the legacy single-document JSON state file when no journal
+    exists yet.
+    """
     try:
         if Path(filename).exists():
-            with open(filename, "r") as f:
+            messages, state = get_conversation_journal(filename).load()
+            logger.info(
+                f"Loaded conversation state from {filename} ({len(messages)} messages)"
+            )
+            return messages, state
+
+        legacy_filename = SREConstants.app.conversation_state_file
+        if Path(legacy_filename).exists():
+            with open(legacy_filename, "r") as f:
                 data = json.load(f)
-                logger.info(f"Loaded conversation state from {filename}")
+                logger.info(f"Loaded conversation state from {legacy_filename}")
                 return data.get("messages", []), data.get("state", {})
     except Exception as e:
         logger.error(f"Failed to load conversation state: {e}")
@@ -653,6 +644,7 @@ async def _run_interactive_session(
     save_markdown: bool = True,
     force_delete_memory: bool = False,
     region_name: str = "us-east-1",
+    parallel_agents: Optional[bool] = None,
 ):
     """Run an interactive multi-turn conversation session."""
     # Buffer to store last query and response for /savereport command
@@ -690,6 +682,7 @@ async def _run_interactive_session(
         force_delete_memory=force_delete_memory,
         export_graph=False,  # Don't export in interactive mode each time
         region_name=region_name,
+        parallel_agents=parallel_agents,
     )
 
     # Initialize conversation state
@@ -926,6 +919,18 @@ async def _run_interactive_session(
                             elif metadata.get("plan_pending_approval"):
                                 print("🧭 Supervisor: Plan created, awaiting approval")
 
+                        elif node_name == "parallel_agents":
+                            metadata = node_output.get("metadata", {})
+                            agent_names = ", ".join(
+                                agent.replace("_agent", "").title()
+                                for agent in metadata.get("parallel_agents", [])
+                            )
+                            print(f"\n🔧 Parallel agents completed: {agent_names}")
+                            logger.info(f"🔧 Parallel agents completed: {agent_names}")
+                            for agent_name in metadata.get("timed_out_agents", []):
+                                print(f"   ⏱️  {agent_name} timed out")
+                                logger.info(f"   ⏱️  {agent_name} timed out")
+
                         elif node_name in [
                             "kubernetes_agent",
                             "logs_agent",
@@ -1157,6 +1162,11 @@ async def main():
         default="./docs/sre_agent_architecture.md",
         help="Path to save the exported Mermaid diagram (default: ./docs/sre_agent_architecture.md)",
     )
+    parser.add_argument(
+        "--sequential-agents",
+        action="store_true",
+        help="Run investigation plan steps one agent at a time instead of in parallel",
+    )
 
     args = parser.parse_args()
 
@@ -1196,6 +1206,9 @@ async def main():
     os.environ["DEBUG"] = "true" if debug_enabled else "false"
 
     logger.info(f"Starting multi-agent system with provider: {args.provider}")
+    parallel_agents = (
+        False if args.sequential_agents else SREConstants.app.parallel_agent_execution
+    )
     if debug_enabled:
         logger.info("Debug logging enabled")
 
@@ -1222,6 +1235,7 @@ async def main():
                 save_markdown=not args.no_markdown,
                 force_delete_memory=args.force_delete_memory,
                 region_name=aws_region,
+                parallel_agents=parallel_agents,
             )
         # Single prompt mode
         else:
@@ -1232,6 +1246,7 @@ async def main():
                     export_graph=args.export_graph,
                     graph_output_path=args.graph_output,
                     region_name=aws_region,
+                    parallel_agents=parallel_agents,
                 )
                 logger.info("Multi-agent system created successfully")
             except Exception as e:
@@ -1341,6 +1356,18 @@ async def main():
                             elif metadata.get("plan_pending_approval"):
                                 print("🧭 Supervisor: Plan created, awaiting approval")
 
+                        elif node_name == "parallel_agents":
+                            metadata = node_output.get("metadata", {})
+                            agent_names = ", ".join(
+                                agent.replace("_agent", "").title()
+                                for agent in metadata.get("parallel_agents", [])
+                            )
+                            print(f"\n🔧 Parallel agents completed: {agent_names}")
+                            logger.info(f"🔧 Parallel agents completed: {agent_names}")
+                            for agent_name in metadata.get("timed_out_agents", []):
+                                print(f"   ⏱️  {agent_name} timed out")
+                                logger.info(f"   ⏱️  {agent_name} timed out")
+
                         elif node_name in [
                             "kubernetes_agent",
                             "logs_agent",
@@ -1494,6 +1521,11 @@ async def main():
     except Exception as e:
         logger.error(f"Error in multi-agent system: {e}")
         raise
+    finally:
+        # Write any memory events still queued before the process exits
+        from .memory.write_behind import flush_memory_writes
+
+        await asyncio.to_thread(flush_memory_writes, 30.0)
 
 
 if __name__ == "__main__":
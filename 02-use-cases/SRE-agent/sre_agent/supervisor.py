@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
+import asyncio
 import json
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.prebuilt import create_react_agent
@@ -15,7 +16,7 @@ from .agent_state import AgentState
 from .constants import SREConstants
 from .llm_utils import create_llm_with_error_handling
 from .memory import create_conversation_memory_manager
-from .memory.client import SREMemoryClient
+from .memory.client import get_memory_client
 from .memory.config import _load_memory_config
 from .memory.hooks import MemoryHookProvider
 from .memory.tools import create_memory_tools
@@ -198,6 +199,26 @@ Create the plan in JSON format with these fields:
 - reasoning: Brief explanation of the investigation approach"""
 
 
+# Agents that build on the findings of the agents before them in a plan. They
+# start a new wave instead of running alongside those agents.
+DEPENDENT_AGENTS = frozenset({"runbooks_agent"})
+
+
+def _plan_wave(agents_sequence: List[str], start: int) -> List[str]:
+    """Return the agents from plan step `start` that can run concurrently.
+
+    A wave ends before an agent that already appears in it, and before a
+    dependent agent (such as runbooks) that should see earlier findings.
+    """
+    wave = []
+    for agent in agents_sequence[start:]:
+        node_name = agent if agent.endswith("_agent") else f"{agent}_agent"
+        if agent in wave or (wave and node_name in DEPENDENT_AGENTS):
+            break
+        wave.append(agent)
+    return wave
+
+
 class SupervisorAgent:
     """Supervisor agent that orchestrates other agents with memory capabilities."""
 
@@ -205,9 +226,11 @@ class SupervisorAgent:
         self,
         llm_provider: str = "bedrock",
         force_delete_memory: bool = False,
+        parallel_agents: bool = False,
         **llm_kwargs,
     ):
         self.llm_provider = llm_provider
+        self.parallel_agents = parallel_agents
         self.llm = self._create_llm(**llm_kwargs)
         self.system_prompt = _read_supervisor_prompt()
         self.formatter = create_formatter(llm_provider=llm_provider)
@@ -217,7 +240,7 @@ class SupervisorAgent:
         if self.memory_config.enabled:
             # Use region from llm_kwargs if provided for bedrock
             memory_region = llm_kwargs.get("region_name", self.memory_config.region) if llm_provider == "bedrock" else self.memory_config.region
-            self.memory_client = SREMemoryClient(
+            self.memory_client = get_memory_client(
                 memory_name=self.memory_config.memory_name,
                 region=memory_region,
                 force_delete=force_delete_memory,
@@ -273,7 +296,10 @@ class SupervisorAgent:
             logger.info(
                 f"Supervisor using retrieve_memory tool: type={memory_type}, query='{query}', actor_id={actor_id}"
             )
-            result = retrieve_tool._run(
+            # Run the blocking retrieval off the event loop; results are
+            # cached by the memory client for follow-up questions
+            result = await asyncio.to_thread(
+                retrieve_tool._run,
                 memory_type=memory_type,
                 query=query,
                 actor_id=actor_id,
@@ -317,7 +343,9 @@ class SupervisorAgent:
                         "session_id is required for memory retrieval but not found in state"
                     )
 
-                memory_context = self.memory_hooks.on_investigation_start(
+                # Preferences, infrastructure and investigations are fetched
+                # concurrently
+                memory_context = await self.memory_hooks.aon_investigation_start(
                     query=current_query,
                     user_id=user_id,
                     actor_id=actor_id,
@@ -586,6 +614,37 @@ User's query: {current_query}
 
         return plan_text
 
+    def _next_dispatch(
+        self, plan: InvestigationPlan, step: int
+    ) -> Tuple[str, int, List[str], str]:
+        """Work out what to run for plan step `step`.
+
+        Returns (next, last plan step covered, parallel agents, reasoning).
+        In parallel mode, independent steps are grouped and routed to the
+        "parallel" node together.
+        """
+        if self.parallel_agents:
+            wave = _plan_wave(plan.agents_sequence, step)
+            if len(wave) > 1:
+                last_step = step + len(wave) - 1
+                return (
+                    "parallel",
+                    last_step,
+                    wave,
+                    f"Executing plan steps {step + 1}-{last_step + 1} in parallel: {', '.join(wave)}",
+                )
+
+        next_agent = plan.agents_sequence[step]
+        step_description = (
+            plan.steps[step] if step < len(plan.steps) else f"Execute {next_agent}"
+        )
+        return (
+            next_agent,
+            step,
+            [],
+            f"Executing plan step {step + 1}: {step_description}",
+        )
+
     async def route(self, state: AgentState) -> Dict[str, Any]:
         """Determine which agent should handle the query next."""
         agents_invoked = state.get("agents_invoked", [])
@@ -617,17 +676,22 @@ User's query: {current_query}
                 }
             else:
                 # Simple plan - start execution
-                next_agent = (
-                    plan.agents_sequence[0] if plan.agents_sequence else "FINISH"
-                )
+                if plan.agents_sequence:
+                    next_agent, plan_step, parallel_agents, reasoning = (
+                        self._next_dispatch(plan, 0)
+                    )
+                else:
+                    next_agent, plan_step, parallel_agents = "FINISH", 0, []
+                    reasoning = "Executing plan step 1: Start"
                 plan_text = self._format_plan_markdown(plan)
                 return {
                     "next": next_agent,
                     "metadata": {
                         **state.get("metadata", {}),
                         "investigation_plan": plan.model_dump(),
-                        "routing_reasoning": f"Executing plan step 1: {plan.steps[0] if plan.steps else 'Start'}",
-                        "plan_step": 0,
+                        "routing_reasoning": reasoning,
+                        "plan_step": plan_step,
+                        "parallel_agents": parallel_agents,
                         "plan_text": plan_text,
                         "show_plan": True,
                     },
@@ -658,20 +722,18 @@ User's query: {current_query}
                     "memory_context": state.get("memory_context", {}),
                 }
             else:
-                # Continue with next agent in plan
-                next_agent = plan.agents_sequence[next_step]
-                step_description = (
-                    plan.steps[next_step]
-                    if next_step < len(plan.steps)
-                    else f"Execute {next_agent}"
+                # Continue with next agent (or wave of agents) in plan
+                next_agent, plan_step, parallel_agents, reasoning = (
+                    self._next_dispatch(plan, next_step)
                 )
 
                 return {
                     "next": next_agent,
                     "metadata": {
                         **state.get("metadata", {}),
-                        "routing_reasoning": f"Executing plan step {next_step + 1}: {step_description}",
-                        "plan_step": next_step,
+                        "routing_reasoning": reasoning,
+                        "plan_step": plan_step,
+                        "parallel_agents": parallel_agents,
                     },
                     # Preserve memory context in state
                     "memory_context": state.get("memory_context", {}),
@@ -822,6 +884,17 @@ You can:
 
             final_response = response.content
 
+        # Agents cut off by the parallel execution timeout only contribute an
+        # error entry to agent_results; make the partial result explicit
+        timed_out_agents = metadata.get("timed_out_agents", [])
+        if timed_out_agents:
+            logger.warning(f"Aggregating without results from: {timed_out_agents}")
+            final_response += (
+                "\n\n> ⚠️ **Partial results:** "
+                f"{', '.join(timed_out_agents)} did not finish within "
+                f"{SREConstants.timeouts.agent_execution_timeout_seconds} seconds."
+            )
+
         # Store final response conversation in memory
         user_id = state.get("user_id")
         session_id = state.get("session_id")
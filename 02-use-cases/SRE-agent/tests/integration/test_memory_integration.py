@@ -46,7 +46,7 @@ class TestMemoryIntegration:
         """Mock memory hooks."""
         with patch("sre_agent.supervisor.MemoryHookProvider") as mock_hooks_class:
             mock_hooks = Mock()
-            mock_hooks.on_investigation_start = AsyncMock(
+            mock_hooks.aon_investigation_start = AsyncMock(
                 return_value={
                     "user_preferences": [],
                     "infrastructure_knowledge": [],
@@ -134,7 +134,7 @@ class TestMemoryIntegration:
             plan = await supervisor.create_investigation_plan(state)
 
             # Verify memory hooks were called
-            mock_memory_hooks.on_investigation_start.assert_called_once_with(
+            mock_memory_hooks.aon_investigation_start.assert_called_once_with(
                 query="Why is my pod failing?",
                 user_id="user123",
                 actor_id="sre-agent",
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from sre_agent.memory.client import (
+    aget_memory_client,
+    get_memory_client,
+    reset_memory_clients,
+)
+
+
+class _FakeMemoryClient:
+    """Stand-in for SREMemoryClient that records constructions."""
+
+    instances = []
+
+    def __init__(self, memory_name, region, force_delete=False):
+        self.memory_name = memory_name
+        self.region = region
+        self.force_delete = force_delete
+        self.memory_id = f"{memory_name}-abc123"
+        _FakeMemoryClient.instances.append(self)
+
+
+class TestMemoryClientRegistry:
+    """Tests for the shared memory client registry."""
+
+    @pytest.fixture(autouse=True)
+    def fake_client(self):
+        """Replace SREMemoryClient and start from an empty registry."""
+        reset_memory_clients()
+        _FakeMemoryClient.instances = []
+        with patch("sre_agent.memory.client.SREMemoryClient", _FakeMemoryClient):
+            yield
+        reset_memory_clients()
+
+    def test_same_key_reuses_client(self):
+        """Test that repeated lookups return the same initialized client."""
+        first = get_memory_client(region="us-east-1")
+        second = get_memory_client(region="us-east-1")
+
+        assert first is second
+        assert len(_FakeMemoryClient.instances) == 1
+
+    def test_different_keys_get_separate_clients(self):
+        """Test that region and memory name both key the registry."""
+        east = get_memory_client(region="us-east-1")
+        west = get_memory_client(region="us-west-2")
+        other = get_memory_client(memory_name="other_memory", region="us-east-1")
+
+        assert len({id(east), id(west), id(other)}) == 3
+
+    def test_force_delete_only_applies_on_first_creation(self):
+        """Test that force_delete does not recreate an existing client."""
+        first = get_memory_client(force_delete=True)
+        second = get_memory_client(force_delete=True)
+
+        assert first is second
+        assert first.force_delete is True
+        assert len(_FakeMemoryClient.instances) == 1
+
+    def test_offline_client_is_not_cached(self):
+        """Test that a client without memory_id is retried on the next call."""
+        with patch.object(_FakeMemoryClient, "__init__", autospec=True) as init:
+
+            def offline_init(self, memory_name, region, force_delete=False):
+                self.memory_id = None
+
+            init.side_effect = offline_init
+            get_memory_client()
+            get_memory_client()
+
+            assert init.call_count == 2
+
+    def test_concurrent_first_use_initializes_once(self):
+        """Test that threads racing on first use share one client."""
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_memory_client()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(_FakeMemoryClient.instances) == 1
+        assert all(client is results[0] for client in results)
+
+    def test_async_lookup_returns_shared_client(self):
+        """Test that the async variant shares the registry."""
+        sync_client = get_memory_client(region="eu-west-1")
+        async_client = asyncio.run(aget_memory_client(region="eu-west-1"))
+
+        assert async_client is sync_client
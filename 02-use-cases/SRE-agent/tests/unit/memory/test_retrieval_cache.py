@@ -0,0 +1,138 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from sre_agent.memory.client import SREMemoryClient
+from sre_agent.memory.retrieval_cache import RetrievalCache
+
+
+class TestRetrievalCache:
+    """Tests for the LRU+TTL retrieval cache."""
+
+    def test_query_is_normalized(self):
+        """Test that case and whitespace differences share one entry."""
+        cache = RetrievalCache()
+        cache.put(RetrievalCache.make_key("/ns", "Pod  Crash", 5), [{"id": 1}])
+
+        assert cache.get(RetrievalCache.make_key("/ns", " pod crash ", 5)) == [
+            {"id": 1}
+        ]
+        assert cache.get(RetrievalCache.make_key("/ns", "pod crash", 10)) is None
+
+    def test_entries_expire(self):
+        """Test that entries are not returned after the TTL."""
+        cache = RetrievalCache(ttl_seconds=10)
+        key = RetrievalCache.make_key("/ns", "q", 5)
+        with patch("sre_agent.memory.retrieval_cache.time.monotonic", return_value=0):
+            cache.put(key, [{"id": 1}])
+        with patch("sre_agent.memory.retrieval_cache.time.monotonic", return_value=11):
+            assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache holds at most max_entries."""
+        cache = RetrievalCache(max_entries=2)
+        first, second, third = (
+            RetrievalCache.make_key("/ns", query, 5) for query in ("a", "b", "c")
+        )
+        cache.put(first, [])
+        cache.put(second, [])
+        cache.get(first)
+        cache.put(third, [])
+
+        assert cache.get(first) == []
+        assert cache.get(second) is None
+
+    def test_invalidate_by_namespace_prefix(self):
+        """Test that invalidation drops session-specific namespaces too."""
+        cache = RetrievalCache()
+        cache.put(RetrievalCache.make_key("/sre/infrastructure/alice", "q", 5), [])
+        cache.put(RetrievalCache.make_key("/sre/infrastructure/alice/s1", "q", 5), [])
+        cache.put(RetrievalCache.make_key("/sre/users/alice/preferences", "q", 5), [])
+
+        assert cache.invalidate("/sre/infrastructure/alice") == 2
+        assert len(cache) == 1
+
+    def test_invalidate_keeps_sibling_namespaces(self):
+        """Test that invalidating one actor leaves actors sharing its prefix."""
+        cache = RetrievalCache()
+        cache.put(RetrievalCache.make_key("/sre/investigations/alice", "q", 5), [])
+        cache.put(RetrievalCache.make_key("/sre/investigations/alice2", "q", 5), [])
+        cache.put(RetrievalCache.make_key("/sre/investigations/alice2/s1", "q", 5), [])
+
+        assert cache.invalidate("/sre/investigations/alice") == 1
+        assert len(cache) == 2
+
+    def test_cached_list_is_a_copy(self):
+        """Test that callers cannot mutate the cached records list."""
+        cache = RetrievalCache()
+        key = RetrievalCache.make_key("/ns", "q", 5)
+        cache.put(key, [{"id": 1}])
+        cache.get(key).append({"id": 2})
+
+        assert cache.get(key) == [{"id": 1}]
+
+
+class TestClientRetrievalCaching:
+    """Tests for retrieve_memories caching in SREMemoryClient."""
+
+    @pytest.fixture
+    def memory_client(self):
+        """Create an SREMemoryClient without touching AWS."""
+        client = SREMemoryClient.__new__(SREMemoryClient)
+        client.memory_id = "mem-123"
+        client.client = Mock()
+        client.client.retrieve_memories.return_value = [{"content": {"text": "x"}}]
+        client.retrieval_cache = RetrievalCache()
+        return client
+
+    def test_repeated_retrieval_uses_cache(self, memory_client):
+        """Test that a follow-up retrieval does not call the memory service."""
+        first = memory_client.retrieve_memories("preferences", "alice", "escalation")
+        second = memory_client.retrieve_memories("preferences", "alice", "Escalation")
+
+        assert first == second
+        assert memory_client.client.retrieve_memories.call_count == 1
+
+    def test_save_event_invalidates_actor_namespace(self, memory_client):
+        """Test that saving an event drops cached retrievals for that actor."""
+        memory_client.retrieve_memories("preferences", "alice", "escalation")
+        with patch("sre_agent.memory.client.submit_memory_event", return_value=True):
+            memory_client.save_event("preferences", "alice", {"pref": "email"})
+        memory_client.retrieve_memories("preferences", "alice", "escalation")
+
+        assert memory_client.client.retrieve_memories.call_count == 2
+
+    def test_retrieval_before_write_is_dropped_once_written(self, memory_client):
+        """Test that results cached while an event is queued do not outlive it."""
+        queued = []
+
+        def submit(*args, on_written=None, **kwargs):
+            queued.append(on_written)
+            return True
+
+        with patch("sre_agent.memory.client.submit_memory_event", side_effect=submit):
+            memory_client.save_event("preferences", "alice", {"pref": "email"})
+        # Retrieved before the queued event reaches the memory service
+        memory_client.retrieve_memories("preferences", "alice", "escalation")
+
+        queued[0]()
+        memory_client.retrieve_memories("preferences", "alice", "escalation")
+
+        assert memory_client.client.retrieve_memories.call_count == 2
+
+    def test_async_retrieval(self, memory_client):
+        """Test that concurrent async retrievals return the same records."""
+
+        async def retrieve_all():
+            return await asyncio.gather(
+                memory_client.aretrieve_memories("preferences", "alice", "q"),
+                memory_client.aretrieve_memories("infrastructure", "alice", "q"),
+                memory_client.aretrieve_memories("investigations", "alice", "q"),
+            )
+
+        results = asyncio.run(retrieve_all())
+
+        assert len(results) == 3
+        assert all(result == [{"content": {"text": "x"}}] for result in results)
@@ -0,0 +1,188 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from sre_agent.memory.write_behind import MemoryWriteBehindQueue
+
+
+class _FakeEventClient:
+    """Records create_event calls and can fail a number of times first."""
+
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    def create_event(self, memory_id, actor_id, session_id, messages):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("throttled")
+            self.calls.append((actor_id, session_id, list(messages)))
+            return {"eventId": f"event-{len(self.calls)}"}
+
+
+class TestMemoryWriteBehindQueue:
+    """Tests for the background memory write queue."""
+
+    @pytest.fixture
+    def write_queue(self):
+        """Create a queue with a coalescing window long enough to batch submits."""
+        write_queue = MemoryWriteBehindQueue(
+            flush_interval_seconds=0.2, retry_base_delay_seconds=0.0
+        )
+        yield write_queue
+        write_queue.shutdown()
+
+    def test_submit_returns_before_write(self, write_queue):
+        """Test that submit queues the write and flush waits for it."""
+        client = _FakeEventClient()
+
+        assert write_queue.submit(client, "mem-1", "alice", "s1", [("hi", "USER")])
+        assert write_queue.flush(timeout=5)
+        assert client.calls == [("alice", "s1", [("hi", "USER")])]
+
+    def test_coalesces_per_actor_and_session(self, write_queue):
+        """Test that pending writes for one actor/session share one event."""
+        client = _FakeEventClient()
+
+        write_queue.submit(client, "mem-1", "alice", "s1", [("a", "USER")])
+        write_queue.submit(client, "mem-1", "bob", "s2", [("b", "USER")])
+        write_queue.submit(client, "mem-1", "alice", "s1", [("c", "ASSISTANT")])
+        write_queue.flush(timeout=5)
+
+        assert sorted(client.calls) == [
+            ("alice", "s1", [("a", "USER"), ("c", "ASSISTANT")]),
+            ("bob", "s2", [("b", "USER")]),
+        ]
+
+    def test_large_batches_are_split(self):
+        """Test that coalesced messages respect max_batch_messages."""
+        client = _FakeEventClient()
+        write_queue = MemoryWriteBehindQueue(
+            max_batch_messages=2, flush_interval_seconds=0.2
+        )
+        messages = [(str(i), "USER") for i in range(5)]
+
+        write_queue.submit(client, "mem-1", "alice", "s1", messages)
+        write_queue.shutdown()
+
+        assert [call[2] for call in client.calls] == [
+            messages[0:2],
+            messages[2:4],
+            messages[4:5],
+        ]
+
+    def test_failed_writes_are_retried(self, write_queue):
+        """Test that create_event is retried with backoff until it succeeds."""
+        client = _FakeEventClient(failures=2)
+
+        write_queue.submit(client, "mem-1", "alice", "s1", [("hi", "USER")])
+        write_queue.flush(timeout=5)
+
+        assert len(client.calls) == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test that a persistently failing write is dropped, not retried forever."""
+        client = _FakeEventClient(failures=10)
+        write_queue = MemoryWriteBehindQueue(
+            max_retries=2, retry_base_delay_seconds=0.0, flush_interval_seconds=0.0
+        )
+
+        write_queue.submit(client, "mem-1", "alice", "s1", [("hi", "USER")])
+
+        assert write_queue.flush(timeout=5)
+        assert client.calls == []
+        assert client.failures == 7
+        write_queue.shutdown()
+
+    def test_shutdown_drains_queue(self):
+        """Test that shutdown writes everything queued before stopping."""
+        client = _FakeEventClient()
+        write_queue = MemoryWriteBehindQueue(flush_interval_seconds=0.0)
+
+        for i in range(20):
+            write_queue.submit(client, "mem-1", f"user-{i}", "s1", [("x", "USER")])
+        write_queue.shutdown()
+
+        assert len(client.calls) == 20
+
+    def test_full_queue_writes_synchronously(self):
+        """Test that a full queue falls back to writing on the caller's thread."""
+        client = _FakeEventClient()
+        write_queue = MemoryWriteBehindQueue(
+            max_queue_size=1, enqueue_timeout_seconds=0.0
+        )
+
+        with patch.object(write_queue, "_ensure_started"):
+            write_queue.submit(client, "mem-1", "alice", "s1", [("queued", "USER")])
+            write_queue.submit(client, "mem-1", "alice", "s1", [("direct", "USER")])
+
+        assert client.calls == [("alice", "s1", [("direct", "USER")])]
+
+    def test_submit_after_shutdown_writes_directly(self):
+        """Test that late writes are not lost once the worker has stopped."""
+        client = _FakeEventClient()
+        write_queue = MemoryWriteBehindQueue()
+        write_queue.shutdown()
+
+        assert write_queue.submit(client, "mem-1", "alice", "s1", [("hi", "USER")])
+        assert len(client.calls) == 1
+
+    def test_on_written_runs_after_the_write(self, write_queue):
+        """Test that the callback runs once the messages reach create_event."""
+        client = _FakeEventClient()
+        written = []
+
+        write_queue.submit(
+            client,
+            "mem-1",
+            "alice",
+            "s1",
+            [("hi", "USER")],
+            on_written=lambda: written.append(len(client.calls)),
+        )
+
+        assert write_queue.flush(timeout=5)
+        assert written == [1]
+
+    def test_on_written_runs_for_each_coalesced_write(self, write_queue):
+        """Test that every callback of a coalesced batch is called."""
+        client = _FakeEventClient()
+        written = []
+
+        for name in ("a", "b"):
+            write_queue.submit(
+                client,
+                "mem-1",
+                "alice",
+                "s1",
+                [(name, "USER")],
+                on_written=lambda name=name: written.append(name),
+            )
+        write_queue.flush(timeout=5)
+
+        assert len(client.calls) == 1
+        assert sorted(written) == ["a", "b"]
+
+    def test_on_written_is_skipped_when_the_write_is_dropped(self):
+        """Test that a write that never succeeds does not report success."""
+        client = _FakeEventClient(failures=10)
+        write_queue = MemoryWriteBehindQueue(
+            max_retries=1, retry_base_delay_seconds=0.0, flush_interval_seconds=0.0
+        )
+        written = []
+
+        write_queue.submit(
+            client,
+            "mem-1",
+            "alice",
+            "s1",
+            [("hi", "USER")],
+            on_written=lambda: written.append(True),
+        )
+        write_queue.flush(timeout=5)
+        write_queue.shutdown()
+
+        assert written == []
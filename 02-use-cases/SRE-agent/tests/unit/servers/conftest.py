@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The demo API servers import their helper modules by bare name
+sys.path.insert(0, str(Path(__file__).parents[3] / "backend" / "servers"))
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import dataset_cache
+from dataset_cache import DatasetCache
+
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestDatasetCache:
+    """Tests for the mtime-invalidated JSON dataset cache."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        """Dataset file with a fixed modification time."""
+        path = tmp_path / "pods.json"
+        _write(path, {"pods": [1, 2]}, mtime_ns=1_000_000_000)
+        return path
+
+    def test_unchanged_file_is_decoded_once(self, path):
+        """Test that repeated loads reuse the decoded value."""
+        cache = DatasetCache()
+
+        with patch.object(
+            dataset_cache, "_decode_file", wraps=dataset_cache._decode_file
+        ) as decode:
+            first = cache.load(path)
+            second = cache.load(path)
+
+        assert first == {"pods": [1, 2]}
+        assert second is first
+        assert decode.call_count == 1
+
+    def test_newer_mtime_reloads_same_size_file(self, path):
+        """Test that a rewrite of the same size is picked up by its mtime."""
+        cache = DatasetCache()
+        cache.load(path)
+
+        _write(path, {"pods": [3, 4]}, mtime_ns=2_000_000_000)
+
+        assert cache.load(path) == {"pods": [3, 4]}
+
+    def test_size_change_reloads_with_same_mtime(self, path):
+        """Test that a rewrite within the same mtime tick is picked up by size."""
+        cache = DatasetCache()
+        cache.load(path)
+
+        _write(path, {"pods": [1, 2, 3]}, mtime_ns=1_000_000_000)
+
+        assert cache.load(path) == {"pods": [1, 2, 3]}
+
+    def test_derived_value_is_built_once_per_version(self, path):
+        """Test that load_derived caches until the dataset changes."""
+        cache = DatasetCache()
+        builds = []
+
+        def build(data):
+            builds.append(data)
+            return len(data["pods"])
+
+        assert cache.load_derived(path, "count", build) == 2
+        assert cache.load_derived(path, "count", build) == 2
+        assert len(builds) == 1
+
+        _write(path, {"pods": [1, 2, 3]}, mtime_ns=2_000_000_000)
+
+        assert cache.load_derived(path, "count", build) == 3
+        assert len(builds) == 2
+
+    def test_derived_values_are_keyed_by_name(self, path):
+        """Test that different derived values of one dataset do not collide."""
+        cache = DatasetCache()
+
+        assert cache.load_derived(path, "count", lambda data: 2) == 2
+        assert cache.load_derived(path, "first", lambda data: 1) == 1
+
+    def test_concurrent_first_loads_decode_once(self, path):
+        """Test that threads loading a new file at once share one decode."""
+        cache = DatasetCache()
+        barrier = threading.Barrier(4)
+        results = []
+        decode_file = dataset_cache._decode_file
+
+        def slow_decode(file_path, size):
+            time.sleep(0.05)
+            return decode_file(file_path, size)
+
+        def load():
+            barrier.wait()
+            results.append(cache.load(path))
+
+        with patch.object(
+            dataset_cache, "_decode_file", side_effect=slow_decode
+        ) as decode:
+            threads = [threading.Thread(target=load) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert decode.call_count == 1
+        assert all(result is results[0] for result in results)
+
+    def test_clear_forces_reload(self, path):
+        """Test that clear drops every cached dataset."""
+        cache = DatasetCache()
+        first = cache.load(path)
+
+        cache.clear()
+
+        assert cache.load(path) is not first
+
+    def test_large_files_decode_the_same(self, path, monkeypatch):
+        """Test that the memory-mapped path returns the same value."""
+        monkeypatch.setattr(dataset_cache, "MMAP_THRESHOLD_BYTES", 0)
+
+        assert DatasetCache().load(path) == {"pods": [1, 2]}
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test that loading a file that does not exist is an error."""
+        with pytest.raises(FileNotFoundError):
+            DatasetCache().load(tmp_path / "missing.json")
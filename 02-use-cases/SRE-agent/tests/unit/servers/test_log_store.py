@@ -0,0 +1,188 @@
+import os
+
+import pytest
+
+from log_store import LogStore, _parse_line
+from time_series import parse_epoch
+
+LINES = [
+    "2024-01-15T14:20:00.000Z [INFO] api-gateway Request served in 120ms",
+    "2024-01-15T14:21:00.000Z [ERROR] payment-service Connection timeout to db-pool-1",
+    "2024-01-15T14:22:00.000Z [WARN] payment-service Slow query: 2300ms",
+    "Caused by: SocketTimeoutException",
+    # Written late, so it is out of order in the file
+    "2024-01-15T14:20:30.000Z [ERROR] api-gateway Upstream timeout after 30s",
+    "not-a-timestamp [ERROR] auth-service Token refresh timeout",
+    "2024-01-15T14:23:00.000Z [CRITICAL] payment-service Pool exhausted: db-pool-1",
+    "2024-01-15T14:24:00.000Z [INFO] auth-service Login ok for user-42",
+]
+
+MINUTE_20 = parse_epoch("2024-01-15T14:20:00.000Z")
+MINUTE_21 = parse_epoch("2024-01-15T14:21:00.000Z")
+MINUTE_22 = parse_epoch("2024-01-15T14:22:00.000Z")
+MINUTE_24 = parse_epoch("2024-01-15T14:24:00.000Z")
+
+
+def _naive_search(lines, pattern, start_time=None, end_time=None, log_level=None):
+    """Reference implementation: scan every line and apply each filter."""
+    results = []
+    for line in lines:
+        entry = _parse_line(line)
+        if pattern.lower() not in line.lower():
+            continue
+        if log_level and entry.get("level") != log_level:
+            continue
+        if start_time is not None or end_time is not None:
+            if "timestamp" not in entry:
+                continue
+            epoch = parse_epoch(entry["timestamp"])
+            # Unparseable timestamps match every time range
+            if epoch is not None and (
+                (start_time is not None and epoch < start_time)
+                or (end_time is not None and epoch > end_time)
+            ):
+                continue
+        results.append(entry)
+    return results
+
+
+def _write(path, lines):
+    path.write_text("".join(f"{line}\n" for line in lines))
+
+
+class TestLogStore:
+    """Tests for the indexed, incrementally tailed log store."""
+
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        """Log file holding LINES."""
+        path = tmp_path / "application.log"
+        _write(path, LINES)
+        return path
+
+    @pytest.fixture
+    def store(self, log_path):
+        """Store indexed over LINES."""
+        store = LogStore(log_path)
+        store.refresh()
+        return store
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            "timeout",
+            "TIMEOUT",
+            "time",
+            "timeout to",
+            "db-pool",
+            "pool-1",
+            "ms",
+            "",
+            "xyz",
+        ],
+    )
+    @pytest.mark.parametrize(
+        "start_time, end_time",
+        [(None, None), (MINUTE_21, None), (None, MINUTE_22), (MINUTE_20, MINUTE_22)],
+    )
+    @pytest.mark.parametrize("log_level", [None, "ERROR", "DEBUG"])
+    def test_search_matches_naive_scan(
+        self, store, pattern, start_time, end_time, log_level
+    ):
+        """Test that indexed search returns what a full scan would, in file order."""
+        results = store.search(pattern, start_time, end_time, log_level, limit=100)
+
+        assert results == _naive_search(LINES, pattern, start_time, end_time, log_level)
+
+    def test_time_window_bounds_are_inclusive(self, store):
+        """Test that entries exactly on start_time and end_time are returned."""
+        results = store.search("", start_time=MINUTE_21, end_time=MINUTE_22)
+
+        assert [entry.get("timestamp") for entry in results] == [
+            "2024-01-15T14:21:00.000Z",
+            "2024-01-15T14:22:00.000Z",
+            "not-a-timestamp",
+        ]
+
+    def test_time_window_just_past_an_entry_excludes_it(self, store):
+        """Test that a start a moment after an entry's timestamp skips it."""
+        results = store.search("", start_time=MINUTE_24 + 0.001)
+
+        assert [entry.get("timestamp") for entry in results] == ["not-a-timestamp"]
+
+    def test_window_between_entries_holds_only_untimed_entries(self, store):
+        """Test that a window with no timestamped entries is empty of them."""
+        results = store.search("", start_time=MINUTE_20 + 1, end_time=MINUTE_20 + 29)
+
+        assert [entry.get("timestamp") for entry in results] == ["not-a-timestamp"]
+
+    def test_out_of_order_entry_is_found_by_its_timestamp(self, store):
+        """Test that an out-of-order line is found by its own timestamp."""
+        results = store.search(
+            "upstream", start_time=MINUTE_20, end_time=MINUTE_20 + 30
+        )
+
+        assert [entry["message"] for entry in results] == ["Upstream timeout after 30s"]
+
+    def test_search_resumes_after_entry_id(self, store):
+        """Test that iter_search_after continues where a page stopped."""
+        all_ids = [entry_id for entry_id, _ in store.iter_search_after(None, "timeout")]
+
+        resumed = [
+            entry_id for entry_id, _ in store.iter_search_after(all_ids[1], "timeout")
+        ]
+
+        assert resumed == all_ids[2:]
+
+    def test_recent_is_newest_first_by_service(self, store):
+        """Test that recent entries come in reverse file order for a service."""
+        results = store.recent(limit=2, service="payment")
+
+        assert [entry["message"] for entry in results] == [
+            "Pool exhausted: db-pool-1",
+            "Slow query: 2300ms",
+        ]
+
+    def test_appended_lines_are_indexed(self, store, log_path):
+        """Test that a refresh picks up only the lines written since the last one."""
+        with open(log_path, "a") as f:
+            f.write(
+                "2024-01-15T14:25:00.000Z [ERROR] api-gateway Gateway timeout\n"
+                "2024-01-15T14:26:00.000Z [ERROR] api-gat"
+            )
+
+        assert store.refresh() == 1
+        assert len(store) == len(LINES) + 1
+        assert store.search("gateway timeout") == [
+            _parse_line("2024-01-15T14:25:00.000Z [ERROR] api-gateway Gateway timeout")
+        ]
+
+    def test_index_is_rebuilt_when_file_is_replaced(self, store, log_path, tmp_path):
+        """Test that a rotated log file replaces the old index."""
+        new_lines = ["2024-01-16T09:00:00.000Z [INFO] billing-service Invoice sent"]
+        rotated = tmp_path / "rotated.log"
+        _write(rotated, new_lines)
+        os.replace(rotated, log_path)
+
+        assert store.refresh() == 1
+        assert len(store) == 1
+        assert store.search("timeout") == []
+        assert store.search("invoice") == _naive_search(new_lines, "invoice")
+        assert store.latest_epoch() == parse_epoch("2024-01-16T09:00:00.000Z")
+
+    def test_index_is_rebuilt_when_file_is_truncated(self, store, log_path):
+        """Test that a file rewritten shorter in place is indexed from scratch."""
+        _write(log_path, LINES[:2])
+
+        store.refresh()
+
+        assert len(store) == 2
+        assert store.search("timeout") == _naive_search(LINES[:2], "timeout")
+
+    def test_removed_file_clears_the_index(self, store, log_path):
+        """Test that deleting the log file empties the store."""
+        log_path.unlink()
+
+        assert store.refresh() == 0
+        assert len(store) == 0
+        assert store.entry_or_none(0) is None
@@ -0,0 +1,187 @@
+import base64
+import json
+
+import pytest
+
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    CursorError,
+    Seekable,
+    decode_cursor,
+    encode_cursor,
+    page_response,
+    paginate,
+)
+
+
+def _records(count):
+    return [
+        {"timestamp": f"2024-01-15T14:{i // 60:02d}:{i % 60:02d}Z", "id": i}
+        for i in range(count)
+    ]
+
+
+def _producers(records):
+    """The record producers endpoints pass to the pagination helpers."""
+    return {
+        "sequence": lambda: records,
+        "seekable": lambda: Seekable.from_sequence(records),
+        "generator": lambda: (record for record in records),
+    }
+
+
+def _walk(make_records, page_size):
+    """Follow next_cursor until the last page, returning every page."""
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate(make_records(), page_size, cursor)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+class TestCursorEncoding:
+    """Tests for the opaque continuation token."""
+
+    def test_round_trip(self):
+        """Test that a decoded token returns what was encoded."""
+        token = encode_cursor("2024-01-15T14:20:00Z", 40, 39)
+
+        assert decode_cursor(token) == ("2024-01-15T14:20:00Z", 40, 39)
+
+    def test_token_is_url_safe(self):
+        """Test that tokens need no escaping in a query string."""
+        token = encode_cursor("2024-01-15T14:20:00+00:00", 7, 6)
+
+        assert "=" not in token and "+" not in token and "/" not in token
+
+    @pytest.mark.parametrize(
+        "token",
+        [
+            "not a cursor",
+            base64.urlsafe_b64encode(b"[1, 2]").decode(),
+            base64.urlsafe_b64encode(b'{"ts": null, "off": 1}').decode(),
+            base64.urlsafe_b64encode(b'{"ts": null, "off": "x", "pos": 0}').decode(),
+            encode_cursor(None, -1, 0),
+        ],
+    )
+    def test_malformed_token_is_rejected(self, token):
+        """Test that tokens the server did not issue raise CursorError."""
+        with pytest.raises(CursorError):
+            decode_cursor(token)
+
+
+class TestPaginate:
+    """Tests for slicing pages out of record producers."""
+
+    @pytest.mark.parametrize("producer", ["sequence", "seekable", "generator"])
+    @pytest.mark.parametrize("page_size", [1, 7, 25, 26])
+    def test_cursor_walk_has_no_duplicates_or_gaps(self, producer, page_size):
+        """Test that following next_cursor returns every record exactly once."""
+        records = _records(25)
+
+        pages = _walk(_producers(records)[producer], page_size)
+
+        assert [record for page in pages for record in page] == records
+        assert all(len(page) == page_size for page in pages[:-1])
+
+    def test_exactly_full_last_page_has_no_cursor(self):
+        """Test that a page ending on the last record does not offer another."""
+        page, next_cursor = paginate(_records(10), 5, paginate(_records(10), 5)[1])
+
+        assert [record["id"] for record in page] == [5, 6, 7, 8, 9]
+        assert next_cursor is None
+
+    def test_seekable_resumes_without_replay(self):
+        """Test that a Seekable producer is asked only for records after the cursor."""
+        records = _records(10)
+        requested = []
+
+        def iterate_after(position):
+            requested.append(position)
+            return Seekable.from_sequence(records).iterate_after(position)
+
+        _, cursor = paginate(records, 4)
+        page, _ = paginate(Seekable(iterate_after, records.__getitem__), 4, cursor)
+
+        assert requested == [3]
+        assert [record["id"] for record in page] == [4, 5, 6, 7]
+
+    def test_transform_is_applied_per_record(self):
+        """Test that Seekable.from_sequence converts only the records returned."""
+        converted = []
+
+        def transform(record):
+            converted.append(record["id"])
+            return {**record, "seen": True}
+
+        page, _ = paginate(Seekable.from_sequence(_records(10), transform), 3)
+
+        assert all(record["seen"] for record in page)
+        # The record after the page is read to decide whether there is a next one
+        assert converted == [0, 1, 2, 3]
+
+    @pytest.mark.parametrize("producer", ["sequence", "seekable", "generator"])
+    def test_cursor_over_changed_records_is_stale(self, producer):
+        """Test that a cursor is rejected when its last record changed."""
+        _, cursor = paginate(_records(10), 4)
+        shifted = _records(11)[1:]
+
+        with pytest.raises(CursorError, match="no longer matches"):
+            paginate(_producers(shifted)[producer](), 4, cursor)
+
+    @pytest.mark.parametrize("producer", ["sequence", "seekable", "generator"])
+    def test_cursor_past_the_end_is_stale(self, producer):
+        """Test that a cursor is rejected when the result set shrank below it."""
+        _, cursor = paginate(_records(10), 4)
+
+        with pytest.raises(CursorError, match="no longer matches"):
+            paginate(_producers(_records(2))[producer](), 4, cursor)
+
+    def test_cursor_with_tampered_timestamp_is_stale(self):
+        """Test that editing the timestamp inside a token is detected."""
+        _, cursor = paginate(_records(10), 4)
+        _, offset, position = decode_cursor(cursor)
+        tampered = encode_cursor("2030-01-01T00:00:00Z", offset, position)
+
+        with pytest.raises(CursorError):
+            paginate(_records(10), 4, tampered)
+
+
+class TestPageResponse:
+    """Tests for rendering paginated endpoint responses."""
+
+    def test_json_page_defaults_to_default_page_size(self):
+        """Test that a request without page_size is truncated with a cursor."""
+        records = _records(DEFAULT_PAGE_SIZE + 20)
+
+        response = page_response("errors", records)
+
+        assert response["errors"] == records[:DEFAULT_PAGE_SIZE]
+        assert "next_cursor" in response
+
+        rest = page_response("errors", records, cursor=response["next_cursor"])
+        assert rest == {"errors": records[DEFAULT_PAGE_SIZE:]}
+
+    def test_json_page_within_default_has_no_cursor(self):
+        """Test that a result set smaller than a page is returned whole."""
+        records = _records(DEFAULT_PAGE_SIZE)
+
+        assert page_response("logs", records) == {"logs": records}
+
+    @pytest.mark.asyncio
+    async def test_ndjson_stream_ends_with_cursor_when_limited(self):
+        """Test that a limited NDJSON stream closes with a next_cursor line."""
+        records = _records(5)
+
+        response = page_response("logs", records, page_size=3, response_format="ndjson")
+        lines = [json.loads(chunk) async for chunk in response.body_iterator]
+
+        assert lines[:3] == records[:3]
+        rest = page_response("logs", records, cursor=lines[3]["next_cursor"])
+        assert rest == {"logs": records[3:]}
+
+    def test_invalid_cursor_raises_before_streaming(self):
+        """Test that a bad cursor surfaces as CursorError, not a broken stream."""
+        with pytest.raises(CursorError):
+            page_response("logs", _records(5), cursor="bogus", response_format="ndjson")
@@ -0,0 +1,184 @@
+import json
+import math
+import os
+
+import pytest
+
+from runbook_index import BM25_B, BM25_K1, RunbookIndex, _tokenize
+
+GUIDES = [
+    {
+        "id": "TG-001",
+        "title": "Pod CrashLoopBackOff",
+        "severity": "high",
+        "steps": ["Check pod logs", "Check memory limits"],
+    },
+    {
+        "id": "TG-002",
+        "title": "Database connection timeout",
+        "severity": "critical",
+        "steps": ["Check connection pool", "Check database connection limits"],
+    },
+    {
+        "id": "TG-003",
+        "title": "High memory usage",
+        "severity": "high",
+        "steps": ["Check memory", "Check memory leaks", "Restart pod"],
+    },
+]
+
+MARKDOWN = """# Runbooks
+
+## Database connection timeout
+
+**Guide ID:** `TG-002`
+
+Increase the pool size.
+
+## Certificate expiry
+
+Renew the certificate.
+"""
+
+
+def _ids(results):
+    return [document.record["id"] for _, document in results]
+
+
+class TestTokenize:
+    """Tests for splitting text into index terms."""
+
+    def test_lowercases_and_splits_on_punctuation(self):
+        """Test that punctuation separates terms and case is ignored."""
+        assert _tokenize("HTTP-503 Errors, CrashLoopBackOff!") == [
+            "http",
+            "503",
+            "errors",
+            "crashloopbackoff",
+        ]
+
+    def test_underscores_split_terms(self):
+        """Test that snake_case identifiers are indexed word by word."""
+        assert _tokenize("max_connections") == ["max", "connections"]
+
+    def test_text_without_terms_is_empty(self):
+        """Test that text without letters or digits has no terms."""
+        assert _tokenize(" -- !! ") == []
+
+
+class TestRunbookIndex:
+    """Tests for BM25 search over runbook records."""
+
+    @pytest.fixture
+    def data_path(self, tmp_path):
+        """Runbooks directory with one JSON file and one markdown file."""
+        (tmp_path / "guides.json").write_text(
+            json.dumps({"troubleshooting_guides": GUIDES, "version": "1"})
+        )
+        (tmp_path / "markdown").mkdir()
+        (tmp_path / "markdown" / "runbooks.md").write_text(MARKDOWN)
+        return tmp_path
+
+    @pytest.fixture
+    def index(self, data_path):
+        """Index over the runbooks directory."""
+        return RunbookIndex(data_path)
+
+    def test_each_record_is_a_document(self, index):
+        """Test that JSON records and unreferenced markdown sections are indexed."""
+        results = index.search("check certificate", top_k=10)
+
+        assert sorted(_ids(results)) == [
+            "TG-001",
+            "TG-002",
+            "TG-003",
+            "runbooks:Certificate expiry",
+        ]
+
+    def test_markdown_section_is_folded_into_referenced_record(self, index):
+        """Test that a section citing a record ID extends that record's text."""
+        results = index.search("pool size")
+
+        assert _ids(results)[0] == "TG-002"
+        assert results[0][1].source == "troubleshooting_guides"
+
+    def test_higher_term_frequency_ranks_first(self, index):
+        """Test that the document mentioning a term most often ranks first."""
+        assert _ids(index.search("memory"))[0] == "TG-003"
+
+    def test_rare_term_outweighs_common_term(self, index):
+        """Test that inverse document frequency favours the rarer query term."""
+        results = index.search("check leaks")
+
+        assert _ids(results)[0] == "TG-003"
+        assert results[0][0] > results[1][0]
+
+    def test_scores_follow_bm25(self, data_path):
+        """Test that a single-term score matches the BM25 formula."""
+        for path in data_path.glob("**/*.*"):
+            path.unlink()
+        (data_path / "guides.json").write_text(
+            json.dumps(
+                {
+                    "guides": [
+                        {"id": "a", "text": "disk disk full"},
+                        {"id": "b", "text": "network down now"},
+                    ]
+                }
+            )
+        )
+
+        [(score, document)] = RunbookIndex(data_path).search("disk")
+
+        # Every string value is indexed, including the id
+        lengths = {"a": 4, "b": 4}
+        idf = math.log(1 + (2 - 1 + 0.5) / (1 + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths["a"] / 4)
+        assert document.record["id"] == "a"
+        assert score == pytest.approx(idf * 2 * (BM25_K1 + 1) / (2 + norm))
+
+    def test_shorter_document_ranks_first_for_equal_frequency(self, data_path):
+        """Test that document length normalization favours the shorter match."""
+        (data_path / "guides.json").write_text(
+            json.dumps(
+                {
+                    "guides": [
+                        {"id": "long", "text": "disk " + "other words " * 10},
+                        {"id": "short", "text": "disk full"},
+                    ]
+                }
+            )
+        )
+
+        assert _ids(RunbookIndex(data_path).search("disk")) == ["short", "long"]
+
+    def test_unknown_token_expands_to_prefixed_terms(self, index):
+        """Test that a partial word matches the indexed terms it starts."""
+        assert _ids(index.search("crashloop")) == ["TG-001"]
+
+    def test_unmatched_query_returns_nothing(self, index):
+        """Test that a query with no indexed terms has no results."""
+        assert index.search("kafka") == []
+
+    def test_filters_require_matching_field(self, index):
+        """Test that filters drop documents with other or missing field values."""
+        results = index.search("check", filters={"severity": "high"})
+
+        assert sorted(_ids(results)) == ["TG-001", "TG-003"]
+
+    def test_top_k_limits_results(self, index):
+        """Test that only the best top_k documents are returned."""
+        assert len(index.search("check", top_k=2)) == 2
+
+    def test_index_is_rebuilt_when_a_source_changes(self, index, data_path):
+        """Test that an edited runbook file is reindexed on the next search."""
+        index.search("check")
+        guides = data_path / "guides.json"
+        guides.write_text(
+            json.dumps({"guides": [{"id": "TG-009", "title": "Kafka lag"}]})
+        )
+        stat = guides.stat()
+        os.utime(guides, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert _ids(index.search("kafka")) == ["TG-009"]
+        assert index.search("crashloopbackoff") == []
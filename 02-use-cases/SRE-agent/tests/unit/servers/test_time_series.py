@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from time_series import TimeSeries, load_series, parse_epoch, parse_query_time
+
+RECORDS = [
+    {"timestamp": "2024-01-15T14:20:00Z", "id": "a"},
+    {"timestamp": "2024-01-15T14:22:00Z", "id": "b"},
+    # Out of order relative to the record before it
+    {"timestamp": "2024-01-15T14:21:00Z", "id": "c"},
+    {"timestamp": "yesterday", "id": "d"},
+    {"id": "e"},
+    {"timestamp": "2024-01-15T14:23:00+00:00", "id": "f"},
+]
+
+MINUTE_21 = parse_epoch("2024-01-15T14:21:00Z")
+MINUTE_22 = parse_epoch("2024-01-15T14:22:00Z")
+
+
+def _ids(records):
+    return [record["id"] for record in records]
+
+
+def _naive_between(records, start, end):
+    """Reference implementation: parse and compare every record's timestamp."""
+    if start is None and end is None:
+        return list(records)
+    results = []
+    for record in records:
+        if not record.get("timestamp"):
+            continue
+        epoch = parse_epoch(record["timestamp"])
+        if epoch is not None and (
+            (start is not None and epoch < start) or (end is not None and epoch > end)
+        ):
+            continue
+        results.append(record)
+    return results
+
+
+class TestParseEpoch:
+    """Tests for timestamp parsing."""
+
+    def test_z_suffix_and_offset_are_equivalent(self):
+        """Test that a Z suffix is read as UTC."""
+        assert parse_epoch("2024-01-15T14:20:00Z") == parse_epoch(
+            "2024-01-15T14:20:00+00:00"
+        )
+
+    def test_naive_timestamp_is_utc(self):
+        """Test that a timestamp without a zone is treated as UTC."""
+        assert parse_epoch("2024-01-15T14:20:00") == parse_epoch("2024-01-15T14:20:00Z")
+
+    @pytest.mark.parametrize("value", ["yesterday", "", "2024-13-45T00:00:00Z"])
+    def test_unparseable_timestamp_is_none(self, value):
+        """Test that invalid timestamps return None instead of raising."""
+        assert parse_epoch(value) is None
+
+    def test_missing_query_time_is_no_bound(self):
+        """Test that an absent query parameter does not bound the range."""
+        assert parse_query_time(None) is None
+        assert parse_query_time("") is None
+
+
+class TestTimeSeries:
+    """Tests for range queries over the pre-parsed time index."""
+
+    @pytest.fixture
+    def series(self):
+        """Series over RECORDS."""
+        return TimeSeries(RECORDS)
+
+    @pytest.mark.parametrize(
+        "start, end",
+        [
+            (None, None),
+            (MINUTE_21, None),
+            (None, MINUTE_21),
+            (MINUTE_21, MINUTE_22),
+            (MINUTE_22 + 1, MINUTE_22 + 2),
+            (0, 1),
+        ],
+    )
+    def test_between_matches_naive_filter(self, series, start, end):
+        """Test that bisect range queries return what a full scan would."""
+        assert series.between(start, end) == _naive_between(RECORDS, start, end)
+
+    def test_bounds_are_inclusive(self, series):
+        """Test that records exactly on start and end are included."""
+        assert _ids(series.between(MINUTE_21, MINUTE_22)) == ["b", "c", "d"]
+
+    def test_results_keep_original_order(self, series):
+        """Test that out-of-order records come back in file order, not time order."""
+        assert _ids(series.between(0, MINUTE_22)) == ["a", "b", "c", "d"]
+
+    def test_unbounded_query_returns_every_record(self, series):
+        """Test that no bounds returns the records list itself."""
+        assert series.between() is RECORDS
+
+    def test_untimed_records_match_every_bounded_range(self, series):
+        """Test that a record with an unparseable timestamp is always included."""
+        assert _ids(series.since(MINUTE_22 * 2)) == ["d"]
+
+    def test_records_without_timestamp_are_excluded_from_ranges(self, series):
+        """Test that a record lacking a timestamp only appears unbounded."""
+        assert "e" not in _ids(series.since(0))
+
+    def test_in_order_records_skip_sorting(self):
+        """Test that records already in time order are returned in order."""
+        records = [r for r in RECORDS if r["id"] in ("a", "c", "b", "f")]
+        records.sort(key=lambda record: parse_epoch(record["timestamp"]))
+
+        assert _ids(TimeSeries(records).since(MINUTE_21)) == ["c", "b", "f"]
+
+
+class TestLoadSeries:
+    """Tests for loading cached series from JSON files."""
+
+    def test_series_is_reused_until_file_changes(self, tmp_path):
+        """Test that the series is rebuilt only when the file changes."""
+        path = tmp_path / "errors.json"
+        path.write_text(json.dumps(RECORDS[:2]))
+
+        first = load_series(path)
+        assert load_series(path) is first
+
+        path.write_text(json.dumps(RECORDS))
+        reloaded = load_series(path)
+
+        assert reloaded is not first
+        assert _ids(reloaded.between()) == _ids(RECORDS)
+
+    def test_list_key_selects_records(self, tmp_path):
+        """Test that list_key reads records from a top-level key."""
+        path = tmp_path / "metrics.json"
+        path.write_text(json.dumps({"metrics": RECORDS[:2]}))
+
+        assert _ids(load_series(path, "metrics").since(MINUTE_22)) == ["b"]
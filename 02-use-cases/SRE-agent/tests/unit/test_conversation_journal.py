@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from sre_agent.conversation_journal import ConversationJournal
+
+
+def _conversation(turns):
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"question {i}"))
+        messages.append(AIMessage(content=f"answer {i}"))
+    return messages
+
+
+class TestConversationJournal:
+    """Tests for the append-only conversation journal."""
+
+    @pytest.fixture
+    def journal_path(self, tmp_path):
+        """Path for a journal file in a temporary directory."""
+        return tmp_path / "conversation.jsonl"
+
+    def _line_count(self, path):
+        return len(path.read_text().splitlines())
+
+    def test_round_trip(self, journal_path):
+        """Test that saved messages and state are replayed in order."""
+        messages = _conversation(2)
+        ConversationJournal(journal_path).save(messages, {"incident_id": "inc-1"})
+
+        loaded, state = ConversationJournal(journal_path).load()
+
+        assert [(m["role"], m["content"]) for m in loaded] == [
+            ("user", "question 0"),
+            ("assistant", "answer 0"),
+            ("user", "question 1"),
+            ("assistant", "answer 1"),
+        ]
+        assert state == {"incident_id": "inc-1"}
+
+    def test_saves_append_only_new_messages(self, journal_path):
+        """Test that each turn appends its messages instead of rewriting."""
+        journal = ConversationJournal(journal_path)
+        messages = _conversation(1)
+        journal.save(messages, {})
+        first_size = self._line_count(journal_path)
+        first_content = journal_path.read_text()
+
+        messages.extend(_conversation(2)[2:])
+        journal.save(messages, {})
+
+        assert journal_path.read_text().startswith(first_content)
+        assert self._line_count(journal_path) == first_size + 2
+
+    def test_missing_journal_returns_none(self, journal_path):
+        """Test that loading without a journal reports no saved state."""
+        assert ConversationJournal(journal_path).load() == (None, None)
+
+    def test_shrinking_conversation_compacts(self, journal_path):
+        """Test that /clear-style shrinking rewrites the journal."""
+        journal = ConversationJournal(journal_path)
+        journal.save(_conversation(3), {})
+        journal.save(_conversation(1), {})
+
+        loaded, _ = ConversationJournal(journal_path).load()
+
+        assert len(loaded) == 2
+
+    def test_replaced_history_compacts(self, journal_path):
+        """Test that a same-length but different history is not appended to."""
+        journal = ConversationJournal(journal_path)
+        journal.save(_conversation(1), {})
+        journal.save(
+            [HumanMessage(content="other"), AIMessage(content="reply"), "extra"], {}
+        )
+
+        loaded, _ = ConversationJournal(journal_path).load()
+
+        assert loaded[0]["content"] == "other"
+        assert len(loaded) == 3
+
+    def test_state_changes_trigger_compaction(self, journal_path):
+        """Test that superseded state records are compacted away."""
+        journal = ConversationJournal(journal_path, compact_after=3)
+        messages = _conversation(1)
+        for i in range(5):
+            journal.save(messages, {"turn": i})
+
+        records = [json.loads(line) for line in journal_path.read_text().splitlines()]
+        state_records = [r for r in records if r["type"] == "state"]
+
+        assert len(state_records) <= 3
+        assert ConversationJournal(journal_path).load()[1] == {"turn": 4}
+
+    def test_partial_last_line_is_skipped_and_rewritten(self, journal_path):
+        """Test recovery from a crash in the middle of an append."""
+        journal = ConversationJournal(journal_path)
+        messages = _conversation(1)
+        journal.save(messages, {})
+        with open(journal_path, "a") as f:
+            f.write('{"type":"message","message":{"role":"us')
+
+        resumed = ConversationJournal(journal_path)
+        loaded, _ = resumed.load()
+        assert len(loaded) == 2
+
+        resumed.save(messages + [HumanMessage(content="next")], {})
+        for line in journal_path.read_text().splitlines():
+            json.loads(line)
+
+    def test_resume_continues_appending(self, journal_path):
+        """Test that a loaded journal is appended to by later saves."""
+        ConversationJournal(journal_path).save(["a", "b"], {})
+        resumed = ConversationJournal(journal_path)
+        loaded, _ = resumed.load()
+        lines_before = self._line_count(journal_path)
+
+        resumed.save(loaded + ["c"], {})
+
+        assert self._line_count(journal_path) == lines_before + 1
@@ -0,0 +1,224 @@
+import asyncio
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from sre_agent import multi_agent_langgraph
+from sre_agent.agent_nodes import ParallelAgentNode
+from sre_agent.constants import SREConstants
+from sre_agent.llm_utils import LLMProviderError
+from sre_agent.supervisor import InvestigationPlan, SupervisorAgent, _plan_wave
+
+
+class FakeAgent:
+    """Agent node that answers after `delay` seconds."""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+
+    async def __call__(self, state):
+        await asyncio.sleep(self.delay)
+        return {
+            "messages": state["messages"] + [AIMessage(content=f"{self.name} done")],
+            "agent_results": {self.name: f"{self.name} findings"},
+            "metadata": {f"{self.name}_trace": [self.name]},
+        }
+
+
+def _supervisor(parallel_agents):
+    """Supervisor without an LLM or memory system."""
+    supervisor = SupervisorAgent.__new__(SupervisorAgent)
+    supervisor.parallel_agents = parallel_agents
+    supervisor.llm_provider = "bedrock"
+    supervisor.llm = Mock()
+    supervisor.memory_client = None
+    supervisor.memory_hooks = None
+    supervisor.conversation_manager = None
+    supervisor.memory_tools = []
+    supervisor.planning_agent = None
+    supervisor.formatter = Mock()
+    supervisor.formatter.format_investigation_response.return_value = "Report"
+    return supervisor
+
+
+def _plan(agents_sequence):
+    return InvestigationPlan(
+        steps=[f"Run {agent}" for agent in agents_sequence],
+        agents_sequence=agents_sequence,
+        complexity="simple",
+        auto_execute=True,
+        reasoning="test",
+    )
+
+
+def _state(parallel_agents):
+    return {
+        "messages": [HumanMessage(content="why is the api slow?")],
+        "agent_results": {},
+        "agents_invoked": [],
+        "metadata": {"parallel_agents": parallel_agents},
+    }
+
+
+class TestPlanWave:
+    """Tests for grouping plan steps into waves."""
+
+    def test_independent_steps_share_a_wave(self):
+        """Test that consecutive diagnostic agents run in one wave."""
+        sequence = ["kubernetes_agent", "logs_agent", "metrics_agent"]
+
+        assert _plan_wave(sequence, 0) == sequence
+
+    def test_runbooks_agent_starts_a_new_wave(self):
+        """Test that runbooks_agent runs after the agents it depends on."""
+        sequence = ["logs_agent", "metrics_agent", "runbooks_agent"]
+
+        assert _plan_wave(sequence, 0) == ["logs_agent", "metrics_agent"]
+        assert _plan_wave(sequence, 2) == ["runbooks_agent"]
+
+    def test_repeated_agent_starts_a_new_wave(self):
+        """Test that an agent appearing twice is not run twice in one wave."""
+        sequence = ["logs_agent", "metrics_agent", "logs_agent"]
+
+        assert _plan_wave(sequence, 0) == ["logs_agent", "metrics_agent"]
+        assert _plan_wave(sequence, 2) == ["logs_agent"]
+
+
+class TestNextDispatch:
+    """Tests for how the supervisor dispatches plan steps."""
+
+    def test_parallel_mode_routes_wave_to_parallel_node(self):
+        """Test that a multi-agent wave is routed to the parallel node."""
+        plan = _plan(["logs_agent", "metrics_agent", "runbooks_agent"])
+
+        next_agent, last_step, wave, _ = _supervisor(True)._next_dispatch(plan, 0)
+
+        assert next_agent == "parallel"
+        assert last_step == 1
+        assert wave == ["logs_agent", "metrics_agent"]
+
+    def test_parallel_mode_runs_dependent_step_alone(self):
+        """Test that the runbooks step is dispatched on its own after the wave."""
+        plan = _plan(["logs_agent", "metrics_agent", "runbooks_agent"])
+
+        next_agent, last_step, wave, _ = _supervisor(True)._next_dispatch(plan, 2)
+
+        assert (next_agent, last_step, wave) == ("runbooks_agent", 2, [])
+
+    def test_sequential_mode_dispatches_one_step_at_a_time(self):
+        """Test that plan steps run one agent at a time without parallel mode."""
+        plan = _plan(["logs_agent", "metrics_agent", "runbooks_agent"])
+        supervisor = _supervisor(False)
+
+        dispatched = [supervisor._next_dispatch(plan, step)[:3] for step in range(3)]
+
+        assert dispatched == [
+            ("logs_agent", 0, []),
+            ("metrics_agent", 1, []),
+            ("runbooks_agent", 2, []),
+        ]
+
+
+class TestParallelAgentNode:
+    """Tests for running a wave of agents concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_merged_in_plan_order(self):
+        """Test that results follow the wave order, not completion order."""
+        node = ParallelAgentNode(
+            {
+                "logs_agent": FakeAgent("logs_agent", delay=0.05),
+                "metrics_agent": FakeAgent("metrics_agent"),
+            },
+            timeout_seconds=5,
+        )
+
+        result = await node(_state(["logs_agent", "metrics_agent"]))
+
+        assert list(result["agent_results"]) == ["logs_agent", "metrics_agent"]
+        assert result["agents_invoked"] == ["logs_agent", "metrics_agent"]
+        assert [m.content for m in result["messages"][1:]] == [
+            "logs_agent done",
+            "metrics_agent done",
+        ]
+        assert result["metadata"]["logs_agent_trace"] == ["logs_agent"]
+        assert result["metadata"]["timed_out_agents"] == []
+
+    @pytest.mark.asyncio
+    async def test_timed_out_agent_is_reported(self):
+        """Test that an agent over the timeout is recorded in timed_out_agents."""
+        node = ParallelAgentNode(
+            {
+                "logs_agent": FakeAgent("logs_agent", delay=5),
+                "metrics_agent": FakeAgent("metrics_agent"),
+            },
+            timeout_seconds=0.05,
+        )
+
+        result = await node(_state(["logs_agent", "metrics_agent"]))
+
+        assert result["metadata"]["timed_out_agents"] == ["logs_agent"]
+        assert result["agent_results"]["logs_agent"].startswith(
+            "Error: Agent timed out"
+        )
+        assert result["agent_results"]["metrics_agent"] == "metrics_agent findings"
+        assert [m.content for m in result["messages"][1:]] == ["metrics_agent done"]
+
+    @pytest.mark.asyncio
+    async def test_aggregation_notes_partial_results(self):
+        """Test that the final report says which agents timed out."""
+        supervisor = _supervisor(True)
+        state = {
+            "current_query": "why is the api slow?",
+            "agent_results": {"metrics_agent": "metrics_agent findings"},
+            "metadata": {"timed_out_agents": ["logs_agent"]},
+        }
+
+        result = await supervisor.aggregate_responses(state)
+
+        assert result["final_response"].startswith("Report")
+        assert "Partial results" in result["final_response"]
+        assert "logs_agent did not finish" in result["final_response"]
+
+    @pytest.mark.asyncio
+    async def test_complete_results_are_not_marked_partial(self):
+        """Test that the report is unchanged when no agent timed out."""
+        supervisor = _supervisor(True)
+        state = {
+            "agent_results": {"metrics_agent": "metrics_agent findings"},
+            "metadata": {"timed_out_agents": []},
+        }
+
+        result = await supervisor.aggregate_responses(state)
+
+        assert result["final_response"] == "Report"
+
+
+class TestSequentialAgentsFlag:
+    """Tests for the --sequential-agents command line flag."""
+
+    async def _parallel_agents_for(self, *flags):
+        create = AsyncMock(side_effect=LLMProviderError("stop after setup"))
+        argv = ["sre-agent", "--prompt", "why is the api slow?", *flags]
+        with (
+            patch.object(sys, "argv", argv),
+            patch.object(multi_agent_langgraph, "create_multi_agent_system", create),
+        ):
+            await multi_agent_langgraph.main()
+        return create.call_args.kwargs["parallel_agents"]
+
+    @pytest.mark.asyncio
+    async def test_flag_disables_parallel_agents(self):
+        """Test that --sequential-agents builds the graph without parallel waves."""
+        assert await self._parallel_agents_for("--sequential-agents") is False
+
+    @pytest.mark.asyncio
+    async def test_default_follows_constants(self):
+        """Test that parallel execution defaults to the application setting."""
+        assert (
+            await self._parallel_agents_for()
+            == SREConstants.app.parallel_agent_execution
+        )
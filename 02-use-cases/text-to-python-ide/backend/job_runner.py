@@ -0,0 +1,212 @@
+"""Bounded, per-session job execution for the IDE backend.
+
+Agent calls and Code Interpreter streams are blocking boto3 work. Running
+them directly inside ``async def`` handlers stalls the event loop for every
+connected client, so handlers submit them here instead:
+
+* a bounded thread pool caps how much blocking work runs at once,
+* jobs of one IDE session run one at a time in submission order (a session
+  has one sandbox and one Python context),
+* jobs can be cancelled - queued jobs never start, running jobs stop at the
+  next stream event,
+* output emitted by a running job is forwarded to an async callback as it
+  arrives, which the WebSocket handler uses to stream stdout.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional
+
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+
+class JobCancelled(Exception):
+    """Raised when a job was cancelled before or while running"""
+
+
+class JobQueueFull(Exception):
+    """Raised when a session already has too many pending jobs"""
+
+
+class Job:
+    """One unit of blocking work submitted on behalf of an IDE session"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, session_id: str, kind: str):
+        self.job_id = f"job-{next(self._ids)}"
+        self.session_id = session_id
+        self.kind = kind
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._emit: Optional[Callable[[str, str], None]] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled(f"{self.kind} {self.job_id} was cancelled")
+
+    def emit_output(self, stream: str, text: str) -> None:
+        """Forward a chunk of output to whoever is listening (thread-safe)"""
+        if self._emit is not None and text:
+            self._emit(stream, text)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+        }
+
+
+# Job running in the current thread. Strands copies the context into its tool
+# threads, so agent tools can stream output and honour cancellation too.
+current_job: ContextVar[Optional[Job]] = ContextVar("current_job", default=None)
+
+
+def _run_job(job: Job, fn: Callable, args: tuple):
+    token = current_job.set(job)
+    try:
+        job.raise_if_cancelled()
+        return fn(*args)
+    finally:
+        current_job.reset(token)
+
+
+class JobRunner:
+    """Runs blocking jobs off the event loop, serialized per session"""
+
+    def __init__(self, max_workers: int = 16, max_pending_per_session: int = 8):
+        self.max_workers = max_workers
+        self.max_pending_per_session = max_pending_per_session
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ide-job"
+        )
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._jobs: Dict[str, List[Job]] = {}
+
+    async def run(
+        self,
+        session_id: str,
+        kind: str,
+        fn: Callable,
+        *args,
+        on_output: Optional[OutputCallback] = None,
+    ):
+        """Run ``fn(*args)`` in the pool once the session's earlier jobs finish.
+
+        Raises JobQueueFull if the session has too many pending jobs and
+        JobCancelled if the job was cancelled before it produced a result.
+        """
+        pending = self._jobs.setdefault(session_id, [])
+        if len(pending) >= self.max_pending_per_session:
+            raise JobQueueFull(
+                f"Session {session_id} already has {len(pending)} pending jobs"
+            )
+
+        job = Job(session_id, kind)
+        pending.append(job)
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        pump = None
+        try:
+            async with lock:
+                job.raise_if_cancelled()
+                job.status = "running"
+                job.started_at = time.time()
+                print(f"⚙️  Running {kind} {job.job_id} for session {session_id}")
+
+                loop = asyncio.get_running_loop()
+                if on_output is not None:
+                    output_queue: asyncio.Queue = asyncio.Queue()
+                    job._emit = lambda stream, text: loop.call_soon_threadsafe(
+                        output_queue.put_nowait, (stream, text)
+                    )
+                    pump = asyncio.create_task(self._pump(output_queue, on_output))
+
+                future = loop.run_in_executor(self._executor, _run_job, job, fn, args)
+                try:
+                    result = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # The thread cannot be interrupted; tell it to stop early
+                    # and keep the session busy until it actually has
+                    job.cancel()
+                    await asyncio.wait({future})
+                    if not future.cancelled():
+                        future.exception()  # Mark the outcome as retrieved
+                    raise
+                finally:
+                    job._emit = None
+                    if pump is not None:
+                        loop.call_soon(output_queue.put_nowait, None)
+                        await asyncio.gather(pump, return_exceptions=True)
+
+                job.raise_if_cancelled()
+                job.status = "done"
+                return result
+        except JobCancelled:
+            job.status = "cancelled"
+            print(f"🛑 {kind} {job.job_id} for session {session_id} cancelled")
+            raise
+        except BaseException:
+            job.status = "cancelled" if job.cancelled else "failed"
+            raise
+        finally:
+            job.finished_at = time.time()
+            pending.remove(job)
+            if not pending:
+                self._jobs.pop(session_id, None)
+                if not lock.locked():
+                    self._session_locks.pop(session_id, None)
+
+    @staticmethod
+    async def _pump(output_queue: asyncio.Queue, on_output: OutputCallback) -> None:
+        while True:
+            item = await output_queue.get()
+            if item is None:
+                return
+            try:
+                await on_output(*item)
+            except Exception as e:
+                print(f"⚠️  Failed to forward job output: {e}")
+
+    def cancel(self, session_id: str, job_id: Optional[str] = None) -> List[str]:
+        """Cancel the session's queued and running jobs (or just ``job_id``)"""
+        cancelled = []
+        for job in self._jobs.get(session_id, []):
+            if job_id is None or job.job_id == job_id:
+                job.cancel()
+                cancelled.append(job.job_id)
+        return cancelled
+
+    def jobs(self, session_id: str) -> List[dict]:
+        return [job.to_dict() for job in self._jobs.get(session_id, [])]
+
+    def stats(self) -> dict:
+        all_jobs = [job for jobs in self._jobs.values() for job in jobs]
+        return {
+            "max_workers": self.max_workers,
+            "running": sum(1 for job in all_jobs if job.status == "running"),
+            "queued": sum(1 for job in all_jobs if job.status == "queued"),
+            "sessions": len(self._jobs),
+        }
+
+    def shutdown(self) -> None:
+        for jobs in self._jobs.values():
+            for job in jobs:
+                job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -10,8 +10,9 @@ from dotenv import load_dotenv
 import boto3
 from botocore.exceptions import NoCredentialsError, ProfileNotFound
 from botocore.config import Config
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 import time
+import tempfile
 from functools import lru_cache
 
 # Load environment variables
@@ -99,6 +100,7 @@ def get_aws_credentials():
 # Import strands-agents framework - handle both installed and local versions
 try:
     from strands import Agent, tool
+    from strands.agent.conversation_manager import SlidingWindowConversationManager
     from strands.models import BedrockModel
     print("✓ Using strands-agents framework")
 except ImportError:
@@ -112,6 +114,7 @@ except ImportError:
     
     try:
         from strands import Agent, tool
+        from strands.agent.conversation_manager import SlidingWindowConversationManager
         from strands.models import BedrockModel
         print("✓ Using local strands framework")
     except ImportError as e:
@@ -121,16 +124,53 @@ except ImportError:
 
 # Import AgentCore for code interpreter
 from bedrock_agentcore.tools.code_interpreter_client import code_session
+from sandbox_pool import PooledSandbox, SandboxPool, current_sandbox_session
+from job_runner import JobCancelled, JobQueueFull, JobRunner, current_job
+from output_scanner import ImageStreamScanner, scan_output
+from session_store import ArtifactStore, SessionStore
+
+# Warm Code Interpreter sandboxes, one per IDE session
+sandbox_pool = None
+
+# Runs blocking agent and sandbox calls off the event loop
+job_runner = None
+
+async def evict_idle_resources():
+    """Periodically stop sandboxes and drop sessions that went quiet"""
+    while True:
+        await asyncio.sleep(60)
+        try:
+            evicted = await asyncio.to_thread(sandbox_pool.evict_idle)
+            if evicted:
+                print(f"🧹 Evicted {evicted} idle sandboxes ({len(sandbox_pool)} warm)")
+            expired = await asyncio.to_thread(active_sessions.evict_expired)
+            if expired:
+                print(f"🧹 Evicted {expired} expired sessions ({len(active_sessions)} active)")
+        except Exception as e:
+            print(f"⚠️  Idle resource eviction failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global aws_session, aws_region
+    global aws_session, aws_region, sandbox_pool, job_runner
     aws_session, aws_region = setup_aws_credentials()
+    sandbox_pool = SandboxPool(
+        aws_region,
+        idle_timeout_seconds=int(os.getenv('SANDBOX_IDLE_TIMEOUT', '600')),
+        session_timeout_seconds=int(os.getenv('AGENTCORE_SESSION_TIMEOUT', '1800')),
+        max_sandboxes=int(os.getenv('SANDBOX_POOL_SIZE', '50'))
+    )
+    job_runner = JobRunner(
+        max_workers=int(os.getenv('EXECUTION_WORKERS', '16')),
+        max_pending_per_session=int(os.getenv('MAX_PENDING_JOBS_PER_SESSION', '8'))
+    )
     initialize_agents()
+    eviction_task = asyncio.create_task(evict_idle_resources())
     yield
-    # Shutdown (if needed)
-    pass
+    # Shutdown
+    eviction_task.cancel()
+    job_runner.shutdown()
+    await asyncio.to_thread(sandbox_pool.shutdown)
 
 app = FastAPI(
     title="AgentCore Code Interpreter", 
@@ -177,109 +217,30 @@ class CodeInterpreterSession:
         self.execution_results = []
         self.interactive_sessions = {}  # Track interactive execution sessions
         self.uploaded_csv = None  # Store uploaded CSV file data
+        # Per-session agents - Strands agents keep conversation history and
+        # reject concurrent invocations, so sessions must not share them
+        self.code_generator = None
+        self.code_executor = None
 
 # Global variables for agents
 code_generator_agent = None
 code_executor_agent = None
 executor_type = "unknown"  # Track which executor type we're using
-active_sessions = {}
-
-def clean_output_for_display(output: str) -> str:
-    """Clean output for display by removing image binary data while preserving analysis text"""
-    if not output:
-        return output
-    
-    # If output contains IMAGE_DATA, extract everything except the binary
-    if 'IMAGE_DATA:' in output:
-        parts = output.split('IMAGE_DATA:')
-        cleaned_parts = []
-        
-        # Add the part before IMAGE_DATA
-        if parts[0].strip():
-            cleaned_parts.append(parts[0].strip())
-        
-        # Process parts after IMAGE_DATA
-        for i in range(1, len(parts)):
-            # Split on newline to separate binary from any following text
-            lines = parts[i].split('\n', 1)
-            if len(lines) > 1:
-                # Skip the binary line, keep any text after it
-                remaining_text = lines[1].strip()
-                if remaining_text and not remaining_text.startswith(('iVBOR', '/9j/', 'data:')):
-                    cleaned_parts.append(remaining_text)
-        
-        if cleaned_parts:
-            result = '\n\n'.join(cleaned_parts)
-            print(f"🧹 Cleaned output: removed image binary, kept {len(result)} chars of text")
-            return result
-        else:
-            return "Code executed successfully - chart generated"
-    
-    return output
 
-def extract_image_data(execution_result: str):
-    """Extract base64 image data from execution results - fixed for AgentCore format"""
-    try:
-        import re
-        import base64
-        
-        images = []
-        
-        print(f"🔍 Image extraction - Input length: {len(execution_result)}")
-        print(f"🔍 Contains IMAGE_DATA: {'IMAGE_DATA:' in execution_result}")
-        
-        if 'IMAGE_DATA:' in execution_result:
-            # Find all IMAGE_DATA: patterns in the text
-            # AgentCore puts the full base64 string in stdout, so we need a greedy pattern
-            pattern = r'IMAGE_DATA:([A-Za-z0-9+/=\n\r\s]+?)(?=\n[A-Za-z]|\nBase64|\n$|$)'
-            matches = re.findall(pattern, execution_result, re.MULTILINE | re.DOTALL)
-            
-            print(f"🔍 Regex matches found: {len(matches)}")
-            
-            for i, match in enumerate(matches):
-                try:
-                    # Clean up the base64 string - remove all whitespace and newlines
-                    clean_match = re.sub(r'[\s\n\r]', '', match)
-                    
-                    print(f"🔍 Match {i+1} - Original length: {len(match)}, Clean length: {len(clean_match)}")
-                    print(f"🔍 Match {i+1} - Starts with: {clean_match[:50]}...")
-                    
-                    # Must be reasonable length for an image (at least 1KB when decoded)
-                    if len(clean_match) > 1000:
-                        # Validate it's valid base64 and can be decoded
-                        decoded = base64.b64decode(clean_match)
-                        print(f"🔍 Match {i+1} - Decoded length: {len(decoded)} bytes")
-                        
-                        # Check if it looks like a PNG (starts with PNG signature)
-                        if decoded.startswith(b'\x89PNG\r\n\x1a\n'):
-                            images.append({
-                                'format': 'png',
-                                'data': clean_match,
-                                'source': 'agentcore_stdout'
-                            })
-                            print(f"✅ Match {i+1} - Valid PNG image extracted")
-                        # Also check for JPEG signatures
-                        elif decoded.startswith(b'\xff\xd8\xff'):
-                            images.append({
-                                'format': 'jpeg',
-                                'data': clean_match,
-                                'source': 'agentcore_stdout'
-                            })
-                            print(f"✅ Match {i+1} - Valid JPEG image extracted")
-                        else:
-                            print(f"⚠️  Match {i+1} - Invalid image signature")
-                    else:
-                        print(f"⚠️  Match {i+1} - Too short to be valid image")
-                except Exception as e:
-                    print(f"❌ Match {i+1} - Extraction error: {e}")
-                    continue
-        
-        print(f"🎯 Final result: {len(images)} images extracted")
-        return images
-        
-    except Exception as e:
-        print(f"❌ Image extraction error: {e}")
-        return []
+# Per-session agents keep their own conversation outside the session store;
+# a sliding window keeps it from growing with every request of a long session
+AGENT_WINDOW_MESSAGES = int(os.getenv('AGENT_WINDOW_MESSAGES', '20'))
+
+# Bounded session store; large CSVs and chart images spill to disk by hash
+active_sessions = SessionStore(
+    CodeInterpreterSession,
+    max_sessions=int(os.getenv('MAX_SESSIONS', '200')),
+    idle_ttl_seconds=int(os.getenv('SESSION_TTL', str(24 * 3600))),
+    max_session_bytes=int(os.getenv('SESSION_MAX_BYTES', str(8 * 1024 * 1024))),
+    artifacts=ArtifactStore(
+        os.getenv('SESSION_ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), 'text-to-python-ide-artifacts'))
+    ) if os.getenv('SESSION_SPILL_TO_DISK', 'true').lower() == 'true' else None
+)
 
 def upload_files_to_agentcore_sandbox(files_data: list, aws_region: str) -> bool:
     """Upload files to AgentCore sandbox using writeFiles tool"""
@@ -309,7 +270,19 @@ def upload_files_to_agentcore_sandbox(files_data: list, aws_region: str) -> bool
         print(f"❌ File upload failed: {str(e)}")
         return False
 
-def execute_chart_code_direct(code: str, session_files: list = None) -> tuple[str, list]:
+@contextmanager
+def sandbox_for_session(session_id: Optional[str]):
+    """Warm pooled sandbox for an IDE session, or a one-off sandbox without one"""
+    if session_id and sandbox_pool is not None:
+        with sandbox_pool.lease(session_id) as sandbox:
+            yield sandbox
+    else:
+        with code_session(aws_region) as code_client:
+            sandbox = PooledSandbox(session_id or "one-off")
+            sandbox.client = code_client
+            yield sandbox
+
+def execute_chart_code_direct(code: str, session_files: list = None, session_id: Optional[str] = None) -> tuple[str, list]:
     """Execute chart code directly with AgentCore to preserve full base64 output"""
     try:
         print(f"\n🎨 Direct AgentCore chart execution")
@@ -319,81 +292,67 @@ def execute_chart_code_direct(code: str, session_files: list = None) -> tuple[st
         clean_code = extract_python_code_from_prompt(code)
         print(f"🔧 Clean code length: {len(clean_code)} characters")
         
-        with code_session(aws_region) as code_client:
-            # Upload files to sandbox if provided
-            if session_files:
-                print(f"📁 Uploading {len(session_files)} files to sandbox...")
-                files_data = []
-                for file_info in session_files:
-                    files_data.append({
-                        "path": file_info['filename'],
-                        "text": file_info['content']
-                    })
-                
-                # Upload files using writeFiles tool
-                upload_response = code_client.invoke("writeFiles", {"content": files_data})
-                for event in upload_response["stream"]:
-                    result = event.get("result", {})
-                    if result.get("isError", False):
-                        error_content = result.get("content", [{}])
-                        error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                        print(f"❌ File upload error: {error_text}")
-                        return f"File upload failed: {error_text}", []
-                    else:
-                        content = result.get("content", [])
-                        for item in content:
-                            if item.get("type") == "text":
-                                print(f"✅ File upload: {item.get('text', '')}")
+        # Process response directly without Strands-Agents truncation;
+        # images are split from the text as stdout arrives
+        scanner = ImageStreamScanner()
+        output_length = 0
+        
+        with sandbox_for_session(session_id) as sandbox:
+            # Upload new or changed session files only
+            upload_error = sandbox.sync_files(session_files or [])
+            if upload_error:
+                return f"File upload failed: {upload_error}", []
             
             # Execute the cleaned code
-            response = code_client.invoke("executeCode", {
+            response = sandbox.client.invoke("executeCode", {
                 "code": clean_code,
                 "language": "python",
                 "clearContext": False
             })
-        
-        # Process response directly without Strands-Agents truncation
-        output_parts = []
-        full_stdout = ""
-        
-        for event in response["stream"]:
-            result = event.get("result", {})
-            
-            if result.get("isError", False):
-                error_content = result.get("content", [{}])
-                error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                print(f"❌ Direct execution error: {error_text}")
-                return f"Error: {error_text}", []
-            
-            # Extract structured content
-            structured_content = result.get("structuredContent", {})
-            stdout = structured_content.get("stdout", "")
-            stderr = structured_content.get("stderr", "")
             
-            if stdout:
-                output_parts.append(stdout)
-                full_stdout += stdout
-                print(f"📤 Direct stdout captured: {len(stdout)} characters")
-            if stderr:
-                output_parts.append(f"Errors: {stderr}")
-                print(f"⚠️  Direct stderr: {stderr}")
-        
-        # Combine output
-        final_output = "\n".join(output_parts) if output_parts else "Code executed successfully"
-        
-        # Extract images directly from full stdout
-        images = extract_image_data(full_stdout)
-        
-        # Clean the output for display (remove image binary but keep analysis text)
-        display_output = clean_output_for_display(final_output)
+            job = current_job.get()
+            for event in response["stream"]:
+                if job:
+                    job.raise_if_cancelled()
+                result = event.get("result", {})
+                
+                if result.get("isError", False):
+                    error_content = result.get("content", [{}])
+                    error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
+                    print(f"❌ Direct execution error: {error_text}")
+                    return f"Error: {error_text}", []
+                
+                # Extract structured content
+                structured_content = result.get("structuredContent", {})
+                stdout = structured_content.get("stdout", "")
+                stderr = structured_content.get("stderr", "")
+                
+                if stdout:
+                    display_text = scanner.feed(stdout)
+                    if job:
+                        job.emit_output("stdout", display_text)
+                    print(f"📤 Direct stdout captured: {len(stdout)} characters")
+                if stderr:
+                    scanner.add_text(f"\nErrors: {stderr}" if output_length else f"Errors: {stderr}")
+                    if job:
+                        job.emit_output("stderr", stderr)
+                    print(f"⚠️  Direct stderr: {stderr}")
+                output_length += len(stdout) + len(stderr)
+        
+        # Display output keeps the analysis text, images carry the binary
+        display_output, images = scanner.finish()
+        if not output_length:
+            display_output = "Code executed successfully"
         
         print(f"✅ Direct execution completed:")
-        print(f"   Output length: {len(final_output)}")
+        print(f"   Output length: {output_length}")
         print(f"   Display output length: {len(display_output)}")
         print(f"   Images extracted: {len(images)}")
         
         return display_output, images
         
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"❌ Direct AgentCore execution failed: {str(e)}")
         import traceback
@@ -651,9 +610,8 @@ def extract_python_code_from_prompt(input_text: str) -> str:
     print(f"🔧 Using input as-is (no markdown formatting detected)")
     return input_text.strip()
 
-@tool
-def execute_python_code(code: str, description: str = "", files: list = None) -> str:
-    """Execute Python code using AgentCore CodeInterpreter - reliable execution with proper output capture and file support"""
+def run_python_code(code: str, description: str = "", files: list = None, session_id: Optional[str] = None) -> str:
+    """Execute Python code in the sandbox of ``session_id`` (a one-off sandbox without one)"""
     
     # Extract clean Python code from markdown-formatted input
     clean_code = extract_python_code_from_prompt(code)
@@ -667,62 +625,50 @@ def execute_python_code(code: str, description: str = "", files: list = None) ->
     print(f"🔧 Clean code preview: {clean_code[:200]}...")
     
     try:
-        with code_session(aws_region) as code_client:
-            # Upload files to sandbox if provided
-            if files:
-                print(f"📁 Uploading {len(files)} files to sandbox...")
-                files_data = []
-                for file_info in files:
-                    files_data.append({
-                        "path": file_info.get('filename', 'uploaded_file.csv'),
-                        "text": file_info.get('content', '')
-                    })
-                
-                # Upload files using writeFiles tool
-                upload_response = code_client.invoke("writeFiles", {"content": files_data})
-                for event in upload_response["stream"]:
-                    result = event.get("result", {})
-                    if result.get("isError", False):
-                        error_content = result.get("content", [{}])
-                        error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                        print(f"❌ File upload error: {error_text}")
-                        return f"File upload failed: {error_text}"
-                    else:
-                        content = result.get("content", [])
-                        for item in content:
-                            if item.get("type") == "text":
-                                print(f"✅ File upload: {item.get('text', '')}")
+        # Process the response stream to capture all output
+        output_parts = []
+        
+        with sandbox_for_session(session_id) as sandbox:
+            # Upload new or changed files to sandbox if provided
+            upload_error = sandbox.sync_files(files or [])
+            if upload_error:
+                return f"File upload failed: {upload_error}"
             
             # Execute the code
-            response = code_client.invoke("executeCode", {
+            response = sandbox.client.invoke("executeCode", {
                 "code": clean_code,
                 "language": "python",
                 "clearContext": False
             })
-        
-        # Process the response stream to capture all output
-        output_parts = []
-        
-        for event in response["stream"]:
-            result = event.get("result", {})
-            
-            if result.get("isError", False):
-                error_content = result.get("content", [{}])
-                error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
-                print(f"❌ AgentCore execution error: {error_text}")
-                return f"Error: {error_text}"
             
-            # Extract structured content (stdout, stderr)
-            structured_content = result.get("structuredContent", {})
-            stdout = structured_content.get("stdout", "")
-            stderr = structured_content.get("stderr", "")
-            
-            if stdout:
-                output_parts.append(stdout)
-                print(f"📤 Stdout captured: {len(stdout)} characters")
-            if stderr:
-                output_parts.append(f"Errors: {stderr}")
-                print(f"⚠️  Stderr captured: {len(stderr)} characters")
+            job = current_job.get()
+            stream_scanner = ImageStreamScanner()
+            for event in response["stream"]:
+                if job:
+                    job.raise_if_cancelled()
+                result = event.get("result", {})
+                
+                if result.get("isError", False):
+                    error_content = result.get("content", [{}])
+                    error_text = error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
+                    print(f"❌ AgentCore execution error: {error_text}")
+                    return f"Error: {error_text}"
+                
+                # Extract structured content (stdout, stderr)
+                structured_content = result.get("structuredContent", {})
+                stdout = structured_content.get("stdout", "")
+                stderr = structured_content.get("stderr", "")
+                if job:
+                    # Stream text only; the agent still gets the full stdout
+                    job.emit_output("stdout", stream_scanner.feed(stdout))
+                    job.emit_output("stderr", stderr)
+                
+                if stdout:
+                    output_parts.append(stdout)
+                    print(f"📤 Stdout captured: {len(stdout)} characters")
+                if stderr:
+                    output_parts.append(f"Errors: {stderr}")
+                    print(f"⚠️  Stderr captured: {len(stderr)} characters")
         
         # Combine all output
         final_output = "\n".join(output_parts) if output_parts else "Code executed successfully (no output)"
@@ -730,12 +676,35 @@ def execute_python_code(code: str, description: str = "", files: list = None) ->
         print(f"✅ AgentCore execution completed - Output length: {len(final_output)}")
         return final_output
                 
+    except JobCancelled:
+        print(f"🛑 AgentCore execution cancelled")
+        return "Execution cancelled"
     except Exception as e:
         print(f"❌ AgentCore execution error: {str(e)}")
         import traceback
         print(f"📋 Full traceback: {traceback.format_exc()}")
         return f"Execution failed: {str(e)}"
 
+def create_execute_python_code_tool(session_id: Optional[str] = None):
+    """Create the execute_python_code tool, bound to an IDE session's sandbox
+    
+    Per-session executor agents get a tool with their session ID baked in, so
+    tool calls reach the session's warm sandbox on whatever thread Strands runs
+    them. An unbound tool falls back to ``current_sandbox_session``.
+    """
+    @tool
+    def execute_python_code(code: str, description: str = "", files: list = None) -> str:
+        """Execute Python code using AgentCore CodeInterpreter - reliable execution with proper output capture and file support"""
+        sandbox_session_id = session_id or current_sandbox_session.get()
+        if sandbox_session_id is None:
+            print("⚠️  execute_python_code has no IDE session - falling back to a one-off sandbox")
+        return run_python_code(code, description, files, sandbox_session_id)
+    
+    return execute_python_code
+
+# Tool of the shared executor agent, which is not bound to a session
+execute_python_code = create_execute_python_code_tool()
+
 @lru_cache(maxsize=1)
 def get_extended_botocore_config():
     """Get BotocoreConfig with extended timeouts for long-running code execution
@@ -818,6 +787,58 @@ def create_bedrock_model_with_fallback(aws_region: str):
             except Exception as final_error:
                 raise Exception(f"All model initialization attempts failed: {final_error}")
 
+def create_code_generator_agent(bedrock_model, model_id: str):
+    """Create a Strands-Agents code generator agent"""
+    return Agent(
+        model=bedrock_model,
+        conversation_manager=SlidingWindowConversationManager(window_size=AGENT_WINDOW_MESSAGES),
+        system_prompt=f"""You are a Python code generator specialist powered by {model_id}. Your role is to:
+            1. Generate clean, well-commented Python code based on user requirements
+            2. Follow Python best practices and PEP 8 style guidelines
+            3. Include appropriate error handling where needed
+            4. Only return executable Python code without explanations or markdown formatting
+            5. Make sure the code is complete and runnable
+            6. Do not include any text before or after the code
+            
+            Focus on creating practical, efficient code that solves the user's specific problem.
+            Return ONLY the Python code, no explanations, no markdown, no additional text."""
+    )
+
+def create_code_executor_agent(bedrock_model, model_id: str, session_id: Optional[str] = None):
+    """Create a Strands-Agents executor agent with the AgentCore CodeInterpreter tool
+    
+    With a ``session_id`` the agent's tool always runs code in that IDE
+    session's sandbox.
+    """
+    # Following the sample system prompt
+    system_prompt = f"""You are a helpful AI assistant powered by {model_id} that validates all answers through code execution.
+
+VALIDATION PRINCIPLES:
+1. When making claims about code, algorithms, or calculations - write code to verify them
+2. Use execute_python_code to test mathematical calculations, algorithms, and logic
+3. Create test scripts to validate your understanding before giving answers
+4. Always show your work with actual code execution
+5. If uncertain, explicitly state limitations and validate what you can
+
+APPROACH:
+- If asked about a programming concept, implement it in code to demonstrate
+- If asked for calculations, compute them programmatically AND show the code
+- If implementing algorithms, include test cases to prove correctness
+- Document your validation process for transparency
+- The sandbox maintains state between executions, so you can refer to previous results
+
+TOOL AVAILABLE:
+- execute_python_code: Run Python code and see output
+
+RESPONSE FORMAT: The execute_python_code tool returns execution results including stdout, stderr, and any errors."""
+    
+    return Agent(
+        model=bedrock_model,
+        tools=[create_execute_python_code_tool(session_id) if session_id else execute_python_code],
+        conversation_manager=SlidingWindowConversationManager(window_size=AGENT_WINDOW_MESSAGES),
+        system_prompt=system_prompt
+    )
+
 def setup_aws_credentials():
     """Setup AWS credentials - uses cached version"""
     global _aws_session_cache
@@ -853,19 +874,7 @@ def initialize_agents():
         print(f"🎯 Using model: {model_id}")
         
         # Initialize Code Generator Agent using strands-agents
-        code_generator_agent = Agent(
-            model=bedrock_model,
-            system_prompt=f"""You are a Python code generator specialist powered by {model_id}. Your role is to:
-            1. Generate clean, well-commented Python code based on user requirements
-            2. Follow Python best practices and PEP 8 style guidelines
-            3. Include appropriate error handling where needed
-            4. Only return executable Python code without explanations or markdown formatting
-            5. Make sure the code is complete and runnable
-            6. Do not include any text before or after the code
-            
-            Focus on creating practical, efficient code that solves the user's specific problem.
-            Return ONLY the Python code, no explanations, no markdown, no additional text."""
-        )
+        code_generator_agent = create_code_generator_agent(bedrock_model, model_id)
         
         # Test AgentCore availability
         with code_session(aws_region) as test_client:
@@ -878,33 +887,8 @@ def initialize_agents():
         # AgentCore is working - create executor agent with AgentCore tool
         executor_type = "agentcore"
         
-        # Create Code Executor Agent with AgentCore tool - following the sample system prompt
-        SYSTEM_PROMPT = f"""You are a helpful AI assistant powered by {model_id} that validates all answers through code execution.
-
-VALIDATION PRINCIPLES:
-1. When making claims about code, algorithms, or calculations - write code to verify them
-2. Use execute_python_code to test mathematical calculations, algorithms, and logic
-3. Create test scripts to validate your understanding before giving answers
-4. Always show your work with actual code execution
-5. If uncertain, explicitly state limitations and validate what you can
-
-APPROACH:
-- If asked about a programming concept, implement it in code to demonstrate
-- If asked for calculations, compute them programmatically AND show the code
-- If implementing algorithms, include test cases to prove correctness
-- Document your validation process for transparency
-- The sandbox maintains state between executions, so you can refer to previous results
-
-TOOL AVAILABLE:
-- execute_python_code: Run Python code and see output
-
-RESPONSE FORMAT: The execute_python_code tool returns execution results including stdout, stderr, and any errors."""
-        
-        code_executor_agent = Agent(
-            model=bedrock_model,
-            tools=[execute_python_code],
-            system_prompt=SYSTEM_PROMPT
-        )
+        # Create Code Executor Agent with AgentCore tool
+        code_executor_agent = create_code_executor_agent(bedrock_model, model_id)
         
         print("✅ Agents initialized successfully:")
         print(f"   - Code Generator: Strands-Agents Agent with {model_id}")
@@ -929,10 +913,24 @@ def get_or_create_session(session_id: Optional[str] = None) -> CodeInterpreterSe
     if session_id is None:
         session_id = str(uuid.uuid4())
     
-    if session_id not in active_sessions:
-        active_sessions[session_id] = CodeInterpreterSession(session_id)
-    
-    return active_sessions[session_id]
+    return active_sessions.get_or_create(session_id)
+
+def get_session_agents(session: CodeInterpreterSession):
+    """Get (code_generator, code_executor) agents for a session, creating them on first use"""
+    if session.code_generator is None or session.code_executor is None:
+        bedrock_model, model_id = create_bedrock_model_with_fallback(aws_region)
+        session.code_generator = create_code_generator_agent(bedrock_model, model_id)
+        session.code_executor = create_code_executor_agent(bedrock_model, model_id, session.session_id)
+    return session.code_generator, session.code_executor
+
+async def run_session_job(session_id: str, kind: str, fn, *args, on_output=None):
+    """Run blocking work for a session on the job runner, mapping job errors to HTTP errors"""
+    try:
+        return await job_runner.run(session_id, kind, fn, *args, on_output=on_output)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except JobCancelled as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 # Utility functions for code analysis
 def detect_chart_code(code: str) -> bool:
@@ -977,49 +975,45 @@ def input(prompt=''):
     
     return input_setup + code
 
-@app.post("/api/generate-code")
-async def generate_code(request: CodeGenerationRequest):
-    """Generate Python code using the strands-agents code generator agent"""
-    try:
-        session = get_or_create_session(request.session_id)
-        
-        # Check if prompt mentions files but no CSV is uploaded
-        file_keywords = ['file', 'csv', 'data', 'dataset', 'load', 'read', 'import', 'upload']
-        mentions_file = any(keyword in request.prompt.lower() for keyword in file_keywords)
-        
-        if mentions_file and not session.uploaded_csv:
-            return {
-                "success": False,
-                "requires_file": True,
-                "message": "Your request mentions working with files. Please upload a CSV file first.",
-                "session_id": session.session_id
-            }
-        
-        # Prepare prompt with CSV context if available
-        enhanced_prompt = request.prompt
-        
-        # Check if the request involves visualization/charts
-        chart_keywords = ['plot', 'chart', 'graph', 'visualiz', 'histogram', 'scatter', 'bar chart', 'line chart', 'pie chart', 'heatmap', 'matplotlib', 'seaborn', 'plotly']
-        needs_visualization = any(keyword in request.prompt.lower() for keyword in chart_keywords)
-        
-        if session.uploaded_csv:
-            csv_info = f"""
+def generate_code_for_session(session: CodeInterpreterSession, prompt: str) -> dict:
+    """Generate code for a session (blocking - run it through the job runner)"""
+    # Check if prompt mentions files but no CSV is uploaded
+    file_keywords = ['file', 'csv', 'data', 'dataset', 'load', 'read', 'import', 'upload']
+    mentions_file = any(keyword in prompt.lower() for keyword in file_keywords)
+    
+    if mentions_file and not session.uploaded_csv:
+        return {
+            "success": False,
+            "requires_file": True,
+            "message": "Your request mentions working with files. Please upload a CSV file first.",
+            "session_id": session.session_id
+        }
+    
+    # Prepare prompt with CSV context if available
+    enhanced_prompt = prompt
+    
+    # Check if the request involves visualization/charts
+    chart_keywords = ['plot', 'chart', 'graph', 'visualiz', 'histogram', 'scatter', 'bar chart', 'line chart', 'pie chart', 'heatmap', 'matplotlib', 'seaborn', 'plotly']
+    needs_visualization = any(keyword in prompt.lower() for keyword in chart_keywords)
+    
+    if session.uploaded_csv:
+        csv_info = f"""
 You have access to a CSV file named '{session.uploaded_csv['filename']}' with the following content preview:
 
 ```csv
-{session.uploaded_csv['content'][:1000]}{'...' if len(session.uploaded_csv['content']) > 1000 else ''}
+{session.uploaded_csv['preview']}{'...' if session.uploaded_csv['size'] > 1000 else ''}
 ```
 
 When generating code, assume this CSV data is available and can be loaded using pandas.read_csv() or similar methods. 
 Use the filename '{session.uploaded_csv['filename']}' in your code.
 
-User request: {request.prompt}
+User request: {prompt}
 """
-            enhanced_prompt = csv_info
-        
-        # Add chart rendering instructions if visualization is needed
-        if needs_visualization:
-            chart_instructions = """
+        enhanced_prompt = csv_info
+    
+    # Add chart rendering instructions if visualization is needed
+    if needs_visualization:
+        chart_instructions = """
 
 IMPORTANT: For reliable chart rendering in the web interface, use this approach:
 
@@ -1053,33 +1047,42 @@ print("Chart generated successfully!")
 
 This ensures your charts are properly displayed in the web interface.
 """
-            enhanced_prompt += chart_instructions
-        
-        # Use the strands-agents agent for code generation
-        agent_result = code_generator_agent(enhanced_prompt)
-        
-        # Extract string content from AgentResult
-        generated_code = str(agent_result) if agent_result is not None else ""
-        
-        # Store generation in session history
-        session.conversation_history.append({
-            "type": "generation",
-            "prompt": request.prompt,
-            "enhanced_prompt": enhanced_prompt if session.uploaded_csv else None,
-            "generated_code": generated_code,
-            "agent": "strands_code_generator",
-            "csv_used": session.uploaded_csv['filename'] if session.uploaded_csv else None,
-            "timestamp": time.time()
-        })
-        
-        return {
-            "success": True,
-            "code": generated_code,
-            "session_id": session.session_id,
-            "agent_used": "strands_code_generator",
-            "csv_file_used": session.uploaded_csv['filename'] if session.uploaded_csv else None
-        }
-        
+        enhanced_prompt += chart_instructions
+    
+    # Use the session's strands-agents agent for code generation
+    code_generator, _ = get_session_agents(session)
+    agent_result = code_generator(enhanced_prompt)
+    
+    # Extract string content from AgentResult
+    generated_code = str(agent_result) if agent_result is not None else ""
+    
+    # Store generation in session history
+    active_sessions.append_history(session, "conversation_history", {
+        "type": "generation",
+        "prompt": prompt,
+        "enhanced_prompt": enhanced_prompt if session.uploaded_csv else None,
+        "generated_code": generated_code,
+        "agent": "strands_code_generator",
+        "csv_used": session.uploaded_csv['filename'] if session.uploaded_csv else None,
+        "timestamp": time.time()
+    })
+    
+    return {
+        "success": True,
+        "code": generated_code,
+        "session_id": session.session_id,
+        "agent_used": "strands_code_generator",
+        "csv_file_used": session.uploaded_csv['filename'] if session.uploaded_csv else None
+    }
+
+@app.post("/api/generate-code")
+async def generate_code(request: CodeGenerationRequest):
+    """Generate Python code using the strands-agents code generator agent"""
+    try:
+        session = get_or_create_session(request.session_id)
+        return await run_session_job(session.session_id, "generate_code", generate_code_for_session, session, request.prompt)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Code generation failed: {str(e)}")
 
@@ -1087,6 +1090,7 @@ This ensures your charts are properly displayed in the web interface.
 async def analyze_code(request: CodeExecutionRequest):
     """Analyze code to detect interactive elements and suggest inputs - OPTIMIZED"""
     try:
+        session = get_or_create_session(request.session_id)
         is_interactive = detect_interactive_code(request.code)
         
         if is_interactive:
@@ -1104,12 +1108,13 @@ Provide:
 
 Keep response short and practical."""
             
-            analysis_result = code_generator_agent(analysis_prompt)
+            code_generator, _ = get_session_agents(session)
+            analysis_result = await run_session_job(session.session_id, "analyze_code", code_generator, analysis_prompt)
             
             return {
                 "success": True,
                 "interactive": True,
-                "analysis": analysis_result,
+                "analysis": str(analysis_result),
                 "suggestions": "Provide inputs in the order they appear in the code"
             }
         else:
@@ -1120,148 +1125,181 @@ Keep response short and practical."""
                 "suggestions": None
             }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Code analysis failed: {str(e)}")
 
-@app.post("/api/execute-code")
-async def execute_code(request: CodeExecutionRequest):
-    """Execute Python code using hybrid approach: direct AgentCore for charts, Strands-Agents for others"""
-    try:
-        session = get_or_create_session(request.session_id)
-        
-        # Track execution start time
-        execution_start_time = time.time()
-        
-        # Check if code is interactive
-        is_interactive = request.interactive or detect_interactive_code(request.code)
-        
-        # Try to find the original prompt from recent conversation history
-        user_prompt = None
-        if session.conversation_history:
-            # Look for the most recent generation entry with a prompt
-            for entry in reversed(session.conversation_history):
-                if entry.get('prompt'):  # Direct prompt field
-                    user_prompt = entry['prompt']
+def run_code_execution(session: CodeInterpreterSession, code: str, interactive: bool = False, inputs: Optional[List[str]] = None) -> dict:
+    """Execute code for a session (blocking - run it through the job runner)"""
+    # Track execution start time
+    execution_start_time = time.time()
+    
+    # Check if code is interactive
+    is_interactive = interactive or detect_interactive_code(code)
+    
+    # Try to find the original prompt from recent conversation history
+    user_prompt = None
+    if session.conversation_history:
+        # Look for the most recent generation entry with a prompt
+        for entry in reversed(session.conversation_history):
+            if entry.get('prompt'):  # Direct prompt field
+                user_prompt = entry['prompt']
+                break
+            elif entry.get('type') == 'generation' and entry.get('generated_code'):
+                # Check if this generated code matches the current code being executed
+                if entry.get('generated_code') and code.strip() in entry.get('generated_code', ''):
+                    user_prompt = entry.get('prompt')
                     break
-                elif entry.get('type') == 'generation' and entry.get('generated_code'):
-                    # Check if this generated code matches the current code being executed
-                    if entry.get('generated_code') and request.code.strip() in entry.get('generated_code', ''):
-                        user_prompt = entry.get('prompt')
-                        break
-        
-        # If no prompt found, check if this is a direct code execution
-        if not user_prompt:
-            # For direct executions, we can create a descriptive prompt based on the code
-            code_lines = request.code.strip().split('\n')
-            if len(code_lines) == 1 and len(code_lines[0]) < 100:
-                user_prompt = f"Execute: {code_lines[0]}"
-            elif 'input(' in request.code:
-                user_prompt = "Interactive code execution"
-            elif any(keyword in request.code.lower() for keyword in ['import matplotlib', 'plt.', 'plot', 'chart']):
-                user_prompt = "Generate visualization/chart"
-            elif 'import pandas' in request.code or 'pd.' in request.code:
-                user_prompt = "Data analysis with pandas"
-            else:
-                user_prompt = "Direct code execution"
-        
-        # Prepare code for execution
-        if is_interactive and request.inputs:
-            prepared_code = prepare_interactive_code(request.code, request.inputs)
-            print(f"🔄 Interactive code prepared with {len(request.inputs)} inputs")
+    
+    # If no prompt found, check if this is a direct code execution
+    if not user_prompt:
+        # For direct executions, we can create a descriptive prompt based on the code
+        code_lines = code.strip().split('\n')
+        if len(code_lines) == 1 and len(code_lines[0]) < 100:
+            user_prompt = f"Execute: {code_lines[0]}"
+        elif 'input(' in code:
+            user_prompt = "Interactive code execution"
+        elif any(keyword in code.lower() for keyword in ['import matplotlib', 'plt.', 'plot', 'chart']):
+            user_prompt = "Generate visualization/chart"
+        elif 'import pandas' in code or 'pd.' in code:
+            user_prompt = "Data analysis with pandas"
         else:
-            prepared_code = request.code
+            user_prompt = "Direct code execution"
+    
+    # Prepare code for execution
+    if is_interactive and inputs:
+        prepared_code = prepare_interactive_code(code, inputs)
+        print(f"🔄 Interactive code prepared with {len(inputs)} inputs")
+    else:
+        prepared_code = code
+    
+    # Check if this is chart/visualization code
+    is_chart_code = detect_chart_code(prepared_code)
+    
+    # Get session files for sandbox upload
+    session_files = []
+    if session.uploaded_csv:
+        session_files.append({
+            'filename': session.uploaded_csv['filename'],
+            'sha256': session.uploaded_csv['sha256'],
+            # Only read back from disk if the sandbox does not have it yet
+            'read_content': lambda: active_sessions.uploaded_csv_content(session)
+        })
+    
+    # REVERTED: Use original logic - only force direct AgentCore for charts and files, NOT for interactive
+    if is_chart_code or session_files:
+        print(f"🎨 Chart code detected - using direct AgentCore execution")
         
-        # Check if this is chart/visualization code
-        is_chart_code = detect_chart_code(prepared_code)
+        # Use direct AgentCore execution to preserve full base64 output
+        execution_result_str, images = execute_chart_code_direct(prepared_code, session_files, session.session_id)
+        agent_used = "direct_agentcore_charts"
         
-        # Get session files for sandbox upload
-        session_files = []
-        if session.uploaded_csv:
-            session_files.append({
-                'filename': session.uploaded_csv['filename'],
-                'content': session.uploaded_csv['content']
-            })
-        
-        # REVERTED: Use original logic - only force direct AgentCore for charts and files, NOT for interactive
-        if is_chart_code or session_files:
-            print(f"🎨 Chart code detected - using direct AgentCore execution")
-            
-            # Use direct AgentCore execution to preserve full base64 output
-            execution_result_str, images = execute_chart_code_direct(prepared_code, session_files)
-            agent_used = "direct_agentcore_charts"
-            
+    else:
+        print(f"📝 Regular code - using Strands-Agents execution")
+        
+        # For regular code, if files are needed, use direct AgentCore as well
+        # since Strands-Agents tools can't easily access session files
+        if session_files:
+            print(f"📁 Files detected - switching to direct AgentCore for file access")
+            execution_result_str, images = execute_chart_code_direct(prepared_code, session_files, session.session_id)
+            agent_used = "direct_agentcore_with_files"
         else:
-            print(f"📝 Regular code - using Strands-Agents execution")
-            
-            # For regular code, if files are needed, use direct AgentCore as well
-            # since Strands-Agents tools can't easily access session files
-            if session_files:
-                print(f"📁 Files detected - switching to direct AgentCore for file access")
-                execution_result_str, images = execute_chart_code_direct(prepared_code, session_files)
-                agent_used = "direct_agentcore_with_files"
-            else:
-                # Use strands-agents with AgentCore tool for regular code without files
-                execution_prompt = f"""Execute this Python code using the execute_python_code tool:
+            # Use strands-agents with AgentCore tool for regular code without files
+            execution_prompt = f"""Execute this Python code using the execute_python_code tool:
 
 ```python
 {prepared_code}
 ```
 
 Use the tool to run the code and return the complete output."""
-                
-                execution_result = code_executor_agent(execution_prompt)
-                
-                # Debug the AgentResult structure
-                print(f"🔍 AgentResult type: {type(execution_result)}")
-                
-                # Extract the actual text content from AgentResult
-                execution_result_str = extract_text_from_agent_result(execution_result)
-                print(f"📊 Extracted text length: {len(execution_result_str)}")
-                
-                # Extract image data from execution results
-                images = extract_image_data(execution_result_str)
-                agent_used = "strands_agents_with_agentcore"
-        
-        # Calculate execution duration
-        execution_end_time = time.time()
-        execution_duration = execution_end_time - execution_start_time
-        
-        # Store execution in session history
-        session.code_history.append(request.code)
-        session.execution_results.append({
-            "code": request.code,
-            "result": execution_result_str,
-            "agent": agent_used,
-            "executor_type": "agentcore",
-            "interactive": is_interactive,
-            "inputs_provided": request.inputs if is_interactive else None,
-            "images": images,
-            "is_chart_code": is_chart_code,
-            "timestamp": execution_end_time,
-            "execution_duration": execution_duration,
-            "prompt": user_prompt,
-            "start_time": execution_start_time,
-            "end_time": execution_end_time
-        })
-        
-        return {
-            "success": True,
-            "result": execution_result_str,
-            "session_id": session.session_id,
-            "agent_used": agent_used,
-            "executor_type": "agentcore",
-            "interactive": is_interactive,
-            "inputs_used": request.inputs if is_interactive else None,
-            "images": images,
-            "is_chart_code": is_chart_code
-        }
-        
+            
+            # The session's executor agent is bound to this session's sandbox
+            _, code_executor = get_session_agents(session)
+            execution_result = code_executor(execution_prompt)
+            
+            # Debug the AgentResult structure
+            print(f"🔍 AgentResult type: {type(execution_result)}")
+            
+            # Extract the actual text content from AgentResult
+            execution_result_str = extract_text_from_agent_result(execution_result)
+            print(f"📊 Extracted text length: {len(execution_result_str)}")
+            
+            # Split image data from the text, so base64 payloads are never
+            # stored in the session history or returned as display output
+            execution_result_str, images = scan_output(execution_result_str)
+            agent_used = "strands_agents_with_agentcore"
+    
+    # Calculate execution duration
+    execution_end_time = time.time()
+    execution_duration = execution_end_time - execution_start_time
+    
+    # Store execution in session history
+    active_sessions.append_history(session, "code_history", code)
+    active_sessions.append_history(session, "execution_results", {
+        "code": code,
+        "result": execution_result_str,
+        "agent": agent_used,
+        "executor_type": "agentcore",
+        "interactive": is_interactive,
+        "inputs_provided": inputs if is_interactive else None,
+        "images": images,
+        "is_chart_code": is_chart_code,
+        "timestamp": execution_end_time,
+        "execution_duration": execution_duration,
+        "prompt": user_prompt,
+        "start_time": execution_start_time,
+        "end_time": execution_end_time
+    })
+    
+    return {
+        "success": True,
+        "result": execution_result_str,
+        "session_id": session.session_id,
+        "agent_used": agent_used,
+        "executor_type": "agentcore",
+        "interactive": is_interactive,
+        "inputs_used": inputs if is_interactive else None,
+        "images": images,
+        "is_chart_code": is_chart_code
+    }
+
+@app.post("/api/execute-code")
+async def execute_code(request: CodeExecutionRequest):
+    """Execute Python code using hybrid approach: direct AgentCore for charts, Strands-Agents for others"""
+    try:
+        session = get_or_create_session(request.session_id)
+        return await run_session_job(
+            session.session_id, "execute_code", run_code_execution,
+            session, request.code, request.interactive, request.inputs
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Code execution failed: {str(e)}")
         import traceback
         print(f"📋 Full traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Code execution failed: {str(e)}")
 
+@app.post("/api/sessions/{session_id}/cancel")
+async def cancel_session_jobs(session_id: str, job_id: Optional[str] = None):
+    """Cancel queued and running jobs of a session"""
+    cancelled = job_runner.cancel(session_id, job_id)
+    return {
+        "success": True,
+        "cancelled": cancelled,
+        "session_id": session_id
+    }
+
+@app.get("/api/sessions/{session_id}/jobs")
+async def get_session_jobs(session_id: str):
+    """List queued and running jobs of a session"""
+    return {
+        "success": True,
+        "jobs": job_runner.jobs(session_id),
+        "session_id": session_id
+    }
+
 @app.post("/api/sessions/{session_id}/clear-csv")
 async def clear_csv_from_session(session_id: str):
     """Clear CSV file from session and AgentCore context"""
@@ -1272,10 +1310,12 @@ async def clear_csv_from_session(session_id: str):
             filename = session.uploaded_csv['filename']
             
             # Clear CSV from session
-            session.uploaded_csv = None
+            active_sessions.clear_uploaded_csv(session)
+            if sandbox_pool is not None:
+                sandbox_pool.forget_file(session_id, filename)
             
             # Add to conversation history
-            session.conversation_history.append({
+            active_sessions.append_history(session, "conversation_history", {
                 "type": "csv_removal",
                 "filename": filename,
                 "timestamp": time.time()
@@ -1310,7 +1350,7 @@ async def upload_csv_file(request: FileUploadRequest):
             raise HTTPException(status_code=400, detail="Only CSV files are allowed")
         
         # Store CSV file in session
-        session.conversation_history.append({
+        active_sessions.append_history(session, "conversation_history", {
             "type": "csv_upload",
             "filename": request.filename,
             "content": request.content,
@@ -1318,11 +1358,9 @@ async def upload_csv_file(request: FileUploadRequest):
         })
         
         # Store CSV data for code generation
-        session.uploaded_csv = {
-            "filename": request.filename,
-            "content": request.content,
-            "timestamp": asyncio.get_event_loop().time()
-        }
+        active_sessions.set_uploaded_csv(
+            session, request.filename, request.content, asyncio.get_event_loop().time()
+        )
         
         return {
             "success": True,
@@ -1342,7 +1380,7 @@ async def upload_file(request: FileUploadRequest):
         session = get_or_create_session(request.session_id)
         
         # Store file in session
-        session.conversation_history.append({
+        active_sessions.append_history(session, "conversation_history", {
             "type": "file_upload",
             "filename": request.filename,
             "content": request.content,
@@ -1368,13 +1406,23 @@ async def get_session_history(session_id: str):
         
         session = active_sessions[session_id]
         
+        # Load spilled CSVs and images back from the artifact store
+        def load_history():
+            return (
+                [active_sessions.materialize(entry) for entry in session.conversation_history],
+                [active_sessions.materialize(entry) for entry in session.execution_results]
+            )
+        conversation_history, execution_results = await asyncio.to_thread(load_history)
+        
         return {
             "success": True,
             "session_id": session_id,
-            "conversation_history": session.conversation_history,
-            "execution_results": session.execution_results
+            "conversation_history": conversation_history,
+            "execution_results": execution_results
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get session history: {str(e)}")
 
@@ -1417,61 +1465,95 @@ async def get_agents_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get agents status: {str(e)}")
 
+async def handle_websocket_message(message: dict, session_id: str, send):
+    """Run one WebSocket request as a session job, streaming output as it arrives"""
+    session = get_or_create_session(session_id)
+    
+    async def send_output(stream: str, text: str):
+        await send({
+            "type": "execution_output",
+            "stream": stream,
+            "data": text,
+            "session_id": session_id
+        })
+    
+    try:
+        if message["type"] == "generate_code":
+            # Handle code generation via WebSocket
+            result = await job_runner.run(
+                session_id, "generate_code", generate_code_for_session, session, message["prompt"]
+            )
+            await send({"type": "code_generated", **result})
+        
+        elif message["type"] == "execute_code":
+            # Handle code execution via WebSocket - stdout is streamed before the final result
+            result = await job_runner.run(
+                session_id, "execute_code", run_code_execution,
+                session, message["code"], message.get("interactive", False), message.get("inputs"),
+                on_output=send_output
+            )
+            await send({"type": "execution_result", **result})
+        
+        else:
+            await send({
+                "type": "error",
+                "success": False,
+                "error": f"Unknown message type: {message['type']}"
+            })
+    
+    except JobCancelled as e:
+        await send({
+            "type": "cancelled",
+            "success": False,
+            "error": str(e),
+            "session_id": session_id
+        })
+    except Exception as e:
+        await send({
+            "type": "error",
+            "success": False,
+            "error": str(e)
+        })
+
 # WebSocket endpoint for real-time communication
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     await websocket.accept()
     print(f"WebSocket connected for session {session_id}")
     
+    send_lock = asyncio.Lock()
+    pending_tasks = set()
+    
+    async def send(payload: dict):
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload, default=str))
+    
     try:
         while True:
             data = await websocket.receive_text()
             message = json.loads(data)
             
-            if message["type"] == "generate_code":
-                # Handle code generation via WebSocket
-                try:
-                    agent_result = code_generator_agent(message["prompt"])
-                    
-                    # Extract string content from AgentResult
-                    generated_code = str(agent_result) if agent_result is not None else ""
-                    
-                    await websocket.send_text(json.dumps({
-                        "type": "code_generated",
-                        "success": True,
-                        "code": generated_code,
-                        "session_id": session_id
-                    }))
-                except Exception as e:
-                    await websocket.send_text(json.dumps({
-                        "type": "error",
-                        "success": False,
-                        "error": str(e)
-                    }))
+            if message["type"] == "cancel":
+                # Handled inline so it is not queued behind the job it cancels
+                cancelled = job_runner.cancel(session_id, message.get("job_id"))
+                await send({
+                    "type": "cancel_requested",
+                    "cancelled": cancelled,
+                    "session_id": session_id
+                })
+                continue
             
-            elif message["type"] == "execute_code":
-                # Handle code execution via WebSocket
-                try:
-                    if executor_type == "agentcore":
-                        execution_result = code_executor_agent(f"Execute this code: {message['code']}")
-                    else:
-                        execution_result = code_executor_agent(f"Simulate execution of: {message['code']}")
-                    
-                    await websocket.send_text(json.dumps({
-                        "type": "execution_result",
-                        "success": True,
-                        "result": execution_result,
-                        "session_id": session_id
-                    }))
-                except Exception as e:
-                    await websocket.send_text(json.dumps({
-                        "type": "error",
-                        "success": False,
-                        "error": str(e)
-                    }))
+            # Keep receiving while the job runs so cancel requests get through
+            task = asyncio.create_task(handle_websocket_message(message, session_id, send))
+            pending_tasks.add(task)
+            task.add_done_callback(pending_tasks.discard)
                     
     except WebSocketDisconnect:
         print(f"WebSocket disconnected for session {session_id}")
+    finally:
+        # Nobody is left to receive the results
+        for task in pending_tasks:
+            task.cancel()
 
 @app.get("/health")
 async def health_check():
@@ -1486,6 +1568,9 @@ async def health_check():
         "current_model": current_model,
         "aws_region": aws_region,
         "authentication": "AWS Profile" if os.getenv('AWS_PROFILE') else "Access Keys",
+        "warm_sandboxes": len(sandbox_pool) if sandbox_pool is not None else 0,
+        "sessions": active_sessions.stats(),
+        "jobs": job_runner.stats() if job_runner is not None else None,
         "architecture": {
             "code_generation": f"Strands-Agents Agent ({current_model})",
             "code_execution": f"{executor_type.title().replace('_', ' ')} Agent ({current_model})"
@@ -0,0 +1,151 @@
+"""Single-pass scanner that splits Code Interpreter stdout into text and images.
+
+Chart code prints ``IMAGE_DATA:<base64>`` lines. Instead of regex-scanning the
+accumulated stdout and base64-decoding every candidate, the scanner consumes
+stdout chunks as stream events arrive. Text goes to the display output, and
+the payload after each marker is collected up to the end of its line. Only
+the first 12 base64 characters of a payload are decoded, which is enough to
+recognize the PNG or JPEG signature.
+"""
+
+import base64
+import binascii
+import re
+from typing import List, Tuple
+
+IMAGE_MARKER = "IMAGE_DATA:"
+
+# Enough base64 for the 8-byte PNG signature (12 chars -> 9 bytes)
+_SNIFF_CHARS = 12
+_BASE64_PAYLOAD = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+)
+
+
+def sniff_image_format(payload: str):
+    """Return 'png' or 'jpeg' from the first decoded bytes, or None"""
+    try:
+        head = base64.b64decode(payload[:_SNIFF_CHARS])
+    except (binascii.Error, ValueError):
+        return None
+    for signature, image_format in _SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    return None
+
+
+class ImageStreamScanner:
+    """Incrementally separates display text from ``IMAGE_DATA:`` payloads.
+
+    ``feed`` returns the display text that became available with the chunk,
+    so callers can stream output without the image binary. ``finish`` returns
+    the cleaned display output and the extracted images.
+    """
+
+    def __init__(self, min_payload_chars: int = 1000, source: str = "agentcore_stdout"):
+        self.min_payload_chars = min_payload_chars
+        self.source = source
+        self.images: List[dict] = []
+        self._segments: List[List[str]] = [[]]  # display text between payloads
+        self._payload: List[str] = []
+        self._in_payload = False
+        self._tail = ""  # may hold the start of a marker split across chunks
+        self._saw_marker = False
+
+    def _emit_text(self, text: str) -> str:
+        if text:
+            self._segments[-1].append(text)
+        return text
+
+    def feed(self, chunk: str) -> str:
+        """Consume a stdout chunk; returns its display text"""
+        if not chunk:
+            return ""
+        data = self._tail + chunk if self._tail else chunk
+        self._tail = ""
+        emitted = []
+        pos = 0
+        while pos < len(data):
+            if self._in_payload:
+                newline = data.find("\n", pos)
+                if newline == -1:
+                    self._payload.append(data[pos:])
+                    break
+                self._payload.append(data[pos:newline])
+                self._close_payload()
+                pos = newline + 1
+                continue
+
+            marker = data.find(IMAGE_MARKER, pos)
+            if marker == -1:
+                end = len(data)
+                # Hold back a suffix that could be the start of a marker
+                for size in range(min(len(IMAGE_MARKER) - 1, end - pos), 0, -1):
+                    if data.endswith(IMAGE_MARKER[:size]):
+                        end -= size
+                        self._tail = data[end:]
+                        break
+                emitted.append(self._emit_text(data[pos:end]))
+                break
+
+            emitted.append(self._emit_text(data[pos:marker]))
+            self._saw_marker = True
+            self._in_payload = True
+            self._segments.append([])
+            pos = marker + len(IMAGE_MARKER)
+        return "".join(emitted)
+
+    def add_text(self, text: str) -> str:
+        """Add display-only text (e.g. stderr) that is never scanned for images"""
+        return self._emit_text(text)
+
+    def _close_payload(self) -> None:
+        payload = "".join(self._payload).strip()
+        self._payload = []
+        self._in_payload = False
+        if " " in payload or "\t" in payload or "\r" in payload:
+            payload = "".join(payload.split())
+
+        index = len(self.images) + 1
+        if len(payload) <= self.min_payload_chars:
+            print(f"⚠️  Image {index} - Too short to be valid image")
+            return
+        if not _BASE64_PAYLOAD.fullmatch(payload):
+            print(f"⚠️  Image {index} - Not valid base64")
+            return
+        image_format = sniff_image_format(payload)
+        if image_format is None:
+            print(f"⚠️  Image {index} - Invalid image signature")
+            return
+        self.images.append({
+            'format': image_format,
+            'data': payload,
+            'source': self.source
+        })
+        print(f"✅ Image {index} - Valid {image_format.upper()} image extracted ({len(payload)} chars)")
+
+    def finish(self) -> Tuple[str, List[dict]]:
+        """Flush pending input; returns (display_output, images)"""
+        if self._tail:
+            self._emit_text(self._tail)
+            self._tail = ""
+        if self._in_payload:
+            self._close_payload()
+
+        if not self._saw_marker:
+            return "".join(self._segments[0]), self.images
+
+        # Matches the historical display format: text around images as paragraphs
+        paragraphs = [text for text in ("".join(seg).strip() for seg in self._segments) if text]
+        if not paragraphs:
+            return "Code executed successfully - chart generated", self.images
+        return "\n\n".join(paragraphs), self.images
+
+
+def scan_output(output: str, min_payload_chars: int = 1000) -> Tuple[str, List[dict]]:
+    """Split an already collected output string into (display_output, images)"""
+    scanner = ImageStreamScanner(min_payload_chars)
+    scanner.feed(output)
+    return scanner.finish()
@@ -0,0 +1,240 @@
+"""Session-affine pool of warm AgentCore Code Interpreter sandboxes.
+
+Each IDE session (``CodeInterpreterSession``) is mapped to one long-lived
+interpreter session. Repeated executions reuse the running sandbox - so the
+Python context survives between runs, as ``clearContext: False`` intends -
+and a per-sandbox manifest of content hashes means only new or changed files
+are sent with ``writeFiles``.
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from bedrock_agentcore.tools.code_interpreter_client import CodeInterpreter
+
+# IDE session whose sandbox an unbound execute_python_code tool should use.
+# Per-session agents get a tool bound to their session ID instead, which does
+# not depend on the context being copied into the threads that run tools.
+current_sandbox_session: ContextVar[Optional[str]] = ContextVar(
+    "current_sandbox_session", default=None
+)
+
+
+def file_digest(content: str) -> str:
+    """Content hash used by the upload manifest"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def write_files_error(response) -> Optional[str]:
+    """Return the error text from a writeFiles response stream, if any"""
+    for event in response["stream"]:
+        result = event.get("result", {})
+        if result.get("isError", False):
+            error_content = result.get("content", [{}])
+            return error_content[0].get("text", "Unknown error") if error_content else "Unknown error"
+        for item in result.get("content", []):
+            if item.get("type") == "text":
+                print(f"✅ File upload: {item.get('text', '')}")
+    return None
+
+
+class PooledSandbox:
+    """A started CodeInterpreter plus what has been uploaded to it"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.client: Optional[CodeInterpreter] = None
+        self.file_manifest: Dict[str, str] = {}  # sandbox path -> sha256
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_health_check = self.created_at
+        # One execution at a time per sandbox keeps stdout and context coherent
+        self.lock = threading.Lock()
+
+    def sync_files(self, files: List[dict]) -> Optional[str]:
+        """Upload files whose content changed since the last sync.
+
+        ``files`` are ``{"filename": ..., "content": ...}`` dicts. Instead of
+        ``content`` a file may give its ``sha256`` and a ``read_content``
+        callable, which is only called when the file has to be uploaded.
+        Returns the upload error text, or None on success.
+        """
+        pending = []
+        digests = {}
+        for file_info in files:
+            path = file_info.get('filename', 'uploaded_file.csv')
+            digest = file_info.get('sha256') or file_digest(file_info.get('content', ''))
+            if self.file_manifest.get(path) != digest:
+                if 'read_content' in file_info:
+                    content = file_info['read_content']()
+                else:
+                    content = file_info.get('content', '')
+                pending.append({"path": path, "text": content})
+                digests[path] = digest
+
+        if not pending:
+            if files:
+                print(f"♻️  {len(files)} files already in sandbox - skipping upload")
+            return None
+
+        print(f"📁 Uploading {len(pending)} of {len(files)} files to sandbox...")
+        error_text = write_files_error(self.client.invoke("writeFiles", {"content": pending}))
+        if error_text:
+            print(f"❌ File upload error: {error_text}")
+            return error_text
+
+        self.file_manifest.update(digests)
+        return None
+
+
+class SandboxPool:
+    """Keeps one warm interpreter session per IDE session.
+
+    Sandboxes idle for longer than ``idle_timeout_seconds`` are stopped, and
+    they are recycled before the service-side ``session_timeout_seconds``
+    expires. A sandbox that has not been used for ``health_check_interval_seconds``
+    is checked with ``get_session`` before it is handed out again; one that
+    is no longer READY, or whose invoke failed, is replaced transparently.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        idle_timeout_seconds: float = 600,
+        session_timeout_seconds: int = 3600,
+        health_check_interval_seconds: float = 60,
+        max_sandboxes: int = 50,
+    ):
+        self.region = region
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.session_timeout_seconds = session_timeout_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.max_sandboxes = max_sandboxes
+        self._sandboxes: Dict[str, PooledSandbox] = {}
+        self._lock = threading.Lock()
+
+    def _start_sandbox(self, sandbox: PooledSandbox) -> None:
+        print(f"🚀 Starting Code Interpreter sandbox for session {sandbox.session_id}")
+        client = CodeInterpreter(self.region)
+        client.start(
+            name=f"ide-{sandbox.session_id[:40]}",
+            session_timeout_seconds=self.session_timeout_seconds,
+        )
+        sandbox.client = client
+        sandbox.created_at = sandbox.last_health_check = time.monotonic()
+        sandbox.file_manifest.clear()
+
+    def _stop_sandbox(self, sandbox: PooledSandbox, reason: str) -> None:
+        print(f"🛑 Stopping sandbox for session {sandbox.session_id} ({reason})")
+        try:
+            sandbox.client.stop()
+        except Exception as e:
+            print(f"⚠️  Failed to stop sandbox for session {sandbox.session_id}: {e}")
+        sandbox.client = None
+
+    def _is_usable(self, sandbox: PooledSandbox) -> bool:
+        """Health check a sandbox before reusing it"""
+        now = time.monotonic()
+        # Leave headroom so a run does not start on a session about to expire
+        if now - sandbox.created_at > self.session_timeout_seconds - self.idle_timeout_seconds:
+            return False
+        if now - sandbox.last_health_check < self.health_check_interval_seconds:
+            return True
+        try:
+            status = sandbox.client.get_session().get("status")
+        except Exception as e:
+            print(f"⚠️  Sandbox health check failed for session {sandbox.session_id}: {e}")
+            return False
+        sandbox.last_health_check = now
+        return status == "READY"
+
+    @contextmanager
+    def lease(self, session_id: str):
+        """Yield the warm sandbox for ``session_id``, starting one if needed"""
+        self.evict_idle()
+        with self._lock:
+            sandbox = self._sandboxes.get(session_id)
+            if sandbox is None:
+                sandbox = PooledSandbox(session_id)
+                self._sandboxes[session_id] = sandbox
+            # Keeps the idle sweep away while we wait for the sandbox lock
+            sandbox.last_used = time.monotonic()
+
+        with sandbox.lock:
+            if sandbox.client is not None and not self._is_usable(sandbox):
+                self._stop_sandbox(sandbox, "failed health check")
+            if sandbox.client is None:
+                self._start_sandbox(sandbox)
+            else:
+                print(f"♻️  Reusing warm sandbox for session {session_id}")
+
+            try:
+                yield sandbox
+            except Exception:
+                # The sandbox state is unknown (or code is still running after a
+                # cancelled run); stop it so the next lease starts a fresh one
+                self._stop_sandbox(sandbox, "execution aborted")
+                raise
+            finally:
+                sandbox.last_used = time.monotonic()
+
+        self._enforce_capacity()
+
+    def _enforce_capacity(self) -> None:
+        with self._lock:
+            overflow = len(self._sandboxes) - self.max_sandboxes
+            if overflow <= 0:
+                return
+            by_age = sorted(self._sandboxes.values(), key=lambda s: s.last_used)
+            victims = [s for s in by_age if not s.lock.locked()][:overflow]
+            for sandbox in victims:
+                del self._sandboxes[sandbox.session_id]
+        for sandbox in victims:
+            if sandbox.client is not None:
+                self._stop_sandbox(sandbox, "pool at capacity")
+
+    def evict_idle(self) -> int:
+        """Stop sandboxes that have been idle longer than the idle timeout"""
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        with self._lock:
+            idle = [
+                s for s in self._sandboxes.values()
+                if s.last_used < cutoff and not s.lock.locked()
+            ]
+            for sandbox in idle:
+                del self._sandboxes[sandbox.session_id]
+        for sandbox in idle:
+            if sandbox.client is not None:
+                self._stop_sandbox(sandbox, "idle")
+        return len(idle)
+
+    def release(self, session_id: str) -> None:
+        """Stop the sandbox belonging to ``session_id``, if there is one"""
+        with self._lock:
+            sandbox = self._sandboxes.pop(session_id, None)
+        if sandbox is not None and sandbox.client is not None:
+            with sandbox.lock:
+                self._stop_sandbox(sandbox, "released")
+
+    def forget_file(self, session_id: str, path: str) -> None:
+        """Drop a file from the manifest so it is uploaded again next time"""
+        with self._lock:
+            sandbox = self._sandboxes.get(session_id)
+        if sandbox is not None:
+            sandbox.file_manifest.pop(path, None)
+
+    def shutdown(self) -> None:
+        """Stop every pooled sandbox"""
+        with self._lock:
+            sandboxes = list(self._sandboxes.values())
+            self._sandboxes.clear()
+        for sandbox in sandboxes:
+            if sandbox.client is not None:
+                self._stop_sandbox(sandbox, "shutdown")
+
+    def __len__(self) -> int:
+        return len(self._sandboxes)
@@ -0,0 +1,340 @@
+"""Bounded store for IDE sessions with disk spill for large artifacts.
+
+``active_sessions`` used to be a plain dict that kept every session, with
+every uploaded CSV and base64 chart, for the life of the process. The
+``SessionStore`` keeps memory flat:
+
+* sessions are evicted least-recently-used first beyond ``max_sessions`` and
+  after ``idle_ttl_seconds`` without access,
+* each session's history is trimmed, oldest entries first, to
+  ``max_session_bytes``,
+* strings of at least ``spill_threshold_bytes`` (CSV contents, chart images)
+  are written to a content-addressed ``ArtifactStore`` and referenced by
+  their sha256 digest. The digest is the same content hash the sandbox pool
+  uses for its upload manifest.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+# History lists that are trimmed to the session byte budget, oldest first
+HISTORY_LISTS = ("conversation_history", "execution_results", "code_history")
+
+# code_history[i] holds the code of execution_results[i]; the plain code
+# strings carry no timestamp, so they are trimmed together with their results
+PAIRED_LISTS = {"execution_results": "code_history"}
+
+
+class ArtifactStore:
+    """Reference-counted, content-addressed text files under ``root``"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._refcounts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._remove_leftovers()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def _remove_leftovers(self) -> None:
+        """Artifacts only live as long as their sessions; drop a previous run's"""
+        removed = 0
+        for prefix in os.listdir(self.root):
+            directory = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if _DIGEST.fullmatch(prefix + name):
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        if removed:
+            print(f"🧹 Removed {removed} artifacts left over in {self.root}")
+
+    def put_text(self, text: str) -> str:
+        """Store ``text`` (or add a reference to it); returns its digest"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            count = self._refcounts.get(digest, 0)
+            if count == 0:
+                path = self._path(digest)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            self._refcounts[digest] = count + 1
+        return digest
+
+    def read_text(self, digest: str) -> str:
+        with open(self._path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def release(self, digest: str) -> None:
+        """Drop one reference; the file is deleted with the last one"""
+        with self._lock:
+            count = self._refcounts.get(digest, 0) - 1
+            if count > 0:
+                self._refcounts[digest] = count
+                return
+            self._refcounts.pop(digest, None)
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._refcounts)
+
+
+def _value_size(value: Any) -> int:
+    """Approximate in-memory size of a history entry, dominated by strings"""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(k) + _value_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(v) for v in value)
+    return 8
+
+
+def _entry_refs(entry: Any) -> List[str]:
+    """Artifact digests referenced by a history entry"""
+    if not isinstance(entry, dict):
+        return []
+    refs = [entry[key] for key in ("content_ref",) if entry.get(key)]
+    for image in entry.get("images") or []:
+        if isinstance(image, dict) and image.get("data_ref"):
+            refs.append(image["data_ref"])
+    return refs
+
+
+class SessionStore:
+    """LRU/TTL-bounded mapping of session id to session.
+
+    Supports ``in`` and ``[]`` like the dict it replaces. History should be
+    added through ``append_history`` and CSV uploads through
+    ``set_uploaded_csv`` so large values are spilled and budgets enforced.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[str], Any],
+        max_sessions: int = 200,
+        idle_ttl_seconds: float = 24 * 3600,
+        max_session_bytes: int = 8 * 1024 * 1024,
+        spill_threshold_bytes: int = 32 * 1024,
+        artifacts: Optional[ArtifactStore] = None,
+    ):
+        self.session_factory = session_factory
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_session_bytes = max_session_bytes
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.artifacts = artifacts
+        # session_id -> (session, last access time)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    # -- dict-like access -------------------------------------------------
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __getitem__(self, session_id: str):
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str):
+        """Return the session and mark it as recently used, or None"""
+        with self._lock:
+            item = self._sessions.get(session_id)
+            if item is None:
+                return None
+            session, last_access = item
+            if time.monotonic() - last_access > self.idle_ttl_seconds:
+                self._evict(session_id, "expired")
+                return None
+            self._sessions[session_id] = (session, time.monotonic())
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: str):
+        with self._lock:
+            session = self.get(session_id)
+            if session is None:
+                session = self.session_factory(session_id)
+                session.history_bytes = 0
+                self._sessions[session_id] = (session, time.monotonic())
+                while len(self._sessions) > self.max_sessions:
+                    self._evict(next(iter(self._sessions)), "least recently used")
+            return session
+
+    # -- eviction ---------------------------------------------------------
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        session, _ = self._sessions.pop(session_id)
+        for list_name in HISTORY_LISTS:
+            for entry in getattr(session, list_name):
+                self._release_refs(entry)
+        self._release_refs(session.uploaded_csv)
+        print(f"🗑️ Evicted session {session_id} ({reason})")
+
+    def evict_expired(self) -> int:
+        """Drop sessions that have not been accessed within the TTL"""
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        with self._lock:
+            expired = [sid for sid, (_, last) in self._sessions.items() if last < cutoff]
+            for session_id in expired:
+                self._evict(session_id, "expired")
+        return len(expired)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            if session_id in self._sessions:
+                self._evict(session_id, "discarded")
+
+    # -- artifacts --------------------------------------------------------
+
+    def _spill(self, text: str) -> Optional[str]:
+        """Write ``text`` to the artifact store if it is large; returns the digest"""
+        if self.artifacts is None or len(text) < self.spill_threshold_bytes:
+            return None
+        return self.artifacts.put_text(text)
+
+    def _release_refs(self, entry: Any) -> None:
+        if self.artifacts is None:
+            return
+        for digest in _entry_refs(entry):
+            self.artifacts.release(digest)
+
+    def load_text(self, digest: str) -> str:
+        return self.artifacts.read_text(digest)
+
+    def _spill_entry(self, entry: Any) -> Any:
+        if not isinstance(entry, dict):
+            return entry
+        content = entry.get("content")
+        if isinstance(content, str):
+            digest = self._spill(content)
+            if digest:
+                entry = {k: v for k, v in entry.items() if k != "content"}
+                entry["content_ref"] = digest
+                entry["size"] = len(content)
+        if entry.get("images"):
+            images = []
+            for image in entry["images"]:
+                digest = self._spill(image.get("data", "")) if isinstance(image, dict) else None
+                if digest:
+                    image = {k: v for k, v in image.items() if k != "data"}
+                    image["data_ref"] = digest
+                images.append(image)
+            entry = {**entry, "images": images}
+        return entry
+
+    def materialize(self, entry: Any) -> Any:
+        """Return a copy of a history entry with spilled values loaded back"""
+        if not isinstance(entry, dict) or not _entry_refs(entry):
+            return entry
+        entry = dict(entry)
+        if entry.get("content_ref"):
+            entry["content"] = self.load_text(entry["content_ref"])
+        if entry.get("images"):
+            entry["images"] = [
+                {**image, "data": self.load_text(image["data_ref"])}
+                if isinstance(image, dict) and image.get("data_ref") else image
+                for image in entry["images"]
+            ]
+        return entry
+
+    # -- session contents -------------------------------------------------
+
+    def _attached(self, session) -> bool:
+        """Whether ``session`` is still stored (a job may outlive its eviction)"""
+        item = self._sessions.get(session.session_id)
+        return item is not None and item[0] is session
+
+    def append_history(self, session, list_name: str, entry: Any) -> None:
+        """Append to one of the session's history lists within its byte budget"""
+        with self._lock:
+            if self._attached(session):
+                # Evicted sessions keep values in memory until they are dropped
+                entry = self._spill_entry(entry)
+            getattr(session, list_name).append(entry)
+            session.history_bytes = getattr(session, "history_bytes", 0) + _value_size(entry)
+            self._trim(session)
+
+    def _trim(self, session) -> None:
+        paired = set(PAIRED_LISTS.values())
+        while session.history_bytes > self.max_session_bytes:
+            # Drop the oldest entry among the history lists
+            candidates = [
+                (getattr(session, name)[0], name) for name in HISTORY_LISTS
+                if name not in paired and len(getattr(session, name)) > 1
+            ]
+            if not candidates:
+                return
+            _, list_name = min(
+                candidates,
+                key=lambda c: c[0].get("timestamp", 0) if isinstance(c[0], dict) else 0
+            )
+            self._pop_oldest(session, list_name)
+            if list_name in PAIRED_LISTS and getattr(session, PAIRED_LISTS[list_name]):
+                self._pop_oldest(session, PAIRED_LISTS[list_name])
+
+    def _pop_oldest(self, session, list_name: str) -> None:
+        entry = getattr(session, list_name).pop(0)
+        session.history_bytes -= _value_size(entry)
+        self._release_refs(entry)
+
+    def set_uploaded_csv(self, session, filename: str, content: str, timestamp: float) -> None:
+        """Store an uploaded CSV, spilling its content to disk when large"""
+        csv_info = {
+            "filename": filename,
+            "size": len(content),
+            "preview": content[:1000],
+            "timestamp": timestamp
+        }
+        digest = self._spill(content) if self._attached(session) else None
+        if digest:
+            csv_info["content_ref"] = digest
+        else:
+            csv_info["content"] = content
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        # Lets the sandbox pool skip unchanged files without reading them
+        csv_info["sha256"] = digest
+        with self._lock:
+            self.clear_uploaded_csv(session)
+            session.uploaded_csv = csv_info
+
+    def clear_uploaded_csv(self, session) -> None:
+        with self._lock:
+            self._release_refs(session.uploaded_csv)
+            session.uploaded_csv = None
+
+    def uploaded_csv_content(self, session) -> str:
+        csv_info = session.uploaded_csv
+        if csv_info.get("content_ref"):
+            return self.load_text(csv_info["content_ref"])
+        return csv_info["content"]
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "artifacts": len(self.artifacts) if self.artifacts is not None else 0,
+        }
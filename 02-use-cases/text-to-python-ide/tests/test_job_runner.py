@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-session job runner
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / 'backend'))
+
+from job_runner import JobCancelled, JobQueueFull, JobRunner, current_job
+
+
+def wait_until_cancelled(started: threading.Event):
+    """Blocking job that runs until it is cancelled"""
+    started.set()
+    job = current_job.get()
+    while True:
+        job.raise_if_cancelled()
+        time.sleep(0.01)
+
+
+async def wait_for_event(event: threading.Event):
+    while not event.is_set():
+        await asyncio.sleep(0.01)
+
+
+def test_job_runs_off_the_event_loop():
+    async def scenario():
+        runner = JobRunner(max_workers=2)
+        loop_thread = threading.current_thread()
+        thread = await runner.run("s1", "execute", threading.current_thread)
+        runner.shutdown()
+        return loop_thread, thread
+
+    loop_thread, job_thread = asyncio.run(scenario())
+
+    assert job_thread is not loop_thread
+    assert job_thread.name.startswith("ide-job")
+
+
+def test_jobs_of_one_session_run_in_order_one_at_a_time():
+    running = []
+    order = []
+
+    def work(name):
+        running.append(name)
+        assert len(running) == 1
+        time.sleep(0.02)
+        order.append(name)
+        running.remove(name)
+        return name
+
+    async def scenario():
+        runner = JobRunner(max_workers=4)
+        results = await asyncio.gather(
+            *(runner.run("s1", "execute", work, name) for name in "abc")
+        )
+        runner.shutdown()
+        return results
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+    assert order == ["a", "b", "c"]
+
+
+def test_sessions_run_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+
+    async def scenario():
+        runner = JobRunner(max_workers=2)
+        # Each job waits for the other, so this only finishes if both run at once
+        await asyncio.gather(
+            runner.run("s1", "execute", barrier.wait),
+            runner.run("s2", "execute", barrier.wait),
+        )
+        runner.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_full_session_queue_is_rejected():
+    async def scenario():
+        runner = JobRunner(max_workers=2, max_pending_per_session=1)
+        started = threading.Event()
+        first = asyncio.create_task(
+            runner.run("s1", "execute", wait_until_cancelled, started)
+        )
+        await wait_for_event(started)
+        with pytest.raises(JobQueueFull):
+            await runner.run("s1", "execute", time.sleep, 0)
+        # Other sessions are not affected
+        await runner.run("s2", "execute", time.sleep, 0)
+        runner.cancel("s1")
+        with pytest.raises(JobCancelled):
+            await first
+        runner.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_queued_job_never_starts():
+    ran = []
+
+    async def scenario():
+        runner = JobRunner(max_workers=2)
+        started = threading.Event()
+        first = asyncio.create_task(
+            runner.run("s1", "execute", wait_until_cancelled, started)
+        )
+        await wait_for_event(started)
+        second = asyncio.create_task(runner.run("s1", "execute", ran.append, 1))
+        await asyncio.sleep(0.05)
+
+        assert [job["status"] for job in runner.jobs("s1")] == ["running", "queued"]
+        second_id = runner.jobs("s1")[1]["job_id"]
+        assert runner.cancel("s1", second_id) == [second_id]
+        runner.cancel("s1")
+
+        for task in (first, second):
+            with pytest.raises(JobCancelled):
+                await task
+        assert runner.jobs("s1") == []
+        runner.shutdown()
+
+    asyncio.run(scenario())
+    assert ran == []
+
+
+def test_running_job_stops_at_next_cancellation_check():
+    async def scenario():
+        runner = JobRunner(max_workers=1)
+        started = threading.Event()
+        task = asyncio.create_task(
+            runner.run("s1", "execute", wait_until_cancelled, started)
+        )
+        await wait_for_event(started)
+        assert runner.stats()["running"] == 1
+
+        runner.cancel("s1")
+        with pytest.raises(JobCancelled):
+            await task
+        assert runner.stats() == {
+            "max_workers": 1, "running": 0, "queued": 0, "sessions": 0
+        }
+        runner.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_stops_the_thread_before_releasing_session():
+    async def scenario():
+        runner = JobRunner(max_workers=2)
+        started = threading.Event()
+        task = asyncio.create_task(
+            runner.run("s1", "execute", wait_until_cancelled, started)
+        )
+        await wait_for_event(started)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The next job of the session can start right away
+        assert await runner.run("s1", "execute", lambda: "next") == "next"
+        runner.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_output_is_streamed_in_order():
+    received = []
+
+    def work():
+        job = current_job.get()
+        for i in range(5):
+            job.emit_output("stdout", f"line {i}\n")
+        job.emit_output("stderr", "")  # Empty chunks are not forwarded
+        return "done"
+
+    async def on_output(stream, text):
+        received.append((stream, text))
+
+    async def scenario():
+        runner = JobRunner(max_workers=1)
+        result = await runner.run("s1", "execute", work, on_output=on_output)
+        runner.shutdown()
+        return result
+
+    assert asyncio.run(scenario()) == "done"
+    assert received == [("stdout", f"line {i}\n") for i in range(5)]
+
+
+def test_job_errors_propagate():
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        runner = JobRunner(max_workers=1)
+        with pytest.raises(ValueError):
+            await runner.run("s1", "execute", fail)
+        assert runner.jobs("s1") == []
+        runner.shutdown()
+
+    asyncio.run(scenario())
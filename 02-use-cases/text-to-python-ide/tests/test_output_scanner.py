@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for splitting Code Interpreter stdout into text and images
+"""
+
+import base64
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / 'backend'))
+
+from output_scanner import ImageStreamScanner, scan_output, sniff_image_format
+
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8).decode()
+JPEG = base64.b64encode(b"\xff\xd8\xff\xe0" + bytes(range(256)) * 8).decode()
+GIF = base64.b64encode(b"GIF89a" + bytes(range(256)) * 8).decode()
+
+
+def test_sniff_image_format():
+    assert sniff_image_format(PNG) == "png"
+    assert sniff_image_format(JPEG) == "jpeg"
+    assert sniff_image_format(GIF) is None
+    assert sniff_image_format("!!not base64!!") is None
+
+
+def test_plain_output_is_returned_unchanged():
+    output = "hello\n  indented\n"
+
+    assert scan_output(output) == (output, [])
+
+
+def test_images_are_split_from_text():
+    output = f"before\nIMAGE_DATA:{PNG}\nbetween\nIMAGE_DATA:{JPEG}\nafter\n"
+
+    display, images = scan_output(output)
+
+    assert display == "before\n\nbetween\n\nafter"
+    assert [image["format"] for image in images] == ["png", "jpeg"]
+    assert images[0]["data"] == PNG
+    assert images[0]["source"] == "agentcore_stdout"
+
+
+def test_chart_only_output_gets_placeholder_text():
+    display, images = scan_output(f"IMAGE_DATA:{PNG}")
+
+    assert display == "Code executed successfully - chart generated"
+    assert len(images) == 1
+
+
+@pytest.mark.parametrize("payload", ["c2hvcnQ=", GIF, PNG[:-8] + "!!!!!!!!"])
+def test_invalid_payloads_are_dropped(payload):
+    display, images = scan_output(f"text\nIMAGE_DATA:{payload}\n")
+
+    assert display == "text"
+    assert images == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 10, 64, 1000])
+def test_chunked_feed_matches_single_pass(chunk_size):
+    output = f"start IMAGE_\nIMAGE_DATA:{PNG}\nmiddle\nIMAGE_DATA:{JPEG[:500]}\n{JPEG[500:]}\nend"
+    scanner = ImageStreamScanner()
+
+    streamed = "".join(
+        scanner.feed(output[i:i + chunk_size])
+        for i in range(0, len(output), chunk_size)
+    )
+    display, images = scanner.finish()
+
+    assert (display, images) == scan_output(output)
+    # Streamed text never contains image payloads or partial markers
+    assert "IMAGE_DATA" not in streamed
+    assert PNG[:100] not in streamed
+    assert streamed.startswith("start IMAGE_\n")
+
+
+def test_marker_prefix_at_end_of_output_is_kept():
+    scanner = ImageStreamScanner()
+
+    assert scanner.feed("total IMAGE") == "total "
+    assert scanner.finish() == ("total IMAGE", [])
+
+
+def test_wrapped_payload_whitespace_is_removed():
+    wrapped = " ".join(PNG[i:i + 76] for i in range(0, len(PNG), 76))
+
+    _, images = scan_output(f"IMAGE_DATA:{wrapped}\n")
+
+    assert images[0]["data"] == PNG
+
+
+def test_added_text_is_never_scanned():
+    scanner = ImageStreamScanner()
+
+    assert scanner.add_text(f"Errors: IMAGE_DATA:{PNG}") == f"Errors: IMAGE_DATA:{PNG}"
+    assert scanner.finish()[1] == []
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the warm sandbox pool and the session-bound execute_python_code tool
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / 'backend'))
+
+import sandbox_pool
+from sandbox_pool import PooledSandbox, SandboxPool
+
+
+class FakeCodeInterpreter:
+    """CodeInterpreter stand-in recording what the pool does with it"""
+
+    instances = []
+
+    def __init__(self, region):
+        self.region = region
+        self.status = "READY"
+        self.started = False
+        self.stopped = False
+        self.written = []
+        FakeCodeInterpreter.instances.append(self)
+
+    def start(self, name, session_timeout_seconds):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def get_session(self):
+        return {"status": self.status}
+
+    def invoke(self, method, params):
+        if method == "writeFiles":
+            self.written.append([item["path"] for item in params["content"]])
+            return {"stream": [{"result": {"content": []}}]}
+        return {"stream": [{"result": {"structuredContent": {"stdout": "ok\n"}}}]}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    FakeCodeInterpreter.instances = []
+    monkeypatch.setattr(sandbox_pool, "CodeInterpreter", FakeCodeInterpreter)
+    clock = Clock()
+    monkeypatch.setattr(sandbox_pool, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def make_pool(**kwargs):
+    options = dict(idle_timeout_seconds=600, session_timeout_seconds=3600,
+                   health_check_interval_seconds=60)
+    options.update(kwargs)
+    return SandboxPool("us-east-1", **options)
+
+
+def test_lease_reuses_warm_sandbox(clock):
+    pool = make_pool()
+
+    with pool.lease("s1") as first:
+        pass
+    with pool.lease("s1") as second:
+        pass
+
+    assert first is second
+    assert len(FakeCodeInterpreter.instances) == 1
+    assert len(pool) == 1
+
+
+def test_sessions_get_their_own_sandbox(clock):
+    pool = make_pool()
+
+    with pool.lease("s1") as first:
+        pass
+    with pool.lease("s2") as second:
+        pass
+
+    assert first.client is not second.client
+
+
+def test_sync_files_only_uploads_changed_files(clock):
+    pool = make_pool()
+    files = [{"filename": "a.csv", "content": "1"}, {"filename": "b.csv", "content": "2"}]
+
+    with pool.lease("s1") as sandbox:
+        assert sandbox.sync_files(files) is None
+        assert sandbox.sync_files(files) is None
+        assert sandbox.sync_files([{"filename": "a.csv", "content": "changed"}]) is None
+
+    assert sandbox.client.written == [["a.csv", "b.csv"], ["a.csv"]]
+
+
+def test_read_content_is_only_called_for_uploads(clock):
+    pool = make_pool()
+    reads = []
+    file_info = {
+        "filename": "big.csv",
+        "sha256": sandbox_pool.file_digest("x,y"),
+        "read_content": lambda: reads.append(1) or "x,y",
+    }
+
+    with pool.lease("s1") as sandbox:
+        sandbox.sync_files([file_info])
+        sandbox.sync_files([file_info])
+
+    assert reads == [1]
+
+
+def test_forgotten_file_is_uploaded_again(clock):
+    pool = make_pool()
+    files = [{"filename": "a.csv", "content": "1"}]
+
+    with pool.lease("s1") as sandbox:
+        sandbox.sync_files(files)
+    pool.forget_file("s1", "a.csv")
+    with pool.lease("s1") as sandbox:
+        sandbox.sync_files(files)
+
+    assert sandbox.client.written == [["a.csv"], ["a.csv"]]
+
+
+def test_aborted_execution_replaces_sandbox(clock):
+    pool = make_pool()
+
+    with pytest.raises(RuntimeError):
+        with pool.lease("s1") as sandbox:
+            first_client = sandbox.client
+            raise RuntimeError("cancelled")
+    with pool.lease("s1") as sandbox:
+        pass
+
+    assert first_client.stopped
+    assert sandbox.client is not first_client
+
+
+def test_unhealthy_sandbox_is_replaced(clock):
+    pool = make_pool(health_check_interval_seconds=60)
+    with pool.lease("s1") as sandbox:
+        first_client = sandbox.client
+
+    first_client.status = "TERMINATED"
+    clock.now += 61
+    with pool.lease("s1") as sandbox:
+        pass
+
+    assert first_client.stopped
+    assert sandbox.client is not first_client
+
+
+def test_sandbox_is_recycled_before_service_timeout(clock):
+    pool = make_pool(idle_timeout_seconds=600, session_timeout_seconds=3600)
+    with pool.lease("s1") as sandbox:
+        first_client = sandbox.client
+
+    # Keep it busy enough not to go idle, but past the session headroom
+    for _ in range(7):
+        clock.now += 500
+        with pool.lease("s1") as sandbox:
+            pass
+
+    assert first_client.stopped
+    assert sandbox.client is not first_client
+
+
+def test_idle_sandboxes_are_evicted(clock):
+    pool = make_pool(idle_timeout_seconds=600)
+    with pool.lease("s1") as idle:
+        pass
+    clock.now += 500
+    with pool.lease("s2"):
+        pass
+
+    clock.now += 200
+    assert pool.evict_idle() == 1
+
+    assert idle.client is None
+    assert len(pool) == 1
+
+
+def test_pool_stops_least_recently_used_at_capacity(clock):
+    pool = make_pool(max_sandboxes=2)
+    leased = {}
+    for session_id in ("s1", "s2", "s3"):
+        clock.now += 1
+        with pool.lease(session_id) as sandbox:
+            leased[session_id] = sandbox.client
+
+    assert len(pool) == 2
+    assert leased["s1"].stopped
+    assert not leased["s3"].stopped
+
+
+def test_release_and_shutdown_stop_sandboxes(clock):
+    pool = make_pool()
+    with pool.lease("s1") as first:
+        first_client = first.client
+    with pool.lease("s2") as second:
+        second_client = second.client
+
+    pool.release("s1")
+    assert first_client.stopped and len(pool) == 1
+
+    pool.shutdown()
+    assert second_client.stopped and len(pool) == 0
+
+
+class FakeSandbox(PooledSandbox):
+    def __init__(self, session_id):
+        super().__init__(session_id)
+        self.client = FakeCodeInterpreter("us-east-1")
+
+
+@pytest.fixture
+def leased_sessions(monkeypatch):
+    """Session IDs execute_python_code asked a sandbox for"""
+    import main
+
+    leased = []
+
+    @contextmanager
+    def fake_sandbox_for_session(session_id):
+        leased.append(session_id)
+        yield FakeSandbox(session_id or "one-off")
+
+    monkeypatch.setattr(main, "sandbox_for_session", fake_sandbox_for_session)
+    return leased
+
+
+def test_session_tool_uses_bound_sandbox_on_any_thread(leased_sessions):
+    import main
+
+    tool = main.create_execute_python_code_tool("session-1")
+    # A plain executor thread does not inherit the caller's context
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        output = executor.submit(tool, code="print('ok')").result()
+
+    assert output == "ok\n"
+    assert leased_sessions == ["session-1"]
+
+
+def test_unbound_tool_logs_one_off_fallback(leased_sessions, capsys):
+    import main
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(main.execute_python_code, code="print('ok')").result()
+
+    assert leased_sessions == [None]
+    assert "falling back to a one-off sandbox" in capsys.readouterr().out
+
+
+def test_unbound_tool_uses_context_session(leased_sessions):
+    import main
+
+    token = sandbox_pool.current_sandbox_session.set("session-2")
+    try:
+        main.execute_python_code(code="print('ok')")
+    finally:
+        sandbox_pool.current_sandbox_session.reset(token)
+
+    assert leased_sessions == ["session-2"]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bounded session store and the artifact store
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root / 'backend'))
+
+import session_store
+from session_store import ArtifactStore, SessionStore
+
+
+class FakeSession:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.conversation_history = []
+        self.code_history = []
+        self.execution_results = []
+        self.uploaded_csv = None
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    return ArtifactStore(str(tmp_path / "artifacts"))
+
+
+def make_store(artifacts=None, **kwargs):
+    return SessionStore(FakeSession, artifacts=artifacts, **kwargs)
+
+
+def artifact_files(store):
+    return sorted(p.name for p in Path(store.root).rglob("*") if p.is_file())
+
+
+# -- ArtifactStore ------------------------------------------------------------
+
+def test_artifact_round_trip(artifacts):
+    digest = artifacts.put_text("a,b\n1,2\n")
+
+    assert digest == hashlib.sha256(b"a,b\n1,2\n").hexdigest()
+    assert artifacts.read_text(digest) == "a,b\n1,2\n"
+
+
+def test_artifact_is_deleted_with_last_reference(artifacts):
+    first = artifacts.put_text("same")
+    second = artifacts.put_text("same")
+    assert first == second and len(artifacts) == 1
+
+    artifacts.release(first)
+    assert artifacts.read_text(first) == "same"
+
+    artifacts.release(first)
+    assert len(artifacts) == 0
+    assert artifact_files(artifacts) == []
+
+
+def test_leftover_artifacts_are_removed_on_startup(tmp_path):
+    root = str(tmp_path / "artifacts")
+    digest = ArtifactStore(root).put_text("from a previous run")
+    unrelated = tmp_path / "artifacts" / "notes.txt"
+    unrelated.write_text("keep")
+
+    ArtifactStore(root)
+
+    assert not os.path.exists(os.path.join(root, digest[:2], digest[2:]))
+    assert unrelated.exists()
+
+
+# -- session eviction ---------------------------------------------------------
+
+def test_least_recently_used_session_is_evicted(clock):
+    store = make_store(max_sessions=2)
+    store.get_or_create("s1")
+    store.get_or_create("s2")
+    store.get("s1")
+
+    store.get_or_create("s3")
+
+    assert "s1" in store and "s3" in store
+    assert "s2" not in store
+    assert len(store) == 2
+
+
+def test_idle_sessions_expire(clock):
+    store = make_store(idle_ttl_seconds=60)
+    session = store.get_or_create("s1")
+    store.get_or_create("s2")
+
+    clock.now += 30
+    store.get("s2")
+    clock.now += 31
+
+    assert store.evict_expired() == 1
+    assert store.get("s1") is None
+    assert store.get_or_create("s1") is not session
+    assert "s2" in store
+
+
+def test_evicted_session_releases_its_artifacts(clock, artifacts):
+    store = make_store(artifacts, max_sessions=1, spill_threshold_bytes=10)
+    session = store.get_or_create("s1")
+    store.append_history(session, "conversation_history", {"content": "x" * 100})
+    store.set_uploaded_csv(session, "data.csv", "y" * 100, timestamp=1)
+    assert len(artifacts) == 2
+
+    store.get_or_create("s2")
+
+    assert len(artifacts) == 0
+    assert artifact_files(artifacts) == []
+
+
+# -- spilling -----------------------------------------------------------------
+
+def test_large_values_spill_and_materialize(clock, artifacts):
+    store = make_store(artifacts, spill_threshold_bytes=10)
+    session = store.get_or_create("s1")
+    image = {"format": "png", "data": "i" * 100, "source": "test"}
+
+    store.append_history(session, "conversation_history", {"content": "c" * 100, "timestamp": 1})
+    store.append_history(session, "execution_results", {"result": "ok", "images": [image], "timestamp": 2})
+    store.append_history(session, "conversation_history", {"content": "small", "timestamp": 3})
+
+    stored_conversation, stored_result = session.conversation_history[0], session.execution_results[0]
+    assert "content" not in stored_conversation and stored_conversation["size"] == 100
+    assert "data" not in stored_result["images"][0]
+    assert session.conversation_history[1] == {"content": "small", "timestamp": 3}
+
+    assert store.materialize(stored_conversation)["content"] == "c" * 100
+    assert store.materialize(stored_result)["images"] == [{**image, "data_ref": stored_result["images"][0]["data_ref"]}]
+    # Materializing returns a copy; the stored entry keeps its reference only
+    assert "content" not in stored_conversation
+
+
+def test_values_stay_in_memory_without_artifact_store(clock):
+    store = make_store(spill_threshold_bytes=10)
+    session = store.get_or_create("s1")
+    entry = {"content": "c" * 100}
+
+    store.append_history(session, "conversation_history", entry)
+
+    assert session.conversation_history == [entry]
+    assert store.materialize(entry) is entry
+
+
+def test_uploaded_csv_spill_and_replace(clock, artifacts):
+    store = make_store(artifacts, spill_threshold_bytes=10)
+    session = store.get_or_create("s1")
+
+    store.set_uploaded_csv(session, "a.csv", "a" * 100, timestamp=1)
+    assert "content" not in session.uploaded_csv
+    assert session.uploaded_csv["sha256"] == hashlib.sha256(b"a" * 100).hexdigest()
+    assert store.uploaded_csv_content(session) == "a" * 100
+
+    store.set_uploaded_csv(session, "b.csv", "b,c", timestamp=2)
+    assert session.uploaded_csv["content"] == "b,c"
+    assert session.uploaded_csv["sha256"] == hashlib.sha256(b"b,c").hexdigest()
+    assert len(artifacts) == 0
+
+    store.clear_uploaded_csv(session)
+    assert session.uploaded_csv is None
+
+
+def test_detached_session_does_not_spill(clock, artifacts):
+    store = make_store(artifacts, max_sessions=1, spill_threshold_bytes=10)
+    session = store.get_or_create("s1")
+    store.get_or_create("s2")
+
+    # A job that outlived the eviction of its session
+    store.append_history(session, "conversation_history", {"content": "c" * 100})
+
+    assert session.conversation_history[0]["content"] == "c" * 100
+    assert len(artifacts) == 0
+
+
+# -- history budget -----------------------------------------------------------
+
+def add_execution(store, session, code, timestamp):
+    store.append_history(session, "code_history", code)
+    store.append_history(session, "execution_results", {
+        "code": code, "result": "r" * 50, "timestamp": timestamp
+    })
+
+
+def test_trim_drops_oldest_entries_first(clock):
+    store = make_store(max_session_bytes=400)
+    session = store.get_or_create("s1")
+
+    for i in range(10):
+        store.append_history(session, "conversation_history", {"content": f"{i}" * 50, "timestamp": i})
+
+    assert session.history_bytes <= 400
+    timestamps = [entry["timestamp"] for entry in session.conversation_history]
+    assert timestamps == list(range(10 - len(timestamps), 10))
+
+
+def test_trim_keeps_code_and_results_paired(clock):
+    store = make_store(max_session_bytes=600)
+    session = store.get_or_create("s1")
+
+    for i in range(10):
+        store.append_history(session, "conversation_history", {"content": "m" * 20, "timestamp": i * 2})
+        add_execution(store, session, f"print({i})", i * 2 + 1)
+
+    assert session.history_bytes <= 600
+    assert len(session.code_history) == len(session.execution_results)
+    assert session.code_history == [entry["code"] for entry in session.execution_results]
+    assert session.execution_results[-1]["code"] == "print(9)"
+
+
+def test_trim_releases_dropped_artifacts(clock, artifacts):
+    store = make_store(artifacts, max_session_bytes=300, spill_threshold_bytes=10)
+    session = store.get_or_create("s1")
+
+    for i in range(5):
+        store.append_history(session, "conversation_history", {"content": f"{i}" * 100, "timestamp": i})
+
+    referenced = {entry["content_ref"] for entry in session.conversation_history}
+    assert len(artifacts) == len(referenced)
+    assert sorted(artifact_files(artifacts)) == sorted(ref[2:] for ref in referenced)
+
+
+def test_history_bytes_track_the_kept_entries(clock):
+    store = make_store(max_session_bytes=500)
+    session = store.get_or_create("s1")
+
+    for i in range(8):
+        add_execution(store, session, f"x = {i}", i)
+
+    expected = sum(
+        session_store._value_size(entry)
+        for name in session_store.HISTORY_LISTS
+        for entry in getattr(session, name)
+    )
+    assert session.history_bytes == expected
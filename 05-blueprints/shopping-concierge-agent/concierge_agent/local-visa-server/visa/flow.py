@@ -6,7 +6,7 @@ import logging
 import base64
 import uuid
 from visa.helpers import (
-    get_secret,
+    crypto_context,
     generate_x_pay_token,
     encrypt_card_data,
     decrypt_token_info,
@@ -15,6 +15,12 @@ from visa.helpers import (
     decrypt_rsa,
 )
 from visa.secure_token import get_secure_token_direct
+from visa.http_client import (
+    get_session,
+    VTS_TIMEOUT,
+    VIC_TIMEOUT,
+    VTS_AUTH_TIMEOUT,
+)
 
 
 # Configure logging
@@ -39,16 +45,13 @@ encryption_shared_secret_secret_name = (
     "visa/encryption-shared-secret"  # pragma: allowlist secret
 )
 vic_api_key_secret_name = "visa/api-key"  # pragma: allowlist secret
-
-# Lazy-load secrets - only load when needed
-_secrets_cache = {}
+vic_key_id_secret_name = "visa/vic_key_id"  # pragma: allowlist secret
 
 
 def get_visa_secret(secret_name):
     """Lazy load secrets from AWS Secrets Manager with caching"""
-    if secret_name not in _secrets_cache:
-        _secrets_cache[secret_name] = get_secret(secret_name, region)
-    return _secrets_cache[secret_name]
+    # Shared with the encryption helpers, so each secret is fetched once
+    return crypto_context.secret(secret_name, region)
 
 
 # All secrets are lazy-loaded when functions are called
@@ -177,7 +180,9 @@ def enroll_pan(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -325,7 +330,9 @@ def provision_token(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -522,7 +529,9 @@ def device_attestation_authenticate(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -627,7 +636,9 @@ def device_binding(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -721,7 +732,9 @@ def step_up(
 
     # Make the request
     try:
-        response = requests.put(url, headers=headers, data=payload)
+        response = get_session().put(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -811,7 +824,9 @@ def validate_otp(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -943,7 +958,9 @@ def device_attestation_register(
     # codeql[py/clear-text-logging-sensitive-data] Debug logging for API integration - logs metadata only, sensitive data is redacted
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -1020,7 +1037,7 @@ def passkey_creation(
     )
 
     try:
-        response = requests.post(url, data=payload)
+        response = get_session().post(url, data=payload, timeout=VTS_AUTH_TIMEOUT)
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -1164,7 +1181,7 @@ def vic_enroll_card(
     )
 
     # Get keyId from secrets (not hardcoded)
-    vic_key_id = get_secret("visa/vic_key_id", region)
+    vic_key_id = get_visa_secret(vic_key_id_secret_name)
 
     headers = {
         "Accept": "application/json",
@@ -1184,7 +1201,9 @@ def vic_enroll_card(
     logger.info(f"Request Body (truncated): {enc_data_str[:100]}...")
 
     try:
-        response = requests.post(url, headers=headers, data=enc_data_str)
+        response = get_session().post(
+            url, headers=headers, data=enc_data_str, timeout=VIC_TIMEOUT
+        )
 
         # Log response details BEFORE raising for status
         logger.info(f"\nResponse Status Code: {response.status_code}")
@@ -1354,7 +1373,7 @@ def vic_initiate_purchase_instructions(
     )
 
     # Get keyId from secrets
-    vic_key_id = get_secret("visa/vic_key_id", region)
+    vic_key_id = get_visa_secret(vic_key_id_secret_name)
 
     headers = {
         "Accept": "application/json",
@@ -1369,7 +1388,9 @@ def vic_initiate_purchase_instructions(
 
     try:
         # codeql[py/clear-text-logging-sensitive-data] Debug logging for API integration - logs metadata only, sensitive data is redacted
-        response = requests.post(url, headers=headers, data=enc_data_str)
+        response = get_session().post(
+            url, headers=headers, data=enc_data_str, timeout=VIC_TIMEOUT
+        )
         response.raise_for_status()
 
         response_json = response.json()
@@ -1488,7 +1509,7 @@ def vic_get_payment_credentials(
     )
 
     # Get keyId from secrets
-    vic_key_id = get_secret("visa/vic_key_id", region)
+    vic_key_id = get_visa_secret(vic_key_id_secret_name)
 
     headers = {
         "Accept": "application/json",
@@ -1503,7 +1524,9 @@ def vic_get_payment_credentials(
 
     try:
         # codeql[py/clear-text-logging-sensitive-data] Debug logging for API integration - logs metadata only, sensitive data is redacted
-        response = requests.post(url, headers=headers, data=enc_data_str)
+        response = get_session().post(
+            url, headers=headers, data=enc_data_str, timeout=VIC_TIMEOUT
+        )
         response.raise_for_status()
 
         response_json = response.json()
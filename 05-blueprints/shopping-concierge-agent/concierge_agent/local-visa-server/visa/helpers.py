@@ -6,6 +6,7 @@ import hmac
 import logging
 import base64
 import ntplib
+import threading
 import uuid
 from datetime import datetime, timezone
 from jwcrypto import jwk, jwe
@@ -90,12 +91,12 @@ def generate_x_pay_token(shared_secret, resource_path, query_string, request_bod
     return token
 
 
-def get_ntp_time():
+def get_ntp_offset():
     """
-    Get current time from US NTP server
+    Get the offset of the local clock from US NTP servers
 
     Returns:
-        Timestamp in seconds (not milliseconds)
+        Offset in seconds to add to the local time, or None if every server failed
     """
     ntp_servers = [
         "time.nist.gov",
@@ -108,22 +109,130 @@ def get_ntp_time():
 
     for ntp_server in ntp_servers:
         try:
-            logger.info(f"  Querying NTP server: {ntp_server}")
             response = client.request(ntp_server, version=3, timeout=5)
-            ntp_time_seconds = int(response.tx_time)
-            _ntp_time_readable = datetime.fromtimestamp(
-                response.tx_time, tz=timezone.utc
-            ).strftime("%Y-%m-%d %H:%M:%S UTC")
-            logger.info(f"  NTP time retrieved successfully from {ntp_server}")
-            return ntp_time_seconds
+            logger.info(
+                f"  NTP offset {response.offset:+.3f}s retrieved from {ntp_server}"
+            )
+            return response.offset
         except Exception as e:
             logger.warning(f"  Failed to get time from {ntp_server}: {str(e)}")
             continue
 
-    # Fallback to system time if all NTP servers fail
-    logger.warning("  All NTP servers failed, falling back to system UTC time")
-    fallback_time_seconds = int(datetime.now(timezone.utc).timestamp())
-    return fallback_time_seconds
+    return None
+
+
+def get_ntp_time():
+    """
+    Get current time from US NTP server
+
+    Returns:
+        Timestamp in seconds (not milliseconds)
+    """
+    offset = get_ntp_offset()
+    if offset is None:
+        # Fallback to system time if all NTP servers fail
+        logger.warning("  All NTP servers failed, falling back to system UTC time")
+        offset = 0.0
+    return int(datetime.now(timezone.utc).timestamp() + offset)
+
+
+class CryptoContext:
+    """
+    Cache of the key material and clock used by the encryption helpers
+
+    - Secrets are kept for secret_ttl_seconds, then fetched again so rotated
+      secrets are picked up; invalidate() forces that immediately.
+    - Parsed PEM keys and derived symmetric keys are cached by the secret
+      value they came from, so a rotated secret is parsed again once.
+    - The NTP clock offset is measured on first use and then refreshed by a
+      background thread every ntp_refresh_seconds, so only the first
+      encryption waits for NTP.
+    """
+
+    def __init__(self, secret_ttl_seconds=3600, ntp_refresh_seconds=900):
+        self.secret_ttl_seconds = secret_ttl_seconds
+        self.ntp_refresh_seconds = ntp_refresh_seconds
+        self._secrets = {}  # (name, region) -> (value, fetched_at)
+        self._pem_keys = {}  # PEM text -> JWK
+        self._symmetric_keys = {}  # shared secret -> JWK
+        self._clock_offset = None
+        self._ntp_thread = None
+        self._lock = threading.Lock()
+        self._ntp_lock = threading.Lock()
+
+    def secret(self, secret_name, region_name="us-east-1"):
+        """Secret value from Secrets Manager, cached for secret_ttl_seconds"""
+        key = (secret_name, region_name)
+        with self._lock:
+            cached = self._secrets.get(key)
+        if cached and time.monotonic() - cached[1] < self.secret_ttl_seconds:
+            return cached[0]
+
+        value = get_secret(secret_name, region_name)
+        with self._lock:
+            self._secrets[key] = (value, time.monotonic())
+        return value
+
+    def invalidate(self, secret_name=None):
+        """Forget one cached secret (all regions), or all of them"""
+        with self._lock:
+            if secret_name is None:
+                self._secrets.clear()
+            else:
+                for key in [k for k in self._secrets if k[0] == secret_name]:
+                    del self._secrets[key]
+
+    def pem_key(self, secret_name, region_name="us-east-1"):
+        """JWK parsed from a PEM certificate/key secret"""
+        pem_data = self.secret(secret_name, region_name)
+        with self._lock:
+            key = self._pem_keys.get(pem_data)
+        if key is None:
+            key = loadPem(pem_data)
+            with self._lock:
+                self._pem_keys[pem_data] = key
+        return key
+
+    def symmetric_key(self, shared_secret):
+        """A256GCMKW JWK derived from an encryption shared secret"""
+        with self._lock:
+            key = self._symmetric_keys.get(shared_secret)
+        if key is None:
+            key_bytes = hashlib.sha256(
+                shared_secret.encode("utf-8")
+            ).digest()  # CodeQL[py/weak-cryptographic-algorithm] SHA256 is mandated by Visa API specification
+            key = jwk.JWK(
+                kty="oct",
+                k=base64.urlsafe_b64encode(key_bytes).decode("utf-8").rstrip("="),
+            )
+            with self._lock:
+                self._symmetric_keys[shared_secret] = key
+        return key
+
+    def ntp_time(self):
+        """Current time in seconds, corrected by the cached NTP clock offset"""
+        if self._clock_offset is None:
+            with self._ntp_lock:
+                if self._clock_offset is None:
+                    self._clock_offset = get_ntp_offset() or 0.0
+                    self._start_ntp_refresh()
+        return int(time.time() + self._clock_offset)
+
+    def _start_ntp_refresh(self):
+        self._ntp_thread = threading.Thread(
+            target=self._ntp_refresh_loop, name="ntp-offset", daemon=True
+        )
+        self._ntp_thread.start()
+
+    def _ntp_refresh_loop(self):
+        while True:
+            time.sleep(self.ntp_refresh_seconds)
+            offset = get_ntp_offset()
+            if offset is not None:
+                self._clock_offset = offset
+
+
+crypto_context = CryptoContext()
 
 
 def encrypt_card_data(payload, encryption_api_key, encryption_shared_secret):
@@ -141,18 +250,11 @@ def encrypt_card_data(payload, encryption_api_key, encryption_shared_secret):
     # Step 1: Convert payload to JSON string
     payload_json = json.dumps(payload)
 
-    # Step 2: Get timestamp
-    iat_utc = get_ntp_time()
+    # Step 2: Get timestamp (NTP-corrected, without querying NTP inline)
+    iat_utc = crypto_context.ntp_time()
 
-    # Step 3: Create symmetric key from shared secret
-    key_bytes = hashlib.sha256(
-        encryption_shared_secret.encode("utf-8")
-    ).digest()  # CodeQL[py/weak-cryptographic-algorithm] SHA256 is mandated by Visa API specification
-
-    # Create JWK object for symmetric key
-    symmetric_key = jwk.JWK(
-        kty="oct", k=base64.urlsafe_b64encode(key_bytes).decode("utf-8").rstrip("=")
-    )
+    # Step 3: Get the symmetric key derived from the shared secret
+    symmetric_key = crypto_context.symmetric_key(encryption_shared_secret)
 
     # Step 4: Create protected header
     protected_header = {
@@ -187,13 +289,8 @@ def decrypt_token_info(encrypted_jwe, encryption_shared_secret):
     Returns:
         Decrypted data as dictionary
     """
-    # Step 1: Create symmetric key from shared secret
-    key_bytes = hashlib.sha256(
-        encryption_shared_secret.encode("utf-8")
-    ).digest()  # CodeQL[py/weak-cryptographic-algorithm] SHA256 is mandated by Visa API specification
-    symmetric_key = jwk.JWK(
-        kty="oct", k=base64.urlsafe_b64encode(key_bytes).decode("utf-8").rstrip("=")
-    )
+    # Step 1: Get the symmetric key derived from the shared secret
+    symmetric_key = crypto_context.symmetric_key(encryption_shared_secret)
 
     # Step 2: Deserialize and decrypt the JWE token
     jwetoken = jwe.JWE()
@@ -257,12 +354,12 @@ def encrypt_payload(
     if isinstance(payload, dict):
         payload = json.dumps(payload)
 
-    # Get certificate from Secrets Manager
-    server_cert = get_secret(server_cert_secret_name, region)
+    # Get the parsed certificate (cached) from Secrets Manager
+    server_key = crypto_context.pem_key(server_cert_secret_name, region)
 
     # Get keyId from Secrets Manager if not provided
     if key_id is None:
-        key_id = get_secret("visa/vic_key_id", region)
+        key_id = crypto_context.secret("visa/vic_key_id", region)
 
     protected_header = {
         "alg": "RSA-OAEP-256",
@@ -272,7 +369,7 @@ def encrypt_payload(
     }
     jwetoken = jwe.JWE(
         payload.encode("utf-8"),
-        recipient=loadPem(server_cert),
+        recipient=server_key,
         protected=protected_header,
     )
 
@@ -295,9 +392,8 @@ def decrypt_rsa(
     Returns:
         Decrypted data as dictionary
     """
-    # Get private key from Secrets Manager
-    private_key_pem = get_secret(private_key_secret_name, region)
-    private_key = loadPem(private_key_pem)
+    # Get the parsed private key (cached) from Secrets Manager
+    private_key = crypto_context.pem_key(private_key_secret_name, region)
 
     # Deserialize and decrypt the JWE token
     jwetoken = jwe.JWE()
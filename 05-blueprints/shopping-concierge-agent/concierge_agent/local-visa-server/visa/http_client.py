@@ -0,0 +1,80 @@
+"""
+Shared HTTPS session for Visa API calls
+
+Every flow step used to call requests.post() directly, which opens a new
+TCP + TLS connection per call. All steps now go through one pooled
+keep-alive requests.Session, so a multi-step onboarding reuses warm
+connections to cert.api.visa.com and sbx.vts.auth.visa.com.
+
+Retries use jittered exponential backoff. Read-only methods (GET, HEAD,
+OPTIONS) are retried on connection errors, read errors and 429/5xx
+responses; POST and PUT requests are only retried when the connection could
+not be established, i.e. when the request never reached Visa. Visa PUT
+steps have side effects (step_up sends an OTP), so they are not replayed.
+
+Two-way SSL client certificates are used when VISA_CLIENT_CERT_PATH (and,
+for a separate key file, VISA_CLIENT_KEY_PATH) are set.
+"""
+
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds per Visa endpoint family
+VTS_TIMEOUT = (5, 30)
+VIC_TIMEOUT = (5, 60)
+VTS_AUTH_TIMEOUT = (5, 15)
+
+POOL_MAXSIZE = int(os.getenv("VISA_HTTP_POOL_MAXSIZE", "10"))
+MAX_RETRIES = int(os.getenv("VISA_HTTP_MAX_RETRIES", "3"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        status=MAX_RETRIES,
+        # POST and PUT are deliberately absent: only connect errors are retried
+        # for them, since replaying step_up's PUT would send another OTP
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        status_forcelist=(429, 500, 502, 503, 504),
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        respect_retry_after_header=True,
+        # Hand the last response back so callers' raise_for_status() sees it
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+
+    client_cert = os.getenv("VISA_CLIENT_CERT_PATH")
+    client_key = os.getenv("VISA_CLIENT_KEY_PATH")
+    if client_cert:
+        session.cert = (client_cert, client_key) if client_key else client_cert
+        logger.info("Using two-way SSL client certificate for Visa API calls")
+
+    return session
+
+
+def get_session():
+    """Process-wide pooled session for Visa API calls (thread-safe)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
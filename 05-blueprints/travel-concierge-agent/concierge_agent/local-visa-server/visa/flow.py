@@ -6,7 +6,7 @@ import logging
 import base64
 import uuid
 from visa.helpers import (
-    get_secret,
+    crypto_context,
     generate_x_pay_token,
     encrypt_card_data,
     decrypt_token_info,
@@ -15,6 +15,12 @@ from visa.helpers import (
     decrypt_rsa,
 )
 from visa.secure_token import get_secure_token_direct
+from visa.http_client import (
+    get_session,
+    VTS_TIMEOUT,
+    VIC_TIMEOUT,
+    VTS_AUTH_TIMEOUT,
+)
 
 
 # Configure logging
@@ -39,16 +45,13 @@ encryption_shared_secret_secret_name = (
     "visa/encryption-shared-secret"  # pragma: allowlist secret
 )
 vic_api_key_secret_name = "visa/api-key"  # pragma: allowlist secret
-
-# Lazy-load secrets - only load when needed
-_secrets_cache = {}
+vic_key_id_secret_name = "visa/vic_key_id"  # pragma: allowlist secret
 
 
 def get_visa_secret(secret_name):
     """Lazy load secrets from AWS Secrets Manager with caching"""
-    if secret_name not in _secrets_cache:
-        _secrets_cache[secret_name] = get_secret(secret_name, region)
-    return _secrets_cache[secret_name]
+    # Shared with the encryption helpers, so each secret is fetched once
+    return crypto_context.secret(secret_name, region)
 
 
 # All secrets are lazy-loaded when functions are called
@@ -177,7 +180,9 @@ def enroll_pan(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -327,7 +332,9 @@ def provision_token(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -524,7 +531,9 @@ def device_attestation_authenticate(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -629,7 +638,9 @@ def device_binding(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -727,7 +738,9 @@ def step_up(
 
     # Make the request
     try:
-        response = requests.put(url, headers=headers, data=payload, timeout=300)
+        response = get_session().put(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -817,7 +830,9 @@ def validate_otp(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -949,7 +964,9 @@ def device_attestation_register(
 
     # Make the request
     try:
-        response = requests.post(url, headers=headers, data=payload, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=payload, timeout=VTS_TIMEOUT
+        )
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -1027,7 +1044,7 @@ def passkey_creation(
     )
 
     try:
-        response = requests.post(url, data=payload, timeout=300)
+        response = get_session().post(url, data=payload, timeout=VTS_AUTH_TIMEOUT)
         response.raise_for_status()
 
         logger.info("\nResponse Body (Parsed JSON):")
@@ -1171,7 +1188,7 @@ def vic_enroll_card(
     )
 
     # Get keyId from secrets (not hardcoded)
-    vic_key_id = get_secret("visa/vic_key_id", region)
+    vic_key_id = get_visa_secret(vic_key_id_secret_name)
 
     headers = {
         "Accept": "application/json",
@@ -1191,7 +1208,9 @@ def vic_enroll_card(
     logger.info(f"Request Body (truncated): {enc_data_str[:100]}...")
 
     try:
-        response = requests.post(url, headers=headers, data=enc_data_str, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=enc_data_str, timeout=VIC_TIMEOUT
+        )
 
         # Log response details BEFORE raising for status
         logger.info(f"\nResponse Status Code: {response.status_code}")
@@ -1361,7 +1380,7 @@ def vic_initiate_purchase_instructions(
     )
 
     # Get keyId from secrets
-    vic_key_id = get_secret("visa/vic_key_id", region)
+    vic_key_id = get_visa_secret(vic_key_id_secret_name)
 
     headers = {
         "Accept": "application/json",
@@ -1376,7 +1395,9 @@ def vic_initiate_purchase_instructions(
     logger.info(f"Request Body (truncated): {enc_data_str[:100]}...")
 
     try:
-        response = requests.post(url, headers=headers, data=enc_data_str, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=enc_data_str, timeout=VIC_TIMEOUT
+        )
         response.raise_for_status()
 
         response_json = response.json()
@@ -1495,7 +1516,7 @@ def vic_get_payment_credentials(
     )
 
     # Get keyId from secrets
-    vic_key_id = get_secret("visa/vic_key_id", region)
+    vic_key_id = get_visa_secret(vic_key_id_secret_name)
 
     headers = {
         "Accept": "application/json",
@@ -1510,7 +1531,9 @@ def vic_get_payment_credentials(
     logger.info(f"Request Body (truncated): {enc_data_str[:100]}...")
 
     try:
-        response = requests.post(url, headers=headers, data=enc_data_str, timeout=300)
+        response = get_session().post(
+            url, headers=headers, data=enc_data_str, timeout=VIC_TIMEOUT
+        )
         response.raise_for_status()
 
         response_json = response.json()
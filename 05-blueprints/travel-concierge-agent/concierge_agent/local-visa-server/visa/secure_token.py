@@ -6,7 +6,6 @@ This calls the discovered API endpoint directly to get the secureToken
 without loading any iframe.
 """
 
-import requests
 import json
 import hashlib
 import base64
@@ -15,6 +14,8 @@ import secrets
 from urllib.parse import urlencode
 import logging
 
+from visa.http_client import get_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,7 +134,7 @@ def get_secure_token_direct(api_key: str, client_app_id: str):
     }
 
     try:
-        response = requests.post(
+        response = get_session().post(
             url, headers=headers, data=urlencode(params), timeout=10
         )
 